@@ -0,0 +1,82 @@
+"""
+Cold-start check for the server module, run against the budget checked in as
+benchmarks/import_budget.json:
+
+    python benchmarks/import_time.py [--runs 5] [--budget benchmarks/import_budget.json]
+
+Each run is a fresh interpreter that imports mcp.server.fastmcp (the framework
+cost the server cannot avoid) and then xlwings_mcp.server. The median time of
+the second step is compared with "max_own_import_ms", and the run fails if any
+module listed in "deferred_modules" (or below it) was loaded, or if importing
+started threads. Exits non-zero when over budget.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SRC = os.path.join(os.path.dirname(HERE), "src")
+
+_PROBE = r"""
+import json, sys, threading, time, warnings
+warnings.simplefilter("ignore")
+started = time.perf_counter()
+import mcp.server.fastmcp
+framework = time.perf_counter()
+import xlwings_mcp.server
+done = time.perf_counter()
+print(json.dumps({
+    "framework_ms": (framework - started) * 1000,
+    "own_ms": (done - framework) * 1000,
+    "modules": sorted(sys.modules),
+    "threads": [t.name for t in threading.enumerate() if t is not threading.main_thread()],
+}))
+"""
+
+
+def probe() -> dict:
+    env = dict(os.environ, PYTHONPATH=SRC + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    out = subprocess.run([sys.executable, "-c", _PROBE], env=env, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget", default=os.path.join(HERE, "import_budget.json"))
+    args = parser.parse_args()
+
+    with open(args.budget, encoding="utf-8") as f:
+        budget = json.load(f)
+
+    runs = [probe() for _ in range(args.runs)]
+    own_ms = statistics.median(run["own_ms"] for run in runs)
+    framework_ms = statistics.median(run["framework_ms"] for run in runs)
+    deferred = budget.get("deferred_modules", [])
+    loaded = sorted({m for run in runs for m in run["modules"]
+                     if any(m == name or m.startswith(name + ".") for name in deferred)})
+    threads = sorted({t for run in runs for t in run["threads"]})
+
+    print(f"mcp.server.fastmcp import: {framework_ms:8.1f} ms (median of {args.runs})")
+    print(f"xlwings_mcp.server import: {own_ms:8.1f} ms (budget {budget['max_own_import_ms']} ms)")
+    print(f"deferred modules loaded:   {', '.join(loaded) or 'none'}")
+    print(f"threads started at import: {', '.join(threads) or 'none'}")
+
+    failures = []
+    if own_ms > budget["max_own_import_ms"]:
+        failures.append(f"import took {own_ms:.1f} ms, budget is {budget['max_own_import_ms']} ms")
+    if loaded:
+        failures.append(f"modules that should load on first use were imported: {', '.join(loaded)}")
+    if threads and not budget.get("allow_threads", False):
+        failures.append(f"threads started at import: {', '.join(threads)}")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
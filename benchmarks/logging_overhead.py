@@ -0,0 +1,108 @@
+"""
+Caller-side cost of one log call: the previous synchronous RotatingFileHandler
+setup versus the queue handler from xlwings_mcp.logging_setup.
+
+    python benchmarks/logging_overhead.py [--records 50000] [--threads 4]
+
+Each thread emits the same INFO message with a few arguments, as a tool does,
+and the CPU time each calling thread spends per record is reported
+(time.thread_time). The queue listener formats and writes on its own thread;
+in the server that work overlaps the tool threads' waits on Excel.
+
+The queue is sized to hold every record, so none is dropped and the caller cost
+is that of delivered records; the listener's own cost is reported as the wall
+time to drain and write them all.
+"""
+
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+from logging.handlers import RotatingFileHandler
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(HERE), "src"))
+
+from xlwings_mcp import logging_setup  # noqa: E402
+
+
+def _in_threads(work, threads: int) -> float:
+    """Run work() in each thread; total caller CPU seconds across threads."""
+    spent = []
+
+    def run():
+        started = time.thread_time()
+        work()
+        spent.append(time.thread_time() - started)
+
+    workers = [threading.Thread(target=run) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return sum(spent)
+
+
+def _emit(logger: logging.Logger, records: int, threads: int, lazy: bool) -> float:
+    """Mean caller CPU microseconds per log record."""
+    def work():
+        for i in range(records):
+            if lazy:
+                logger.info("📊 Inserting %s rows at row %s in %s", 10, i, "Data")
+            else:
+                logger.info(f"📊 Inserting {10} rows at row {i} in {'Data'}")
+
+    return _in_threads(work, threads) / (records * threads) * 1e6
+
+
+def _call_records(records: int, threads: int) -> float:
+    """Mean caller CPU microseconds per structured tool-call record."""
+    def work():
+        for i in range(records):
+            logging_setup.log_tool_call("write_data_to_excel", "3f2a9c1e", 12.5, 1000, False)
+
+    return _in_threads(work, threads) / (records * threads) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=50000, help="records per thread")
+    parser.add_argument("--threads", type=int, default=4)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        sync_logger = logging.getLogger("bench.sync")
+        sync_logger.propagate = False
+        handler = RotatingFileHandler(os.path.join(workdir, "sync.log"), maxBytes=5*1024*1024, backupCount=3)
+        handler.setFormatter(logging.Formatter(logging_setup.LOG_FORMAT))
+        sync_logger.addHandler(handler)
+        sync_logger.setLevel(logging.INFO)
+        sync_us = _emit(sync_logger, args.records, args.threads, lazy=False)
+        handler.close()
+
+        total = args.records * args.threads
+        logging_setup.QUEUE_SIZE = 2 * total + 1
+        logging_setup.configure_logging(os.path.join(workdir, "queued.log"))
+        queued_logger = logging.getLogger("bench.queued")
+        started = time.perf_counter()
+        queued_us = _emit(queued_logger, args.records, args.threads, lazy=True)
+        call_us = _call_records(args.records, args.threads)
+        logging_setup.stop_logging()
+        drain_us = (time.perf_counter() - started) / (2 * total) * 1e6
+        dropped = logging_setup.dropped_records()
+        if dropped:
+            sys.exit(f"{dropped} records were dropped; the numbers would not describe delivered records")
+
+    print(f"records: {args.records} x {args.threads} threads")
+    print(f"synchronous RotatingFileHandler: {sync_us:8.2f} us/record")
+    print(f"queue handler (lazy args):       {queued_us:8.2f} us/record")
+    print(f"structured tool-call record:     {call_us:8.2f} us/record")
+    print(f"listener, enqueue to written:    {drain_us:8.2f} us/record (wall)")
+    print(f"dropped (queue full):            {dropped}")
+
+
+if __name__ == "__main__":
+    main()
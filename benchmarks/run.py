@@ -0,0 +1,559 @@
+"""
+Benchmark the MCP tools in server.py against the simulated workbook backend.
+
+Each scenario drives one tool (called directly, as the MCP dispatcher would)
+at several data sizes and records latency percentiles, throughput, peak RSS
+and backend call counts to JSON, so runs from two commits can be compared:
+
+    python benchmarks/run.py --quick
+    python benchmarks/run.py --output before.json
+    python benchmarks/run.py --output after.json --compare before.json
+
+Runs on Linux without Excel: xlwings.App is replaced by SimApp for the
+duration of the run (see simulated_excel.py for the latency model).
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, os.path.join(ROOT, "src"))
+sys.path.insert(0, HERE)
+
+import xlwings as xw  # noqa: E402
+
+from simulated_excel import Backend, SimApp, SimSheet, fill_sheet  # noqa: E402
+
+CELL_SIZES = {"1k": 1_000, "100k": 100_000, "1m": 1_000_000}
+SHEET_COUNTS = [1, 50, 200]
+COLUMNS = ["ID", "Region", "Product", "Qty", "Price", "Discount", "Day", "Channel", "Score", "Total"]
+REGIONS = ["North", "South", "East", "West", "Central", "Coastal", "Mountain", "Islands"]
+CHANNELS = ["Online", "Retail", "Partner", "Direct"]
+FILLER_CELLS = 100    # per extra sheet in the sheet-count scenarios
+SEED = 20240501
+
+
+# ============================================================================
+# FIXTURES
+# ============================================================================
+
+_rows_cache: Dict[int, List[List[Any]]] = {}
+
+
+def dataset(cells: int) -> List[List[Any]]:
+    """Header plus deterministic rows; the Total column holds row formulas."""
+    rows = max(1, cells // len(COLUMNS) - 1)
+    if rows not in _rows_cache:
+        rng = random.Random(SEED)
+        data = [list(COLUMNS)]
+        for i in range(rows):
+            r = i + 2
+            data.append([
+                i + 1,
+                rng.choice(REGIONS),
+                f"P{rng.randint(1, 50):03d}",
+                rng.randint(1, 100),
+                round(rng.uniform(1, 500), 2),
+                round(rng.random() * 0.3, 3),
+                45000 + rng.randint(0, 730),
+                rng.choice(CHANNELS),
+                rng.randint(0, 1000),
+                f"=D{r}*E{r}*(1-F{r})",
+            ])
+        _rows_cache[rows] = data
+    return _rows_cache[rows]
+
+
+@dataclass
+class Fixture:
+    """One open session on a simulated workbook: a Data sheet plus filler sheets."""
+    server: Any
+    workdir: str
+    cells: int
+    sheets: int
+    session_id: str = ""
+    counter: int = 0
+
+    def open(self) -> "Fixture":
+        path = os.path.join(self.workdir, f"bench_{self.cells}_{self.sheets}_{time.time_ns()}.xlsx")
+        self.session_id = self.server.open_workbook(filepath=path)["session_id"]
+        book = self.book
+        with book.backend.paused():
+            data_sheet = book.sheets._items[0]
+            data_sheet._name = "Data"
+            fill_sheet(data_sheet, [list(row) for row in dataset(self.cells)])
+            filler = [[r * 10 + c for c in range(10)] for r in range(FILLER_CELLS // 10)]
+            for n in range(2, self.sheets + 1):
+                sheet = SimSheet(book, f"S{n:03d}")
+                book.sheets._items.append(sheet)
+                fill_sheet(sheet, filler)
+        return self
+
+    def close(self) -> None:
+        from xlwings_mcp.session import SESSION_MANAGER
+        with SimApp.backend.paused():
+            SESSION_MANAGER.close_workbook(self.session_id, save=False)
+
+    @property
+    def session(self):
+        from xlwings_mcp.session import SESSION_MANAGER
+        return SESSION_MANAGER.get_session(self.session_id)
+
+    @property
+    def book(self):
+        return self.session.workbook
+
+    @property
+    def rows(self) -> int:
+        return len(dataset(self.cells)) - 1
+
+    @property
+    def last_row(self) -> int:
+        return self.rows + 1
+
+    def unique(self, prefix: str) -> str:
+        self.counter += 1
+        return f"{prefix}{self.counter}"
+
+
+# ============================================================================
+# SCENARIOS
+# ============================================================================
+
+@dataclass
+class Scenario:
+    """How to drive one tool: call(fx, i) is timed; setup/prepare are not."""
+    name: str
+    tool: str
+    axis: str                                   # "cells", "sheets" or "session"
+    call: Callable[[Fixture, int], Any]
+    setup: Optional[Callable[[Fixture], None]] = None
+    prepare: Optional[Callable[[Fixture, int], None]] = None
+    cells: Callable[[Fixture], int] = lambda fx: 0       # cells moved per call, for throughput
+    warmup: bool = False
+    max_cells: Optional[int] = None
+    max_cells_reason: str = ""
+
+
+def _cold(fx: Fixture, i: int) -> None:
+    fx.session.mark_changed()
+
+
+def _write_qty(fx: Fixture, i: int) -> None:
+    fx.server.write_data_to_excel(fx.session_id, "Data", [[i + 1]], "D2")
+
+
+def _cold_structure(fx: Fixture, i: int) -> None:
+    fx.session.mark_changed(structure=True)
+
+
+def _add_sheet(fx: Fixture, i: int) -> None:
+    with SimApp.backend.paused():
+        fx.book.sheets._items.append(SimSheet(fx.book, f"Doomed{i}"))
+
+
+def _merged(state: bool) -> Callable[[Fixture, int], None]:
+    def prepare(fx: Fixture, i: int) -> None:
+        data = fx.book.sheets._items[0]
+        data.merged.clear()
+        if state:
+            data.merged.add((1, 12, 1, 14))
+    return prepare
+
+
+def _build_index(fx: Fixture) -> None:
+    fx.server.create_column_index(fx.session_id, "Data", "ID")
+
+
+_opened: List[str] = []    # sessions opened by the open_workbook scenario, closed by the next
+
+
+def _open_new(fx: Fixture, i: int) -> Any:
+    result = fx.server.open_workbook(filepath=os.path.join(fx.workdir, f"open_{time.time_ns()}.xlsx"))
+    _opened.append(result["session_id"])
+    return result
+
+
+def _open_peer(fx: Fixture) -> None:
+    """Second session for cross-workbook copies; closed with the _open_new sessions."""
+    _open_new(fx, 0)
+
+
+def _legacy_path(fx: Fixture) -> str:
+    path = os.path.join(fx.workdir, "legacy.xlsx")
+    if not os.path.exists(path):
+        open(path, "wb").close()
+    return path
+
+
+def _all(fx: Fixture) -> int:
+    return fx.rows * len(COLUMNS)
+
+
+SCENARIOS: List[Scenario] = [
+    # --- data size axis --------------------------------------------------
+    Scenario("read_data_from_excel", "read_data_from_excel", "cells",
+             lambda fx, i: fx.server.read_data_from_excel(fx.session_id, "Data", "A1", f"J{fx.last_row}"),
+             prepare=_cold, cells=_all, max_cells=100_000,
+             max_cells_reason="result is one JSON object per cell"),
+    Scenario("read_data_from_excel[cached]", "read_data_from_excel", "cells",
+             lambda fx, i: fx.server.read_data_from_excel(fx.session_id, "Data", "A1", f"J{fx.last_row}"),
+             cells=_all, warmup=True, max_cells=100_000,
+             max_cells_reason="result is one JSON object per cell"),
+    Scenario("read_data_from_excel[after write]", "read_data_from_excel", "cells",
+             lambda fx, i: fx.server.read_data_from_excel(fx.session_id, "Data", "A1", f"I{fx.last_row}"),
+             prepare=_write_qty, cells=lambda fx: fx.rows * (len(COLUMNS) - 1), warmup=True, max_cells=100_000,
+             max_cells_reason="result is one JSON object per cell"),
+    Scenario("write_data_to_excel", "write_data_to_excel", "cells",
+             lambda fx, i: fx.server.write_data_to_excel(fx.session_id, "Data", dataset(fx.cells), "L1"),
+             cells=_all),
+    Scenario("aggregate_range[cold]", "aggregate_range", "cells",
+             lambda fx, i: fx.server.aggregate_range(fx.session_id, "Data", ["Qty", "Price"], group_by=["Region"],
+                                                     agg_funcs=["sum", "mean"], data_range=f"A1:I{fx.last_row}"),
+             prepare=_cold, cells=_all),
+    Scenario("aggregate_range[cached]", "aggregate_range", "cells",
+             lambda fx, i: fx.server.aggregate_range(fx.session_id, "Data", ["Qty", "Price"], group_by=["Region"],
+                                                     agg_funcs=["sum", "mean"], data_range=f"A1:I{fx.last_row}"),
+             cells=_all, warmup=True),
+    Scenario("query_range[cold]", "query_range", "cells",
+             lambda fx, i: fx.server.query_range(fx.session_id, "Data", where=[{"column": "Qty", "op": ">", "value": 50}],
+                                                 sort_by=["Price"], descending=True, limit=100,
+                                                 data_range=f"A1:I{fx.last_row}"),
+             prepare=_cold, cells=_all),
+    Scenario("create_column_index", "create_column_index", "cells",
+             lambda fx, i: fx.server.create_column_index(fx.session_id, "Data", "ID"),
+             cells=lambda fx: fx.rows),
+    Scenario("lookup_rows", "lookup_rows", "cells",
+             lambda fx, i: fx.server.lookup_rows(fx.session_id, "Data", "ID",
+                                                 values=list(range(1, fx.rows + 1, max(1, fx.rows // 50)))),
+             setup=_build_index, cells=lambda fx: 50 * len(COLUMNS)),
+    Scenario("apply_formula", "apply_formula", "cells",
+             lambda fx, i: fx.server.apply_formula(fx.session_id, "Data", "L1", f"=SUM(D2:D{fx.last_row})")),
+    Scenario("apply_formulas", "apply_formulas", "cells",
+             lambda fx, i: fx.server.apply_formulas(fx.session_id, "Data", f"K2:K{fx.last_row}", formula="=D2*E2"),
+             cells=lambda fx: fx.rows),
+    Scenario("validate_formula_syntax", "validate_formula_syntax", "cells",
+             lambda fx, i: fx.server.validate_formula_syntax("Data", "L1", f"=SUMIF(B2:B{fx.last_row},\"North\",D2:D{fx.last_row})",
+                                                             session_id=fx.session_id)),
+    Scenario("validate_formulas", "validate_formulas", "cells",
+             lambda fx, i: fx.server.validate_formulas(fx.session_id, "Data",
+                                                       [f"=SUM(D2:D{fx.last_row})", "=AVERAGE(E2:E10)", "=D2*"]),
+             prepare=_cold),
+    Scenario("get_precedents[cold]", "get_precedents", "cells",
+             lambda fx, i: fx.server.get_precedents(fx.session_id, "Data", "J2"),
+             prepare=_cold_structure, cells=_all),
+    Scenario("get_dependents", "get_dependents", "cells",
+             lambda fx, i: fx.server.get_dependents(fx.session_id, "Data", "D2:D10"),
+             warmup=True),
+    Scenario("recalculate", "recalculate", "cells",
+             lambda fx, i: fx.server.recalculate(fx.session_id, full=True), cells=_all),
+    Scenario("format_range", "format_range", "cells",
+             lambda fx, i: fx.server.format_range("Data", "A1", session_id=fx.session_id, end_cell="J1",
+                                                  bold=True, bg_color="#DDEBF7", number_format="@")),
+    Scenario("copy_range", "copy_range", "cells",
+             lambda fx, i: fx.server.copy_range("Data", "A1", f"J{min(fx.last_row, 1000)}", "L1", session_id=fx.session_id),
+             cells=lambda fx: min(fx.last_row, 1000) * len(COLUMNS)),
+    Scenario("copy_between_sessions", "copy_between_sessions", "cells",
+             lambda fx, i: fx.server.copy_between_sessions(fx.session_id, _opened[-1], "Data",
+                                                           source_range=f"A1:J{fx.last_row}"),
+             setup=_open_peer, cells=lambda fx: fx.last_row * len(COLUMNS)),
+    Scenario("delete_range", "delete_range", "cells",
+             lambda fx, i: fx.server.delete_range("Data", "L1", "N10", session_id=fx.session_id)),
+    Scenario("merge_cells", "merge_cells", "cells",
+             lambda fx, i: fx.server.merge_cells("Data", "L1", "N1", session_id=fx.session_id),
+             prepare=_merged(False)),
+    Scenario("unmerge_cells", "unmerge_cells", "cells",
+             lambda fx, i: fx.server.unmerge_cells("Data", "L1", "N1", session_id=fx.session_id),
+             prepare=_merged(True)),
+    Scenario("get_merged_cells", "get_merged_cells", "cells",
+             lambda fx, i: fx.server.get_merged_cells("Data", session_id=fx.session_id), prepare=_cold, cells=_all,
+             max_cells=100_000, max_cells_reason="scans the used range cell by cell (~3 backend calls per cell)"),
+    Scenario("validate_excel_range", "validate_excel_range", "cells",
+             lambda fx, i: fx.server.validate_excel_range("Data", "A1", session_id=fx.session_id, end_cell=f"J{fx.last_row}"),
+             prepare=_cold),
+    Scenario("get_data_validation_info", "get_data_validation_info", "cells",
+             lambda fx, i: fx.server.get_data_validation_info("Data", session_id=fx.session_id),
+             prepare=_cold),
+    Scenario("insert_rows", "insert_rows", "cells",
+             lambda fx, i: fx.server.insert_rows("Data", 2, session_id=fx.session_id, count=10)),
+    Scenario("delete_sheet_rows", "delete_sheet_rows", "cells",
+             lambda fx, i: fx.server.delete_sheet_rows("Data", 2, session_id=fx.session_id, count=10)),
+    Scenario("insert_columns", "insert_columns", "cells",
+             lambda fx, i: fx.server.insert_columns("Data", 11, session_id=fx.session_id, count=1)),
+    Scenario("delete_sheet_columns", "delete_sheet_columns", "cells",
+             lambda fx, i: fx.server.delete_sheet_columns("Data", 11, session_id=fx.session_id, count=1)),
+    Scenario("create_chart", "create_chart", "cells",
+             lambda fx, i: fx.server.create_chart("Data", f"D1:E{min(fx.last_row, 100)}", "line", "L2",
+                                                  session_id=fx.session_id, title="Qty vs Price")),
+    Scenario("create_charts", "create_charts", "cells",
+             lambda fx, i: fx.server.create_charts(fx.session_id, "Data", [
+                 {"data_range": f"D1:D{min(fx.last_row, 100)}", "chart_type": "line", "title": "Qty"},
+                 {"data_range": f"E1:E{min(fx.last_row, 100)}", "chart_type": "bar", "title": "Price"},
+             ])),
+
+    # --- sheet count axis ------------------------------------------------
+    Scenario("get_workbook_metadata", "get_workbook_metadata", "sheets",
+             lambda fx, i: fx.server.get_workbook_metadata(fx.session_id, include_ranges=True),
+             prepare=_cold),
+    Scenario("list_workbooks", "list_workbooks", "sheets",
+             lambda fx, i: fx.server.list_workbooks()),
+    Scenario("create_worksheet", "create_worksheet", "sheets",
+             lambda fx, i: fx.server.create_worksheet(fx.session_id, fx.unique("New"))),
+    Scenario("copy_worksheet", "copy_worksheet", "sheets",
+             lambda fx, i: fx.server.copy_worksheet(fx.session_id, "Data", fx.unique("Copy"))),
+    Scenario("rename_worksheet", "rename_worksheet", "sheets",
+             lambda fx, i: fx.server.rename_worksheet(fx.session_id, "Data" if i % 2 == 0 else "Renamed",
+                                                      "Renamed" if i % 2 == 0 else "Data")),
+    Scenario("delete_worksheet", "delete_worksheet", "sheets",
+             lambda fx, i: fx.server.delete_worksheet(fx.session_id, f"Doomed{i}"),
+             prepare=_add_sheet),
+    Scenario("create_workbook", "create_workbook", "sheets",
+             lambda fx, i: fx.server.create_workbook(session_id=fx.session_id)),
+    Scenario("set_calculation_mode", "set_calculation_mode", "sheets",
+             lambda fx, i: fx.server.set_calculation_mode(fx.session_id, "manual" if i % 2 == 0 else "automatic")),
+    Scenario("get_server_metrics", "get_server_metrics", "sheets",
+             lambda fx, i: fx.server.get_server_metrics()),
+
+    # --- session lifecycle -----------------------------------------------
+    Scenario("open_workbook", "open_workbook", "session", _open_new),
+    Scenario("close_workbook", "close_workbook", "session",
+             lambda fx, i: fx.server.close_workbook(_opened.pop(), save=True),
+             prepare=lambda fx, i: _open_new(fx, i)),
+    # Deprecated filepath= calls, served from the pooled per-path session
+    Scenario("get_merged_cells_filepath", "get_merged_cells", "session",
+             lambda fx, i: fx.server.get_merged_cells("Sheet1", filepath=_legacy_path(fx))),
+]
+
+# Tools with no scenario, and why
+SKIPPED_TOOLS = {
+    "force_close_workbook_by_path_tool": "terminates OS processes holding a file; nothing to simulate",
+    "evaluate_formulas_offline": "reads the saved .xlsx from disk; simulated workbooks have no file contents",
+    "create_pivot_table": "PivotCaches/PivotTables are not modelled by the simulated backend",
+    "create_pivot_tables": "PivotCaches/PivotTables are not modelled by the simulated backend",
+    "create_table": "ListObjects are not modelled by the simulated backend",
+    "read_table": "ListObjects are not modelled by the simulated backend",
+    "append_table_rows": "ListObjects are not modelled by the simulated backend",
+}
+
+
+# ============================================================================
+# RUNNER
+# ============================================================================
+
+def percentile(samples: List[float], q: float) -> float:
+    """Nearest-rank percentile (q in 0..100)."""
+    ordered = sorted(samples)
+    rank = max(1, int(round(q / 100 * len(ordered) + 0.5)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def _failure(result: Any) -> Optional[str]:
+    if isinstance(result, str) and result.startswith("Error"):
+        return result
+    if isinstance(result, dict) and "error" in result:
+        return str(result["error"])
+    return None
+
+
+def run_scenario(server, scenario: Scenario, workdir: str, cells: int, sheets: int,
+                 iterations: int, budget_s: float) -> Dict[str, Any]:
+    record = {"scenario": scenario.name, "tool": scenario.tool, "axis": scenario.axis,
+              "cells": cells, "sheets": sheets}
+    if scenario.max_cells is not None and cells > scenario.max_cells:
+        record.update(status="skipped", reason=scenario.max_cells_reason)
+        return record
+
+    backend = SimApp.backend
+    fx = Fixture(server, workdir, cells, sheets).open()
+    latencies: List[float] = []
+    calls: List[int] = []
+    moved: List[int] = []
+    error = None
+    try:
+        if scenario.setup:
+            scenario.setup(fx)
+        if scenario.warmup:
+            scenario.call(fx, -1)
+        started_all = time.perf_counter()
+        for i in range(iterations):
+            if scenario.prepare:
+                scenario.prepare(fx, i)
+            backend.reset()
+            started = time.perf_counter()
+            try:
+                result = scenario.call(fx, i)
+            except Exception as e:
+                result = f"Error: {type(e).__name__}: {e}"
+            elapsed = (time.perf_counter() - started) * 1000
+            error = _failure(result)
+            if error:
+                break
+            latencies.append(elapsed)
+            calls.append(backend.total_calls)
+            moved.append(backend.cells)
+            if time.perf_counter() - started_all > budget_s:
+                break
+        top_ops = dict(backend.calls.most_common(5))
+    finally:
+        while _opened:
+            with backend.paused():
+                server.close_workbook(_opened.pop(), save=False)
+        fx.close()
+
+    if error:
+        record.update(status="error", error=error[:500])
+        return record
+
+    total_s = sum(latencies) / 1000
+    per_call_cells = scenario.cells(fx)
+    record.update(
+        status="ok",
+        iterations=len(latencies),
+        p50_ms=round(percentile(latencies, 50), 3),
+        p99_ms=round(percentile(latencies, 99), 3),
+        mean_ms=round(sum(latencies) / len(latencies), 3),
+        ops_per_s=round(len(latencies) / total_s, 2) if total_s else None,
+        cells_per_s=round(per_call_cells * len(latencies) / total_s) if total_s and per_call_cells else None,
+        backend_calls=round(sum(calls) / len(calls), 1),
+        backend_cells=round(sum(moved) / len(moved)),
+        top_backend_ops=top_ops,
+        peak_rss_mb=peak_rss_mb(),
+    )
+    return record
+
+
+def git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                             capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except Exception:
+        return None
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """Lines describing p50 and backend-call changes beyond threshold; regressions are marked."""
+    def key(record):
+        return record["scenario"], record["cells"], record["sheets"]
+
+    before = {key(r): r for r in baseline.get("results", []) if r.get("status") == "ok"}
+    lines = []
+    for record in current["results"]:
+        old = before.get(key(record))
+        if record.get("status") != "ok" or old is None:
+            continue
+        label = f"{record['scenario']} cells={record['cells']} sheets={record['sheets']}"
+        for metric in ("p50_ms", "backend_calls"):
+            a, b = old[metric], record[metric]
+            if not a:
+                continue
+            change = (b - a) / a
+            if abs(change) >= threshold:
+                flag = "REGRESSION" if change > 0 else "improved"
+                lines.append(f"{flag:10} {label}: {metric} {a} -> {b} ({change:+.0%})")
+    return lines
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--quick", action="store_true", help="smallest sizes, 3 iterations (smoke run)")
+    parser.add_argument("--cells", default=",".join(CELL_SIZES), help="data sizes to run (default: 1k,100k,1m)")
+    parser.add_argument("--sheets", default=",".join(map(str, SHEET_COUNTS)), help="sheet counts (default: 1,50,200)")
+    parser.add_argument("--tools", help="comma-separated scenario or tool names to run")
+    parser.add_argument("--iterations", type=int, default=10)
+    parser.add_argument("--budget", type=float, default=30.0, help="seconds per scenario before stopping early")
+    parser.add_argument("--latency-us", type=float, default=50.0, help="simulated per-call latency")
+    parser.add_argument("--cell-ns", type=float, default=100.0, help="simulated per-cell transfer cost")
+    parser.add_argument("--output", help="JSON results path (default: benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", help="baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="relative change reported by --compare")
+    args = parser.parse_args(argv)
+
+    if args.quick:
+        args.cells, args.sheets, args.iterations, args.budget = "1k", "1", 3, 5.0
+    cell_sizes = [CELL_SIZES[name.strip().lower()] for name in args.cells.split(",")]
+    sheet_counts = [int(n) for n in args.sheets.split(",")]
+    wanted = {name.strip() for name in args.tools.split(",")} if args.tools else None
+    output = os.path.abspath(args.output or os.path.join(HERE, "results", f"{git_commit() or 'local'}.json"))
+
+    SimApp.backend = Backend(args.latency_us, args.cell_ns)
+    real_app = xw.App
+    xw.App = SimApp
+    try:
+        from xlwings_mcp import server
+
+        results = []
+        with tempfile.TemporaryDirectory(prefix="xlwings-mcp-bench-") as workdir:
+            for scenario in SCENARIOS:
+                if wanted and scenario.name not in wanted and scenario.tool not in wanted:
+                    continue
+                if scenario.axis == "cells":
+                    matrix = [(cells, 1) for cells in cell_sizes]
+                elif scenario.axis == "sheets":
+                    matrix = [(CELL_SIZES["1k"], sheets) for sheets in sheet_counts]
+                else:
+                    matrix = [(CELL_SIZES["1k"], 1)]
+                for cells, sheets in matrix:
+                    record = run_scenario(server, scenario, workdir, cells, sheets, args.iterations, args.budget)
+                    results.append(record)
+                    if record["status"] == "ok":
+                        print(f"{scenario.name:28} cells={cells:<8} sheets={sheets:<4} "
+                              f"p50={record['p50_ms']:>10.2f}ms p99={record['p99_ms']:>10.2f}ms "
+                              f"calls={record['backend_calls']:>9} rss={record['peak_rss_mb']}MB")
+                    else:
+                        print(f"{scenario.name:28} cells={cells:<8} sheets={sheets:<4} "
+                              f"{record['status'].upper()}: {record.get('reason') or record.get('error')}")
+    finally:
+        xw.App = real_app
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "latency_us": args.latency_us,
+            "cell_ns": args.cell_ns,
+            "iterations": args.iterations,
+            "quick": args.quick,
+        },
+        "skipped_tools": SKIPPED_TOOLS,
+        "results": results,
+    }
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nWrote {output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        lines = compare(report, baseline, args.threshold)
+        print(f"\nCompared with {args.compare} (commit {baseline.get('meta', {}).get('commit')}):")
+        print("\n".join(lines) if lines else "no changes beyond threshold")
+        if any(line.startswith("REGRESSION") for line in lines):
+            return 1
+    failed = [r for r in results if r["status"] == "error"]
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,868 @@
+"""
+Deterministic in-process stand-in for the parts of the xlwings object model
+the server uses (App > Books > Book > Sheets > Sheet > Range, plus the .api
+escape hatches), so the MCP tools can be benchmarked on Linux without Excel.
+
+Every backend operation goes through Backend.hit(), which counts it and
+busy-waits for a fixed per-call latency plus a per-cell transfer cost, the
+two costs that dominate real COM automation. Cells are stored in Python
+(row -> dense list of columns); formulas are stored but never calculated.
+"""
+
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Tuple
+
+from xlwings_mcp.formula.parser import column_letter, split_range
+
+MAX_ROWS = 1048576
+MAX_COLS = 16384
+
+# Values .api attributes report when nothing more specific is modelled
+_COM_DEFAULTS = {
+    "ProtectContents": False,
+    "HasFormula": False,
+    "MergeCells": False,
+    "WrapText": False,
+    "Count": 0,
+    "Visible": -1,
+    "Text": "",
+    "Saved": True,
+}
+
+
+class Backend:
+    """Call counter and latency model shared by every object of one simulated app."""
+
+    def __init__(self, latency_us: float = 50.0, cell_ns: float = 100.0):
+        self.latency_us = latency_us
+        self.cell_ns = cell_ns
+        self.calls: Counter = Counter()
+        self.cells = 0
+        self._paused = 0
+
+    def hit(self, op: str, cells: int = 0) -> None:
+        if self._paused:
+            return
+        self.calls[op] += 1
+        self.cells += cells
+        cost = (self.latency_us * 1000 + cells * self.cell_ns) / 1e9
+        if cost > 0:
+            # Busy-wait: sleep() granularity is too coarse for microsecond latencies
+            deadline = time.perf_counter() + cost
+            while time.perf_counter() < deadline:
+                pass
+
+    @property
+    def total_calls(self) -> int:
+        return sum(self.calls.values())
+
+    def reset(self) -> None:
+        self.calls.clear()
+        self.cells = 0
+
+    @contextmanager
+    def paused(self):
+        """Neither count nor delay operations (fixture setup)."""
+        self._paused += 1
+        try:
+            yield
+        finally:
+            self._paused -= 1
+
+
+class SimCom:
+    """Absorbing stand-in for a raw COM object: every access is counted and succeeds."""
+
+    def __init__(self, backend: Backend, name: str):
+        object.__setattr__(self, "_backend", backend)
+        object.__setattr__(self, "_name", name)
+
+    def __getattr__(self, attr: str) -> Any:
+        if attr.startswith("__"):
+            raise AttributeError(attr)
+        self._backend.hit(f"{self._name}.{attr}")
+        if attr in _COM_DEFAULTS:
+            return _COM_DEFAULTS[attr]
+        return SimCom(self._backend, attr)
+
+    def __setattr__(self, attr: str, value: Any) -> None:
+        self._backend.hit(f"{self._name}.{attr}=")
+
+    def __call__(self, *args, **kwargs) -> "SimCom":
+        self._backend.hit(f"{self._name}()")
+        return SimCom(self._backend, self._name)
+
+    def __iter__(self):
+        return iter(())
+
+    def __len__(self):
+        return 0
+
+    def __bool__(self):
+        return True
+
+
+class SimRangeCom(SimCom):
+    """Range.api: the structural and calculation calls the tools make through COM."""
+
+    def __init__(self, rng: "SimRange"):
+        super().__init__(rng.sheet.backend, "Range")
+        object.__setattr__(self, "_range", rng)
+
+    def Insert(self, *args, **kwargs):
+        rng = self._range
+        self._backend.hit("Range.Insert()")
+        rng.sheet._shift(rng, +1)
+
+    def Delete(self, *args, **kwargs):
+        rng = self._range
+        self._backend.hit("Range.Delete()")
+        rng.sheet._shift(rng, -1)
+
+    def Calculate(self, *args, **kwargs):
+        self._backend.hit("Range.Calculate()", self._range.size)
+
+    @property
+    def HasFormula(self):
+        rng = self._range
+        self._backend.hit("Range.HasFormula")
+        flags = {rng.sheet._formula_at(r, c) is not None for r, c in rng._cells()}
+        return flags.pop() if len(flags) == 1 else None
+
+    def Address(self, *args, **kwargs):
+        self._backend.hit("Range.Address()")
+        return self._range.address
+
+
+class SimSheetCom(SimCom):
+    """Sheet.api: Copy and Calculate are modelled, everything else is absorbed."""
+
+    def __init__(self, sheet: "SimSheet"):
+        super().__init__(sheet.backend, "Worksheet")
+        object.__setattr__(self, "_sheet", sheet)
+
+    def Copy(self, Before=None, After=None):
+        self._backend.hit("Worksheet.Copy()")
+        anchor = After if After is not None else Before
+        self._sheet._duplicate(anchor._sheet if isinstance(anchor, SimSheetCom) else None)
+
+    def Calculate(self, *args, **kwargs):
+        self._backend.hit("Worksheet.Calculate()", self._sheet.cell_count)
+
+    @property
+    def UsedRange(self):
+        return SimRangeCom(self._sheet.used_range)
+
+
+class SimAppCom(SimCom):
+    def __init__(self, app: "SimApp"):
+        super().__init__(app.backend, "Application")
+        object.__setattr__(self, "_app", app)
+
+    def _workbook_cells(self) -> int:
+        return sum(sheet.cell_count for book in self._app.books for sheet in book.sheets._items)
+
+    def Calculate(self, *args, **kwargs):
+        self._backend.hit("Application.Calculate()", self._workbook_cells())
+
+    def CalculateFull(self, *args, **kwargs):
+        self._backend.hit("Application.CalculateFull()", self._workbook_cells())
+
+
+class SimCollection:
+    """Empty, absorbing collection (charts, tables, names, pictures)."""
+
+    def __init__(self, backend: Backend, name: str):
+        self.backend = backend
+        self.name = name
+
+    def __iter__(self):
+        self.backend.hit(f"{self.name}.__iter__")
+        return iter(())
+
+    def __len__(self):
+        return 0
+
+    def __getitem__(self, key):
+        self.backend.hit(f"{self.name}[]")
+        raise KeyError(key)
+
+    def add(self, *args, **kwargs):
+        self.backend.hit(f"{self.name}.add()")
+        return SimCom(self.backend, self.name.rstrip("s").capitalize())
+
+    @property
+    def api(self):
+        return SimCom(self.backend, self.name)
+
+
+class _Axis:
+    """Range.rows / Range.columns."""
+
+    def __init__(self, rng: "SimRange", by_row: bool):
+        self.rng = rng
+        self.by_row = by_row
+        self.count = rng.r2 - rng.r1 + 1 if by_row else rng.c2 - rng.c1 + 1
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index: int) -> "SimRange":
+        rng = self.rng
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError(index)
+        if self.by_row:
+            return rng._view(rng.r1 + index, rng.c1, rng.r1 + index, rng.c2)
+        return rng._view(rng.r1, rng.c1 + index, rng.r2, rng.c1 + index)
+
+    def __iter__(self):
+        return (self[i] for i in range(self.count))
+
+
+class SimRange:
+    def __init__(self, sheet: "SimSheet", r1: int, c1: int, r2: int, c2: int, ndim: Optional[int] = None):
+        self.sheet = sheet
+        self.r1, self.c1 = min(r1, r2), min(c1, c2)
+        self.r2, self.c2 = max(r1, r2), max(c1, c2)
+        self._ndim = ndim
+
+    # Geometry -------------------------------------------------------------
+
+    @property
+    def size(self) -> int:
+        return (self.r2 - self.r1 + 1) * (self.c2 - self.c1 + 1)
+
+    def _cells(self):
+        for r in range(self.r1, self.r2 + 1):
+            for c in range(self.c1, self.c2 + 1):
+                yield r, c
+
+    def _view(self, r1, c1, r2, c2) -> "SimRange":
+        return SimRange(self.sheet, r1, c1, r2, c2)
+
+    @property
+    def row(self) -> int:
+        self.sheet.backend.hit("Range.row")
+        return self.r1
+
+    @property
+    def column(self) -> int:
+        self.sheet.backend.hit("Range.column")
+        return self.c1
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        self.sheet.backend.hit("Range.shape")
+        return self.r2 - self.r1 + 1, self.c2 - self.c1 + 1
+
+    @property
+    def count(self) -> int:
+        return self.size
+
+    @property
+    def rows(self) -> _Axis:
+        self.sheet.backend.hit("Range.rows")
+        return _Axis(self, by_row=True)
+
+    @property
+    def columns(self) -> _Axis:
+        self.sheet.backend.hit("Range.columns")
+        return _Axis(self, by_row=False)
+
+    @property
+    def address(self) -> str:
+        self.sheet.backend.hit("Range.address")
+        first = f"${column_letter(self.c1)}${self.r1}"
+        if self.r1 == self.r2 and self.c1 == self.c2:
+            return first
+        return f"{first}:${column_letter(self.c2)}${self.r2}"
+
+    def get_address(self, row_absolute=True, column_absolute=True, include_sheetname=False, external=False) -> str:
+        address = self.address
+        if not (row_absolute and column_absolute):
+            address = address.replace("$", "")
+        return f"{self.sheet.name}!{address}" if include_sheetname else address
+
+    # Points, assuming default row height and column width
+    @property
+    def top(self) -> float:
+        self.sheet.backend.hit("Range.top")
+        return (self.r1 - 1) * 15.0
+
+    @property
+    def left(self) -> float:
+        self.sheet.backend.hit("Range.left")
+        return (self.c1 - 1) * 48.0
+
+    @property
+    def height(self) -> float:
+        self.sheet.backend.hit("Range.height")
+        return (self.r2 - self.r1 + 1) * 15.0
+
+    @property
+    def width(self) -> float:
+        self.sheet.backend.hit("Range.width")
+        return (self.c2 - self.c1 + 1) * 48.0
+
+    @property
+    def last_cell(self) -> "SimRange":
+        self.sheet.backend.hit("Range.last_cell")
+        return self._view(self.r2, self.c2, self.r2, self.c2)
+
+    def offset(self, row_offset: int = 0, column_offset: int = 0) -> "SimRange":
+        self.sheet.backend.hit("Range.offset()")
+        return self._view(self.r1 + row_offset, self.c1 + column_offset,
+                          self.r2 + row_offset, self.c2 + column_offset)
+
+    def resize(self, row_size: Optional[int] = None, column_size: Optional[int] = None) -> "SimRange":
+        self.sheet.backend.hit("Range.resize()")
+        rows = row_size if row_size is not None else self.r2 - self.r1 + 1
+        cols = column_size if column_size is not None else self.c2 - self.c1 + 1
+        return self._view(self.r1, self.c1, self.r1 + rows - 1, self.c1 + cols - 1)
+
+    def expand(self, mode: str = "table") -> "SimRange":
+        self.sheet.backend.hit("Range.expand()")
+        sheet = self.sheet
+        r2, c2 = self.r2, self.c2
+        if mode in ("table", "down", "d"):
+            while sheet._value_at(r2 + 1, self.c1) is not None:
+                r2 += 1
+        if mode in ("table", "right", "r"):
+            while sheet._value_at(self.r1, c2 + 1) is not None:
+                c2 += 1
+        return self._view(self.r1, self.c1, r2, c2)
+
+    def options(self, ndim: Optional[int] = None, **kwargs) -> "SimRange":
+        return SimRange(self.sheet, self.r1, self.c1, self.r2, self.c2, ndim=ndim)
+
+    def __call__(self, row: int, column: int) -> "SimRange":
+        return self._view(self.r1 + row - 1, self.c1 + column - 1, self.r1 + row - 1, self.c1 + column - 1)
+
+    def __getitem__(self, key) -> "SimRange":
+        rows, cols = key if isinstance(key, tuple) else (key, slice(None))
+
+        def bounds(index, start, stop):
+            if isinstance(index, slice):
+                lo = start + (index.start or 0)
+                hi = start + index.stop - 1 if index.stop is not None else stop
+                return lo, hi
+            return start + index, start + index
+
+        r1, r2 = bounds(rows, self.r1, self.r2)
+        c1, c2 = bounds(cols, self.c1, self.c2)
+        return self._view(r1, c1, r2, c2)
+
+    def __len__(self):
+        return self.size
+
+    def __bool__(self):
+        return True
+
+    def __eq__(self, other):
+        return (isinstance(other, SimRange) and other.sheet is self.sheet
+                and (self.r1, self.c1, self.r2, self.c2) == (other.r1, other.c1, other.r2, other.c2))
+
+    def __hash__(self):
+        return hash((id(self.sheet), self.r1, self.c1, self.r2, self.c2))
+
+    # Data -----------------------------------------------------------------
+
+    def _shaped(self, grid: List[List[Any]]) -> Any:
+        """Apply xlwings' default dimensionality rules (or the ndim option)."""
+        if self._ndim == 2:
+            return grid
+        if self._ndim == 1:
+            return [v for row in grid for v in row]
+        if self.r1 == self.r2 and self.c1 == self.c2:
+            return grid[0][0]
+        if self.r1 == self.r2:
+            return grid[0]
+        if self.c1 == self.c2:
+            return [row[0] for row in grid]
+        return grid
+
+    @property
+    def value(self) -> Any:
+        self.sheet.backend.hit("Range.value", self.size)
+        return self._shaped(self.sheet._read(self.r1, self.c1, self.r2, self.c2))
+
+    @value.setter
+    def value(self, data: Any) -> None:
+        grid = _as_grid(data, self)
+        self.sheet.backend.hit("Range.value=", sum(len(row) for row in grid))
+        self.sheet._write(self.r1, self.c1, grid, formulas=False)
+
+    @property
+    def formula(self) -> Any:
+        self.sheet.backend.hit("Range.formula", self.size)
+        sheet = self.sheet
+        grid = []
+        for r in range(self.r1, self.r2 + 1):
+            line = []
+            for c in range(self.c1, self.c2 + 1):
+                f = sheet._formula_at(r, c)
+                if f is None:
+                    v = sheet._value_at(r, c)
+                    f = "" if v is None else str(v)
+                line.append(f)
+            grid.append(tuple(line))
+        if self.r1 == self.r2 and self.c1 == self.c2:
+            return grid[0][0]
+        return tuple(grid)
+
+    @formula.setter
+    def formula(self, data: Any) -> None:
+        grid = _as_grid(data, self)
+        self.sheet.backend.hit("Range.formula=", sum(len(row) for row in grid))
+        self.sheet._write(self.r1, self.c1, grid, formulas=True)
+
+    formula2 = formula
+
+    def clear_contents(self) -> None:
+        self.sheet.backend.hit("Range.clear_contents()", self.size)
+        self.sheet._write(self.r1, self.c1, [[None] * (self.c2 - self.c1 + 1)] * (self.r2 - self.r1 + 1), formulas=False)
+
+    clear = clear_contents
+
+    def copy(self, destination: Optional["SimRange"] = None) -> None:
+        self.sheet.backend.hit("Range.copy()", self.size)
+        if destination is not None:
+            grid = self.sheet._read(self.r1, self.c1, self.r2, self.c2)
+            destination.sheet._write(destination.r1, destination.c1, grid, formulas=False)
+
+    def delete(self, shift: Optional[str] = None) -> None:
+        self.sheet.backend.hit("Range.delete()", self.size)
+        self.clear_contents()
+
+    # Merging is tracked only so merge/unmerge round-trips behave
+    @property
+    def merge_cells(self) -> bool:
+        self.sheet.backend.hit("Range.merge_cells")
+        return (self.r1, self.c1, self.r2, self.c2) in self.sheet.merged
+
+    def merge(self, across: bool = False) -> None:
+        self.sheet.backend.hit("Range.merge()")
+        self.sheet.merged.add((self.r1, self.c1, self.r2, self.c2))
+
+    def unmerge(self) -> None:
+        self.sheet.backend.hit("Range.unmerge()")
+        self.sheet.merged.discard((self.r1, self.c1, self.r2, self.c2))
+
+    @property
+    def merge_area(self) -> "SimRange":
+        self.sheet.backend.hit("Range.merge_area")
+        for area in self.sheet.merged:
+            if area[0] <= self.r1 <= area[2] and area[1] <= self.c1 <= area[3]:
+                return self._view(*area)
+        return self
+
+    @property
+    def parent(self) -> "SimSheet":
+        return self.sheet
+
+    @property
+    def api(self) -> SimRangeCom:
+        return SimRangeCom(self)
+
+    def __getattr__(self, attr: str) -> Any:
+        # Formatting properties (font, color, number_format, ...) are absorbed
+        if attr.startswith("_"):
+            raise AttributeError(attr)
+        self.sheet.backend.hit(f"Range.{attr}")
+        return SimCom(self.sheet.backend, attr)
+
+    def __repr__(self):
+        return f"<SimRange [{self.sheet.book.name}]{self.sheet.name}!{self.address}>"
+
+
+def _as_grid(data: Any, rng: SimRange) -> List[List[Any]]:
+    """Normalize an assigned value the way xlwings does (scalars fill the range)."""
+    if isinstance(data, (list, tuple)):
+        if data and all(isinstance(row, (list, tuple)) for row in data):
+            return [list(row) for row in data]
+        if rng.c1 == rng.c2 and rng.r1 != rng.r2:
+            return [[v] for v in data]
+        return [list(data)]
+    return [[data] * (rng.c2 - rng.c1 + 1) for _ in range(rng.r2 - rng.r1 + 1)]
+
+
+class SimSheet:
+    def __init__(self, book: "SimBook", name: str):
+        self.book = book
+        self.backend = book.backend
+        self._name = name
+        self.rows: Dict[int, List[Any]] = {}          # row -> values from column 1
+        self.formulas: Dict[Tuple[int, int], str] = {}
+        self.merged = set()
+        self._used: Optional[Tuple[int, int, int, int]] = None    # cached used-range bounds
+        self.charts = SimCollection(self.backend, "charts")
+        self.tables = SimCollection(self.backend, "tables")
+        self.pictures = SimCollection(self.backend, "pictures")
+        self.shapes = SimCollection(self.backend, "shapes")
+
+    # Storage --------------------------------------------------------------
+
+    @property
+    def cell_count(self) -> int:
+        return sum(len(row) for row in self.rows.values())
+
+    def _value_at(self, r: int, c: int) -> Any:
+        row = self.rows.get(r)
+        if row is None or c > len(row):
+            return None
+        return row[c - 1]
+
+    def _formula_at(self, r: int, c: int) -> Optional[str]:
+        return self.formulas.get((r, c))
+
+    def _read(self, r1: int, c1: int, r2: int, c2: int) -> List[List[Any]]:
+        width = c2 - c1 + 1
+        blank = [None] * width
+        grid = []
+        for r in range(r1, r2 + 1):
+            row = self.rows.get(r)
+            if row is None:
+                grid.append(list(blank))
+                continue
+            line = row[c1 - 1:c2]
+            if len(line) < width:
+                line = line + [None] * (width - len(line))
+            grid.append(line)
+        return grid
+
+    def _write(self, r1: int, c1: int, grid: List[List[Any]], formulas: bool) -> None:
+        self._used = None
+        for i, line in enumerate(grid):
+            r = r1 + i
+            row = self.rows.setdefault(r, [])
+            end = c1 - 1 + len(line)
+            if len(row) < end:
+                row.extend([None] * (end - len(row)))
+            for j, v in enumerate(line):
+                c = c1 + j
+                if isinstance(v, str) and v.startswith("=") and formulas:
+                    self.formulas[(r, c)] = v
+                    row[c - 1] = 0
+                else:
+                    self.formulas.pop((r, c), None)
+                    row[c - 1] = v
+
+    def _shift(self, rng: SimRange, direction: int) -> None:
+        """Insert (+1) or delete (-1) the whole rows/columns a Range.api call targets."""
+        self._used = None
+        if rng.c1 == 1 and rng.c2 >= MAX_COLS:
+            start, count = rng.r1, rng.r2 - rng.r1 + 1
+            moved = {}
+            for r, row in self.rows.items():
+                if r < start:
+                    moved[r] = row
+                elif direction > 0:
+                    moved[r + count] = row
+                elif r >= start + count:
+                    moved[r - count] = row
+            self.rows = moved
+            self.formulas = {
+                (r if r < start else r + direction * count, c): f
+                for (r, c), f in self.formulas.items()
+                if not (direction < 0 and start <= r < start + count)
+            }
+        elif rng.r1 == 1 and rng.r2 >= MAX_ROWS:
+            start, count = rng.c1, rng.c2 - rng.c1 + 1
+            for row in self.rows.values():
+                if len(row) < start:
+                    continue
+                if direction > 0:
+                    row[start - 1:start - 1] = [None] * count
+                else:
+                    del row[start - 1:start - 1 + count]
+            self.formulas = {
+                (r, c if c < start else c + direction * count): f
+                for (r, c), f in self.formulas.items()
+                if not (direction < 0 and start <= c < start + count)
+            }
+        else:
+            rng.clear_contents()
+
+    def _duplicate(self, anchor: Optional["SimSheet"] = None) -> "SimSheet":
+        # Copies land after anchor, which may belong to another book of the same app
+        anchor = anchor or self
+        sheets = anchor.book.sheets
+        base, n = self._name, 2
+        if anchor.book is not self.book and sheets._find(base) is None:
+            name = base
+        else:
+            while sheets._find(f"{base} ({n})") is not None:
+                n += 1
+            name = f"{base} ({n})"
+        copy = SimSheet(anchor.book, name)
+        copy.rows = {r: list(row) for r, row in self.rows.items()}
+        copy.formulas = dict(self.formulas)
+        sheets._items.insert(sheets._items.index(anchor) + 1, copy)
+        return copy
+
+    # Object model ---------------------------------------------------------
+
+    @property
+    def name(self) -> str:
+        self.backend.hit("Sheet.name")
+        return self._name
+
+    @name.setter
+    def name(self, value: str) -> None:
+        self.backend.hit("Sheet.name=")
+        if self.book.sheets._find(value) not in (None, self):
+            raise ValueError(f"A sheet named '{value}' already exists")
+        self._name = value
+
+    @property
+    def index(self) -> int:
+        return self.book.sheets._items.index(self) + 1
+
+    @property
+    def api(self) -> SimSheetCom:
+        return SimSheetCom(self)
+
+    def range(self, cell1: Any, cell2: Any = None) -> SimRange:
+        self.backend.hit("Sheet.range()")
+        if cell2 is not None:
+            a, b = self._corner(cell1), self._corner(cell2)
+            return SimRange(self, a[0], a[1], b[2], b[3])
+        r1, c1, r2, c2 = self._corner(cell1)
+        return SimRange(self, r1, c1, r2, c2)
+
+    def _corner(self, ref: Any) -> Tuple[int, int, int, int]:
+        if isinstance(ref, SimRange):
+            return ref.r1, ref.c1, ref.r2, ref.c2
+        if isinstance(ref, tuple):
+            return ref[0], ref[1], ref[0], ref[1]
+        text = str(ref).split("!")[-1].replace("$", "")
+        if ":" in text:
+            left, right = text.split(":", 1)
+            if left.isdigit() and right.isdigit():
+                return int(left), 1, int(right), MAX_COLS
+            if left.isalpha() and right.isalpha():
+                _, _, c1, _, c2 = split_range(f"{left}1:{right}1")
+                return 1, c1, MAX_ROWS, c2
+        _, r1, c1, r2, c2 = split_range(text)
+        return r1, c1, r2, c2
+
+    @property
+    def cells(self) -> SimRange:
+        return SimRange(self, 1, 1, MAX_ROWS, MAX_COLS)
+
+    @property
+    def used_range(self) -> SimRange:
+        self.backend.hit("Sheet.used_range")
+        if self._used is None:
+            bounds = None
+            for r, row in self.rows.items():
+                filled = [c for c, v in enumerate(row, 1) if v is not None]
+                if not filled:
+                    continue
+                if bounds is None:
+                    bounds = [r, filled[0], r, filled[-1]]
+                else:
+                    bounds = [min(bounds[0], r), min(bounds[1], filled[0]),
+                              max(bounds[2], r), max(bounds[3], filled[-1])]
+            self._used = tuple(bounds) if bounds else (1, 1, 1, 1)
+        return SimRange(self, *self._used)
+
+    def delete(self) -> None:
+        self.backend.hit("Sheet.delete()")
+        self.book.sheets._items.remove(self)
+
+    def copy(self, before=None, after=None, name: Optional[str] = None) -> "SimSheet":
+        self.backend.hit("Sheet.copy()")
+        copy = self._duplicate()
+        if name:
+            copy._name = name
+        return copy
+
+    def activate(self) -> None:
+        self.backend.hit("Sheet.activate()")
+
+    def clear(self) -> None:
+        self.backend.hit("Sheet.clear()")
+        self.rows.clear()
+        self.formulas.clear()
+        self._used = None
+
+    clear_contents = clear
+
+    def __eq__(self, other):
+        return self is other
+
+    def __hash__(self):
+        return id(self)
+
+    def __repr__(self):
+        return f"<SimSheet [{self.book.name}]{self._name}>"
+
+
+class SimSheets:
+    def __init__(self, book: "SimBook"):
+        self.book = book
+        self.backend = book.backend
+        self._items: List[SimSheet] = []
+
+    def _find(self, name: str) -> Optional[SimSheet]:
+        lowered = name.lower()
+        for sheet in self._items:
+            if sheet._name.lower() == lowered:
+                return sheet
+        return None
+
+    def __iter__(self):
+        self.backend.hit("Sheets.__iter__")
+        return iter(list(self._items))
+
+    def __len__(self):
+        self.backend.hit("Sheets.count")
+        return len(self._items)
+
+    @property
+    def count(self) -> int:
+        return len(self)
+
+    def __getitem__(self, key) -> SimSheet:
+        self.backend.hit("Sheets[]")
+        if isinstance(key, int):
+            return self._items[key]
+        sheet = self._find(key)
+        if sheet is None:
+            raise KeyError(f"No sheet named '{key}'")
+        return sheet
+
+    def __call__(self, key) -> SimSheet:
+        return self[key - 1 if isinstance(key, int) else key]
+
+    @property
+    def active(self) -> SimSheet:
+        return self._items[0]
+
+    def add(self, name: Optional[str] = None, before: Optional[SimSheet] = None,
+            after: Optional[SimSheet] = None) -> SimSheet:
+        self.backend.hit("Sheets.add()")
+        if name is None:
+            n = len(self._items) + 1
+            while self._find(f"Sheet{n}") is not None:
+                n += 1
+            name = f"Sheet{n}"
+        elif self._find(name) is not None:
+            raise ValueError(f"Sheet named '{name}' already present in workbook")
+        sheet = SimSheet(self.book, name)
+        if after is not None:
+            self._items.insert(self._items.index(after) + 1, sheet)
+        elif before is not None:
+            self._items.insert(self._items.index(before), sheet)
+        else:
+            self._items.insert(0, sheet)
+        return sheet
+
+
+class SimBook:
+    def __init__(self, app: "SimApp", fullname: str):
+        self.app = app
+        self.backend = app.backend
+        self.fullname = fullname
+        self.sheets = SimSheets(self)
+        self.names = SimCollection(self.backend, "names")
+        self.saves = 0
+        self.closed = False
+        self.sheets._items.append(SimSheet(self, "Sheet1"))
+
+    @property
+    def name(self) -> str:
+        return self.fullname.replace("\\", "/").rsplit("/", 1)[-1]
+
+    @property
+    def api(self) -> SimCom:
+        return SimCom(self.backend, "Workbook")
+
+    def save(self, path: Optional[str] = None) -> None:
+        self.backend.hit("Book.save()")
+        if path:
+            self.fullname = path
+        self.saves += 1
+
+    def close(self) -> None:
+        self.backend.hit("Book.close()")
+        self.closed = True
+        if self in self.app.books._items:
+            self.app.books._items.remove(self)
+
+    def __repr__(self):
+        return f"<SimBook [{self.name}]>"
+
+
+class SimBooks:
+    def __init__(self, app: "SimApp"):
+        self.app = app
+        self._items: List[SimBook] = []
+
+    def __iter__(self):
+        return iter(list(self._items))
+
+    def __len__(self):
+        return len(self._items)
+
+    def open(self, fullname: str, **kwargs) -> SimBook:
+        self.app.backend.hit("Books.open()")
+        book = SimBook(self.app, fullname)
+        self._items.append(book)
+        return book
+
+    def add(self) -> SimBook:
+        self.app.backend.hit("Books.add()")
+        book = SimBook(self.app, f"Book{len(self._items) + 1}")
+        self._items.append(book)
+        return book
+
+
+class SimApp:
+    """Drop-in for xw.App; all apps created by one factory share its Backend."""
+
+    backend = Backend()
+    _next_pid = 10000
+
+    def __init__(self, visible: bool = False, add_book: bool = True, **kwargs):
+        self.backend.hit("App()")
+        SimApp._next_pid += 1
+        self.pid = SimApp._next_pid
+        self.visible = visible
+        self.books = SimBooks(self)
+        self.calculation = "automatic"
+        self.screen_updating = True
+        self.enable_events = True
+        self.display_alerts = True
+        if add_book:
+            self.books.add()
+
+    def __setattr__(self, attr: str, value: Any) -> None:
+        if attr in ("calculation", "screen_updating", "enable_events", "display_alerts", "visible") \
+                and attr in self.__dict__:
+            self.backend.hit(f"App.{attr}=")
+        object.__setattr__(self, attr, value)
+
+    @property
+    def api(self) -> SimAppCom:
+        return SimAppCom(self)
+
+    def calculate(self) -> None:
+        SimAppCom(self).Calculate()
+
+    def quit(self) -> None:
+        self.backend.hit("App.quit()")
+
+    def kill(self) -> None:
+        self.quit()
+
+
+def fill_sheet(sheet: SimSheet, values: List[List[Any]], top_left: Tuple[int, int] = (1, 1)) -> None:
+    """Load fixture data without counting or delaying."""
+    with sheet.backend.paused():
+        sheet._write(top_left[0], top_left[1], values, formulas=True)
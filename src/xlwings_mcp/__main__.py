@@ -1,8 +1,8 @@
 import asyncio
 import typer
 
-from .server import run_sse, run_stdio, run_streamable_http
-
+# The server module (mcp, tool registration) is imported by the command that runs it,
+# so `--help` and argument errors return without loading it
 app = typer.Typer(
     help="Excel MCP Server",
     invoke_without_command=True  # 명령 없이 실행 가능
@@ -17,13 +17,17 @@ def callback(ctx: typer.Context):
         stdio()
 
 @app.command()
-def sse():
+def sse(
+    workers: int = typer.Option(0, "--workers", envvar="EXCEL_MCP_WORKERS",
+                                help="Worker processes for tool calls (0 or 1: run in the server process)"),
+):
     """Start Excel MCP Server in SSE mode"""
     print("Excel MCP Server - SSE mode")
     print("----------------------")
     print("Press Ctrl+C to exit")
     try:
-        asyncio.run(run_sse())
+        from .server import run_sse
+        asyncio.run(run_sse(workers))
     except KeyboardInterrupt:
         print("\nShutting down server...")
     except Exception as e:
@@ -34,13 +38,17 @@ def sse():
         print("Service stopped.")
 
 @app.command()
-def streamable_http():
+def streamable_http(
+    workers: int = typer.Option(0, "--workers", envvar="EXCEL_MCP_WORKERS",
+                                help="Worker processes for tool calls (0 or 1: run in the server process)"),
+):
     """Start Excel MCP Server in streamable HTTP mode"""
     print("Excel MCP Server - Streamable HTTP mode")
     print("---------------------------------------")
     print("Press Ctrl+C to exit")
     try:
-        asyncio.run(run_streamable_http())
+        from .server import run_streamable_http
+        asyncio.run(run_streamable_http(workers))
     except KeyboardInterrupt:
         print("\nShutting down server...")
     except Exception as e:
@@ -57,6 +65,7 @@ def stdio():
     print("-----------------------------")
     print("Press Ctrl+C to exit")
     try:
+        from .server import run_stdio
         run_stdio()
     except KeyboardInterrupt:
         print("\nShutting down server...")
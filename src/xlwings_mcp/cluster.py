@@ -0,0 +1,453 @@
+"""
+Multi-process mode for the SSE and streamable HTTP transports.
+
+The supervisor process keeps the MCP transport and the tool schemas, but every
+tool call is forwarded to one of N worker processes, each with its own
+ExcelSessionManager, so sessions on different workbooks no longer share one
+GIL and COM thread. Calls are routed by consistent hashing of the session_id,
+or of the workbook path for open_workbook and filepath= calls. Workers mint
+session IDs that hash to themselves, so routing needs no shared table and all
+sessions on one workbook live on one worker. copy_between_sessions names two
+sessions; when they live on different workers the supervisor has the source
+worker export the values and the target worker import them.
+
+A health thread pings the workers. When one dies or stops answering, calls for
+its keys move to the next live worker on the ring, which first adopts the dead
+worker's recovery journal and then reopens those sessions from their files on
+first use. The dead worker is restarted under the same name; keys that moved
+stay where they are, new keys hash to it again.
+"""
+
+import asyncio
+import bisect
+import functools
+import hashlib
+import itertools
+import json
+import logging
+import multiprocessing
+import os
+import threading
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+HEALTH_INTERVAL = float(os.getenv("EXCEL_MCP_WORKER_HEALTH_INTERVAL", "5"))
+HEALTH_TIMEOUT = float(os.getenv("EXCEL_MCP_WORKER_HEALTH_TIMEOUT", "10"))
+WORKER_THREADS = int(os.getenv("EXCEL_MCP_WORKER_THREADS", "8"))
+STARTUP_TIMEOUT = 60.0
+# Consecutive missed pings before a worker is treated as dead
+MAX_MISSED_PINGS = 3
+# Virtual nodes per worker on the hash ring
+_VNODES = 64
+# Tools with no session or workbook: every worker answers and results are merged
+_BROADCAST_TOOLS = ("list_workbooks", "get_server_metrics")
+# Tools with a source and a target session, which may live on different workers
+_TRANSFER_TOOLS = ("copy_between_sessions",)
+
+
+def _hash(key: str) -> int:
+    return int.from_bytes(hashlib.md5(key.encode("utf-8")).digest()[:8], "big")
+
+
+class HashRing:
+    """Consistent hash ring with virtual nodes."""
+
+    def __init__(self, nodes: List[str], vnodes: int = _VNODES):
+        self.nodes = list(nodes)
+        points = sorted((_hash(f"{node}#{i}"), node) for node in self.nodes for i in range(vnodes))
+        self._points = [point for point, _ in points]
+        self._owners = [node for _, node in points]
+
+    def successors(self, key: str) -> Iterator[str]:
+        """Each node once, in ring order starting at the key's owner."""
+        start = bisect.bisect(self._points, _hash(key))
+        seen = set()
+        for i in range(len(self._points)):
+            node = self._owners[(start + i) % len(self._points)]
+            if node not in seen:
+                seen.add(node)
+                yield node
+                if len(seen) == len(self.nodes):
+                    return
+
+    def owner(self, key: str) -> str:
+        return next(self.successors(key))
+
+
+def worker_journal(journal: str, name: str) -> str:
+    """Per-worker recovery journal path derived from the server's (empty if disabled)."""
+    if not journal:
+        return ""
+    root, ext = os.path.splitext(journal)
+    return f"{root}-{name}{ext}"
+
+
+def _mint_session_id(ring: HashRing, name: str) -> str:
+    """A random session ID that the ring assigns to this worker (about N tries)."""
+    while True:
+        session_id = str(uuid.uuid4())
+        if ring.owner(session_id) == name:
+            return session_id
+
+
+def _com_init() -> None:
+    try:
+        import pythoncom
+        pythoncom.CoInitialize()
+    except ImportError:
+        pass
+
+
+def _worker_main(name: str, nodes: List[str], conn, files_path: Optional[str]) -> None:
+    """Worker process: run tool calls arriving on conn against this process's sessions."""
+    from xlwings_mcp import server
+    from xlwings_mcp.logging_setup import configure_logging, stop_logging
+    from xlwings_mcp.session import SESSION_MANAGER
+
+    os.makedirs(server.LOGS_DIR, exist_ok=True)
+    configure_logging(os.path.join(server.LOGS_DIR, f"excel-mcp-{name}.log"))
+    server.EXCEL_FILES_PATH = files_path
+    journal = worker_journal(server.RECOVERY_JOURNAL, name)
+    if journal:
+        SESSION_MANAGER.enable_recovery_journal(journal)
+    SESSION_MANAGER.session_id_factory = functools.partial(_mint_session_id, HashRing(nodes), name)
+    tools = {tool.name: tool.fn for tool in server.mcp._tool_manager.list_tools()}
+
+    send_lock = threading.Lock()
+
+    def reply(request_id: int, ok: bool, value: Any) -> None:
+        with send_lock:
+            try:
+                conn.send((request_id, ok, value))
+            except Exception:
+                # Unpicklable result or exception; send() pickles before writing
+                conn.send((request_id, False, RuntimeError(f"{type(value).__name__}: {value}")))
+
+    def run(request_id: int, fn: Callable, arguments: Dict[str, Any]) -> None:
+        try:
+            reply(request_id, True, fn(**arguments))
+        except Exception as e:
+            reply(request_id, False, e)
+
+    pool = ThreadPoolExecutor(max_workers=WORKER_THREADS, thread_name_prefix=f"{name}-tool", initializer=_com_init)
+    logger.info("Worker %s started (pid %s)", name, os.getpid())
+    conn.send((None, True, "ready"))
+    while True:
+        try:
+            request_id, op, payload = conn.recv()
+        except (EOFError, OSError):
+            break  # Supervisor gone
+        if op == "call":
+            tool, arguments = payload
+            pool.submit(run, request_id, tools[tool], arguments)
+        elif op == "export":
+            pool.submit(run, request_id, server.export_session_values, payload)
+        elif op == "import":
+            pool.submit(run, request_id, server.import_session_values, payload)
+        elif op == "ping":
+            # Answered here, not on the pool, so long tool calls do not look like a hang
+            reply(request_id, True, os.getpid())
+        elif op == "adopt":
+            pool.submit(lambda rid=request_id, path=payload: reply(rid, True, SESSION_MANAGER.adopt_recovery_journal(path)))
+        elif op == "prometheus":
+            from xlwings_mcp.metrics import METRICS
+            reply(request_id, True, METRICS.prometheus())
+        elif op == "stop":
+            break
+    pool.shutdown(wait=True)
+    SESSION_MANAGER.close_all_sessions()
+    logger.info("Worker %s stopped", name)
+    stop_logging()
+
+
+class WorkerHandle:
+    """Supervisor-side state of one worker process."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.process = None
+        self.conn = None
+        self.alive = False
+        self.missed_pings = 0
+        self.restarts = 0
+        self.pending: Dict[int, Future] = {}
+        self.lock = threading.Lock()
+
+
+class Supervisor:
+    """Spawns worker processes and forwards tool calls to them."""
+
+    def __init__(self, count: int, files_path: Optional[str] = None, journal: str = "",
+                 target: Callable = _worker_main):
+        self.ring = HashRing([f"w{i}" for i in range(count)])
+        self.workers = {name: WorkerHandle(name) for name in self.ring.nodes}
+        self.files_path = files_path
+        self.journal = journal
+        # Worker entry point; benchmarks pass one that patches in a simulated Excel
+        self.target = target
+        # Keys served by a fallback worker while their owner was down stay there
+        self._moved: Dict[str, str] = {}
+        # (fallback, owner, owner restarts) for journals already adopted
+        self._adopted: Set[Tuple[str, str, int]] = set()
+        self._request_ids = itertools.count(1)
+        self._context = multiprocessing.get_context("spawn")
+        self._stopping = threading.Event()
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        """Start all workers (in parallel) and the health thread."""
+        started = [(worker, self._launch(worker)) for worker in self.workers.values()]
+        for worker, (process, conn) in started:
+            self._attach(worker, process, conn)
+        threading.Thread(target=self._health_loop, name="worker-health", daemon=True).start()
+        logger.info("Supervisor started %s workers", len(self.workers))
+
+    def stop(self, timeout: float = 30.0) -> None:
+        """Ask workers to close their sessions and exit; terminate stragglers."""
+        self._stopping.set()
+        for worker in self.workers.values():
+            with worker.lock:
+                if worker.alive:
+                    try:
+                        worker.conn.send((None, "stop", None))
+                    except OSError:
+                        pass
+        for worker in self.workers.values():
+            if worker.process is not None:
+                worker.process.join(timeout)
+                if worker.process.is_alive():
+                    logger.warning("Worker %s did not stop in %ss; terminating", worker.name, timeout)
+                    worker.process.terminate()
+        logger.info("Supervisor stopped")
+
+    def _launch(self, worker: WorkerHandle):
+        parent, child = self._context.Pipe()
+        process = self._context.Process(target=self.target, args=(worker.name, self.ring.nodes, child, self.files_path),
+                                        name=f"xlwings-mcp-{worker.name}", daemon=True)
+        process.start()
+        child.close()
+        return process, parent
+
+    def _attach(self, worker: WorkerHandle, process, conn) -> None:
+        """Wait for a launched worker's ready message and start routing to it."""
+        try:
+            if not conn.poll(STARTUP_TIMEOUT):
+                raise TimeoutError(f"no reply within {STARTUP_TIMEOUT:.0f}s")
+            conn.recv()
+        except (EOFError, OSError) as e:
+            process.terminate()
+            raise RuntimeError(f"Worker {worker.name} failed to start: {e or 'exited'}") from e
+        with worker.lock:
+            worker.process, worker.conn = process, conn
+            worker.alive = True
+            worker.missed_pings = 0
+        threading.Thread(target=self._receive_loop, args=(worker, conn),
+                         name=f"{worker.name}-receiver", daemon=True).start()
+        logger.info("Worker %s ready (pid %s)", worker.name, process.pid)
+
+    def _receive_loop(self, worker: WorkerHandle, conn) -> None:
+        while True:
+            try:
+                request_id, ok, value = conn.recv()
+            except (EOFError, OSError):
+                break
+            with worker.lock:
+                future = worker.pending.pop(request_id, None)
+            if future is not None:
+                if ok:
+                    future.set_result(value)
+                else:
+                    future.set_exception(value)
+        self._lost(worker, conn)
+
+    def _lost(self, worker: WorkerHandle, conn) -> None:
+        """Stop routing to a worker and fail its in-flight calls."""
+        with worker.lock:
+            if worker.conn is not conn or not worker.alive:
+                return
+            worker.alive = False
+            pending, worker.pending = worker.pending, {}
+        if not self._stopping.is_set():
+            logger.error("WORKER_LOST: Worker %s exited; %s calls failed, its sessions move to other workers",
+                         worker.name, len(pending))
+        for future in pending.values():
+            future.set_exception(ConnectionError(
+                f"WORKER_LOST: Worker {worker.name} exited during the call. Retry; the session will be recovered."))
+
+    def _health_loop(self) -> None:
+        while not self._stopping.wait(HEALTH_INTERVAL):
+            for worker in self.workers.values():
+                if self._stopping.is_set():
+                    return
+                try:
+                    self._check(worker)
+                except Exception as e:
+                    logger.error("Health check of worker %s failed: %s", worker.name, e)
+
+    def _check(self, worker: WorkerHandle) -> None:
+        if worker.alive and not worker.process.is_alive():
+            self._lost(worker, worker.conn)
+        if worker.alive:
+            try:
+                self._request(worker, "ping").result(HEALTH_TIMEOUT)
+                worker.missed_pings = 0
+            except Exception:
+                worker.missed_pings += 1
+                logger.warning("Worker %s missed a health check (%s/%s)", worker.name, worker.missed_pings, MAX_MISSED_PINGS)
+                if worker.missed_pings >= MAX_MISSED_PINGS:
+                    worker.process.terminate()
+                    self._lost(worker, worker.conn)
+        if not worker.alive:
+            self._replace(worker)
+
+    def _replace(self, worker: WorkerHandle) -> None:
+        """Restart a dead worker; it reloads its own journal for keys that did not move."""
+        process, conn = self._launch(worker)
+        self._attach(worker, process, conn)
+        worker.restarts += 1
+        logger.info("Worker %s restarted (restarts: %s)", worker.name, worker.restarts)
+
+    # ------------------------------------------------------------------
+    # Routing
+    # ------------------------------------------------------------------
+
+    def _request(self, worker: WorkerHandle, op: str, payload: Any = None) -> Future:
+        future: Future = Future()
+        request_id = next(self._request_ids)
+        with worker.lock:
+            if not worker.alive:
+                raise ConnectionError(f"WORKER_LOST: Worker {worker.name} is restarting")
+            worker.pending[request_id] = future
+            worker.conn.send((request_id, op, payload))
+        return future
+
+    def routing_key(self, arguments: Dict[str, Any]) -> str:
+        """session_id if given, else the normalized workbook path, else empty."""
+        if arguments.get("session_id"):
+            return str(arguments["session_id"])
+        filepath = arguments.get("filepath")
+        if filepath:
+            if not os.path.isabs(filepath) and self.files_path:
+                filepath = os.path.join(self.files_path, filepath)
+            return os.path.normcase(os.path.abspath(filepath))
+        return ""
+
+    def route(self, key: str) -> Tuple[WorkerHandle, Optional[WorkerHandle]]:
+        """Worker for the key, and the dead owner it stands in for (None if it is the owner).
+
+        A key served by a fallback while its owner was down stays on the fallback.
+        """
+        moved = self._moved.get(key)
+        if moved is not None and self.workers[moved].alive:
+            return self.workers[moved], None
+        owner = None
+        for name in self.ring.successors(key):
+            worker = self.workers[name]
+            if worker.alive:
+                return worker, owner
+            owner = owner or worker
+        raise ConnectionError("WORKER_LOST: No worker processes are running")
+
+    async def _take_over(self, worker: WorkerHandle, owner: WorkerHandle) -> None:
+        """Have the fallback adopt the dead owner's recovery journal (once per owner restart)."""
+        adopted = (worker.name, owner.name, owner.restarts)
+        journal = worker_journal(self.journal, owner.name)
+        if adopted not in self._adopted and journal and os.path.exists(journal):
+            count = await asyncio.wrap_future(self._request(worker, "adopt", journal))
+            self._adopted.add(adopted)
+            logger.info("Worker %s adopted %s recoverable sessions of worker %s", worker.name, count, owner.name)
+
+    async def call(self, tool: str, arguments: Dict[str, Any]) -> Any:
+        if tool in _BROADCAST_TOOLS:
+            return await self._broadcast(tool, arguments)
+        if tool in _TRANSFER_TOOLS:
+            return await self._transfer(tool, arguments)
+        worker = await self._worker_for(self.routing_key(arguments))
+        return await asyncio.wrap_future(self._request(worker, "call", (tool, arguments)))
+
+    async def _worker_for(self, key: str) -> WorkerHandle:
+        worker, owner = self.route(key)
+        if owner is not None:
+            await self._take_over(worker, owner)
+            self._moved[key] = worker.name
+        return worker
+
+    async def _transfer(self, tool: str, arguments: Dict[str, Any]) -> Any:
+        """One call when both sessions live on one worker; otherwise the source
+        worker exports the values and the target worker imports them, so the data
+        crosses the supervisor once and never reaches the client."""
+        from xlwings_mcp.server import transfer_summary
+
+        source_id, target_id = str(arguments["source_session_id"]), str(arguments["target_session_id"])
+        source = await self._worker_for(source_id)
+        target = await self._worker_for(target_id)
+        if source is target:
+            return await asyncio.wrap_future(self._request(source, "call", (tool, arguments)))
+        block = await asyncio.wrap_future(self._request(source, "export", {
+            "session_id": source_id,
+            "sheet_name": arguments["source_sheet"],
+            "source_range": arguments.get("source_range"),
+        }))
+        if isinstance(block, str) or "error" in block:
+            return transfer_summary("values", source_id, target_id, block, {})
+        result = await asyncio.wrap_future(self._request(target, "import", {
+            "session_id": target_id,
+            "block": block,
+            "target_sheet": arguments.get("target_sheet") or arguments["source_sheet"],
+            "target_start": arguments.get("target_start"),
+        }))
+        return transfer_summary("values", source_id, target_id, block, result)
+
+    async def _broadcast(self, tool: str, arguments: Dict[str, Any]) -> Any:
+        workers = [worker for worker in self.workers.values() if worker.alive]
+        results = await asyncio.gather(
+            *(asyncio.wrap_future(self._request(worker, "call", (tool, arguments))) for worker in workers))
+        if tool == "list_workbooks":
+            return [dict(info, worker=worker.name) for worker, result in zip(workers, results) for info in result]
+        return json.dumps({
+            "workers": {worker.name: json.loads(result) for worker, result in zip(workers, results)},
+            "restarts": {worker.name: worker.restarts for worker in self.workers.values()},
+        }, indent=2, default=str, ensure_ascii=False)
+
+    async def prometheus(self) -> str:
+        """Every worker's metrics with a worker label, one block per metric family."""
+        workers = [worker for worker in self.workers.values() if worker.alive]
+        texts = await asyncio.gather(*(asyncio.wrap_future(self._request(worker, "prometheus")) for worker in workers))
+        families: Dict[str, List[str]] = {}
+        for worker, text in zip(workers, texts):
+            family = None
+            for line in text.splitlines():
+                if line.startswith("# HELP "):
+                    family = line.split()[2]
+                    if family in families:
+                        continue
+                    families[family] = [line]
+                elif line.startswith("# TYPE "):
+                    if len(families[family]) == 1:
+                        families[family].append(line)
+                elif line:
+                    name, _, rest = line.partition("{")
+                    if rest:
+                        families[family].append(f'{name}{{worker="{worker.name}",{rest}')
+                    else:
+                        name, value = line.rsplit(" ", 1)
+                        families[family].append(f'{name}{{worker="{worker.name}"}} {value}')
+        return "\n".join(line for lines in families.values() for line in lines) + "\n"
+
+    def install(self, mcp) -> None:
+        """Point every registered tool at a forwarder; schemas and docs are unchanged."""
+        for tool in mcp._tool_manager.list_tools():
+            tool.fn = self._forwarder(tool.name, tool.fn)
+            tool.is_async = True
+
+    def _forwarder(self, name: str, fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        async def forward(**arguments):
+            return await self.call(name, arguments)
+        return forward
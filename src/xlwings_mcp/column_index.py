@@ -0,0 +1,177 @@
+"""
+Key-column indexes for lookup-by-value on large sheets.
+An index is built from one bulk read of a column and then maintained from
+the writes and row/column inserts and deletes that go through the server.
+"""
+
+import bisect
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from .columnar import _group_key, _is_empty, sort_key
+from .formula.parser import column_letter
+
+
+def lookup_keys(value: Any) -> List[Any]:
+    """Hash keys a lookup operand may match: numeric text also matches numbers,
+    ISO date text also matches dates."""
+    keys = [_group_key(value)]
+    if isinstance(value, str):
+        text = value.strip()
+        try:
+            keys.append(_group_key(float(text)))
+        except ValueError:
+            try:
+                keys.append(datetime.fromisoformat(text))
+            except ValueError:
+                pass
+    return keys
+
+
+class ColumnIndex:
+    """Hash index (equality, O(1)) plus a lazily sorted view (ranges, O(log n)) over one column."""
+
+    def __init__(self, sheet: str, column: int, header: Optional[str], first_row: int,
+                 span: Tuple[int, int], table_name: Optional[str] = None,
+                 header_row: Optional[int] = 1):
+        self.sheet = sheet
+        self.column = column                # sheet column of the key
+        self.header = header
+        self.first_row = first_row          # first data row; rows above are never indexed
+        self.span = span                    # (first_col, last_col) returned for matching rows
+        self.table_name = table_name
+        self.header_row = header_row        # row holding the column names, if any
+        self.has_formulas = False
+        self.spec: Tuple[Any, ...] = ()     # build arguments (key_column, table_name, header_row)
+        self.structure_token = 0
+        self.change_token = 0
+        self.built_at = time.time()
+        self.build_ms = 0.0
+        self._values: Dict[int, Any] = {}            # row -> cell value
+        self._hash: Dict[Any, Set[int]] = {}         # key -> rows
+        self._sorted: Optional[List[Tuple[Tuple[int, Any], int]]] = None
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def matches(self, key_column: str) -> bool:
+        """Whether a user-supplied column reference (header or letter) names this index."""
+        key = str(key_column).strip().lower()
+        return key == column_letter(self.column).lower() or (
+            self.header is not None and key == self.header.strip().lower()
+        )
+
+    def _remove(self, row: int) -> None:
+        if row in self._values:
+            key = _group_key(self._values.pop(row))
+            rows = self._hash.get(key)
+            if rows is not None:
+                rows.discard(row)
+                if not rows:
+                    del self._hash[key]
+
+    def set_values(self, first_row: int, values: Sequence[Any]) -> None:
+        """Index cells of the key column starting at first_row; blanks are unindexed."""
+        for offset, value in enumerate(values):
+            row = first_row + offset
+            if row < self.first_row:
+                continue
+            self._remove(row)
+            if not _is_empty(value):
+                self._values[row] = value
+                self._hash.setdefault(_group_key(value), set()).add(row)
+        self._sorted = None
+
+    def _rebuild_hash(self) -> None:
+        self._hash = {}
+        for row, value in self._values.items():
+            self._hash.setdefault(_group_key(value), set()).add(row)
+        self._sorted = None
+
+    def shift_rows(self, start: int, count: int) -> None:
+        """Apply an insert (count > 0) or delete (count < 0) of rows at start."""
+        if count > 0:
+            moved = {row + count if row >= start else row: value for row, value in self._values.items()}
+        else:
+            end = start - count             # first row after the deleted block
+            moved = {}
+            for row, value in self._values.items():
+                if row < start:
+                    moved[row] = value
+                elif row >= end:
+                    moved[row + count] = value
+        self._values = moved
+        if self.header_row and self.header_row >= start:
+            self.header_row = max(self.header_row + count, start)
+        if self.first_row > start:
+            self.first_row = max(self.first_row + count, start)
+        self._rebuild_hash()
+
+    def shift_columns(self, start: int, count: int) -> bool:
+        """Apply a column insert/delete; returns False if the key column was deleted."""
+        if count < 0 and start <= self.column < start - count:
+            return False
+        if count > 0:
+            move = lambda col: col + count if col >= start else col
+            first, last = move(self.span[0]), move(self.span[1])
+        else:
+            end = start - count
+            move = lambda col: col if col < start else col + count if col >= end else start
+            first = move(self.span[0])
+            last = self.span[1] + count if self.span[1] >= end else min(self.span[1], start - 1)
+        self.column = move(self.column)
+        self.span = (first, max(first, last))
+        return True
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def find(self, values: Iterable[Any]) -> List[int]:
+        """Rows whose key equals any of the values (hash lookups)."""
+        rows: Set[int] = set()
+        for value in values:
+            for key in lookup_keys(value):
+                rows.update(self._hash.get(key, ()))
+        return sorted(rows)
+
+    def find_range(self, low: Any = None, high: Any = None) -> List[int]:
+        """Rows whose key lies in [low, high] in Excel sort order (bisect on a sorted view)."""
+        if self._sorted is None:
+            self._sorted = sorted((sort_key(value), row) for row, value in self._values.items())
+        keys = self._sorted
+        start = 0 if low is None else bisect.bisect_left(keys, (self._bound(low), -1))
+        stop = len(keys) if high is None else bisect.bisect_right(keys, (self._bound(high), float("inf")))
+        return sorted(row for _, row in keys[start:stop])
+
+    def _bound(self, value: Any) -> Tuple[int, Any]:
+        """Sort key for a range bound, read as a number or date when the column holds those."""
+        if isinstance(value, str) and self._sorted:
+            kind = self._sorted[len(self._sorted) // 2][0][0]
+            if kind == 0:
+                for convert in (float, datetime.fromisoformat):
+                    try:
+                        return sort_key(convert(value.strip()))
+                    except ValueError:
+                        continue
+        return sort_key(value)
+
+    def stats(self) -> Dict[str, Any]:
+        result = {
+            "sheet": self.sheet,
+            "key_column": column_letter(self.column),
+            "header": self.header,
+            "rows": len(self._values),
+            "distinct_keys": len(self._hash),
+            "first_row": self.first_row,
+            "columns": f"{column_letter(self.span[0])}:{column_letter(self.span[1])}",
+            "build_ms": self.build_ms,
+            "built_at": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.built_at)),
+        }
+        if self.table_name:
+            result["table"] = self.table_name
+        if self.has_formulas:
+            result["has_formulas"] = True
+        return result
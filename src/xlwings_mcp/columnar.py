@@ -0,0 +1,425 @@
+"""
+Columnar in-memory copies of worksheet ranges for server-side analysis.
+A range is read from Excel once, stored column by column and reused by
+aggregation and filter queries until the session's change token moves on.
+"""
+
+import heapq
+import math
+import time
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .exceptions import ValidationError
+from .formula.parser import column_letter
+
+# Aggregation name -> canonical function; "average" mirrors create_pivot_table's agg_func
+AGGREGATIONS = {
+    "sum": "sum",
+    "count": "count",
+    "mean": "mean",
+    "average": "mean",
+    "avg": "mean",
+    "min": "min",
+    "max": "max",
+    "count_distinct": "count_distinct",
+}
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and not (
+        isinstance(value, float) and math.isnan(value)
+    )
+
+
+def _is_empty(value: Any) -> bool:
+    return value is None or value == ""
+
+
+def _group_key(value: Any) -> Any:
+    """Grouping key for a cell: text groups case-insensitively like Excel pivots."""
+    if isinstance(value, str):
+        return value.strip().lower()
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+class ColumnarTable:
+    """A worksheet range held as one Python list per column."""
+
+    def __init__(self, sheet: str, address: str, first_row: int, first_col: int,
+                 headers: List[str], columns: List[List[Any]], read_ms: float = 0.0):
+        self.sheet = sheet
+        self.address = address
+        self.first_row = first_row      # sheet row of the first data row
+        self.first_col = first_col
+        self.headers = headers
+        self.columns = columns
+        self.row_count = len(columns[0]) if columns else 0
+        self.read_ms = read_ms
+        self.created_at = time.time()
+        self._positions = {}
+        for position, name in enumerate(headers):
+            self._positions.setdefault(name.strip().lower(), position)
+
+    @classmethod
+    def from_values(cls, sheet: str, address: str, first_row: int, first_col: int,
+                    values: Sequence[Sequence[Any]], header: bool = True,
+                    read_ms: float = 0.0) -> "ColumnarTable":
+        """Build from a 2D value block (as returned by Range.options(ndim=2).value).
+
+        With header=False, columns are named by their sheet column letters.
+        """
+        rows = [list(row) for row in values or []]
+        width = max((len(row) for row in rows), default=0)
+        if header and rows:
+            headers = [
+                str(name).strip() if not _is_empty(name) else column_letter(first_col + i)
+                for i, name in enumerate(rows[0] + [None] * (width - len(rows[0])))
+            ]
+            rows = rows[1:]
+            first_row += 1
+        else:
+            headers = [column_letter(first_col + i) for i in range(width)]
+
+        # Trailing blank rows come from generous ranges like "A:D"; drop them
+        while rows and all(_is_empty(value) for value in rows[-1]):
+            rows.pop()
+
+        columns = [[] for _ in range(width)]
+        for row in rows:
+            for i in range(width):
+                columns[i].append(row[i] if i < len(row) else None)
+        return cls(sheet, address, first_row, first_col, headers, columns, read_ms)
+
+    def position(self, column: str) -> int:
+        """Resolve a header name (case-insensitive) or column letter to a column position."""
+        key = str(column).strip().lower()
+        if key in self._positions:
+            return self._positions[key]
+        letters = [column_letter(self.first_col + i).lower() for i in range(len(self.headers))]
+        if key in letters:
+            return letters.index(key)
+        raise ValidationError(
+            f"Column '{column}' not found. Available columns: {', '.join(self.headers)}"
+        )
+
+    def column(self, column: str) -> List[Any]:
+        return self.columns[self.position(column)]
+
+    def memory_cells(self) -> int:
+        return self.row_count * len(self.headers)
+
+
+def aggregate(
+    table: ColumnarTable,
+    group_by: Optional[List[str]],
+    values: List[str],
+    agg_funcs: Optional[List[str]] = None,
+    sort_by: Optional[str] = None,
+    descending: bool = False,
+    limit: Optional[int] = None
+) -> Dict[str, Any]:
+    """Group-by summary of a columnar table.
+
+    Rows are first mapped to integer group codes in one pass over the group
+    columns; each aggregate then makes a single pass over its value column.
+    sum/mean/min/max use numeric cells only and count counts non-empty cells,
+    matching Excel's pivot semantics.
+
+    Args:
+        table: Source table
+        group_by: Grouping columns (None or empty for a grand total)
+        values: Columns to aggregate
+        agg_funcs: Aggregations applied to every value column (default ["sum"])
+        sort_by: Output column to sort by (default: group order of first appearance)
+        descending: Sort direction
+        limit: Maximum number of groups to return
+
+    Returns:
+        Dict with output column names, rows and group count
+    """
+    group_by = list(group_by or [])
+    if not values:
+        raise ValidationError("At least one value column is required")
+    funcs = []
+    for name in agg_funcs or ["sum"]:
+        canonical = AGGREGATIONS.get(str(name).strip().lower())
+        if canonical is None:
+            raise ValidationError(
+                f"Unsupported aggregation '{name}'. Supported: {', '.join(sorted(AGGREGATIONS))}"
+            )
+        funcs.append((name, canonical))
+
+    group_columns = [table.column(name) for name in group_by]
+    value_positions = [table.position(name) for name in values]
+
+    # Pass 1: group codes
+    if group_columns:
+        codes: List[int] = []
+        labels: List[Tuple[Any, ...]] = []
+        lookup: Dict[Tuple[Any, ...], int] = {}
+        for raw in zip(*group_columns):
+            key = tuple(_group_key(value) for value in raw)
+            code = lookup.get(key)
+            if code is None:
+                code = lookup[key] = len(labels)
+                labels.append(raw)
+            codes.append(code)
+    else:
+        labels = [()]
+        codes = [0] * table.row_count
+    group_count = len(labels)
+
+    # Pass 2: one sweep per (value column, aggregation)
+    output_columns = [table.headers[table.position(name)] for name in group_by]
+    results: List[List[Any]] = []
+    for position in value_positions:
+        data = table.columns[position]
+        header = table.headers[position]
+        sums = [0.0] * group_count
+        numeric = [0] * group_count
+        filled = [0] * group_count
+        mins: List[Any] = [None] * group_count
+        maxs: List[Any] = [None] * group_count
+        distinct: Optional[List[set]] = (
+            [set() for _ in range(group_count)] if any(c == "count_distinct" for _, c in funcs) else None
+        )
+        for code, value in zip(codes, data):
+            if _is_empty(value):
+                continue
+            filled[code] += 1
+            if distinct is not None:
+                distinct[code].add(_group_key(value))
+            if _is_number(value):
+                numeric[code] += 1
+                sums[code] += value
+                if mins[code] is None or value < mins[code]:
+                    mins[code] = value
+                if maxs[code] is None or value > maxs[code]:
+                    maxs[code] = value
+
+        for name, canonical in funcs:
+            output_columns.append(f"{canonical}({header})")
+            if canonical == "sum":
+                column = [s if n else 0 for s, n in zip(sums, numeric)]
+            elif canonical == "count":
+                column = filled
+            elif canonical == "mean":
+                column = [s / n if n else None for s, n in zip(sums, numeric)]
+            elif canonical == "min":
+                column = mins
+            elif canonical == "max":
+                column = maxs
+            else:
+                column = [len(seen) for seen in distinct]
+            results.append([_tidy(value) for value in column])
+
+    rows = [list(labels[code]) + [column[code] for column in results] for code in range(group_count)]
+    if sort_by is not None:
+        matches = [i for i, name in enumerate(output_columns) if name.lower() == str(sort_by).strip().lower()]
+        if not matches:
+            raise ValidationError(
+                f"sort_by '{sort_by}' is not an output column. Output columns: {', '.join(output_columns)}"
+            )
+        rows.sort(key=lambda row: sort_key(row[matches[0]]), reverse=descending)
+
+    truncated = limit is not None and len(rows) > limit
+    if truncated:
+        rows = rows[:limit]
+    result = {
+        "columns": output_columns,
+        "rows": rows,
+        "group_count": group_count,
+        "source_rows": table.row_count,
+    }
+    if truncated:
+        result["truncated"] = True
+    return result
+
+
+def _tidy(value: Any) -> Any:
+    """Render whole floats as ints and round float noise from summation."""
+    if isinstance(value, float):
+        if value.is_integer():
+            return int(value)
+        return round(value, 10)
+    return value
+
+
+def sort_key(value: Any) -> Tuple[int, Any]:
+    """Excel sort order: numbers, then text (case-insensitive), then booleans, then blanks."""
+    if _is_empty(value):
+        return (3, 0)
+    if isinstance(value, bool):
+        return (2, value)
+    if _is_number(value):
+        return (0, value)
+    if isinstance(value, str):
+        return (1, value.lower())
+    try:
+        return (0, value.timestamp())
+    except AttributeError:
+        return (1, str(value).lower())
+
+
+# ----------------------------------------------------------------------
+# Filtering
+# ----------------------------------------------------------------------
+
+QUERY_OPERATORS = (
+    "==", "!=", ">", ">=", "<", "<=", "in", "not_in", "between",
+    "contains", "startswith", "endswith", "is_empty", "not_empty",
+)
+
+_OPERATOR_ALIASES = {"=": "==", "eq": "==", "ne": "!=", "<>": "!=", "gt": ">", "gte": ">=",
+                     "ge": ">=", "lt": "<", "lte": "<=", "le": "<="}
+
+
+def _coerce_operand(sample: Any, operand: Any) -> Any:
+    """Convert a JSON operand to the cell type of the column (ISO dates, numeric text)."""
+    if isinstance(operand, str):
+        if isinstance(sample, (datetime, date)):
+            try:
+                return datetime.fromisoformat(operand)
+            except ValueError:
+                return operand
+        if _is_number(sample):
+            try:
+                return float(operand)
+            except ValueError:
+                return operand
+    return operand
+
+
+def _comparable(value: Any, operand: Any) -> bool:
+    if _is_number(value):
+        return _is_number(operand)
+    if isinstance(value, str):
+        return isinstance(operand, str)
+    if isinstance(value, (datetime, date)):
+        return isinstance(operand, (datetime, date))
+    return False
+
+
+def _match_value(value: Any, operand: Any) -> bool:
+    """Excel-style equality: text compares case-insensitively, 5 == 5.0."""
+    if isinstance(value, str) and isinstance(operand, str):
+        return value.lower() == operand.lower()
+    if _is_empty(value):
+        return _is_empty(operand)
+    return value == operand
+
+
+def _predicate(op: str, operand: Any, sample: Any):
+    """Build a cell -> bool test for one condition."""
+    if op in ("is_empty", "not_empty"):
+        return _is_empty if op == "is_empty" else (lambda value: not _is_empty(value))
+    if op in ("in", "not_in"):
+        if not isinstance(operand, (list, tuple)):
+            raise ValidationError(f"Operator '{op}' needs a list value")
+        keys = {_group_key(_coerce_operand(sample, item)) for item in operand}
+        if op == "in":
+            return lambda value: _group_key(value) in keys
+        return lambda value: _group_key(value) not in keys
+    if op == "between":
+        if not isinstance(operand, (list, tuple)) or len(operand) != 2:
+            raise ValidationError("Operator 'between' needs a [low, high] value")
+        low, high = (_coerce_operand(sample, item) for item in operand)
+        return lambda value: _comparable(value, low) and _comparable(value, high) and low <= value <= high
+    if op in ("contains", "startswith", "endswith"):
+        needle = str(operand).lower()
+        if op == "contains":
+            return lambda value: not _is_empty(value) and needle in str(value).lower()
+        if op == "startswith":
+            return lambda value: not _is_empty(value) and str(value).lower().startswith(needle)
+        return lambda value: not _is_empty(value) and str(value).lower().endswith(needle)
+
+    operand = _coerce_operand(sample, operand)
+    if op == "==":
+        return lambda value: _match_value(value, operand)
+    if op == "!=":
+        return lambda value: not _match_value(value, operand)
+    if isinstance(operand, str):
+        operand = operand.lower()
+        lower = lambda value: value.lower() if isinstance(value, str) else value
+    else:
+        lower = lambda value: value
+    compare = {
+        ">": lambda a, b: a > b,
+        ">=": lambda a, b: a >= b,
+        "<": lambda a, b: a < b,
+        "<=": lambda a, b: a <= b,
+    }[op]
+    return lambda value: _comparable(value, operand) and compare(lower(value), operand)
+
+
+def query(
+    table: ColumnarTable,
+    where: Optional[List[Dict[str, Any]]] = None,
+    columns: Optional[List[str]] = None,
+    sort_by: Optional[List[str]] = None,
+    descending: bool = False,
+    limit: Optional[int] = None,
+    offset: int = 0
+) -> Dict[str, Any]:
+    """Filter, sort and project the rows of a columnar table.
+
+    Conditions are applied one column at a time to a shrinking list of row
+    positions; top-N with a sort uses a heap instead of a full sort.
+
+    Args:
+        table: Source table
+        where: Conditions, all of which must hold: {"column", "op", "value"};
+            op defaults to "=="
+        columns: Columns to return (default: all)
+        sort_by: Columns to sort by, in priority order
+        descending: Sort direction
+        limit: Maximum number of rows to return
+        offset: Number of matching rows to skip (for paging)
+
+    Returns:
+        Dict with output columns, rows, their sheet row numbers and match count
+    """
+    positions = list(range(table.row_count))
+    for condition in where or []:
+        if not isinstance(condition, dict) or "column" not in condition:
+            raise ValidationError(f"Invalid condition {condition!r}: expected {{'column', 'op', 'value'}}")
+        op = str(condition.get("op", "==")).strip().lower()
+        op = _OPERATOR_ALIASES.get(op, op)
+        if op not in QUERY_OPERATORS:
+            raise ValidationError(f"Unsupported operator '{op}'. Supported: {', '.join(QUERY_OPERATORS)}")
+        data = table.column(condition["column"])
+        sample = next((value for value in data if not _is_empty(value)), None)
+        test = _predicate(op, condition.get("value"), sample)
+        positions = [i for i in positions if test(data[i])]
+
+    matched = len(positions)
+    if sort_by:
+        keys = [table.column(name) for name in sort_by]
+        # Blanks sort last in both directions, as in Excel
+        blank = (-1, 0) if descending else (3, 0)
+        sort_for = lambda i: tuple(blank if _is_empty(data[i]) else sort_key(data[i]) for data in keys)
+        wanted = None if limit is None else offset + limit
+        if wanted is not None and wanted < matched:
+            pick = heapq.nlargest if descending else heapq.nsmallest
+            positions = pick(wanted, positions, key=sort_for)
+        else:
+            positions.sort(key=sort_for, reverse=descending)
+    positions = positions[offset:]
+    if limit is not None:
+        positions = positions[:limit]
+
+    picked = [table.position(name) for name in columns] if columns else list(range(len(table.headers)))
+    data_columns = [table.columns[p] for p in picked]
+    result = {
+        "columns": [table.headers[p] for p in picked],
+        "rows": [[data[i] for data in data_columns] for i in positions],
+        "row_numbers": [table.first_row + i for i in positions],
+        "matched": matched,
+        "source_rows": table.row_count,
+    }
+    if offset + len(positions) < matched:
+        result["truncated"] = True
+    return result
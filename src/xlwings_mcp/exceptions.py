@@ -33,3 +33,19 @@ class PivotError(ExcelMCPError):
 class ChartError(ExcelMCPError):
     """Raised when chart operations fail."""
     pass
+
+class FormulaParseError(CalculationError):
+    """Raised when a formula cannot be parsed by the offline formula engine."""
+    pass
+
+class SessionBusyError(ExcelMCPError):
+    """Raised when a session's call queue is full."""
+
+    def __init__(self, session_id: str, queued: int, retry_after: float):
+        self.session_id = session_id
+        self.queued = queued
+        self.retry_after = retry_after
+        super().__init__(
+            f"SESSION_BUSY: Session '{session_id}' already has {queued} calls waiting. "
+            f"Retry after {retry_after}s."
+        )
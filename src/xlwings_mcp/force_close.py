@@ -61,17 +61,17 @@ def force_close_workbook_by_path(filepath: str) -> Dict[str, Any]:
                     wb_path = os.path.abspath(wb.FullName).lower()
                     
                     if wb_path == target_path:
-                        logger.info(f"Found workbook to force close: {wb.FullName}")
+                        logger.info("Found workbook to force close: %s", wb.FullName)
                         found = True
                         
                         # Force close without saving
                         wb.Close(SaveChanges=False)
                         closed = True
-                        logger.info(f"Successfully force closed: {filepath}")
+                        logger.info("Successfully force closed: %s", filepath)
                         break
                         
                 except Exception as e:
-                    logger.warning(f"Error checking/closing workbook: {e}")
+                    logger.warning("Error checking/closing workbook: %s", e)
                     continue
             
             # If no workbooks remain, optionally quit Excel
@@ -84,7 +84,7 @@ def force_close_workbook_by_path(filepath: str) -> Dict[str, Any]:
                     
         except Exception as e:
             # No Excel instance running or other COM error
-            logger.debug(f"Could not connect to Excel: {e}")
+            logger.debug("Could not connect to Excel: %s", e)
             return {
                 "closed": False,
                 "message": f"No Excel instance found or cannot connect: {str(e)}"
@@ -106,7 +106,7 @@ def force_close_workbook_by_path(filepath: str) -> Dict[str, Any]:
         }
         
     except Exception as e:
-        logger.error(f"Force close failed for {filepath}: {e}")
+        logger.error("Force close failed for %s: %s", filepath, e)
         return {
             "closed": False,
             "message": f"Force close failed: {str(e)}"
@@ -146,10 +146,10 @@ def force_close_all_excel_instances() -> Dict[str, Any]:
             
             # Quit Excel
             xl.Quit()
-            logger.info(f"Force closed {count} workbooks and quit Excel")
+            logger.info("Force closed %s workbooks and quit Excel", count)
             
         except Exception as e:
-            logger.debug(f"No Excel instance to close: {e}")
+            logger.debug("No Excel instance to close: %s", e)
             
         finally:
             pythoncom.CoUninitialize()
@@ -160,7 +160,7 @@ def force_close_all_excel_instances() -> Dict[str, Any]:
         }
         
     except Exception as e:
-        logger.error(f"Force close all failed: {e}")
+        logger.error("Force close all failed: %s", e)
         return {
             "count": 0,
             "message": f"Force close all failed: {str(e)}"
@@ -0,0 +1,58 @@
+"""
+Offline formula engine for the Excel MCP Server.
+Parses and evaluates common Excel formulas from workbook files without COM,
+so read-only sessions and non-Windows hosts can get up-to-date results.
+"""
+
+import os
+import threading
+from typing import Dict, Tuple
+
+from .engine import FormulaEngine
+from .functions import FUNCTIONS, LAZY_FUNCTIONS, ExcelError, Grid
+from .graph import DependencyGraph
+from .parser import parse, shift_formula, split_cell, split_range, cell_address, column_index, column_letter
+from .xlsx import SUPPORTED_EXTENSIONS, load_workbook
+
+__all__ = [
+    "FormulaEngine",
+    "DependencyGraph",
+    "ExcelError",
+    "Grid",
+    "parse",
+    "shift_formula",
+    "split_cell",
+    "split_range",
+    "cell_address",
+    "column_index",
+    "column_letter",
+    "load_workbook",
+    "get_engine_for_file",
+    "supported_functions",
+]
+
+# Engines are cached per file and rebuilt when the file changes on disk
+_ENGINE_CACHE: Dict[str, Tuple[Tuple[float, int], FormulaEngine]] = {}
+_ENGINE_LOCK = threading.Lock()
+
+
+def get_engine_for_file(filepath: str) -> FormulaEngine:
+    """Return a FormulaEngine for a workbook file, reusing it while the file is unchanged."""
+    path = os.path.abspath(filepath)
+    if not path.lower().endswith(SUPPORTED_EXTENSIONS):
+        raise ValueError(f"Offline evaluation supports {', '.join(SUPPORTED_EXTENSIONS)} files only")
+    stat = os.stat(path)
+    signature = (stat.st_mtime, stat.st_size)
+    with _ENGINE_LOCK:
+        cached = _ENGINE_CACHE.get(path)
+        if cached and cached[0] == signature:
+            return cached[1]
+    engine = load_workbook(path)
+    with _ENGINE_LOCK:
+        _ENGINE_CACHE[path] = (signature, engine)
+    return engine
+
+
+def supported_functions() -> list:
+    """Names of all functions the offline engine can evaluate."""
+    return sorted(set(FUNCTIONS) | set(LAZY_FUNCTIONS))
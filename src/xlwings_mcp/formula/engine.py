@@ -0,0 +1,339 @@
+"""
+In-memory workbook model and incremental formula calculator.
+Holds cell values and parsed formulas per sheet and recalculates only the
+cells downstream of a change, without any COM / Excel dependency.
+"""
+
+import logging
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from ..exceptions import FormulaParseError
+from .functions import (
+    FUNCTIONS, LAZY_FUNCTIONS, VOLATILE_FUNCTIONS, NAME, REF, VALUE,
+    ExcelError, Grid, binary_op, negate, percent, to_python,
+)
+from .graph import CellKey, DependencyGraph, DirtyCells
+from .parser import (
+    ArrayLiteral, Binary, Call, Literal, Name, Percent, Ref, Unary,
+    cell_address, iter_references, parse, split_cell, split_range,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class FormulaEngine:
+    """Workbook values, formulas and a dependency graph for offline evaluation."""
+
+    def __init__(self):
+        self._sheet_names: Dict[str, str] = {}                      # lower -> canonical
+        self.values: Dict[str, Dict[Tuple[int, int], Any]] = {}     # constants per sheet
+        self.formulas: Dict[CellKey, Tuple[str, Any]] = {}           # cell -> (text, ast)
+        self.computed: Dict[CellKey, Any] = {}                       # last result per formula cell
+        self.names: Dict[str, Any] = {}                              # defined name -> Ref | ast
+        self.graph = DependencyGraph()
+        self.dirty = DirtyCells()
+        self.volatile: Set[CellKey] = set()
+        self._bounds: Dict[str, Tuple[int, int]] = {}                # sheet -> (max_row, max_col)
+        self._active: Set[CellKey] = set()                           # cells being computed
+        self.lock = threading.RLock()
+
+    # ------------------------------------------------------------------
+    # Sheets and addressing
+    # ------------------------------------------------------------------
+
+    @property
+    def sheet_names(self) -> List[str]:
+        return list(self.values.keys())
+
+    def add_sheet(self, name: str) -> str:
+        if name.lower() not in self._sheet_names:
+            self._sheet_names[name.lower()] = name
+            self.values[name] = {}
+            self._bounds[name] = (0, 0)
+        return self._sheet_names[name.lower()]
+
+    def resolve_sheet(self, name: Optional[str], default: Optional[str] = None) -> str:
+        if name is None:
+            name = default
+        if name is None:
+            raise ExcelError(REF)
+        canonical = self._sheet_names.get(name.lower())
+        if canonical is None:
+            raise ExcelError(REF)
+        return canonical
+
+    def _extend_bounds(self, sheet: str, row: int, col: int) -> None:
+        max_row, max_col = self._bounds[sheet]
+        if row > max_row or col > max_col:
+            self._bounds[sheet] = (max(row, max_row), max(col, max_col))
+
+    def _resolve_ref(self, ref: Ref, sheet: str) -> Ref:
+        return ref._replace(sheet=self.resolve_sheet(ref.sheet, sheet))
+
+    # ------------------------------------------------------------------
+    # Loading / editing
+    # ------------------------------------------------------------------
+
+    def load_value(self, sheet: str, row: int, col: int, value: Any) -> None:
+        """Store a constant without triggering recalculation (bulk load)."""
+        sheet = self.add_sheet(sheet)
+        key = (sheet, row, col)
+        if key in self.formulas:
+            self._drop_formula(key)
+        if value is None:
+            self.values[sheet].pop((row, col), None)
+        else:
+            self.values[sheet][(row, col)] = value
+            self._extend_bounds(sheet, row, col)
+
+    def load_formula(self, sheet: str, row: int, col: int, formula: str, cached: Any = None) -> None:
+        """Store a formula (and its cached result) without recalculating."""
+        sheet = self.add_sheet(sheet)
+        key = (sheet, row, col)
+        self.values[sheet].pop((row, col), None)
+        self._extend_bounds(sheet, row, col)
+        text = formula if formula.startswith("=") else "=" + formula
+        try:
+            ast = parse(text)
+        except FormulaParseError as e:
+            logger.debug("Unparseable formula at %s!%s: %s", sheet, cell_address(row, col), e)
+            ast = Literal(ExcelError(NAME))
+        self.formulas[key] = (text, ast)
+        self.computed[key] = cached
+        self._link(key, ast)
+        self.dirty.add(key)
+
+    def define_name(self, name: str, definition: str) -> None:
+        """Register a workbook-level defined name (range or formula)."""
+        ast = parse(definition)
+        self.names[name.upper()] = ast
+
+    def _link(self, key: CellKey, ast: Any) -> None:
+        refs = []
+        volatile = False
+        for node in iter_references(ast):
+            if type(node) is Ref:
+                try:
+                    refs.append(self._resolve_ref(node, key[0]))
+                except ExcelError:
+                    continue
+            else:
+                target = self.names.get(node.name)
+                if type(target) is Ref and target.sheet is not None:
+                    try:
+                        refs.append(self._resolve_ref(target, key[0]))
+                    except ExcelError:
+                        continue
+        stack = [ast]
+        while stack and not volatile:
+            node = stack.pop()
+            if type(node) is Call:
+                volatile = node.name in VOLATILE_FUNCTIONS
+                stack.extend(node.args)
+            elif type(node) is Binary:
+                stack.extend((node.left, node.right))
+            elif type(node) in (Unary, Percent):
+                stack.append(node.operand)
+        self.graph.set_precedents(key, refs)
+        if volatile:
+            self.volatile.add(key)
+        else:
+            self.volatile.discard(key)
+
+    def _drop_formula(self, key: CellKey) -> None:
+        self.formulas.pop(key, None)
+        self.computed.pop(key, None)
+        self.graph.remove(key)
+        self.dirty.discard(key)
+        self.volatile.discard(key)
+
+    def set_value(self, sheet: str, address: str, value: Any) -> List[str]:
+        """Set a constant and recalculate its downstream cells."""
+        return self.set_cells(sheet, {address: value})
+
+    def set_formula(self, sheet: str, address: str, formula: str) -> List[str]:
+        """Set a formula and recalculate it plus its downstream cells."""
+        return self.set_cells(sheet, {address: formula if formula.startswith("=") else "=" + formula})
+
+    def set_cells(self, sheet: str, updates: Dict[str, Any]) -> List[str]:
+        """Apply several edits (strings starting with '=' are formulas) and
+        recalculate only the affected cells. Returns recalculated addresses."""
+        sheet = self.resolve_sheet(sheet)
+        sources = []
+        for address, value in updates.items():
+            row, col = split_cell(address)
+            if isinstance(value, str) and value.startswith("="):
+                self.load_formula(sheet, row, col, value)
+            else:
+                self.load_value(sheet, row, col, value)
+            sources.append((sheet, row, col, row, col))
+        for key in self.graph.transitive_dependents(sources):
+            self.dirty.add(key)
+        return self.recalculate()
+
+    # ------------------------------------------------------------------
+    # Calculation
+    # ------------------------------------------------------------------
+
+    def recalculate(self, full: bool = False) -> List[str]:
+        """Compute dirty (or, with full=True, all) formula cells."""
+        if full:
+            self.dirty.update(self.formulas.keys())
+        self.dirty.update(self.volatile)
+        pending = list(self.dirty)
+        self._ensure(pending)
+        return [f"{sheet}!{cell_address(row, col)}" for sheet, row, col in pending]
+
+    def _dirty_inputs(self, key: CellKey) -> List[CellKey]:
+        inputs = []
+        for ref in self.graph.precedents(key):
+            if ref.is_cell:
+                cell = (ref.sheet, ref.r1, ref.c1)
+                if cell in self.dirty:
+                    inputs.append(cell)
+            else:
+                inputs.extend(self.dirty.in_block(ref.sheet, ref.r1, ref.c1, ref.r2, ref.c2))
+        return inputs
+
+    def _ensure(self, cells: Iterable[CellKey]) -> None:
+        """Compute dirty cells after their dirty precedents (iterative DFS).
+
+        Circular references read the previous (cached) value of the cell that
+        closes the loop instead of recursing forever.
+        """
+        stack = [(cell, False) for cell in cells if cell in self.dirty and cell not in self._active]
+        active = self._active
+        while stack:
+            cell, expanded = stack.pop()
+            if cell not in self.dirty:
+                continue
+            if expanded:
+                active.discard(cell)
+                self.computed[cell] = self._compute(cell)
+                self.dirty.discard(cell)
+                continue
+            if cell in active:
+                continue
+            active.add(cell)
+            stack.append((cell, True))
+            for dep in self._dirty_inputs(cell):
+                if dep not in active:
+                    stack.append((dep, False))
+
+    def _compute(self, key: CellKey) -> Any:
+        _, ast = self.formulas[key]
+        try:
+            result = self._eval(ast, key[0])
+        except ExcelError as error:
+            return error
+        except (TypeError, ValueError, ZeroDivisionError, OverflowError, IndexError):
+            return ExcelError(VALUE)
+        if isinstance(result, Grid):
+            # Single-cell storage keeps the top-left element of an array result
+            result = result.rows[0][0] if result.rows and result.rows[0] else None
+        return result
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def _cell(self, sheet: str, row: int, col: int) -> Any:
+        key = (sheet, row, col)
+        if key in self.formulas:
+            if key in self.dirty and key not in self._active:
+                self._ensure([key])
+            value = self.computed.get(key)
+            return 0 if value is None else value
+        return self.values[sheet].get((row, col))
+
+    def _grid(self, ref: Ref) -> Grid:
+        max_row, max_col = self._bounds[ref.sheet]
+        r2 = min(ref.r2, max(max_row, ref.r1))
+        c2 = min(ref.c2, max(max_col, ref.c1))
+        pending = [
+            cell for cell in self.dirty.in_block(ref.sheet, ref.r1, ref.c1, r2, c2)
+            if cell not in self._active
+        ]
+        if pending:
+            self._ensure(pending)
+        sheet_values = self.values[ref.sheet]
+        computed = self.computed
+        sheet = ref.sheet
+        rows = []
+        for row in range(ref.r1, r2 + 1):
+            line = []
+            for col in range(ref.c1, c2 + 1):
+                key = (sheet, row, col)
+                if key in computed:
+                    value = computed[key]
+                    line.append(0 if value is None else value)
+                else:
+                    line.append(sheet_values.get((row, col)))
+            rows.append(line)
+        return Grid(rows)
+
+    def _eval(self, node: Any, sheet: str) -> Any:
+        kind = type(node)
+        if kind is Literal:
+            return node.value
+        if kind is Ref:
+            ref = self._resolve_ref(node, sheet)
+            if ref.is_cell:
+                return self._cell(ref.sheet, ref.r1, ref.c1)
+            return self._grid(ref)
+        if kind is Binary:
+            return binary_op(node.op, self._eval(node.left, sheet), self._eval(node.right, sheet))
+        if kind is Call:
+            lazy = LAZY_FUNCTIONS.get(node.name)
+            if lazy is not None:
+                return lazy(lambda arg: self._eval(arg, sheet), node.args)
+            func = FUNCTIONS.get(node.name)
+            if func is None:
+                raise ExcelError(NAME)
+            args = [self._eval(arg, sheet) for arg in node.args]
+            return func(*args)
+        if kind is Unary:
+            return negate(self._eval(node.operand, sheet))
+        if kind is Percent:
+            return percent(self._eval(node.operand, sheet))
+        if kind is Name:
+            target = self.names.get(node.name)
+            if target is None:
+                raise ExcelError(NAME)
+            return self._eval(target, sheet)
+        if kind is ArrayLiteral:
+            return Grid([list(row) for row in node.rows])
+        raise ExcelError(VALUE)
+
+    def get_value(self, sheet: str, address: str) -> Any:
+        """Current value of a cell, recalculating it first if needed."""
+        sheet = self.resolve_sheet(sheet)
+        row, col = split_cell(address)
+        return to_python(self._cell(sheet, row, col))
+
+    def get_range(self, sheet: str, address: str) -> List[List[Any]]:
+        """Current values of a range as a 2D list."""
+        ref_sheet, r1, c1, r2, c2 = split_range(address)
+        ref = Ref(self.resolve_sheet(ref_sheet, sheet), r1, c1, r2, c2)
+        return self._grid(ref).to_python()
+
+    def get_formula(self, sheet: str, address: str) -> Optional[str]:
+        sheet = self.resolve_sheet(sheet)
+        row, col = split_cell(address)
+        entry = self.formulas.get((sheet, row, col))
+        return entry[0] if entry else None
+
+    def evaluate(self, formula: str, sheet: str) -> Any:
+        """Evaluate a formula against the current model without storing it.
+
+        Array results are returned as 2D lists; errors as their code strings.
+        """
+        sheet = self.resolve_sheet(sheet)
+        ast = parse(formula if formula.startswith("=") else "=" + formula)
+        try:
+            return to_python(self._eval(ast, sheet))
+        except ExcelError as error:
+            return str(error)
+        except (TypeError, ValueError, ZeroDivisionError, OverflowError, IndexError):
+            return VALUE
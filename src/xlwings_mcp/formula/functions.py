@@ -0,0 +1,1226 @@
+"""
+Value model and built-in function library for the offline formula engine.
+Ranges are evaluated into Grid objects (lists of rows) and arithmetic is
+applied elementwise over whole grids instead of cell by cell.
+"""
+
+import calendar
+import datetime
+import math
+import re
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+
+# ============================================================================
+# VALUE MODEL
+# ============================================================================
+
+class ExcelError(Exception):
+    """Excel error value (#N/A, #DIV/0!, ...). Raised to short-circuit evaluation."""
+
+    def __init__(self, code: str):
+        super().__init__(code)
+        self.code = code
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, ExcelError) and other.code == self.code
+
+    def __hash__(self) -> int:
+        return hash(self.code)
+
+    def __repr__(self) -> str:
+        return self.code
+
+    __str__ = __repr__
+
+
+NA = "#N/A"
+DIV0 = "#DIV/0!"
+VALUE = "#VALUE!"
+REF = "#REF!"
+NAME = "#NAME?"
+NUM = "#NUM!"
+
+
+class Grid:
+    """Rectangular block of cell values, stored row-major."""
+
+    __slots__ = ("rows",)
+
+    def __init__(self, rows: List[List[Any]]):
+        self.rows = rows
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return len(self.rows), (len(self.rows[0]) if self.rows else 0)
+
+    def flat(self) -> Iterable[Any]:
+        for row in self.rows:
+            yield from row
+
+    def column(self, index: int) -> List[Any]:
+        return [row[index] for row in self.rows]
+
+    def scalar(self) -> Any:
+        if self.shape == (1, 1):
+            return self.rows[0][0]
+        raise ExcelError(VALUE)
+
+    def to_python(self) -> List[List[Any]]:
+        return [[_plain(v) for v in row] for row in self.rows]
+
+    def __repr__(self) -> str:
+        return f"Grid({self.rows!r})"
+
+
+def _plain(value: Any) -> Any:
+    return str(value) if isinstance(value, ExcelError) else value
+
+
+def to_python(value: Any) -> Any:
+    """Convert an engine value into a JSON-friendly Python value."""
+    if isinstance(value, Grid):
+        if value.shape == (1, 1):
+            return _plain(value.rows[0][0])
+        return value.to_python()
+    return _plain(value)
+
+
+# ============================================================================
+# COERCION
+# ============================================================================
+
+def scalar(value: Any) -> Any:
+    """Reduce a single-cell grid to its value; errors in the value are raised."""
+    if isinstance(value, Grid):
+        value = value.scalar()
+    if isinstance(value, ExcelError):
+        raise value
+    return value
+
+
+def to_number(value: Any) -> float:
+    value = scalar(value)
+    if value is None:
+        return 0
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, (int, float)):
+        return value
+    if isinstance(value, datetime.datetime):
+        return datetime_to_serial(value)
+    if isinstance(value, datetime.date):
+        return date_to_serial(value)
+    if isinstance(value, str):
+        text = value.strip()
+        if not text:
+            raise ExcelError(VALUE)
+        try:
+            return float(text.replace(",", ""))
+        except ValueError:
+            if text.endswith("%"):
+                try:
+                    return float(text[:-1]) / 100
+                except ValueError:
+                    pass
+            raise ExcelError(VALUE)
+    raise ExcelError(VALUE)
+
+
+def to_int(value: Any) -> int:
+    return int(math.floor(to_number(value)))
+
+
+def to_text(value: Any) -> str:
+    value = scalar(value)
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "TRUE" if value else "FALSE"
+    if isinstance(value, float):
+        if value.is_integer():
+            return str(int(value))
+        return repr(round(value, 15)).rstrip("0") if "e" not in repr(value) else repr(value)
+    return str(value)
+
+
+def to_bool(value: Any) -> bool:
+    value = scalar(value)
+    if value is None:
+        return False
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, (int, float)):
+        return value != 0
+    if isinstance(value, str):
+        upper = value.upper()
+        if upper in ("TRUE", "FALSE"):
+            return upper == "TRUE"
+    raise ExcelError(VALUE)
+
+
+def is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def as_grid(value: Any) -> Grid:
+    return value if isinstance(value, Grid) else Grid([[value]])
+
+
+def numbers_in(args: Iterable[Any]) -> List[float]:
+    """Collect numeric values the way SUM/AVERAGE do.
+
+    Direct scalar arguments are coerced; values inside ranges are used only if numeric.
+    Errors anywhere propagate.
+    """
+    numbers: List[float] = []
+    for arg in args:
+        if isinstance(arg, Grid):
+            for value in arg.flat():
+                if isinstance(value, ExcelError):
+                    raise value
+                if is_number(value):
+                    numbers.append(value)
+        elif arg is not None:
+            numbers.append(to_number(arg))
+    return numbers
+
+
+# ============================================================================
+# ELEMENTWISE OPERATORS
+# ============================================================================
+
+def broadcast(func: Callable[..., Any], *args: Any) -> Any:
+    """Apply a scalar function across grid arguments, Excel array style.
+
+    Single-row/column arguments are stretched to the largest shape; errors are
+    captured per element instead of aborting the whole operation.
+    """
+    if not any(isinstance(arg, Grid) for arg in args):
+        return func(*args)
+
+    grids = [as_grid(arg) for arg in args]
+    height = max(g.shape[0] for g in grids)
+    width = max(g.shape[1] for g in grids)
+
+    def pick(grid: Grid, r: int, c: int) -> Any:
+        h, w = grid.shape
+        rr = 0 if h == 1 else r
+        cc = 0 if w == 1 else c
+        if rr >= h or cc >= w:
+            return ExcelError(NA)
+        return grid.rows[rr][cc]
+
+    rows = []
+    for r in range(height):
+        row = []
+        for c in range(width):
+            try:
+                row.append(func(*(pick(g, r, c) for g in grids)))
+            except ExcelError as error:
+                row.append(error)
+        rows.append(row)
+    return Grid(rows)
+
+
+def _compare_key(value: Any) -> Tuple[int, Any]:
+    # Excel ordering: numbers < text < logicals; blanks compare as 0 / ""
+    if isinstance(value, bool):
+        return 2, value
+    if is_number(value):
+        return 0, value
+    if isinstance(value, str):
+        return 1, value.lower()
+    return 0, 0
+
+
+def _compare(op: str, left: Any, right: Any) -> bool:
+    left, right = scalar(left), scalar(right)
+    if left is None:
+        left = "" if isinstance(right, str) else (False if isinstance(right, bool) else 0)
+    if right is None:
+        right = "" if isinstance(left, str) else (False if isinstance(left, bool) else 0)
+    lk, rk = _compare_key(left), _compare_key(right)
+    if op == "=":
+        return lk == rk
+    if op == "<>":
+        return lk != rk
+    if op == "<":
+        return lk < rk
+    if op == ">":
+        return lk > rk
+    if op == "<=":
+        return lk <= rk
+    return lk >= rk
+
+
+def _arith(op: str, left: Any, right: Any) -> Any:
+    a, b = to_number(left), to_number(right)
+    if op == "+":
+        return a + b
+    if op == "-":
+        return a - b
+    if op == "*":
+        return a * b
+    if op == "/":
+        if b == 0:
+            raise ExcelError(DIV0)
+        return a / b
+    if op == "^":
+        try:
+            result = a ** b
+        except (OverflowError, ZeroDivisionError):
+            raise ExcelError(NUM)
+        if isinstance(result, complex):
+            raise ExcelError(NUM)
+        return result
+    raise ExcelError(VALUE)
+
+
+def binary_op(op: str, left: Any, right: Any) -> Any:
+    if op == "&":
+        return broadcast(lambda a, b: to_text(a) + to_text(b), left, right)
+    if op in ("=", "<>", "<", ">", "<=", ">="):
+        return broadcast(lambda a, b: _compare(op, a, b), left, right)
+    return broadcast(lambda a, b: _arith(op, a, b), left, right)
+
+
+def negate(value: Any) -> Any:
+    return broadcast(lambda v: -to_number(v), value)
+
+
+def percent(value: Any) -> Any:
+    return broadcast(lambda v: to_number(v) / 100, value)
+
+
+# ============================================================================
+# DATES (Excel 1900 date system, including the 1900-02-29 quirk)
+# ============================================================================
+
+_EPOCH = datetime.date(1899, 12, 31)
+
+
+def date_to_serial(value: datetime.date) -> int:
+    serial = (value - _EPOCH).days
+    return serial + 1 if serial > 59 else serial
+
+
+def datetime_to_serial(value: datetime.datetime) -> float:
+    day = date_to_serial(value.date())
+    seconds = value.hour * 3600 + value.minute * 60 + value.second + value.microsecond / 1e6
+    return day + seconds / 86400
+
+
+def serial_to_date(serial: Any) -> datetime.date:
+    number = int(math.floor(to_number(serial)))
+    if number < 0:
+        raise ExcelError(NUM)
+    if number > 59:
+        number -= 1
+    if number == 0:
+        number = 1    # Excel's 1900-01-00 maps to the epoch start
+    return _EPOCH + datetime.timedelta(days=number)
+
+
+def _make_date(year: int, month: int, day: int) -> int:
+    if year < 1900:
+        year += 1900
+    # Normalize overflowing months/days the way DATE() does
+    year += (month - 1) // 12
+    month = (month - 1) % 12 + 1
+    base = datetime.date(year, month, 1)
+    return date_to_serial(base) + day - 1
+
+
+def _add_months(serial: Any, months: int) -> datetime.date:
+    start = serial_to_date(serial)
+    total = start.year * 12 + (start.month - 1) + months
+    year, month = divmod(total, 12)
+    month += 1
+    day = min(start.day, calendar.monthrange(year, month)[1])
+    return datetime.date(year, month, day)
+
+
+# ============================================================================
+# CRITERIA (SUMIF / COUNTIF family)
+# ============================================================================
+
+_CRITERIA_RE = re.compile(r"^(<=|>=|<>|<|>|=)?(.*)$", re.DOTALL)
+
+
+def _wildcard_regex(pattern: str) -> "re.Pattern":
+    out = []
+    i = 0
+    while i < len(pattern):
+        ch = pattern[i]
+        if ch == "~" and i + 1 < len(pattern):
+            out.append(re.escape(pattern[i + 1]))
+            i += 2
+            continue
+        out.append(".*" if ch == "*" else "." if ch == "?" else re.escape(ch))
+        i += 1
+    return re.compile("^" + "".join(out) + "$", re.IGNORECASE | re.DOTALL)
+
+
+def make_criteria(criteria: Any) -> Callable[[Any], bool]:
+    """Build a predicate from a SUMIF-style criterion ("&gt;5", "a*", 3, ...)."""
+    criteria = scalar(criteria)
+    if not isinstance(criteria, str):
+        target = criteria if criteria is not None else 0
+        return lambda v: v is not None and not isinstance(v, ExcelError) and _compare_key(v) == _compare_key(target)
+
+    op, operand = _CRITERIA_RE.match(criteria).groups()
+    op = op or "="
+    number: Optional[float]
+    try:
+        number = float(operand) if operand.strip() else None
+    except ValueError:
+        number = None
+    if operand.upper() in ("TRUE", "FALSE"):
+        boolean = operand.upper() == "TRUE"
+        if op == "=":
+            return lambda v: v is boolean
+        if op == "<>":
+            return lambda v: v is not boolean
+
+    if number is not None:
+        def numeric(v: Any) -> bool:
+            if isinstance(v, str):
+                try:
+                    v = float(v)
+                except ValueError:
+                    return op == "<>"
+            if not is_number(v):
+                return op == "<>"
+            return _compare(op, v, number)
+        return numeric
+
+    if op in ("=", "<>"):
+        if operand == "":
+            blank = lambda v: v is None or v == ""
+            return blank if op == "=" else (lambda v: not blank(v))
+        regex = _wildcard_regex(operand)
+        matches = lambda v: isinstance(v, str) and bool(regex.match(v))
+        return matches if op == "=" else (lambda v: not matches(v))
+
+    return lambda v: isinstance(v, str) and _compare(op, v, operand)
+
+
+def _criteria_mask(pairs: List[Tuple[Any, Any]]) -> Tuple[Tuple[int, int], List[bool]]:
+    shape = None
+    mask: Optional[List[bool]] = None
+    for rng, criteria in pairs:
+        grid = as_grid(rng)
+        if shape is None:
+            shape = grid.shape
+        elif grid.shape != shape:
+            raise ExcelError(VALUE)
+        test = make_criteria(criteria)
+        current = [test(v) for v in grid.flat()]
+        mask = current if mask is None else [a and b for a, b in zip(mask, current)]
+    return shape, mask
+
+
+# ============================================================================
+# FUNCTION REGISTRY
+# ============================================================================
+
+FUNCTIONS: Dict[str, Callable[..., Any]] = {}
+# Lazy functions receive (evaluate, args) where args are unevaluated AST nodes
+LAZY_FUNCTIONS: Dict[str, Callable[..., Any]] = {}
+# Volatile functions force their cell to recalculate on every pass
+VOLATILE_FUNCTIONS = {"NOW", "TODAY", "RAND", "RANDBETWEEN", "OFFSET", "INDIRECT"}
+
+
+def register(*names: str):
+    def decorator(func):
+        for name in names:
+            FUNCTIONS[name] = func
+        return func
+    return decorator
+
+
+def register_lazy(*names: str):
+    def decorator(func):
+        for name in names:
+            LAZY_FUNCTIONS[name] = func
+        return func
+    return decorator
+
+
+def _arg(args: Tuple[Any, ...], index: int, default: Any = None) -> Any:
+    if index < len(args) and args[index] is not None:
+        return args[index]
+    return default
+
+
+# ---------------------------------------------------------------------------
+# Logical
+# ---------------------------------------------------------------------------
+
+@register_lazy("IF")
+def _if(evaluate, args):
+    if len(args) < 2:
+        raise ExcelError(VALUE)
+    condition = evaluate(args[0])
+    if isinstance(condition, Grid) and condition.shape != (1, 1):
+        then = evaluate(args[1])
+        other = evaluate(args[2]) if len(args) > 2 else False
+        return broadcast(lambda c, t, o: t if to_bool(c) else o, condition, then, other)
+    if to_bool(condition):
+        return evaluate(args[1])
+    return evaluate(args[2]) if len(args) > 2 else False
+
+
+@register_lazy("IFERROR")
+def _iferror(evaluate, args):
+    try:
+        value = evaluate(args[0])
+    except ExcelError:
+        return evaluate(args[1])
+    if isinstance(value, Grid):
+        fallback = evaluate(args[1])
+        return broadcast(lambda v, f: f if isinstance(v, ExcelError) else v, value, fallback)
+    return evaluate(args[1]) if isinstance(value, ExcelError) else value
+
+
+@register_lazy("IFNA")
+def _ifna(evaluate, args):
+    try:
+        value = evaluate(args[0])
+    except ExcelError as error:
+        if error.code == NA:
+            return evaluate(args[1])
+        raise
+    return value
+
+
+@register("AND")
+def _and(*args):
+    values = [to_bool(v) for v in _logicals(args)]
+    if not values:
+        raise ExcelError(VALUE)
+    return all(values)
+
+
+@register("OR")
+def _or(*args):
+    values = [to_bool(v) for v in _logicals(args)]
+    if not values:
+        raise ExcelError(VALUE)
+    return any(values)
+
+
+def _logicals(args):
+    for arg in args:
+        if isinstance(arg, Grid):
+            for value in arg.flat():
+                if isinstance(value, ExcelError):
+                    raise value
+                if isinstance(value, bool) or is_number(value):
+                    yield value
+        else:
+            yield arg
+
+
+@register("NOT")
+def _not(value):
+    return broadcast(lambda v: not to_bool(v), value)
+
+
+@register("TRUE")
+def _true():
+    return True
+
+
+@register("FALSE")
+def _false():
+    return False
+
+
+# ---------------------------------------------------------------------------
+# Math / aggregation
+# ---------------------------------------------------------------------------
+
+@register("SUM")
+def _sum(*args):
+    return sum(numbers_in(args))
+
+
+@register("AVERAGE")
+def _average(*args):
+    numbers = numbers_in(args)
+    if not numbers:
+        raise ExcelError(DIV0)
+    return sum(numbers) / len(numbers)
+
+
+@register("MIN")
+def _min(*args):
+    numbers = numbers_in(args)
+    return min(numbers) if numbers else 0
+
+
+@register("MAX")
+def _max(*args):
+    numbers = numbers_in(args)
+    return max(numbers) if numbers else 0
+
+
+@register("COUNT")
+def _count(*args):
+    total = 0
+    for arg in args:
+        if isinstance(arg, Grid):
+            total += sum(1 for v in arg.flat() if is_number(v))
+        else:
+            try:
+                to_number(arg)
+                total += 1
+            except ExcelError:
+                pass
+    return total
+
+
+@register("COUNTA")
+def _counta(*args):
+    total = 0
+    for arg in args:
+        if isinstance(arg, Grid):
+            total += sum(1 for v in arg.flat() if v is not None)
+        elif arg is not None:
+            total += 1
+    return total
+
+
+@register("COUNTBLANK")
+def _countblank(rng):
+    return sum(1 for v in as_grid(rng).flat() if v is None or v == "")
+
+
+@register("PRODUCT")
+def _product(*args):
+    result = 1
+    for number in numbers_in(args):
+        result *= number
+    return result
+
+
+@register("SUMPRODUCT")
+def _sumproduct(*args):
+    grids = [as_grid(a) for a in args]
+    if any(g.shape != grids[0].shape for g in grids):
+        raise ExcelError(VALUE)
+    total = 0
+    columns = [list(g.flat()) for g in grids]
+    for values in zip(*columns):
+        product = 1
+        for v in values:
+            if isinstance(v, ExcelError):
+                raise v
+            product *= v if is_number(v) else 0
+        total += product
+    return total
+
+
+def _round_half_away(number: float, digits: int) -> float:
+    factor = 10 ** digits
+    scaled = abs(number) * factor
+    rounded = math.floor(scaled + 0.5 + 1e-9) / factor
+    return math.copysign(rounded, number)
+
+
+@register("ROUND")
+def _round(number, digits=0):
+    return broadcast(lambda n, d: _round_half_away(to_number(n), to_int(d)), number, digits)
+
+
+@register("ROUNDUP")
+def _roundup(number, digits=0):
+    def op(n, d):
+        n, factor = to_number(n), 10 ** to_int(d)
+        return math.copysign(math.ceil(abs(n) * factor - 1e-9) / factor, n)
+    return broadcast(op, number, digits)
+
+
+@register("ROUNDDOWN")
+def _rounddown(number, digits=0):
+    def op(n, d):
+        n, factor = to_number(n), 10 ** to_int(d)
+        return math.copysign(math.floor(abs(n) * factor + 1e-9) / factor, n)
+    return broadcast(op, number, digits)
+
+
+@register("INT")
+def _int(number):
+    return broadcast(lambda n: math.floor(to_number(n)), number)
+
+
+@register("ABS")
+def _abs(number):
+    return broadcast(lambda n: abs(to_number(n)), number)
+
+
+@register("MOD")
+def _mod(number, divisor):
+    def op(n, d):
+        n, d = to_number(n), to_number(d)
+        if d == 0:
+            raise ExcelError(DIV0)
+        return n - d * math.floor(n / d)
+    return broadcast(op, number, divisor)
+
+
+@register("POWER")
+def _power(number, power):
+    return binary_op("^", number, power)
+
+
+@register("SQRT")
+def _sqrt(number):
+    def op(n):
+        n = to_number(n)
+        if n < 0:
+            raise ExcelError(NUM)
+        return math.sqrt(n)
+    return broadcast(op, number)
+
+
+# ---------------------------------------------------------------------------
+# Conditional aggregation
+# ---------------------------------------------------------------------------
+
+@register("SUMIF")
+def _sumif(rng, criteria, sum_range=None):
+    grid = as_grid(rng)
+    target = as_grid(sum_range) if sum_range is not None else grid
+    test = make_criteria(criteria)
+    total = 0
+    for value, addend in zip(grid.flat(), target.flat()):
+        if test(value):
+            if isinstance(addend, ExcelError):
+                raise addend
+            if is_number(addend):
+                total += addend
+    return total
+
+
+@register("SUMIFS")
+def _sumifs(sum_range, *pairs):
+    if len(pairs) % 2:
+        raise ExcelError(VALUE)
+    target = as_grid(sum_range)
+    shape, mask = _criteria_mask(list(zip(pairs[::2], pairs[1::2])))
+    if shape != target.shape:
+        raise ExcelError(VALUE)
+    total = 0
+    for keep, value in zip(mask, target.flat()):
+        if keep:
+            if isinstance(value, ExcelError):
+                raise value
+            if is_number(value):
+                total += value
+    return total
+
+
+@register("COUNTIF")
+def _countif(rng, criteria):
+    test = make_criteria(criteria)
+    return sum(1 for v in as_grid(rng).flat() if test(v))
+
+
+@register("COUNTIFS")
+def _countifs(*pairs):
+    if not pairs or len(pairs) % 2:
+        raise ExcelError(VALUE)
+    _, mask = _criteria_mask(list(zip(pairs[::2], pairs[1::2])))
+    return sum(mask)
+
+
+@register("AVERAGEIF")
+def _averageif(rng, criteria, average_range=None):
+    grid = as_grid(rng)
+    target = as_grid(average_range) if average_range is not None else grid
+    test = make_criteria(criteria)
+    numbers = [a for v, a in zip(grid.flat(), target.flat()) if test(v) and is_number(a)]
+    if not numbers:
+        raise ExcelError(DIV0)
+    return sum(numbers) / len(numbers)
+
+
+@register("AVERAGEIFS")
+def _averageifs(average_range, *pairs):
+    target = as_grid(average_range)
+    shape, mask = _criteria_mask(list(zip(pairs[::2], pairs[1::2])))
+    if shape != target.shape:
+        raise ExcelError(VALUE)
+    numbers = [v for keep, v in zip(mask, target.flat()) if keep and is_number(v)]
+    if not numbers:
+        raise ExcelError(DIV0)
+    return sum(numbers) / len(numbers)
+
+
+# ---------------------------------------------------------------------------
+# Lookup
+# ---------------------------------------------------------------------------
+
+def _values_equal(a: Any, b: Any) -> bool:
+    if isinstance(a, str) and isinstance(b, str):
+        return a.lower() == b.lower()
+    if is_number(a) and is_number(b):
+        return a == b
+    return type(a) is type(b) and a == b
+
+
+def _approximate_index(values: List[Any], target: Any, descending: bool = False) -> int:
+    """Binary search for the last position <= target (or >= for descending)."""
+    key = _compare_key(target)
+    lo, hi, found = 0, len(values) - 1, -1
+    while lo <= hi:
+        mid = (lo + hi) // 2
+        value = values[mid]
+        if value is None:
+            hi = mid - 1
+            continue
+        mid_key = _compare_key(value)
+        if mid_key[0] != key[0]:
+            if mid_key[0] < key[0]:
+                lo = mid + 1
+            else:
+                hi = mid - 1
+            continue
+        ok = mid_key >= key if descending else mid_key <= key
+        if ok:
+            found = mid
+            lo = mid + 1
+        else:
+            hi = mid - 1
+    return found
+
+
+def _exact_index(values: List[Any], target: Any) -> int:
+    if isinstance(target, str) and any(ch in target for ch in "*?~"):
+        regex = _wildcard_regex(target)
+        for i, value in enumerate(values):
+            if isinstance(value, str) and regex.match(value):
+                return i
+        return -1
+    for i, value in enumerate(values):
+        if _values_equal(value, target):
+            return i
+    return -1
+
+
+@register("VLOOKUP")
+def _vlookup(lookup_value, table, col_index, approximate=True):
+    target = scalar(lookup_value)
+    grid = as_grid(table)
+    column = to_int(col_index)
+    if column < 1:
+        raise ExcelError(VALUE)
+    if column > grid.shape[1]:
+        raise ExcelError(REF)
+    keys = grid.column(0)
+    index = _approximate_index(keys, target) if to_bool(approximate) else _exact_index(keys, target)
+    if index < 0:
+        raise ExcelError(NA)
+    return grid.rows[index][column - 1]
+
+
+@register("HLOOKUP")
+def _hlookup(lookup_value, table, row_index, approximate=True):
+    target = scalar(lookup_value)
+    grid = as_grid(table)
+    row = to_int(row_index)
+    if row < 1:
+        raise ExcelError(VALUE)
+    if row > grid.shape[0]:
+        raise ExcelError(REF)
+    keys = grid.rows[0]
+    index = _approximate_index(keys, target) if to_bool(approximate) else _exact_index(keys, target)
+    if index < 0:
+        raise ExcelError(NA)
+    return grid.rows[row - 1][index]
+
+
+def _vector(value: Any) -> List[Any]:
+    grid = as_grid(value)
+    height, width = grid.shape
+    if height != 1 and width != 1:
+        raise ExcelError(NA)
+    return list(grid.flat())
+
+
+@register("MATCH")
+def _match(lookup_value, lookup_array, match_type=1):
+    target = scalar(lookup_value)
+    values = _vector(lookup_array)
+    mode = to_int(match_type)
+    if mode == 0:
+        index = _exact_index(values, target)
+    else:
+        index = _approximate_index(values, target, descending=mode < 0)
+    if index < 0:
+        raise ExcelError(NA)
+    return index + 1
+
+
+@register("INDEX")
+def _index(array, row_num=0, col_num=None):
+    grid = as_grid(array)
+    height, width = grid.shape
+    row = to_int(row_num)
+    col = to_int(col_num) if col_num is not None else None
+    if col is None:
+        # INDEX(vector, n) addresses a single row or column
+        if height == 1:
+            row, col = 1, row
+        else:
+            col = 1 if width == 1 else 0
+    if row < 0 or col < 0 or row > height or col > width:
+        raise ExcelError(REF)
+    if row == 0 and col == 0:
+        return grid
+    if row == 0:
+        return Grid([[r[col - 1]] for r in grid.rows])
+    if col == 0:
+        return Grid([list(grid.rows[row - 1])])
+    return grid.rows[row - 1][col - 1]
+
+
+@register("XLOOKUP")
+def _xlookup(lookup_value, lookup_array, return_array, if_not_found=None, match_mode=0, search_mode=1):
+    target = scalar(lookup_value)
+    keys_grid = as_grid(lookup_array)
+    values_grid = as_grid(return_array)
+    keys = list(keys_grid.flat())
+    vertical = keys_grid.shape[1] == 1
+    mode = to_int(match_mode)
+    search = to_int(search_mode)
+
+    order = range(len(keys)) if search >= 0 else range(len(keys) - 1, -1, -1)
+    index = -1
+    if mode == 2 or (mode == 0 and isinstance(target, str) and any(ch in target for ch in "*?")):
+        regex = _wildcard_regex(target if isinstance(target, str) else to_text(target))
+        index = next((i for i in order if isinstance(keys[i], str) and regex.match(keys[i])), -1)
+    else:
+        index = next((i for i in order if _values_equal(keys[i], target)), -1)
+        if index < 0 and mode in (-1, 1):
+            tkey = _compare_key(target)
+            best = None
+            for i in order:
+                if keys[i] is None:
+                    continue
+                k = _compare_key(keys[i])
+                if k[0] != tkey[0]:
+                    continue
+                if (mode == -1 and k < tkey and (best is None or k > best[0])) or \
+                   (mode == 1 and k > tkey and (best is None or k < best[0])):
+                    best = (k, i)
+            index = best[1] if best else -1
+
+    if index < 0:
+        if if_not_found is not None:
+            return if_not_found
+        raise ExcelError(NA)
+    if vertical:
+        if values_grid.shape[0] != len(keys):
+            raise ExcelError(VALUE)
+        row = values_grid.rows[index]
+        return row[0] if len(row) == 1 else Grid([list(row)])
+    if values_grid.shape[1] != len(keys):
+        raise ExcelError(VALUE)
+    column = values_grid.column(index)
+    return column[0] if len(column) == 1 else Grid([[v] for v in column])
+
+
+@register("ROWS")
+def _rows(array):
+    return as_grid(array).shape[0]
+
+
+@register("COLUMNS")
+def _columns(array):
+    return as_grid(array).shape[1]
+
+
+# ---------------------------------------------------------------------------
+# Information
+# ---------------------------------------------------------------------------
+
+@register_lazy("ISERROR")
+def _iserror(evaluate, args):
+    try:
+        value = evaluate(args[0])
+    except ExcelError:
+        return True
+    return broadcast(lambda v: isinstance(v, ExcelError), value)
+
+
+@register_lazy("ISNA")
+def _isna(evaluate, args):
+    try:
+        value = evaluate(args[0])
+    except ExcelError as error:
+        return error.code == NA
+    return broadcast(lambda v: isinstance(v, ExcelError) and v.code == NA, value)
+
+
+@register("ISBLANK")
+def _isblank(value):
+    return broadcast(lambda v: v is None, value)
+
+
+@register("ISNUMBER")
+def _isnumber(value):
+    return broadcast(is_number, value)
+
+
+@register("ISTEXT")
+def _istext(value):
+    return broadcast(lambda v: isinstance(v, str), value)
+
+
+@register("NA")
+def _na():
+    raise ExcelError(NA)
+
+
+# ---------------------------------------------------------------------------
+# Text
+# ---------------------------------------------------------------------------
+
+@register("CONCATENATE", "CONCAT")
+def _concat(*args):
+    parts = []
+    for arg in args:
+        if isinstance(arg, Grid):
+            parts.extend(to_text(v) for v in arg.flat())
+        else:
+            parts.append(to_text(arg))
+    return "".join(parts)
+
+
+@register("TEXTJOIN")
+def _textjoin(delimiter, ignore_empty, *args):
+    sep = to_text(delimiter)
+    skip = to_bool(ignore_empty)
+    parts = []
+    for arg in args:
+        values = arg.flat() if isinstance(arg, Grid) else [arg]
+        for value in values:
+            if isinstance(value, ExcelError):
+                raise value
+            text = to_text(value)
+            if text or not skip:
+                parts.append(text)
+    return sep.join(parts)
+
+
+@register("LEN")
+def _len(text):
+    return broadcast(lambda t: len(to_text(t)), text)
+
+
+@register("LEFT")
+def _left(text, count=1):
+    return broadcast(lambda t, n: to_text(t)[:max(to_int(n), 0)], text, count)
+
+
+@register("RIGHT")
+def _right(text, count=1):
+    def op(t, n):
+        n = to_int(n)
+        return to_text(t)[-n:] if n > 0 else ""
+    return broadcast(op, text, count)
+
+
+@register("MID")
+def _mid(text, start, count):
+    def op(t, s, n):
+        s, n = to_int(s), to_int(n)
+        if s < 1 or n < 0:
+            raise ExcelError(VALUE)
+        return to_text(t)[s - 1:s - 1 + n]
+    return broadcast(op, text, start, count)
+
+
+@register("UPPER")
+def _upper(text):
+    return broadcast(lambda t: to_text(t).upper(), text)
+
+
+@register("LOWER")
+def _lower(text):
+    return broadcast(lambda t: to_text(t).lower(), text)
+
+
+@register("PROPER")
+def _proper(text):
+    return broadcast(lambda t: to_text(t).title(), text)
+
+
+@register("TRIM")
+def _trim(text):
+    return broadcast(lambda t: re.sub(" +", " ", to_text(t).strip(" ")), text)
+
+
+@register("SUBSTITUTE")
+def _substitute(text, old, new, instance=None):
+    source, old_text, new_text = to_text(text), to_text(old), to_text(new)
+    if not old_text:
+        return source
+    if instance is None:
+        return source.replace(old_text, new_text)
+    nth = to_int(instance)
+    index = -1
+    for _ in range(nth):
+        index = source.find(old_text, index + 1)
+        if index < 0:
+            return source
+    return source[:index] + new_text + source[index + len(old_text):]
+
+
+@register("FIND")
+def _find(find_text, within_text, start=1):
+    index = to_text(within_text).find(to_text(find_text), to_int(start) - 1)
+    if index < 0:
+        raise ExcelError(VALUE)
+    return index + 1
+
+
+@register("SEARCH")
+def _search(find_text, within_text, start=1):
+    pattern = _wildcard_regex(to_text(find_text)).pattern[1:-1]
+    match = re.compile(pattern, re.IGNORECASE | re.DOTALL).search(to_text(within_text), to_int(start) - 1)
+    if not match:
+        raise ExcelError(VALUE)
+    return match.start() + 1
+
+
+@register("VALUE")
+def _value(text):
+    return broadcast(to_number, text)
+
+
+@register("TEXT")
+def _text(value, format_text):
+    number = to_number(value)
+    fmt = to_text(format_text)
+    if fmt.lower() in ("yyyy-mm-dd", "yyyy/mm/dd", "mm/dd/yyyy", "dd/mm/yyyy"):
+        day = serial_to_date(number)
+        pattern = fmt.lower().replace("yyyy", "%Y").replace("mm", "%m").replace("dd", "%d")
+        return day.strftime(pattern)
+    match = re.fullmatch(r"(#,##)?0(?:\.(0+))?(%?)", fmt)
+    if match:
+        decimals = len(match.group(2) or "")
+        if match.group(3):
+            number *= 100
+        text = f"{number:,.{decimals}f}" if match.group(1) else f"{number:.{decimals}f}"
+        return text + match.group(3)
+    return to_text(value)
+
+
+# ---------------------------------------------------------------------------
+# Dates
+# ---------------------------------------------------------------------------
+
+@register("DATE")
+def _date(year, month, day):
+    return _make_date(to_int(year), to_int(month), to_int(day))
+
+
+@register("YEAR")
+def _year(serial):
+    return broadcast(lambda s: serial_to_date(s).year, serial)
+
+
+@register("MONTH")
+def _month(serial):
+    return broadcast(lambda s: serial_to_date(s).month, serial)
+
+
+@register("DAY")
+def _day(serial):
+    return broadcast(lambda s: serial_to_date(s).day, serial)
+
+
+@register("WEEKDAY")
+def _weekday(serial, return_type=1):
+    kind = to_int(return_type)
+    iso = serial_to_date(serial).isoweekday()   # Monday=1 .. Sunday=7
+    if kind == 1:
+        return iso % 7 + 1
+    if kind == 2:
+        return iso
+    if kind == 3:
+        return iso - 1
+    raise ExcelError(NUM)
+
+
+@register("TODAY")
+def _today():
+    return date_to_serial(datetime.date.today())
+
+
+@register("NOW")
+def _now():
+    return datetime_to_serial(datetime.datetime.now())
+
+
+@register("EDATE")
+def _edate(start, months):
+    return date_to_serial(_add_months(start, to_int(months)))
+
+
+@register("EOMONTH")
+def _eomonth(start, months):
+    moved = _add_months(start, to_int(months))
+    last = calendar.monthrange(moved.year, moved.month)[1]
+    return date_to_serial(moved.replace(day=last))
+
+
+@register("DAYS")
+def _days(end, start):
+    return to_int(end) - to_int(start)
+
+
+@register("DATEDIF")
+def _datedif(start, end, unit):
+    first, last = serial_to_date(start), serial_to_date(end)
+    if first > last:
+        raise ExcelError(NUM)
+    unit = to_text(unit).upper()
+    months = (last.year - first.year) * 12 + last.month - first.month - (1 if last.day < first.day else 0)
+    if unit == "D":
+        return (last - first).days
+    if unit == "M":
+        return months
+    if unit == "Y":
+        return months // 12
+    if unit == "YM":
+        return months % 12
+    if unit == "MD":
+        return (last - _add_months(date_to_serial(first), months)).days
+    if unit == "YD":
+        anniversary = _add_months(date_to_serial(first), (months // 12) * 12)
+        return (last - anniversary).days
+    raise ExcelError(NUM)
+
+
+@register("NETWORKDAYS")
+def _networkdays(start, end, holidays=None):
+    first, last = serial_to_date(start), serial_to_date(end)
+    sign = 1
+    if first > last:
+        first, last, sign = last, first, -1
+    skip = set()
+    if holidays is not None:
+        skip = {serial_to_date(v) for v in as_grid(holidays).flat() if is_number(v)}
+    count = 0
+    day = first
+    while day <= last:
+        if day.weekday() < 5 and day not in skip:
+            count += 1
+        day += datetime.timedelta(days=1)
+    return sign * count
@@ -0,0 +1,193 @@
+"""
+Cell dependency graph for formula evaluation and precedent/dependent lookups.
+Reverse edges are indexed by (sheet, column) so a changed cell finds its
+direct dependents without scanning every formula in the workbook; the set of
+cells awaiting recalculation is indexed the same way.
+"""
+
+from collections import defaultdict, deque
+from typing import Dict, Iterable, Iterator, List, Set, Tuple
+
+from .parser import Ref
+
+CellKey = Tuple[str, int, int]
+
+# Ranges spanning more columns than this are kept in a per-sheet list instead
+# of being copied into every column bucket.
+WIDE_RANGE_COLUMNS = 64
+
+
+class DependencyGraph:
+    """Forward (precedents) and reverse (dependents) edges between cells."""
+
+    def __init__(self):
+        self._precedents: Dict[CellKey, List[Ref]] = {}
+        # (sheet, col) -> row -> formula cells referencing that single cell
+        self._points: Dict[Tuple[str, int], Dict[int, Set[CellKey]]] = defaultdict(lambda: defaultdict(set))
+        # (sheet, col) -> formula cell -> [(r1, r2)] for narrow ranges
+        self._columns: Dict[Tuple[str, int], Dict[CellKey, List[Tuple[int, int]]]] = defaultdict(dict)
+        # sheet -> formula cell -> [Ref] for wide ranges
+        self._wide: Dict[str, Dict[CellKey, List[Ref]]] = defaultdict(dict)
+
+    def __len__(self) -> int:
+        return len(self._precedents)
+
+    def __contains__(self, cell: CellKey) -> bool:
+        return cell in self._precedents
+
+    def cells(self) -> Iterable[CellKey]:
+        return self._precedents.keys()
+
+    def precedents(self, cell: CellKey) -> List[Ref]:
+        """Resolved references (sheet always set) used by a formula cell."""
+        return self._precedents.get(cell, [])
+
+    def set_precedents(self, cell: CellKey, refs: Iterable[Ref]) -> None:
+        """Replace the outgoing edges of a formula cell."""
+        self.remove(cell)
+        refs = list(refs)
+        self._precedents[cell] = refs
+        for ref in refs:
+            if ref.is_cell:
+                self._points[(ref.sheet, ref.c1)][ref.r1].add(cell)
+            elif ref.c2 - ref.c1 + 1 > WIDE_RANGE_COLUMNS:
+                self._wide[ref.sheet].setdefault(cell, []).append(ref)
+            else:
+                for col in range(ref.c1, ref.c2 + 1):
+                    self._columns[(ref.sheet, col)].setdefault(cell, []).append((ref.r1, ref.r2))
+
+    def remove(self, cell: CellKey) -> None:
+        """Drop a formula cell and its outgoing edges."""
+        refs = self._precedents.pop(cell, None)
+        if not refs:
+            return
+        for ref in refs:
+            if ref.is_cell:
+                rows = self._points.get((ref.sheet, ref.c1))
+                if rows and ref.r1 in rows:
+                    rows[ref.r1].discard(cell)
+                    if not rows[ref.r1]:
+                        del rows[ref.r1]
+            elif ref.c2 - ref.c1 + 1 > WIDE_RANGE_COLUMNS:
+                self._wide.get(ref.sheet, {}).pop(cell, None)
+            else:
+                for col in range(ref.c1, ref.c2 + 1):
+                    self._columns.get((ref.sheet, col), {}).pop(cell, None)
+
+    def clear_sheet(self, sheet: str) -> None:
+        """Remove every formula cell located on a sheet."""
+        for cell in [c for c in self._precedents if c[0] == sheet]:
+            self.remove(cell)
+
+    def dependents(self, sheet: str, r1: int, c1: int, r2: int = None, c2: int = None) -> Set[CellKey]:
+        """Formula cells that directly reference any cell in the given block."""
+        r2 = r1 if r2 is None else r2
+        c2 = c1 if c2 is None else c2
+        found: Set[CellKey] = set()
+        height = r2 - r1 + 1
+
+        for col in range(c1, c2 + 1):
+            rows = self._points.get((sheet, col))
+            if rows:
+                if height <= len(rows):
+                    for row in range(r1, r2 + 1):
+                        cells = rows.get(row)
+                        if cells:
+                            found.update(cells)
+                else:
+                    for row, cells in rows.items():
+                        if r1 <= row <= r2:
+                            found.update(cells)
+            bucket = self._columns.get((sheet, col))
+            if bucket:
+                for cell, spans in bucket.items():
+                    if cell not in found and any(lo <= r2 and r1 <= hi for lo, hi in spans):
+                        found.add(cell)
+
+        for cell, refs in self._wide.get(sheet, {}).items():
+            if cell not in found and any(
+                ref.r1 <= r2 and r1 <= ref.r2 and ref.c1 <= c2 and c1 <= ref.c2 for ref in refs
+            ):
+                found.add(cell)
+        return found
+
+    def transitive_dependents(self, sources: Iterable[Tuple[str, int, int, int, int]]) -> List[CellKey]:
+        """All formula cells downstream of the given blocks, in discovery order."""
+        seen: Set[CellKey] = set()
+        ordered: List[CellKey] = []
+        queue = deque()
+        for sheet, r1, c1, r2, c2 in sources:
+            for cell in self.dependents(sheet, r1, c1, r2, c2):
+                if cell not in seen:
+                    seen.add(cell)
+                    ordered.append(cell)
+                    queue.append(cell)
+        while queue:
+            sheet, row, col = queue.popleft()
+            for cell in self.dependents(sheet, row, col):
+                if cell not in seen:
+                    seen.add(cell)
+                    ordered.append(cell)
+                    queue.append(cell)
+        return ordered
+
+
+class DirtyCells:
+    """Formula cells awaiting recalculation, indexed by sheet and column so that
+    finding the dirty cells inside a range costs no more than the range itself."""
+
+    def __init__(self):
+        self._cells: Set[CellKey] = set()
+        # sheet -> col -> rows
+        self._columns: Dict[str, Dict[int, Set[int]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._cells)
+
+    def __contains__(self, cell: CellKey) -> bool:
+        return cell in self._cells
+
+    def __iter__(self) -> Iterator[CellKey]:
+        return iter(self._cells)
+
+    def add(self, cell: CellKey) -> None:
+        if cell not in self._cells:
+            self._cells.add(cell)
+            sheet, row, col = cell
+            self._columns.setdefault(sheet, {}).setdefault(col, set()).add(row)
+
+    def update(self, cells: Iterable[CellKey]) -> None:
+        for cell in cells:
+            self.add(cell)
+
+    def discard(self, cell: CellKey) -> None:
+        if cell in self._cells:
+            self._cells.discard(cell)
+            sheet, row, col = cell
+            columns = self._columns[sheet]
+            rows = columns[col]
+            rows.discard(row)
+            if not rows:
+                del columns[col]
+                if not columns:
+                    del self._columns[sheet]
+
+    def in_block(self, sheet: str, r1: int, c1: int, r2: int, c2: int) -> List[CellKey]:
+        """Dirty cells inside a block of one sheet."""
+        columns = self._columns.get(sheet)
+        if not columns:
+            return []
+        if c2 - c1 + 1 <= len(columns):
+            buckets = ((col, columns.get(col)) for col in range(c1, c2 + 1))
+        else:
+            buckets = ((col, rows) for col, rows in columns.items() if c1 <= col <= c2)
+        found = []
+        height = r2 - r1 + 1
+        for col, rows in buckets:
+            if not rows:
+                continue
+            if height <= len(rows):
+                found.extend((sheet, row, col) for row in range(r1, r2 + 1) if row in rows)
+            else:
+                found.extend((sheet, row, col) for row in rows if r1 <= row <= r2)
+        return found
@@ -0,0 +1,213 @@
+"""
+Formula dependency index for precedents/dependents queries.
+Built from bulk formula reads of each sheet's used range and kept current by
+re-reading only the blocks that tools write.
+"""
+
+import time
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from ..exceptions import FormulaParseError
+from .graph import CellKey, DependencyGraph
+from .parser import MAX_COLS, MAX_ROWS, Name, Ref, cell_address, column_letter, iter_references, parse, split_range
+
+
+def _quote_sheet(sheet: str) -> str:
+    if sheet.replace("_", "").replace(".", "").isalnum() and not sheet[0].isdigit():
+        return sheet
+    return "'" + sheet.replace("'", "''") + "'"
+
+
+def format_ref(ref: Ref) -> str:
+    """Render a resolved Ref as "Sheet!A1:B2" (whole rows/columns as "A:B" / "1:2")."""
+    if ref.r1 == 1 and ref.r2 == MAX_ROWS:
+        body = f"{column_letter(ref.c1)}:{column_letter(ref.c2)}"
+    elif ref.c1 == 1 and ref.c2 == MAX_COLS:
+        body = f"{ref.r1}:{ref.r2}"
+    elif ref.is_cell:
+        body = cell_address(ref.r1, ref.c1)
+    else:
+        body = f"{cell_address(ref.r1, ref.c1)}:{cell_address(ref.r2, ref.c2)}"
+    return f"{_quote_sheet(ref.sheet)}!{body}"
+
+
+def _rows_of(formulas: Any) -> List[List[Any]]:
+    """Normalize xlwings .formula results (str, 1D or 2D tuples) to a 2D list."""
+    if not isinstance(formulas, (list, tuple)):
+        return [[formulas]]
+    if formulas and not isinstance(formulas[0], (list, tuple)):
+        return [list(formulas)]
+    return [list(row) for row in formulas]
+
+
+class DependencyIndex:
+    """Precedent/dependent lookup over every formula in a workbook."""
+
+    def __init__(self, sheet_names: Iterable[str] = ()):
+        self.graph = DependencyGraph()
+        self.formulas: Dict[CellKey, str] = {}
+        self.names: Dict[CellKey, Tuple[str, ...]] = {}
+        self.unparsed: Set[CellKey] = set()
+        self._sheets: Dict[str, str] = {}
+        self._cells_by_sheet: Dict[str, Set[Tuple[int, int]]] = {}
+        self.built_at = time.time()
+        for name in sheet_names:
+            self.add_sheet(name)
+
+    def add_sheet(self, name: str) -> str:
+        canonical = self._sheets.setdefault(name.lower(), name)
+        self._cells_by_sheet.setdefault(canonical, set())
+        return canonical
+
+    def _sheet(self, name: Optional[str], default: str) -> str:
+        if name is None:
+            return default
+        return self._sheets.get(name.lower(), name)
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+
+    def set_formula(self, sheet: str, row: int, col: int, formula: Optional[str]) -> None:
+        """Index one cell; non-formula content removes it from the index."""
+        sheet = self.add_sheet(sheet)
+        key = (sheet, row, col)
+        if not isinstance(formula, str) or not formula.startswith("="):
+            if key in self.formulas:
+                del self.formulas[key]
+                self.names.pop(key, None)
+                self.unparsed.discard(key)
+                self._cells_by_sheet[sheet].discard((row, col))
+                self.graph.remove(key)
+            return
+
+        self.formulas[key] = formula
+        self._cells_by_sheet[sheet].add((row, col))
+        self.names.pop(key, None)
+        self.unparsed.discard(key)
+        try:
+            ast = parse(formula)
+        except FormulaParseError:
+            self.unparsed.add(key)
+            self.graph.set_precedents(key, [])
+            return
+        refs = []
+        names = []
+        for node in iter_references(ast):
+            if type(node) is Ref:
+                refs.append(node._replace(sheet=self._sheet(node.sheet, sheet)))
+            elif type(node) is Name:
+                names.append(node.name)
+        self.graph.set_precedents(key, refs)
+        if names:
+            self.names[key] = tuple(names)
+
+    def load_block(self, sheet: str, row: int, col: int, formulas: Any) -> int:
+        """Index a block read via Range.formula anchored at (row, col).
+
+        Returns the number of formula cells in the block.
+        """
+        count = 0
+        for r_offset, line in enumerate(_rows_of(formulas)):
+            for c_offset, formula in enumerate(line):
+                self.set_formula(sheet, row + r_offset, col + c_offset, formula)
+                if isinstance(formula, str) and formula.startswith("="):
+                    count += 1
+        return count
+
+    def drop_sheet(self, sheet: str) -> None:
+        sheet = self._sheet(sheet, sheet)
+        for row, col in list(self._cells_by_sheet.get(sheet, ())):
+            self.set_formula(sheet, row, col, None)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def _block(self, sheet: str, address: str) -> Ref:
+        ref_sheet, r1, c1, r2, c2 = split_range(address)
+        return Ref(self._sheet(ref_sheet, self._sheet(sheet, sheet)), r1, c1, r2, c2)
+
+    def _formula_cells_in(self, ref: Ref) -> List[CellKey]:
+        cells = self._cells_by_sheet.get(ref.sheet, ())
+        if ref.is_cell:
+            return [(ref.sheet, ref.r1, ref.c1)] if (ref.r1, ref.c1) in cells else []
+        return [
+            (ref.sheet, row, col) for row, col in cells
+            if ref.r1 <= row <= ref.r2 and ref.c1 <= col <= ref.c2
+        ]
+
+    def precedents(self, sheet: str, address: str, transitive: bool = False,
+                   limit: int = 1000) -> Dict[str, Any]:
+        """Ranges and names feeding the formula cells in an address."""
+        block = self._block(sheet, address)
+        start = self._formula_cells_in(block)
+        refs: Dict[str, int] = {}          # rendered range -> depth
+        names: Set[str] = set()
+        seen: Set[CellKey] = set(start)
+        queue = deque((cell, 1) for cell in start)
+        truncated = False
+        while queue:
+            cell, depth = queue.popleft()
+            names.update(self.names.get(cell, ()))
+            for ref in self.graph.precedents(cell):
+                text = format_ref(ref)
+                if text not in refs:
+                    if len(refs) >= limit:
+                        truncated = True
+                        break
+                    refs[text] = depth
+                if transitive:
+                    for upstream in self._formula_cells_in(ref):
+                        if upstream not in seen:
+                            seen.add(upstream)
+                            queue.append((upstream, depth + 1))
+        result = {
+            "precedents": [{"range": text, "depth": depth} for text, depth in refs.items()],
+            "names": sorted(names),
+            "formula_cells": len(start),
+        }
+        if len(start) == 1:
+            result["formula"] = self.formulas[start[0]]
+        if truncated:
+            result["truncated"] = True
+        return result
+
+    def dependents(self, sheet: str, address: str, transitive: bool = False,
+                   limit: int = 1000) -> Dict[str, Any]:
+        """Formula cells that read any cell in an address."""
+        block = self._block(sheet, address)
+        direct = self.graph.dependents(block.sheet, block.r1, block.c1, block.r2, block.c2)
+        found: Dict[CellKey, int] = {cell: 1 for cell in direct}
+        queue = deque((cell, 1) for cell in direct) if transitive else deque()
+        if transitive:
+            while queue and len(found) < limit:
+                (cell_sheet, row, col), depth = queue.popleft()
+                for cell in self.graph.dependents(cell_sheet, row, col):
+                    if cell not in found:
+                        found[cell] = depth + 1
+                        queue.append((cell, depth + 1))
+        ordered = sorted(found.items(), key=lambda item: (item[1], item[0]))
+        result = {
+            "dependents": [
+                {
+                    "cell": f"{_quote_sheet(cell[0])}!{cell_address(cell[1], cell[2])}",
+                    "formula": self.formulas.get(cell),
+                    "depth": depth,
+                }
+                for cell, depth in ordered[:limit]
+            ],
+            "count": len(found),
+        }
+        if len(found) > limit or queue:
+            result["truncated"] = True
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "formula_cells": len(self.formulas),
+            "unparsed_formulas": len(self.unparsed),
+            "sheets": len(self._cells_by_sheet),
+            "built_at": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.built_at)),
+        }
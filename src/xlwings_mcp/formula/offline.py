@@ -0,0 +1,108 @@
+"""
+Offline evaluation entry points used by the MCP tools.
+Evaluates formulas and reads recalculated cells from a workbook file without
+starting Excel; what-if overrides are applied temporarily and rolled back.
+"""
+
+import logging
+import os
+from typing import Any, Dict, List, Optional
+
+from ..exceptions import FormulaParseError
+from . import get_engine_for_file
+from .functions import ExcelError
+from .parser import split_cell
+
+logger = logging.getLogger(__name__)
+
+
+def _snapshot(engine, sheet: str, address: str) -> Any:
+    formula = engine.get_formula(sheet, address)
+    if formula is not None:
+        return formula
+    row, col = split_cell(address)
+    value = engine.values[engine.resolve_sheet(sheet)].get((row, col))
+    return value
+
+
+def evaluate_offline(
+    filepath: str,
+    sheet_name: str,
+    formulas: Optional[List[str]] = None,
+    cells: Optional[List[str]] = None,
+    overrides: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """Evaluate formulas and/or read recalculated cells from a workbook file.
+
+    Args:
+        filepath: Path to the .xlsx/.xlsm file
+        sheet_name: Sheet providing the context for unqualified references
+        formulas: Formulas to evaluate without storing them
+        cells: Cell addresses (optionally "Sheet!A1") whose current values to return
+        overrides: Temporary {address: value or "=formula"} edits applied on sheet_name
+
+    Returns:
+        Dict with formula results, cell values and recalculation info
+    """
+    if not formulas and not cells:
+        return {"error": "Provide formulas and/or cells to evaluate"}
+    if not os.path.exists(filepath):
+        return {"error": f"File not found: {filepath}"}
+
+    try:
+        engine = get_engine_for_file(filepath)
+    except ValueError as e:
+        return {"error": str(e)}
+    except Exception as e:
+        logger.error("Failed to load workbook for offline evaluation: %s", e)
+        return {"error": f"Failed to load workbook: {str(e)}"}
+
+    with engine.lock:
+        try:
+            sheet = engine.resolve_sheet(sheet_name)
+        except ExcelError:
+            return {"error": f"Sheet '{sheet_name}' not found. Available sheets: {', '.join(engine.sheet_names)}"}
+
+        originals: Dict[str, Any] = {}
+        recalculated: List[str] = []
+        try:
+            if overrides:
+                for address in overrides:
+                    originals[address] = _snapshot(engine, sheet, address)
+                recalculated = engine.set_cells(sheet, overrides)
+            else:
+                recalculated = engine.recalculate()
+
+            formula_results = []
+            for formula in formulas or []:
+                entry = {"formula": formula}
+                try:
+                    entry["value"] = engine.evaluate(formula, sheet)
+                except FormulaParseError as e:
+                    entry["error"] = str(e)
+                formula_results.append(entry)
+
+            cell_values = {}
+            for address in cells or []:
+                target_sheet, _, target_cell = address.rpartition("!")
+                target_sheet = target_sheet.strip("'").replace("''", "'") or sheet
+                try:
+                    cell_values[address] = engine.get_value(target_sheet, target_cell)
+                except (ExcelError, FormulaParseError) as e:
+                    cell_values[address] = f"Error: {e}"
+        except FormulaParseError as e:
+            return {"error": str(e)}
+        finally:
+            if originals:
+                engine.set_cells(sheet, originals)
+
+    result = {
+        "message": "Evaluated offline from file contents (no Excel instance used)",
+        "sheet": sheet,
+        "recalculated_cells": len(recalculated),
+    }
+    if formulas:
+        result["formulas"] = formula_results
+    if cells:
+        result["cells"] = cell_values
+    return result
@@ -0,0 +1,511 @@
+"""
+Excel formula tokenizer and parser for the offline formula engine.
+Builds a small AST from A1-style formulas and provides reference helpers
+shared by evaluation and dependency tracking.
+"""
+
+import re
+from typing import Any, Iterator, List, NamedTuple, Optional, Tuple
+
+from ..exceptions import FormulaParseError
+
+MAX_ROWS = 1048576
+MAX_COLS = 16384
+
+
+# ============================================================================
+# CELL ADDRESS HELPERS
+# ============================================================================
+
+def column_index(letters: str) -> int:
+    """Convert column letters to a 1-based index (e.g., "AB" -> 28)."""
+    index = 0
+    for ch in letters.upper():
+        index = index * 26 + (ord(ch) - ord('A') + 1)
+    return index
+
+
+def column_letter(index: int) -> str:
+    """Convert a 1-based column index to letters (e.g., 28 -> "AB")."""
+    result = ""
+    while index > 0:
+        index, remainder = divmod(index - 1, 26)
+        result = chr(ord('A') + remainder) + result
+    return result
+
+
+_CELL_RE = re.compile(r"^\$?([A-Za-z]{1,3})\$?(\d+)$")
+
+
+def split_cell(address: str) -> Tuple[int, int]:
+    """Split "A1" / "$A$1" into (row, col)."""
+    match = _CELL_RE.match(address.strip())
+    if not match:
+        raise FormulaParseError(f"Invalid cell address: '{address}'")
+    return int(match.group(2)), column_index(match.group(1))
+
+
+def cell_address(row: int, col: int) -> str:
+    """Build an A1 address from (row, col)."""
+    return f"{column_letter(col)}{row}"
+
+
+def split_range(address: str) -> Tuple[Optional[str], int, int, int, int]:
+    """Split "Sheet1!A1:B2" (sheet optional) into (sheet, r1, c1, r2, c2)."""
+    tokens = tokenize(address)
+    if len(tokens) != 1 or tokens[0].kind != REF:
+        raise FormulaParseError(f"Invalid range address: '{address}'")
+    ref = tokens[0].value.to_node()
+    return ref.sheet, ref.r1, ref.c1, ref.r2, ref.c2
+
+
+# ============================================================================
+# AST NODES
+# ============================================================================
+
+class Literal(NamedTuple):
+    value: Any
+
+
+class Ref(NamedTuple):
+    """Cell or rectangular range reference; whole rows/columns use sheet limits."""
+    sheet: Optional[str]
+    r1: int
+    c1: int
+    r2: int
+    c2: int
+
+    @property
+    def is_cell(self) -> bool:
+        return self.r1 == self.r2 and self.c1 == self.c2
+
+
+class Name(NamedTuple):
+    name: str
+
+
+class Call(NamedTuple):
+    name: str
+    args: Tuple[Any, ...]
+
+
+class Unary(NamedTuple):
+    op: str
+    operand: Any
+
+
+class Binary(NamedTuple):
+    op: str
+    left: Any
+    right: Any
+
+
+class Percent(NamedTuple):
+    operand: Any
+
+
+class ArrayLiteral(NamedTuple):
+    rows: Tuple[Tuple[Any, ...], ...]
+
+
+# ============================================================================
+# TOKENIZER
+# ============================================================================
+
+NUMBER, STRING, BOOL, ERROR, REF, NAME, OP, LPAREN, RPAREN, COMMA, SEMICOLON, LBRACE, RBRACE = (
+    "NUMBER", "STRING", "BOOL", "ERROR", "REF", "NAME", "OP",
+    "LPAREN", "RPAREN", "COMMA", "SEMICOLON", "LBRACE", "RBRACE"
+)
+
+ERROR_LITERALS = ("#NULL!", "#DIV/0!", "#VALUE!", "#REF!", "#NAME?", "#NUM!", "#N/A", "#GETTING_DATA")
+
+# Prefixes Excel writes into files for newer functions (e.g. _xlfn.XLOOKUP)
+_FUNCTION_PREFIXES = ("_XLFN._XLWS.", "_XLFN.", "_XLWS.")
+
+
+class RefParts(NamedTuple):
+    """Raw pieces of a reference token, kept so formulas can be re-rendered shifted."""
+    sheet_prefix: str                 # e.g. "'My Sheet'!" or ""
+    sheet: Optional[str]              # unquoted sheet name
+    start: Tuple[bool, Optional[int], bool, Optional[int]]   # (col_abs, col, row_abs, row)
+    end: Optional[Tuple[bool, Optional[int], bool, Optional[int]]]
+
+    def to_node(self) -> Ref:
+        _, c1, _, r1 = self.start
+        _, c2, _, r2 = self.end if self.end else self.start
+        if c1 is None:      # whole rows, e.g. 1:3
+            c1, c2 = 1, MAX_COLS
+        if r1 is None:      # whole columns, e.g. A:C
+            r1, r2 = 1, MAX_ROWS
+        return Ref(self.sheet, min(r1, r2), min(c1, c2), max(r1, r2), max(c1, c2))
+
+
+class Token(NamedTuple):
+    kind: str
+    value: Any
+    text: str
+
+
+_SHEET_PREFIX = r"(?:'(?:[^']|'')+'|[A-Za-z_À-￿][\w.À-￿]*)!"
+_CELL_PART = r"\$?[A-Za-z]{1,3}\$?\d+"
+_REF_RE = re.compile(
+    rf"(?P<sheet>{_SHEET_PREFIX})?"
+    rf"(?:(?P<cell1>{_CELL_PART})(?::(?P<cell2>{_CELL_PART}))?"
+    r"|(?P<col1>\$?[A-Za-z]{1,3}):(?P<col2>\$?[A-Za-z]{1,3})"
+    r"|(?P<row1>\$?\d+):(?P<row2>\$?\d+))"
+    r"(?![\w.(\[!])"
+)
+_NUMBER_RE = re.compile(r"(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?")
+_STRING_RE = re.compile(r'"(?:[^"]|"")*"')
+_NAME_RE = re.compile(r"[A-Za-z_\\À-￿][\w.À-￿]*")
+_OP_RE = re.compile(r"<>|<=|>=|[-+*/^&=<>%]")
+_CELL_PARTS_RE = re.compile(r"(\$?)([A-Za-z]{1,3})(\$?)(\d+)")
+
+_SINGLE_CHAR_TOKENS = {"(": LPAREN, ")": RPAREN, ",": COMMA, ";": SEMICOLON, "{": LBRACE, "}": RBRACE}
+
+
+def _parse_cell_part(text: str) -> Tuple[bool, int, bool, int]:
+    match = _CELL_PARTS_RE.fullmatch(text)
+    return bool(match.group(1)), column_index(match.group(2)), bool(match.group(3)), int(match.group(4))
+
+
+def _ref_parts(match: "re.Match") -> RefParts:
+    prefix = match.group("sheet") or ""
+    sheet = None
+    if prefix:
+        sheet = prefix[:-1]
+        if sheet.startswith("'"):
+            sheet = sheet[1:-1].replace("''", "'")
+
+    if match.group("cell1"):
+        start = _parse_cell_part(match.group("cell1"))
+        end = _parse_cell_part(match.group("cell2")) if match.group("cell2") else None
+    elif match.group("col1"):
+        c1, c2 = match.group("col1"), match.group("col2")
+        start = (c1.startswith("$"), column_index(c1.lstrip("$")), False, None)
+        end = (c2.startswith("$"), column_index(c2.lstrip("$")), False, None)
+    else:
+        r1, r2 = match.group("row1"), match.group("row2")
+        start = (False, None, r1.startswith("$"), int(r1.lstrip("$")))
+        end = (False, None, r2.startswith("$"), int(r2.lstrip("$")))
+    return RefParts(prefix, sheet, start, end)
+
+
+def tokenize(formula: str) -> List[Token]:
+    """Split a formula (with or without leading '=') into tokens."""
+    text = formula[1:] if formula.startswith("=") else formula
+    tokens: List[Token] = []
+    pos = 0
+    length = len(text)
+
+    while pos < length:
+        ch = text[pos]
+
+        if ch.isspace():
+            pos += 1
+            continue
+
+        if ch == '"':
+            match = _STRING_RE.match(text, pos)
+            if not match:
+                raise FormulaParseError("Unterminated string literal")
+            tokens.append(Token(STRING, match.group()[1:-1].replace('""', '"'), match.group()))
+            pos = match.end()
+            continue
+
+        if ch == "#":
+            upper = text[pos:pos + 14].upper()
+            for literal in ERROR_LITERALS:
+                if upper.startswith(literal):
+                    tokens.append(Token(ERROR, literal, text[pos:pos + len(literal)]))
+                    pos += len(literal)
+                    break
+            else:
+                raise FormulaParseError(f"Unknown error literal at position {pos}")
+            continue
+
+        if ch in _SINGLE_CHAR_TOKENS:
+            tokens.append(Token(_SINGLE_CHAR_TOKENS[ch], ch, ch))
+            pos += 1
+            continue
+
+        match = _REF_RE.match(text, pos)
+        if match:
+            tokens.append(Token(REF, _ref_parts(match), match.group()))
+            pos = match.end()
+            continue
+
+        match = _NUMBER_RE.match(text, pos)
+        if match:
+            raw = match.group()
+            number = float(raw)
+            tokens.append(Token(NUMBER, int(number) if number.is_integer() and "e" not in raw.lower() and "." not in raw else number, raw))
+            pos = match.end()
+            continue
+
+        match = _NAME_RE.match(text, pos)
+        if match:
+            raw = match.group()
+            end = match.end()
+            if end < length and text[end] == "[":
+                raise FormulaParseError(f"Structured table references are not supported: '{raw}['")
+            upper = raw.upper()
+            next_char = text[end:end + 1]
+            if upper in ("TRUE", "FALSE") and next_char != "(":
+                tokens.append(Token(BOOL, upper == "TRUE", raw))
+            else:
+                tokens.append(Token(NAME, upper, raw))
+            pos = end
+            continue
+
+        match = _OP_RE.match(text, pos)
+        if match:
+            tokens.append(Token(OP, match.group(), match.group()))
+            pos = match.end()
+            continue
+
+        raise FormulaParseError(f"Unexpected character '{ch}' at position {pos}")
+
+    return tokens
+
+
+# ============================================================================
+# PARSER
+# ============================================================================
+
+_COMPARISON_OPS = ("=", "<>", "<", ">", "<=", ">=")
+
+
+class _Parser:
+    """Recursive-descent parser following Excel operator precedence."""
+
+    def __init__(self, tokens: List[Token]):
+        self.tokens = tokens
+        self.pos = 0
+
+    def peek(self) -> Optional[Token]:
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def advance(self) -> Token:
+        token = self.tokens[self.pos]
+        self.pos += 1
+        return token
+
+    def expect(self, kind: str) -> Token:
+        token = self.peek()
+        if token is None or token.kind != kind:
+            found = token.text if token else "end of formula"
+            raise FormulaParseError(f"Expected {kind}, found {found}")
+        return self.advance()
+
+    def at_op(self, *ops: str) -> bool:
+        token = self.peek()
+        return token is not None and token.kind == OP and token.value in ops
+
+    def parse(self) -> Any:
+        if not self.tokens:
+            raise FormulaParseError("Formula is empty")
+        node = self.comparison()
+        if self.peek() is not None:
+            raise FormulaParseError(f"Unexpected token '{self.peek().text}'")
+        return node
+
+    def comparison(self) -> Any:
+        node = self.concat()
+        while self.at_op(*_COMPARISON_OPS):
+            op = self.advance().value
+            node = Binary(op, node, self.concat())
+        return node
+
+    def concat(self) -> Any:
+        node = self.additive()
+        while self.at_op("&"):
+            self.advance()
+            node = Binary("&", node, self.additive())
+        return node
+
+    def additive(self) -> Any:
+        node = self.multiplicative()
+        while self.at_op("+", "-"):
+            op = self.advance().value
+            node = Binary(op, node, self.multiplicative())
+        return node
+
+    def multiplicative(self) -> Any:
+        node = self.power()
+        while self.at_op("*", "/"):
+            op = self.advance().value
+            node = Binary(op, node, self.power())
+        return node
+
+    def power(self) -> Any:
+        node = self.unary()
+        while self.at_op("^"):
+            self.advance()
+            node = Binary("^", node, self.unary())
+        return node
+
+    def unary(self) -> Any:
+        # Excel binds unary minus tighter than ^ (=-2^2 is 4)
+        if self.at_op("+", "-"):
+            op = self.advance().value
+            operand = self.unary()
+            return operand if op == "+" else Unary("-", operand)
+        return self.postfix()
+
+    def postfix(self) -> Any:
+        node = self.primary()
+        while self.at_op("%"):
+            self.advance()
+            node = Percent(node)
+        return node
+
+    def primary(self) -> Any:
+        token = self.peek()
+        if token is None:
+            raise FormulaParseError("Unexpected end of formula")
+
+        if token.kind in (NUMBER, STRING, BOOL):
+            self.advance()
+            return Literal(token.value)
+        if token.kind == ERROR:
+            self.advance()
+            from .functions import ExcelError
+            return Literal(ExcelError(token.value))
+        if token.kind == REF:
+            self.advance()
+            return token.value.to_node()
+        if token.kind == LPAREN:
+            self.advance()
+            node = self.comparison()
+            self.expect(RPAREN)
+            return node
+        if token.kind == LBRACE:
+            return self.array()
+        if token.kind == NAME:
+            self.advance()
+            nxt = self.peek()
+            if nxt is not None and nxt.kind == LPAREN:
+                return self.call(token.value)
+            return Name(token.value)
+
+        raise FormulaParseError(f"Unexpected token '{token.text}'")
+
+    def call(self, name: str) -> Call:
+        for prefix in _FUNCTION_PREFIXES:
+            if name.startswith(prefix):
+                name = name[len(prefix):]
+                break
+        self.expect(LPAREN)
+        args: List[Any] = []
+        if self.peek() is not None and self.peek().kind == RPAREN:
+            self.advance()
+            return Call(name, ())
+        while True:
+            token = self.peek()
+            if token is not None and token.kind in (COMMA, RPAREN):
+                args.append(Literal(None))     # omitted argument
+            else:
+                args.append(self.comparison())
+            token = self.peek()
+            if token is not None and token.kind == COMMA:
+                self.advance()
+                continue
+            self.expect(RPAREN)
+            return Call(name, tuple(args))
+
+    def array(self) -> ArrayLiteral:
+        self.expect(LBRACE)
+        rows: List[Tuple[Any, ...]] = []
+        row: List[Any] = []
+        while True:
+            negative = False
+            if self.at_op("-"):
+                self.advance()
+                negative = True
+            token = self.advance() if self.peek() is not None else None
+            if token is None or token.kind not in (NUMBER, STRING, BOOL, ERROR):
+                raise FormulaParseError("Array constants may only contain literal values")
+            value = token.value
+            if token.kind == ERROR:
+                from .functions import ExcelError
+                value = ExcelError(value)
+            row.append(-value if negative else value)
+            sep = self.advance() if self.peek() is not None else None
+            if sep is None:
+                raise FormulaParseError("Unterminated array constant")
+            if sep.kind == COMMA:
+                continue
+            rows.append(tuple(row))
+            row = []
+            if sep.kind == SEMICOLON:
+                continue
+            if sep.kind == RBRACE:
+                break
+            raise FormulaParseError(f"Unexpected token '{sep.text}' in array constant")
+        if len({len(r) for r in rows}) != 1:
+            raise FormulaParseError("Array constant rows must have the same length")
+        return ArrayLiteral(tuple(rows))
+
+
+def parse(formula: str) -> Any:
+    """Parse a formula (leading '=' optional) into an AST."""
+    return _Parser(tokenize(formula)).parse()
+
+
+def iter_references(node: Any) -> Iterator[Any]:
+    """Yield every Ref and Name node contained in an AST."""
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        kind = type(current)
+        if kind is Ref or kind is Name:
+            yield current
+        elif kind is Call:
+            stack.extend(current.args)
+        elif kind is Binary:
+            stack.append(current.left)
+            stack.append(current.right)
+        elif kind is Unary or kind is Percent:
+            stack.append(current.operand)
+
+
+def _render_ref_part(part: Tuple[bool, Optional[int], bool, Optional[int]], drow: int, dcol: int) -> str:
+    col_abs, col, row_abs, row = part
+    text = ""
+    if col is not None:
+        col = col if col_abs else col + dcol
+        if col < 1 or col > MAX_COLS:
+            raise FormulaParseError("Shifted reference falls outside the sheet")
+        text += ("$" if col_abs else "") + column_letter(col)
+    if row is not None:
+        row = row if row_abs else row + drow
+        if row < 1 or row > MAX_ROWS:
+            raise FormulaParseError("Shifted reference falls outside the sheet")
+        text += ("$" if row_abs else "") + str(row)
+    return text
+
+
+def shift_formula(formula: str, drow: int, dcol: int) -> str:
+    """Re-render a formula with relative references moved by (drow, dcol).
+
+    Used to expand shared formulas stored once per block in .xlsx files.
+    """
+    has_equals = formula.startswith("=")
+    out = []
+    for token in tokenize(formula):
+        if token.kind == REF:
+            parts: RefParts = token.value
+            text = parts.sheet_prefix + _render_ref_part(parts.start, drow, dcol)
+            if parts.end is not None:
+                text += ":" + _render_ref_part(parts.end, drow, dcol)
+            out.append(text)
+        elif token.kind == STRING:
+            out.append(token.text)
+        elif token.kind == NAME:
+            out.append(token.text)
+        else:
+            out.append(token.text)
+        # Keep word-like tokens apart (e.g. "A1 B1" intersections are not supported anyway)
+    rendered = "".join(out)
+    return ("=" + rendered) if has_equals else rendered
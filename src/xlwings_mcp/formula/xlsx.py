@@ -0,0 +1,150 @@
+"""
+Minimal .xlsx/.xlsm reader feeding the offline formula engine.
+Reads cell values, formulas (including shared formulas), cached results and
+defined names straight from the package XML using only the standard library.
+"""
+
+import logging
+import posixpath
+import zipfile
+import xml.etree.ElementTree as ET
+from typing import Dict, List, Optional, Tuple
+
+from ..exceptions import FormulaParseError
+from .engine import FormulaEngine
+from .functions import ExcelError
+from .parser import shift_formula, split_cell
+
+logger = logging.getLogger(__name__)
+
+_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_REL_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+_PKG_REL_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+SUPPORTED_EXTENSIONS = (".xlsx", ".xlsm")
+
+
+def _text_of(element: Optional[ET.Element]) -> str:
+    """Concatenate all <t> runs below an element (rich text aware)."""
+    if element is None:
+        return ""
+    return "".join(t.text or "" for t in element.iter(f"{_NS}t"))
+
+
+def _read_shared_strings(archive: zipfile.ZipFile) -> List[str]:
+    try:
+        data = archive.open("xl/sharedStrings.xml")
+    except KeyError:
+        return []
+    strings = []
+    with data:
+        for _, element in ET.iterparse(data):
+            if element.tag == f"{_NS}si":
+                strings.append(_text_of(element))
+                element.clear()
+    return strings
+
+
+def _read_sheet_targets(archive: zipfile.ZipFile) -> Tuple[List[Tuple[str, str]], List[Tuple[str, str]]]:
+    """Return [(sheet name, part path)] in workbook order and global defined names."""
+    workbook = ET.fromstring(archive.read("xl/workbook.xml"))
+    rels = ET.fromstring(archive.read("xl/_rels/workbook.xml.rels"))
+    targets = {}
+    for rel in rels.iter(f"{_PKG_REL_NS}Relationship"):
+        target = rel.get("Target", "")
+        if target.startswith("/"):
+            path = target.lstrip("/")
+        else:
+            path = posixpath.normpath(posixpath.join("xl", target))
+        targets[rel.get("Id")] = path
+
+    sheets = []
+    for sheet in workbook.iter(f"{_NS}sheet"):
+        path = targets.get(sheet.get(f"{_REL_NS}id"))
+        if path and path in archive.namelist():
+            sheets.append((sheet.get("name"), path))
+
+    names = []
+    for defined in workbook.iter(f"{_NS}definedName"):
+        name = defined.get("name", "")
+        # Built-in (_xlnm.*) and sheet-scoped names are not needed for evaluation
+        if name.startswith("_xlnm.") or defined.get("localSheetId") is not None:
+            continue
+        if defined.text:
+            names.append((name, defined.text))
+    return sheets, names
+
+
+def _cell_value(cell: ET.Element, shared_strings: List[str]):
+    kind = cell.get("t", "n")
+    if kind == "inlineStr":
+        return _text_of(cell.find(f"{_NS}is"))
+    raw = cell.findtext(f"{_NS}v")
+    if raw is None:
+        return None
+    if kind == "s":
+        index = int(raw)
+        return shared_strings[index] if index < len(shared_strings) else None
+    if kind == "b":
+        return raw == "1"
+    if kind == "e":
+        return ExcelError(raw)
+    if kind == "str":
+        return raw
+    number = float(raw)
+    return int(number) if number.is_integer() and "." not in raw and "E" not in raw.upper() else number
+
+
+def _load_sheet(archive: zipfile.ZipFile, path: str, sheet: str,
+                engine: FormulaEngine, shared_strings: List[str]) -> None:
+    shared: Dict[str, Tuple[str, int, int]] = {}   # si -> (formula, row, col)
+    with archive.open(path) as data:
+        for _, element in ET.iterparse(data):
+            if element.tag != f"{_NS}c":
+                if element.tag == f"{_NS}row":
+                    element.clear()
+                continue
+            address = element.get("r")
+            if not address:
+                continue
+            row, col = split_cell(address)
+            value = _cell_value(element, shared_strings)
+            formula_el = element.find(f"{_NS}f")
+            formula = None
+            if formula_el is not None:
+                formula = formula_el.text
+                if formula_el.get("t") == "shared":
+                    si = formula_el.get("si")
+                    if formula:
+                        shared[si] = (formula, row, col)
+                    elif si in shared:
+                        base, base_row, base_col = shared[si]
+                        try:
+                            formula = shift_formula(base, row - base_row, col - base_col)
+                        except FormulaParseError:
+                            formula = None
+            if formula:
+                engine.load_formula(sheet, row, col, formula, cached=value)
+            elif value is not None:
+                engine.load_value(sheet, row, col, value)
+
+
+def load_workbook(path: str) -> FormulaEngine:
+    """Build a FormulaEngine from an .xlsx/.xlsm file on disk."""
+    engine = FormulaEngine()
+    with zipfile.ZipFile(path) as archive:
+        shared_strings = _read_shared_strings(archive)
+        sheets, names = _read_sheet_targets(archive)
+        for name, _ in sheets:
+            engine.add_sheet(name)
+        for name, definition in names:
+            try:
+                engine.define_name(name, definition)
+            except FormulaParseError as e:
+                logger.debug("Skipping defined name %s: %s", name, e)
+        for name, part in sheets:
+            _load_sheet(archive, part, name, engine, shared_strings)
+    logger.info(
+        "Loaded %s sheet(s) and %s formula(s) from %s for offline evaluation", len(sheets), len(engine.formulas), path
+    )
+    return engine
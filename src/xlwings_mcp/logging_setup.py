@@ -0,0 +1,152 @@
+"""
+Queue-based logging for the Excel MCP Server.
+Tool threads only enqueue log records; a background listener thread formats
+them and writes the rotating log file, so rotation and disk flushes never run
+inside a tool call. Per-call records (tool, session, duration, cells) go to the
+"xlwings_mcp.calls" logger as %-style messages with the fields also attached to
+the record, for handlers that want them structured.
+"""
+
+import atexit
+import logging
+import os
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Optional
+
+LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+QUEUE_SIZE = int(os.getenv("EXCEL_MCP_LOG_QUEUE_SIZE", "10000"))
+CALL_LOG_ENABLED = os.getenv("EXCEL_MCP_CALL_LOG", "1").lower() in ("1", "true", "yes")
+
+# Argument types that are safe to format later on the listener thread
+_DEFERRABLE = (str, int, float, bool, type(None))
+
+call_logger = logging.getLogger("xlwings_mcp.calls")
+
+_listener: Optional[QueueListener] = None
+_lock = threading.Lock()
+
+
+class DeferredQueueHandler(QueueHandler):
+    """QueueHandler that leaves formatting to the listener and never blocks the caller.
+
+    The stock handler formats every record before enqueueing it. Here records whose
+    arguments are immutable scalars are enqueued as-is; anything else (exceptions,
+    COM objects, containers that may change) is rendered now so the log shows the
+    value at call time. When the queue is full, INFO and DEBUG records are dropped
+    and counted; WARNING and above are written synchronously through the fallback
+    handler (or wait for room without one), so errors are never lost under load.
+    """
+
+    def __init__(self, log_queue: "queue.Queue", fallback: Optional[logging.Handler] = None):
+        super().__init__(log_queue)
+        self.fallback = fallback
+        self.dropped = 0
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        # The queue is thread-safe, so skip the per-handler lock Handler.handle takes
+        rv = self.filter(record)
+        if rv:
+            self.enqueue(self.prepare(record))
+        return rv
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        args = record.args
+        if args and not (isinstance(args, tuple) and all(isinstance(a, _DEFERRABLE) for a in args)):
+            record.msg = record.getMessage()
+            record.args = None
+        if record.exc_info:
+            # Tracebacks hold frames; render them on the calling thread
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            if record.levelno < logging.WARNING:
+                self.dropped += 1
+            elif self.fallback is not None:
+                # The file handler locks itself, so this is safe next to the listener thread
+                self.fallback.handle(record)
+            else:
+                self.queue.put(record)
+
+
+class _BlockingStopListener(QueueListener):
+    """Waits for room for the stop sentinel instead of failing on a full queue."""
+
+    def enqueue_sentinel(self) -> None:
+        self.queue.put(self._sentinel)
+
+
+def configure_logging(log_file: str, level: Optional[int] = None) -> QueueListener:
+    """Route the root logger through a bounded queue to a rotating file writer thread.
+
+    Args:
+        log_file: Path of the rotating log file
+        level: Root level (default: DEBUG if EXCEL_MCP_DEBUG_LOG is set, else INFO)
+
+    Returns:
+        The running QueueListener (stopped and flushed at interpreter exit)
+    """
+    global _listener
+    with _lock:
+        if _listener is not None:
+            return _listener
+        if level is None:
+            debug = os.getenv("EXCEL_MCP_DEBUG_LOG", "0").lower() in ("1", "true", "yes")
+            level = logging.DEBUG if debug else logging.INFO
+
+        # LOG_FORMAT uses none of the caller location or process fields, so skip collecting
+        # them for every record (see "Optimization" in the logging HOWTO)
+        logging._srcfile = None
+        logging.logProcesses = False
+        logging.logMultiprocessing = False
+
+        # The stdio transport owns stdout, so the only sink is the log file.
+        # 5MB max, keep 3 backup files.
+        file_handler = RotatingFileHandler(log_file, maxBytes=5*1024*1024, backupCount=3, encoding="utf-8")
+        file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+
+        log_queue: "queue.Queue" = queue.Queue(maxsize=QUEUE_SIZE)
+        handler = DeferredQueueHandler(log_queue, fallback=file_handler)
+
+        root = logging.getLogger()
+        for existing in list(root.handlers):
+            root.removeHandler(existing)
+        root.addHandler(handler)
+        root.setLevel(level)
+
+        _listener = _BlockingStopListener(log_queue, file_handler, respect_handler_level=True)
+        _listener.start()
+        atexit.register(stop_logging)
+        return _listener
+
+
+def stop_logging() -> None:
+    """Drain the queue and stop the writer thread."""
+    global _listener
+    with _lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+
+
+def dropped_records() -> int:
+    """INFO/DEBUG records discarded because the queue was full."""
+    return sum(getattr(h, "dropped", 0) for h in logging.getLogger().handlers)
+
+
+def log_tool_call(tool: str, session_id: Optional[str], duration_ms: float, cells: int, failed: bool) -> None:
+    """Emit one structured per-call record; costs one level check when disabled."""
+    if not CALL_LOG_ENABLED or not call_logger.isEnabledFor(logging.INFO):
+        return
+    status = "error" if failed else "ok"
+    call_logger.info(
+        "tool=%s session=%s duration_ms=%.1f cells=%d status=%s",
+        tool, session_id or "-", duration_ms, cells, status,
+        extra={"tool": tool, "session": session_id, "duration_ms": duration_ms, "cells": cells, "status": status},
+    )
@@ -0,0 +1,419 @@
+"""
+Runtime metrics for the Excel MCP Server.
+Records per-tool wall time, session lock wait, time inside COM (*_with_wb
+calls), time in Workbook.save(), response size and cell counts. Each thread
+writes to its own histograms, so recording never takes a lock; snapshots
+merge the per-thread stores.
+"""
+
+import bisect
+import functools
+import importlib.abc
+import importlib.machinery
+import inspect
+import sys
+import threading
+import logging
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from . import tracing
+from .logging_setup import dropped_records, log_tool_call
+
+logger = logging.getLogger(__name__)
+
+# Upper bucket bounds per unit; a final +Inf bucket is implied
+MS_BUCKETS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000)
+BYTES_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+CELLS_BUCKETS = (1, 10, 100, 1000, 10000, 100000, 1000000)
+CALLS_BUCKETS = (1, 2, 5, 10, 25, 50, 100, 250, 1000, 10000)
+
+HISTOGRAMS = {
+    "tool_duration_ms": ("Wall time of a tool call", MS_BUCKETS),
+    "tool_lock_wait_ms": ("Time a tool call waited for its session lock", MS_BUCKETS),
+    "tool_com_ms": ("Time a tool call spent in *_with_wb Excel calls", MS_BUCKETS),
+    "tool_save_ms": ("Time a tool call spent in Workbook.save()", MS_BUCKETS),
+    "tool_response_bytes": ("Size of a tool response", BYTES_BUCKETS),
+    "tool_cells": ("Cells read or written by a tool call", CELLS_BUCKETS),
+    "tool_com_calls": ("Traced object-model operations per tool call (EXCEL_MCP_TRACE_COM=1)", CALLS_BUCKETS),
+    "session_open_wait_ms": ("Time open_workbook waited for session capacity", MS_BUCKETS),
+}
+COUNTERS = {
+    "tool_calls_total": "Tool calls",
+    "tool_errors_total": "Tool calls that raised or returned an error",
+    "com_calls_total": "Top-level *_with_wb calls",
+    "saves_total": "Workbook.save() calls",
+    "sessions_evicted_total": "Sessions closed to make room for new ones",
+    "session_busy_total": "Tool calls rejected because their session's queue was full",
+}
+
+# Label used for work outside a tool call (cleanup thread, startup)
+BACKGROUND = "(background)"
+
+
+class Histogram:
+    """Fixed-bucket histogram; only ever written by its owning thread."""
+
+    __slots__ = ("bounds", "counts", "total", "count", "max")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.total = 0.0
+        self.count = 0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.total += value
+        self.count += 1
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other: "Histogram") -> None:
+        for i, n in enumerate(other.counts):
+            self.counts[i] += n
+        self.total += other.total
+        self.count += other.count
+        self.max = max(self.max, other.max)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Bucket upper bound holding the q-quantile (max for the +Inf bucket)."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank and n:
+                return round(min(self.bounds[i], self.max) if i < len(self.bounds) else self.max, 2)
+        return round(self.max, 2)
+
+
+class _CallContext:
+    """Accumulators for the tool call running on the current thread."""
+
+    __slots__ = ("tool", "lock_ms", "com_ms", "save_ms", "cells", "com_depth", "trace")
+
+    def __init__(self, tool: str):
+        self.tool = tool
+        self.lock_ms = 0.0
+        self.com_ms = 0.0
+        self.save_ms = 0.0
+        self.cells = 0
+        self.com_depth = 0
+        self.trace = tracing.ComTracer(tool) if tracing.TRACING_ENABLED else None
+
+
+class Metrics:
+    """Process-wide metrics registry backed by per-thread stores."""
+
+    def __init__(self):
+        self._local = threading.local()
+        self._stores: List[Dict[Tuple[str, str], Any]] = []
+        self._register_lock = threading.Lock()     # taken once per thread, never while recording
+        self.last_traces: Dict[str, Dict[str, Any]] = {}
+        self.started_at = time.time()
+
+    # ------------------------------------------------------------------
+    # Recording
+    # ------------------------------------------------------------------
+
+    def _store(self) -> Dict[Tuple[str, str], Any]:
+        store = getattr(self._local, "store", None)
+        if store is None:
+            store = self._local.store = {}
+            with self._register_lock:
+                self._stores.append(store)
+        return store
+
+    def _context(self) -> Optional[_CallContext]:
+        return getattr(self._local, "context", None)
+
+    def current_tool(self) -> str:
+        context = self._context()
+        return context.tool if context else BACKGROUND
+
+    def observe(self, name: str, value: float, tool: Optional[str] = None) -> None:
+        key = (name, tool or self.current_tool())
+        store = self._store()
+        histogram = store.get(key)
+        if histogram is None:
+            histogram = store[key] = Histogram(HISTOGRAMS[name][1])
+        histogram.observe(value)
+
+    def inc(self, name: str, amount: int = 1, tool: Optional[str] = None) -> None:
+        key = (name, tool or self.current_tool())
+        store = self._store()
+        store[key] = store.get(key, 0) + amount
+
+    def add_lock_wait(self, ms: float) -> None:
+        context = self._context()
+        if context:
+            context.lock_ms += ms
+        else:
+            self.observe("tool_lock_wait_ms", ms)
+
+    def add_cells(self, count: int) -> None:
+        """Count cells read or written by the current tool call."""
+        context = self._context()
+        if context:
+            context.cells += count
+
+    # ------------------------------------------------------------------
+    # Instrumentation
+    # ------------------------------------------------------------------
+
+    def instrument_tool(self, fn: Callable) -> Callable:
+        """Wrap an MCP tool function to record its per-call metrics."""
+        tool = fn.__name__
+        params = list(inspect.signature(fn).parameters)
+        session_pos = params.index("session_id") if "session_id" in params else None
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            outer = self._context()
+            context = self._local.context = _CallContext(tool)
+            started = time.perf_counter()
+            failed = True
+            result = None
+            try:
+                result = fn(*args, **kwargs)
+                failed = isinstance(result, str) and result.startswith(("Error", "SESSION_", "FILE_", "SHEET_", "INVALID_", "PARAMETER_"))
+                return result
+            finally:
+                self._local.context = outer
+                duration_ms = (time.perf_counter() - started) * 1000
+                self.observe("tool_duration_ms", duration_ms, tool)
+                self.observe("tool_lock_wait_ms", context.lock_ms, tool)
+                self.observe("tool_com_ms", context.com_ms, tool)
+                if context.save_ms:
+                    self.observe("tool_save_ms", context.save_ms, tool)
+                if context.cells:
+                    self.observe("tool_cells", context.cells, tool)
+                if isinstance(result, str):
+                    self.observe("tool_response_bytes", len(result.encode("utf-8", "replace")), tool)
+                self.inc("tool_calls_total", 1, tool)
+                if failed:
+                    self.inc("tool_errors_total", 1, tool)
+                if context.trace is not None:
+                    self._finish_trace(context.trace)
+                session_id = kwargs.get("session_id")
+                if session_id is None and session_pos is not None and session_pos < len(args):
+                    session_id = args[session_pos]
+                log_tool_call(tool, session_id, duration_ms, context.cells, failed)
+
+        return wrapper
+
+    def _finish_trace(self, trace: "tracing.ComTracer") -> None:
+        summary = trace.summary()
+        self.observe("tool_com_calls", summary["calls"], trace.label)
+        self.last_traces[trace.label] = summary
+        logger.debug("COM trace %s: %s calls, %sms, top=%s", trace.label, summary['calls'], summary['ms'], summary['top'])
+        if tracing.FOLDED_PATH:
+            try:
+                trace.dump_folded(tracing.FOLDED_PATH)
+            except OSError as e:
+                logger.warning("Could not write COM trace to %s: %s", tracing.FOLDED_PATH, e)
+
+    def instrument_tool_decorator(self, tool_decorator: Callable) -> Callable:
+        """Wrap FastMCP.tool so every registered tool is instrumented."""
+        @functools.wraps(tool_decorator)
+        def tool(*args, **kwargs):
+            register = tool_decorator(*args, **kwargs)
+
+            def decorator(fn):
+                wrapped = self.instrument_tool(fn)
+                register(wrapped)
+                return wrapped
+            return decorator
+        return tool
+
+    def instrument_com(self, fn: Callable) -> Callable:
+        """Wrap a *_with_wb function so its run time counts as COM time (outermost call only)."""
+        if getattr(fn, "_com_timed", False):
+            return fn
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            context = self._context()
+            if context is None or context.com_depth:
+                return fn(*args, **kwargs)
+            context.com_depth += 1
+            if context.trace is not None and args and not isinstance(args[0], tracing.TracingProxy):
+                args = (context.trace.wrap(args[0], "Book"),) + args[1:]
+            started = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                context.com_depth -= 1
+                context.com_ms += (time.perf_counter() - started) * 1000
+                self.inc("com_calls_total")
+
+        wrapper._com_timed = True
+        return wrapper
+
+    def instrument_module(self, namespace: Dict[str, Any]) -> None:
+        """Instrument every *_with_wb function defined in a module namespace.
+
+        Implementation modules import xlwings themselves, so this is also where
+        the save timer is installed without the server importing xlwings early.
+        """
+        self.install_save_timer()
+        module = namespace.get("__name__")
+        for name, value in list(namespace.items()):
+            if name.endswith("_with_wb") and callable(value) and getattr(value, "__module__", None) == module:
+                namespace[name] = self.instrument_com(value)
+
+    def instrument_package(self, package: str) -> None:
+        """Instrument each submodule of a package as it is first imported (idempotent).
+
+        The implementation modules are imported lazily by the tools, so a finder
+        wraps their loaders rather than each module instrumenting itself.
+        """
+        if not any(isinstance(f, _PackageInstrumenter) and f.prefix == package + "." for f in sys.meta_path):
+            sys.meta_path.insert(0, _PackageInstrumenter(package, self))
+
+    def install_save_timer(self) -> None:
+        """Time xlwings Book.save() calls made anywhere in the server (idempotent)."""
+        import xlwings as xw
+        book = xw.main.Book
+        if getattr(book.save, "_save_timed", False):
+            return
+        original = book.save
+
+        @functools.wraps(original)
+        def save(book_self, *args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return original(book_self, *args, **kwargs)
+            finally:
+                ms = (time.perf_counter() - started) * 1000
+                context = self._context()
+                if context:
+                    context.save_ms += ms
+                else:
+                    self.observe("tool_save_ms", ms)
+                self.inc("saves_total")
+
+        save._save_timed = True
+        book.save = save
+
+    # ------------------------------------------------------------------
+    # Reporting
+    # ------------------------------------------------------------------
+
+    def _merged(self) -> Tuple[Dict[Tuple[str, str], Histogram], Dict[Tuple[str, str], int]]:
+        histograms: Dict[Tuple[str, str], Histogram] = {}
+        counters: Dict[Tuple[str, str], int] = {}
+        with self._register_lock:
+            stores = list(self._stores)
+        for store in stores:
+            for key, value in list(store.items()):
+                if isinstance(value, Histogram):
+                    merged = histograms.get(key)
+                    if merged is None:
+                        merged = histograms[key] = Histogram(value.bounds)
+                    merged.merge(value)
+                else:
+                    counters[key] = counters.get(key, 0) + value
+        return histograms, counters
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Per-tool summary: call/error counts and p50/p95/p99/mean/max per histogram."""
+        histograms, counters = self._merged()
+        tools: Dict[str, Dict[str, Any]] = {}
+        for (name, tool), value in sorted(counters.items()):
+            tools.setdefault(tool, {})[name] = value
+        for (name, tool), histogram in sorted(histograms.items(), key=lambda item: item[0]):
+            tools.setdefault(tool, {})[name] = {
+                "count": histogram.count,
+                "mean": round(histogram.total / histogram.count, 2) if histogram.count else None,
+                "p50": histogram.quantile(0.5),
+                "p95": histogram.quantile(0.95),
+                "p99": histogram.quantile(0.99),
+                "max": round(histogram.max, 2),
+                "total": round(histogram.total, 2),
+            }
+        result = {
+            "uptime_s": round(time.time() - self.started_at, 1),
+            "log_records_dropped": dropped_records(),
+            "tools": tools,
+        }
+        if tracing.TRACING_ENABLED:
+            result["last_com_traces"] = dict(self.last_traces)
+        return result
+
+    def prometheus(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        histograms, counters = self._merged()
+        lines = []
+        for name, help_text in COUNTERS.items():
+            lines.append(f"# HELP xlwings_mcp_{name} {help_text}")
+            lines.append(f"# TYPE xlwings_mcp_{name} counter")
+            for (metric, tool), value in sorted(counters.items()):
+                if metric == name:
+                    lines.append(f'xlwings_mcp_{name}{{tool="{_escape(tool)}"}} {value}')
+        for name, (help_text, _) in HISTOGRAMS.items():
+            lines.append(f"# HELP xlwings_mcp_{name} {help_text}")
+            lines.append(f"# TYPE xlwings_mcp_{name} histogram")
+            for (metric, tool), histogram in sorted(histograms.items(), key=lambda item: item[0]):
+                if metric != name:
+                    continue
+                label = _escape(tool)
+                cumulative = 0
+                for bound, n in zip(histogram.bounds, histogram.counts):
+                    cumulative += n
+                    lines.append(f'xlwings_mcp_{name}_bucket{{tool="{label}",le="{bound}"}} {cumulative}')
+                lines.append(f'xlwings_mcp_{name}_bucket{{tool="{label}",le="+Inf"}} {histogram.count}')
+                lines.append(f'xlwings_mcp_{name}_sum{{tool="{label}"}} {round(histogram.total, 3)}')
+                lines.append(f'xlwings_mcp_{name}_count{{tool="{label}"}} {histogram.count}')
+        lines.append("# HELP xlwings_mcp_log_records_dropped_total INFO and DEBUG log records discarded because the log queue was full")
+        lines.append("# TYPE xlwings_mcp_log_records_dropped_total counter")
+        lines.append(f"xlwings_mcp_log_records_dropped_total {dropped_records()}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        """Clear all recorded values (each thread's store is emptied in place)."""
+        with self._register_lock:
+            for store in self._stores:
+                store.clear()
+        self.last_traces.clear()
+        self.started_at = time.time()
+
+
+class _PackageInstrumenter(importlib.abc.MetaPathFinder):
+    """Finder that runs Metrics.instrument_module on a package's submodules once loaded."""
+
+    def __init__(self, package: str, metrics: Metrics):
+        self.prefix = package + "."
+        self.metrics = metrics
+
+    def find_spec(self, fullname, path, target=None):
+        if not fullname.startswith(self.prefix) or path is None:
+            return None
+        spec = importlib.machinery.PathFinder.find_spec(fullname, path)
+        if spec is None or spec.loader is None or not hasattr(spec.loader, "exec_module"):
+            return spec
+        spec.loader = _InstrumentingLoader(spec.loader, self.metrics)
+        return spec
+
+
+class _InstrumentingLoader(importlib.abc.Loader):
+    def __init__(self, loader: importlib.abc.Loader, metrics: Metrics):
+        self.loader = loader
+        self.metrics = metrics
+
+    def create_module(self, spec):
+        return self.loader.create_module(spec)
+
+    def exec_module(self, module) -> None:
+        self.loader.exec_module(module)
+        self.metrics.instrument_module(vars(module))
+
+
+def _escape(label: str) -> str:
+    return label.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+METRICS = Metrics()
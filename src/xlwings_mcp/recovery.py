@@ -0,0 +1,114 @@
+"""
+On-disk journal of recoverable sessions for the Excel MCP Server.
+Session open/expire/forget events and recovery redirects are appended as JSON
+lines, so a restarted server can still auto-recover session IDs that clients
+hold. Replaying the journal yields the sessions that were open or expired and
+not closed since; the file is compacted to that state on load and whenever it
+grows well past it.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Rewrite the journal once it holds this many more lines than live entries
+_COMPACT_SLACK = 1000
+
+
+class RecoveryJournal:
+    """Append-only JSONL journal; every method is safe to call from any thread."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = None
+        self._lines = 0
+
+    def load(self) -> Tuple["OrderedDict[str, Dict[str, Any]]", Dict[str, str]]:
+        """Replay the journal.
+
+        Returns:
+            (session_id -> recovery info, oldest first; old session_id -> new session_id).
+            Sessions still open when the server stopped are returned as recoverable.
+        """
+        entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        redirects: Dict[str, str] = {}
+        sources: Dict[str, Set[str]] = {}
+        if not os.path.exists(self.path):
+            return entries, redirects
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                    op = record["op"]
+                    if op in ("open", "expire"):
+                        entries.pop(record["id"], None)
+                        info = dict(record["info"])
+                        info.setdefault("expired_at", record.get("at", time.time()))
+                        entries[record["id"]] = info
+                    elif op == "forget":
+                        entries.pop(record["id"], None)
+                    elif op == "redirect":
+                        # Same one-hop compression as the session manager
+                        moved = sources.pop(record["from"], set())
+                        moved.add(record["from"])
+                        for source in moved:
+                            redirects[source] = record["to"]
+                        sources.setdefault(record["to"], set()).update(moved)
+                except (ValueError, KeyError, TypeError):
+                    # A torn last line from a crash; everything before it is intact
+                    logger.warning("RECOVERY_JOURNAL: Skipping unreadable line in %s", self.path)
+        # A redirect is only useful while its target can still be recovered
+        redirects = {source: target for source, target in redirects.items() if target in entries}
+        return entries, redirects
+
+    def append(self, op: str, **fields: Any) -> None:
+        """Append one event and flush it to the OS."""
+        record = {"op": op, "at": round(time.time(), 3), **fields}
+        line = json.dumps(record, default=str, ensure_ascii=False) + "\n"
+        with self._lock:
+            try:
+                if self._file is None:
+                    os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                    self._file = open(self.path, "a", encoding="utf-8")
+                self._file.write(line)
+                self._file.flush()
+                self._lines += 1
+            except OSError as e:
+                logger.warning("RECOVERY_JOURNAL: Cannot write %s: %s", self.path, e)
+
+    def needs_compaction(self, live: int) -> bool:
+        return self._lines > 2 * live + _COMPACT_SLACK
+
+    def compact(self, entries: Dict[str, Dict[str, Any]], redirects: Dict[str, str],
+                open_sessions: Optional[Dict[str, Dict[str, Any]]] = None) -> None:
+        """Atomically replace the journal with the given state."""
+        records = [{"op": "expire", "id": sid, "info": info} for sid, info in entries.items()]
+        records += [{"op": "open", "id": sid, "info": info} for sid, info in (open_sessions or {}).items()]
+        records += [{"op": "redirect", "from": source, "to": target} for source, target in redirects.items()]
+        tmp_path = self.path + ".tmp"
+        with self._lock:
+            try:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    for record in records:
+                        f.write(json.dumps({**record, "at": round(time.time(), 3)}, default=str, ensure_ascii=False) + "\n")
+                if self._file is not None:
+                    self._file.close()
+                    self._file = None
+                os.replace(tmp_path, self.path)
+                self._lines = len(records)
+            except OSError as e:
+                logger.warning("RECOVERY_JOURNAL: Cannot compact %s: %s", self.path, e)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
@@ -0,0 +1,279 @@
+"""
+Per-session call scheduling for the Excel MCP Server.
+Each session's lock is a SessionScheduler: a re-entrant reader/writer lock whose
+waiters are served from a bounded priority FIFO instead of in whatever order the
+OS wakes them. Anything that calls into Excel or changes session state holds it
+exclusively (``with session.lock:``); reads answered from server-side caches
+hold it shared (``with session.lock.shared():``) and run concurrently.
+Read-only tools queue ahead of writes (a write is passed by at most
+MAX_READ_BYPASS reads), and a tool call that finds the queue full fails at once
+with SESSION_BUSY and a retry-after hint instead of piling up.
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+from .exceptions import SessionBusyError
+from .metrics import BACKGROUND, METRICS
+
+# Calls that may wait for one session at a time; more fail with SESSION_BUSY
+QUEUE_LIMIT = int(os.getenv("EXCEL_MCP_SESSION_QUEUE_LIMIT", "16"))
+# Reads allowed to go ahead of a waiting write before it is served
+MAX_READ_BYPASS = int(os.getenv("EXCEL_MCP_MAX_READ_BYPASS", "8"))
+
+# Tools that never modify the workbook; they queue ahead of writes
+READ_ONLY_TOOLS = frozenset({
+    "read_data_from_excel",
+    "aggregate_range",
+    "query_range",
+    "lookup_rows",
+    "read_table",
+    "get_workbook_metadata",
+    "get_merged_cells",
+    "validate_excel_range",
+    "get_data_validation_info",
+    "get_precedents",
+    "get_dependents",
+    "validate_formula_syntax",
+    "validate_formulas",
+})
+
+_READ, _WRITE = 0, 1
+# Smoothing factor for the hold-time average behind retry-after
+_EWMA_ALPHA = 0.2
+
+
+class _Waiter:
+    __slots__ = ("thread", "priority", "shared", "seq", "bypassed", "event", "tool", "queued_at")
+
+    def __init__(self, thread: int, priority: int, shared: bool, seq: int, tool: str):
+        self.thread = thread
+        self.priority = priority
+        self.shared = shared
+        self.seq = seq
+        self.bypassed = 0
+        self.event = threading.Event()
+        self.tool = tool
+        self.queued_at = time.perf_counter()
+
+
+class SessionScheduler:
+    """Re-entrant reader/writer session lock with a bounded, read-first FIFO of waiters.
+
+    Used like the lock it replaces (``with session.lock:``) for exclusive access,
+    or ``with session.lock.shared():`` for cache-only reads. The exclusive holder
+    may also enter shared(); a shared holder must not take the exclusive lock.
+    Tool calls beyond QUEUE_LIMIT raise SessionBusyError; server-internal
+    callers (teardown, expiry) always queue. Acquisition wait is reported to METRICS.
+    """
+
+    def __init__(self, session_id: str = ""):
+        self.session_id = session_id
+        self._mutex = threading.Lock()
+        self._owner: Optional[int] = None
+        self._depth = 0
+        self._owner_tool: Optional[str] = None
+        self._acquired_at = 0.0
+        # Shared holders: thread ident -> re-entry depth
+        self._readers: Dict[int, int] = {}
+        self._waiters: List[_Waiter] = []
+        self._seq = 0
+        # Stats for list_workbooks
+        self._hold_ms_avg = 0.0
+        self._wait_ms_avg = 0.0
+        self._wait_ms_max = 0.0
+        self._granted = 0
+        self._shared_granted = 0
+        self._rejected = 0
+
+    # ------------------------------------------------------------------
+    # Exclusive
+    # ------------------------------------------------------------------
+
+    def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
+        me = threading.get_ident()
+        with self._mutex:
+            if self._owner == me:
+                self._depth += 1
+                return True
+            if me in self._readers:
+                raise RuntimeError("cannot take the exclusive session lock while holding it shared")
+            if self._owner is None and not self._readers and not self._waiters:
+                self._grant(me, METRICS.current_tool(), 0.0)
+                METRICS.add_lock_wait(0.0)
+                return True
+            if not blocking:
+                return False
+            waiter = self._enqueue(me, shared=False)
+        return self._wait(waiter, timeout)
+
+    def release(self) -> None:
+        with self._mutex:
+            if self._owner != threading.get_ident():
+                raise RuntimeError("cannot release un-acquired session lock")
+            self._depth -= 1
+            if self._depth:
+                return
+            held_ms = (time.perf_counter() - self._acquired_at) * 1000
+            self._hold_ms_avg += _EWMA_ALPHA * (held_ms - self._hold_ms_avg)
+            self._owner = None
+            self._owner_tool = None
+            self._dispatch()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.release()
+
+    # ------------------------------------------------------------------
+    # Shared
+    # ------------------------------------------------------------------
+
+    def acquire_shared(self, blocking: bool = True, timeout: float = -1) -> bool:
+        me = threading.get_ident()
+        with self._mutex:
+            if self._owner == me:
+                # Reading under our own exclusive hold
+                self._depth += 1
+                return True
+            if me in self._readers:
+                self._readers[me] += 1
+                return True
+            if self._owner is None and self._readers_may_enter():
+                self._pass_exclusive(self._seq + 1)
+                self._readers[me] = 1
+                self._shared_granted += 1
+                METRICS.add_lock_wait(0.0)
+                return True
+            if not blocking:
+                return False
+            waiter = self._enqueue(me, shared=True)
+        return self._wait(waiter, timeout)
+
+    def release_shared(self) -> None:
+        me = threading.get_ident()
+        with self._mutex:
+            if self._owner == me:
+                self._depth -= 1
+                return
+            depth = self._readers.get(me)
+            if not depth:
+                raise RuntimeError("cannot release un-acquired shared session lock")
+            if depth > 1:
+                self._readers[me] = depth - 1
+                return
+            del self._readers[me]
+            if not self._readers:
+                self._dispatch()
+
+    @contextmanager
+    def shared(self) -> Iterator["SessionScheduler"]:
+        """Hold the lock shared for a read that touches only server-side state."""
+        self.acquire_shared()
+        try:
+            yield self
+        finally:
+            self.release_shared()
+
+    # ------------------------------------------------------------------
+    # Queue (all helpers below must be called with the mutex held)
+    # ------------------------------------------------------------------
+
+    def _enqueue(self, thread: int, shared: bool) -> _Waiter:
+        tool = METRICS.current_tool()
+        if tool != BACKGROUND and len(self._waiters) >= QUEUE_LIMIT:
+            self._rejected += 1
+            METRICS.inc("session_busy_total")
+            raise SessionBusyError(self.session_id, len(self._waiters), self._retry_after())
+        self._seq += 1
+        priority = _READ if shared or tool in READ_ONLY_TOOLS else _WRITE
+        waiter = _Waiter(thread, priority, shared, self._seq, tool)
+        self._waiters.append(waiter)
+        return waiter
+
+    def _wait(self, waiter: _Waiter, timeout: float) -> bool:
+        granted = waiter.event.wait(None if timeout < 0 else timeout)
+        if not granted:
+            with self._mutex:
+                # May have been granted between the timeout and taking the mutex
+                granted = waiter.event.is_set()
+                if not granted:
+                    self._waiters.remove(waiter)
+                    self._dispatch()
+        if granted:
+            METRICS.add_lock_wait((time.perf_counter() - waiter.queued_at) * 1000)
+        return granted
+
+    def _readers_may_enter(self) -> bool:
+        """New shared holders may join unless an exclusive waiter has been passed too often."""
+        return not any(not w.shared and w.bypassed >= MAX_READ_BYPASS for w in self._waiters)
+
+    def _pass_exclusive(self, seq: int) -> None:
+        """Count a read served ahead of the exclusive waiters queued before it."""
+        for waiter in self._waiters:
+            if not waiter.shared and waiter.seq < seq:
+                waiter.bypassed += 1
+
+    def _next(self) -> Optional[_Waiter]:
+        """The next waiter: the oldest write that reads have passed too often, else the oldest read, else the oldest write."""
+        writes = [w for w in self._waiters if w.priority == _WRITE]
+        reads = [w for w in self._waiters if w.priority == _READ]
+        if reads and not (writes and writes[0].bypassed >= MAX_READ_BYPASS):
+            return reads[0]
+        return writes[0] if writes else None
+
+    def _dispatch(self) -> None:
+        """Grant the lock to waiters now that it is free of an exclusive holder."""
+        while self._owner is None and self._waiters:
+            waiter = self._next()
+            if waiter.shared:
+                self._pass_exclusive(waiter.seq)
+                self._waiters.remove(waiter)
+                self._readers[waiter.thread] = 1
+                self._shared_granted += 1
+                self._record_wait((time.perf_counter() - waiter.queued_at) * 1000)
+                waiter.event.set()
+                continue
+            if self._readers:
+                return
+            if waiter.priority == _READ:
+                self._pass_exclusive(waiter.seq)
+            self._waiters.remove(waiter)
+            self._grant(waiter.thread, waiter.tool, (time.perf_counter() - waiter.queued_at) * 1000)
+            waiter.event.set()
+
+    def _grant(self, owner: int, tool: str, wait_ms: float) -> None:
+        """Make a thread the exclusive owner."""
+        self._owner = owner
+        self._depth = 1
+        self._owner_tool = tool
+        self._acquired_at = time.perf_counter()
+        self._granted += 1
+        self._record_wait(wait_ms)
+
+    def _record_wait(self, wait_ms: float) -> None:
+        self._wait_ms_avg += _EWMA_ALPHA * (wait_ms - self._wait_ms_avg)
+        self._wait_ms_max = max(self._wait_ms_max, wait_ms)
+
+    def _retry_after(self) -> float:
+        """Seconds until a new call would likely get a queue slot."""
+        return round(max(self._hold_ms_avg, 50.0) * (len(self._waiters) + 1) / 1000 / 2, 1)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._mutex:
+            return {
+                "active_tool": self._owner_tool,
+                "readers": len(self._readers),
+                "depth": len(self._waiters),
+                "reads_waiting": sum(1 for w in self._waiters if w.priority == _READ),
+                "wait_ms_avg": round(self._wait_ms_avg, 1),
+                "wait_ms_max": round(self._wait_ms_max, 1),
+                "granted": self._granted,
+                "shared_granted": self._shared_granted,
+                "rejected": self._rejected,
+            }
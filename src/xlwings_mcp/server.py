@@ -1,5 +1,7 @@
 import logging
 import os
+import time
+from contextlib import ExitStack, contextmanager
 from typing import Any, List, Dict, Optional
 
 from mcp.server.fastmcp import FastMCP
@@ -33,29 +35,38 @@ from xlwings_mcp.force_close import force_close_workbook_by_path
 
 ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 LOGS_DIR = os.path.join(ROOT_DIR, "logs")
-os.makedirs(LOGS_DIR, exist_ok=True)
 LOG_FILE = os.path.join(LOGS_DIR, "excel-mcp.log")
+# Session recovery journal; set EXCEL_MCP_RECOVERY_JOURNAL to "" to keep recovery in memory only
+RECOVERY_JOURNAL = os.getenv("EXCEL_MCP_RECOVERY_JOURNAL", os.path.join(LOGS_DIR, "recovery.jsonl"))
 
 # Initialize EXCEL_FILES_PATH variable without assigning a value
 EXCEL_FILES_PATH = None
+# Worker supervisor when an HTTP transport runs with --workers > 1
+SUPERVISOR = None
 
 # xlwings 구현 사용 (openpyxl 마이그레이션 완료)
 
-# Configure logging with rotation to prevent infinite log growth
-from logging.handlers import RotatingFileHandler
-
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[
-        # Referring to https://github.com/modelcontextprotocol/python-sdk/issues/409#issuecomment-2816831318
-        # The stdio mode server MUST NOT write anything to its stdout that is not a valid MCP message.
-        # Use RotatingFileHandler to prevent infinite log growth (5MB max, keep 3 backup files)
-        RotatingFileHandler(LOG_FILE, maxBytes=5*1024*1024, backupCount=3)
-    ],
-)
+# Log through a queue: tool threads only enqueue, a background thread writes the
+# rotating file. The stdio mode server MUST NOT write anything to its stdout that is
+# not a valid MCP message, see https://github.com/modelcontextprotocol/python-sdk/issues/409#issuecomment-2816831318
+from xlwings_mcp.logging_setup import configure_logging
+
 logger = logging.getLogger("excel-mcp")
-logger.info("🚀 Excel MCP Server starting - xlwings 모드 활성화")
+
+
+def setup_logging() -> None:
+    """Create the log directory and start queued logging; called by the run_* entry points
+    rather than at import, so importing the server stays cheap."""
+    os.makedirs(LOGS_DIR, exist_ok=True)
+    configure_logging(LOG_FILE)
+    logger.info("🚀 Excel MCP Server starting - xlwings 모드 활성화")
+
+
+def setup_recovery() -> None:
+    """Load the session recovery journal, so IDs from before a restart still recover"""
+    if RECOVERY_JOURNAL:
+        SESSION_MANAGER.enable_recovery_journal(RECOVERY_JOURNAL)
+
 
 # Error message templates for consistent error reporting
 ERROR_TEMPLATES = {
@@ -93,12 +104,151 @@ def get_validated_session(session_id: str):
     
     return session
 
+def refresh_dependency_index(session, sheet_name: str, address: Optional[str]) -> None:
+    """
+    Keep a built dependency index in step with a block a tool just wrote.
+    Must be called while holding session.lock.
+    
+    Args:
+        session: Session whose workbook was written
+        sheet_name: Sheet that was written
+        address: Written range; None discards the index
+    """
+    if session.dependency_index is None:
+        return
+    from xlwings_mcp.xlwings_impl.dependencies_xlw import refresh_dependency_index_xlw_with_wb
+    if not address or not refresh_dependency_index_xlw_with_wb(
+        session.workbook, session.dependency_index, sheet_name, address
+    ):
+        session.dependency_index = None
+
+def refresh_column_indexes(session, sheet_name: str, address: Optional[str]) -> None:
+    """
+    Keep the session's key-column indexes in step with a block a tool just wrote.
+    Must be called while holding session.lock.
+    
+    Args:
+        session: Session whose workbook was written
+        sheet_name: Sheet that was written
+        address: Written range; None marks the sheet's indexes for rebuild
+    """
+    from xlwings_mcp.xlwings_impl.lookup_xlw import refresh_column_index_xlw_with_wb
+    for index in session.column_indexes:
+        if index.sheet.lower() != sheet_name.lower() or index.structure_token != session.structure_token:
+            continue
+        if address and refresh_column_index_xlw_with_wb(session.workbook, index, address):
+            index.change_token = session.change_token
+        else:
+            index.structure_token = -1
+
+def shift_column_indexes(session, sheet_name: str, axis: str, start: int, count: int) -> None:
+    """
+    Carry key-column indexes across a row/column insert (count > 0) or delete
+    (count < 0). Call right after mark_changed(structure=True), while holding
+    session.lock; indexes that were already stale stay stale.
+    """
+    kept = []
+    for index in session.column_indexes:
+        if index.structure_token == session.structure_token - 1:
+            if index.sheet.lower() == sheet_name.lower():
+                if axis == "rows":
+                    index.shift_rows(start, count)
+                elif not index.shift_columns(start, count):
+                    continue  # key column deleted
+            index.structure_token = session.structure_token
+            index.change_token = session.change_token
+        kept.append(index)
+    session.column_indexes = kept
+
+def patch_value_snapshot(session, sheet_name: Optional[str] = None, edit=None) -> None:
+    """
+    Carry the session's value snapshot across a change a tool just made. Call
+    right after mark_changed(), while holding session.lock; a snapshot that was
+    already stale, or a change without a patch, leaves nothing to serve.
+
+    Args:
+        sheet_name: Sheet the change touched; None when no values changed
+        edit: Maps the sheet's SheetValues to the new ones; None drops the sheet
+    """
+    snapshot = session.value_snapshot
+    if snapshot is None or snapshot.change_token != session.change_token - 1:
+        session.value_snapshot = None
+        return
+    session.value_snapshot = snapshot.edited(session.change_token, sheet_name, edit)
+
+def block_bounds(address: str):
+    """(r1, c1, r2, c2) of an A1 cell or range address"""
+    from xlwings_mcp.formula.parser import split_range
+    return split_range(address)[1:]
+
+def read_block(session, key, sheet_name: str, r1: int, c1: int, r2: int, c2: int, render):
+    """
+    Answer a read of one block from the session's value snapshot. A current
+    snapshot is read without any lock, so readers never wait for COM;
+    otherwise the sheet is loaded (or its unsettled cells re-read) under the
+    exclusive lock and a new snapshot published. Rendered results are kept on
+    the snapshot, so repeating a read returns the same result until a change.
+    
+    Args:
+        key: Tool name and arguments identifying the result
+        render: Builds the result from the block's 2D list of values
+    
+    Returns:
+        The rendered result, or None when the sheet cannot be served from a
+        snapshot (missing, or larger than EXCEL_MCP_SNAPSHOT_MAX_CELLS)
+    """
+    from xlwings_mcp.session import READ_CACHE_SIZE
+    snapshot = session.value_snapshot
+    if snapshot is not None and snapshot.change_token == session.change_token:
+        if sheet_name in snapshot.oversize:
+            return None
+        sheet = snapshot.sheet(sheet_name)
+        if sheet is not None and sheet.is_fresh(r1, c1, r2, c2, session.read_token()):
+            result = snapshot.rendered.get(key)
+            if result is None:
+                result = render(sheet.block(r1, c1, r2, c2))
+                snapshot.remember(key, result, READ_CACHE_SIZE)
+            return result
+
+    from xlwings_mcp.snapshot import SNAPSHOT_MAX_CELLS, ValueSnapshot
+    from xlwings_mcp.xlwings_impl.snapshot_xlw import load_sheet_values_xlw_with_wb, refresh_sheet_values_xlw_with_wb
+    with session.lock:
+        ensure_calculated(session)
+        snapshot = session.value_snapshot
+        if snapshot is None or snapshot.change_token != session.change_token:
+            snapshot = ValueSnapshot(session.change_token)
+        if sheet_name in snapshot.oversize:
+            return None
+        read_token = session.read_token()
+        previous = snapshot.sheet(sheet_name)
+        if previous is None or previous.formulas_stale(read_token):
+            result = load_sheet_values_xlw_with_wb(session.workbook, sheet_name, read_token)
+        else:
+            result = refresh_sheet_values_xlw_with_wb(session.workbook, previous)
+        sheet = result.get("sheet")
+        if sheet is None:
+            if "error" not in result:
+                session.value_snapshot = snapshot.with_oversize(sheet_name)
+            return None
+        kept = snapshot.cell_count() - (previous.cell_count() if previous else 0)
+        if kept + sheet.cell_count() > SNAPSHOT_MAX_CELLS:
+            snapshot = ValueSnapshot(session.change_token, oversize=snapshot.oversize)
+        snapshot = snapshot.with_sheet(sheet)
+        result = render(sheet.block(r1, c1, r2, c2))
+        snapshot.remember(key, result, READ_CACHE_SIZE)
+        session.value_snapshot = snapshot
+        return result
+
 # Initialize FastMCP server
 mcp = FastMCP(
     "excel-mcp",
     instructions="Excel MCP Server for manipulating Excel files"
 )
 
+# Record latency, lock wait, COM/save time and response size for every tool
+from xlwings_mcp.metrics import METRICS
+mcp.tool = METRICS.instrument_tool_decorator(mcp.tool)
+
 def get_excel_path(filename: str) -> str:
     """Get full path to Excel file.
     
@@ -120,6 +270,66 @@ def get_excel_path(filename: str) -> str:
     # In SSE mode, if it's a relative path, resolve it based on EXCEL_FILES_PATH
     return os.path.join(EXCEL_FILES_PATH, filename)
 
+@contextmanager
+def legacy_path_session(filepath: str):
+    """
+    Serve a deprecated filepath= call from the pooled session for that file.
+    Yields the session with its lock held, or an error message string (as
+    get_validated_session does) when the file is missing or locked. Changes
+    are saved to the file when the block exits.
+    
+    Args:
+        filepath: Path to Excel file as given to the tool
+    """
+    logger.warning("Using deprecated filepath parameter. Please use session_id instead.")
+    full_path = get_excel_path(filepath)
+    if not os.path.exists(full_path):
+        yield f"Error: File not found: {full_path}"
+        return
+    with ExitStack() as stack:
+        try:
+            session = stack.enter_context(SESSION_MANAGER.path_session(full_path))
+        except IOError as e:
+            yield f"Error: {str(e)}"
+            return
+        yield session
+
+@contextmanager
+def tool_session(session_id: Optional[str], filepath: Optional[str], lock: bool = True):
+    """
+    Resolve the session for a tool that accepts session_id or the deprecated
+    filepath. Yields the session, or an error message string when neither is
+    given or the session or file cannot be used.
+    
+    Args:
+        session_id: Session ID from open_workbook (preferred)
+        filepath: Path to Excel file (legacy); served by legacy_path_session
+        lock: Hold session.lock exclusively in the block. Read tools that go
+            through read_through pass False; a filepath session is always
+            locked, since it is saved when the block exits.
+    """
+    if session_id:
+        session = SESSION_MANAGER.get_session(session_id)
+        if not session:
+            yield ERROR_TEMPLATES['SESSION_NOT_FOUND'].format(
+                session_id=session_id, 
+                ttl=10  # Default TTL is 10 minutes (600 seconds)
+            )
+            return
+        if not lock:
+            yield session
+            return
+        with session.lock:
+            yield session
+    elif filepath:
+        with legacy_path_session(filepath) as session:
+            yield session
+    else:
+        yield ERROR_TEMPLATES['PARAMETER_MISSING'].format(
+            param1='session_id',
+            param2='filepath'
+        )
+
 # ============================================================================
 # SESSION MANAGEMENT TOOLS (NEW)
 # ============================================================================
@@ -159,7 +369,7 @@ def open_workbook(
         }
         
     except Exception as e:
-        logger.error(f"Error opening workbook: {e}")
+        logger.error("Error opening workbook: %s", e)
         raise WorkbookError(f"Failed to open workbook: {str(e)}")
 
 @mcp.tool()
@@ -185,7 +395,7 @@ def close_workbook(
         return f"Workbook session {session_id} closed successfully"
         
     except Exception as e:
-        logger.error(f"Error closing workbook: {e}")
+        logger.error("Error closing workbook: %s", e)
         raise WorkbookError(f"Failed to close workbook: {str(e)}")
 
 @mcp.tool()
@@ -199,7 +409,7 @@ def list_workbooks() -> List[Dict[str, Any]]:
     try:
         return SESSION_MANAGER.list_sessions()
     except Exception as e:
-        logger.error(f"Error listing workbooks: {e}")
+        logger.error("Error listing workbooks: %s", e)
         raise WorkbookError(f"Failed to list workbooks: {str(e)}")
 
 @mcp.tool()
@@ -217,9 +427,12 @@ def force_close_workbook_by_path_tool(
     """
     try:
         full_path = get_excel_path(filepath)
+        # Changes made through filepath= calls were saved as each call returned
+        if SESSION_MANAGER.close_path_session(full_path, save=False):
+            return {"closed": True, "message": f"Closed pooled workbook {full_path}"}
         return force_close_workbook_by_path(full_path)
     except Exception as e:
-        logger.error(f"Error force closing workbook: {e}")
+        logger.error("Error force closing workbook: %s", e)
         return {
             "closed": False,
             "message": f"Failed to force close workbook: {str(e)}"
@@ -234,7 +447,8 @@ def apply_formula(
     session_id: str,
     sheet_name: str,
     cell: str,
-    formula: str
+    formula: str,
+    preview: bool = False
 ) -> str:
     """
     Apply Excel formula to cell.
@@ -244,6 +458,7 @@ def apply_formula(
         sheet_name: Name of worksheet
         cell: Cell address (e.g., "A1")
         formula: Excel formula to apply
+        preview: Compute the result offline from the saved file without writing the cell
     """
     try:
         # Validate session using centralized helper
@@ -251,16 +466,87 @@ def apply_formula(
         if isinstance(session, str):  # Error message returned
             return session
         
+        if preview:
+            from xlwings_mcp.formula.offline import evaluate_offline
+            result = evaluate_offline(session.filepath, sheet_name, formulas=[formula])
+            if "error" in result:
+                return f"Error: {result['error']}"
+            entry = result["formulas"][0]
+            if "error" in entry:
+                return f"Error: {entry['error']}"
+            return f"Preview of {formula} at {cell}: {entry['value']} (not written)"
+        
         with session.lock:
             from xlwings_mcp.xlwings_impl.calculations_xlw import apply_formula_xlw_with_wb
             result = apply_formula_xlw_with_wb(session.workbook, sheet_name, cell, formula)
+            session.mark_changed()
+            if "error" not in result:
+                refresh_dependency_index(session, sheet_name, cell)
+                refresh_column_indexes(session, sheet_name, cell)
+                patch_value_snapshot(session, sheet_name, lambda sheet: sheet.formulas_written(*block_bounds(cell)))
         
         return result.get("message", "Formula applied successfully") if "error" not in result else f"Error: {result['error']}"
             
     except (ValidationError, CalculationError) as e:
         return f"Error: {str(e)}"
     except Exception as e:
-        logger.error(f"Error applying formula: {e}")
+        logger.error("Error applying formula: %s", e)
+        raise
+
+@mcp.tool()
+def apply_formulas(
+    session_id: str,
+    sheet_name: str,
+    target_range: str,
+    formula: Optional[str] = None,
+    formulas: Optional[List[List[Any]]] = None,
+    r1c1: bool = False,
+    preview_rows: int = 5
+) -> str:
+    """
+    Apply formulas to a whole range in a single assignment.
+    
+    Args:
+        session_id: Session ID from open_workbook (required)
+        sheet_name: Name of worksheet
+        target_range: Range to fill (e.g., "C2:C20001"), or top-left cell for a formulas matrix
+        formula: Single A1/R1C1 formula filled across the range (relative references adjust per cell)
+        formulas: 2D list of formulas written cell-for-cell (alternative to formula)
+        r1c1: Interpret formulas in R1C1 notation (default: False)
+        preview_rows: Number of evenly spaced rows of computed values to return (0 disables preview)
+    """
+    try:
+        # Validate session using centralized helper
+        session = get_validated_session(session_id)
+        if isinstance(session, str):  # Error message returned
+            return session
+        
+        with session.lock:
+            from xlwings_mcp.xlwings_impl.calculations_xlw import apply_formulas_xlw_with_wb
+            result = apply_formulas_xlw_with_wb(
+                session.workbook,
+                sheet_name,
+                target_range,
+                formula=formula,
+                formulas=formulas,
+                r1c1=r1c1,
+                preview_rows=preview_rows
+            )
+            session.mark_changed()
+            if "error" not in result:
+                refresh_dependency_index(session, sheet_name, result.get("range"))
+                refresh_column_indexes(session, sheet_name, result.get("range"))
+                patch_value_snapshot(session, sheet_name, lambda sheet: sheet.formulas_written(*block_bounds(result["range"])))
+        
+        if "error" in result:
+            return f"Error: {result['error']}"
+        import json
+        return json.dumps(result, indent=2, default=str, ensure_ascii=False)
+            
+    except (ValidationError, CalculationError) as e:
+        return f"Error: {str(e)}"
+    except Exception as e:
+        logger.error("Error applying formulas: %s", e)
         raise
 
 @mcp.tool()
@@ -284,222 +570,824 @@ def validate_formula_syntax(
     Note: Use session_id for better performance. filepath parameter is deprecated.
     """
     try:
-        # Support both new (session_id) and old (filepath) API
-        if session_id:
-            # New API: use session
-            session = SESSION_MANAGER.get_session(session_id)
-            if not session:
-                return ERROR_TEMPLATES['SESSION_NOT_FOUND'].format(
-                    session_id=session_id, 
-                    ttl=10  # Default TTL is 10 minutes (600 seconds)
-                )
-            
-            with session.lock:
-                from xlwings_mcp.xlwings_impl.calculations_xlw import validate_formula_syntax_xlw_with_wb
-                result = validate_formula_syntax_xlw_with_wb(session.workbook, sheet_name, cell, formula)
-        elif filepath:
-            # Legacy API: backwards compatibility
-            logger.warning("Using deprecated filepath parameter. Please use session_id instead.")
-            full_path = get_excel_path(filepath)
-            from xlwings_mcp.xlwings_impl.calculations_xlw import validate_formula_syntax_xlw
-            result = validate_formula_syntax_xlw(full_path, sheet_name, cell, formula)
-        else:
-            return ERROR_TEMPLATES['PARAMETER_MISSING'].format(
-                param1='session_id',
-                param2='filepath'
+        with tool_session(session_id, filepath) as session:
+            if isinstance(session, str):
+                return session
+            from xlwings_mcp.xlwings_impl.calculations_xlw import validate_formula_syntax_xlw_with_wb
+            result = validate_formula_syntax_xlw_with_wb(
+                session.workbook,
+                sheet_name,
+                cell,
+                formula,
+                cache=session.formula_validation_cache,
+                change_token=session.change_token
             )
         
         return result.get("message", "Formula validation completed") if "error" not in result else f"Error: {result['error']}"
     except (ValidationError, CalculationError) as e:
         return f"Error: {str(e)}"
     except Exception as e:
-        logger.error(f"Error validating formula: {e}")
+        logger.error("Error validating formula: %s", e)
         raise
 
 @mcp.tool()
-def format_range(
+def validate_formulas(
+    session_id: str,
+    sheet_name: str,
+    formulas: List[str]
+) -> str:
+    """
+    Validate a list of Excel formulas without writing to any cell.
+    
+    Formulas are evaluated in the context of the given sheet, so the workbook
+    is not modified and no dependents recalculate. Results are cached per
+    sheet and formula until the workbook changes.
+    
+    Args:
+        session_id: Session ID from open_workbook (required)
+        sheet_name: Worksheet providing the evaluation context
+        formulas: Formulas to validate ('=' prefix optional)
+    """
+    try:
+        # Validate session using centralized helper
+        session = get_validated_session(session_id)
+        if isinstance(session, str):  # Error message returned
+            return session
+        
+        with session.lock:
+            from xlwings_mcp.xlwings_impl.calculations_xlw import validate_formulas_xlw_with_wb
+            result = validate_formulas_xlw_with_wb(
+                session.workbook,
+                sheet_name,
+                formulas,
+                cache=session.formula_validation_cache,
+                change_token=session.change_token
+            )
+        
+        if "error" in result:
+            return f"Error: {result['error']}"
+        import json
+        return json.dumps(result, indent=2, default=str, ensure_ascii=False)
+        
+    except (ValidationError, CalculationError) as e:
+        return f"Error: {str(e)}"
+    except Exception as e:
+        logger.error("Error validating formulas: %s", e)
+        raise
+
+@mcp.tool()
+def evaluate_formulas_offline(
     sheet_name: str,
-    start_cell: str,
     session_id: Optional[str] = None,
     filepath: Optional[str] = None,
-    end_cell: Optional[str] = None,
-    bold: bool = False,
-    italic: bool = False,
-    underline: bool = False,
-    font_size: Optional[int] = None,
-    font_color: Optional[str] = None,
-    bg_color: Optional[str] = None,
-    border_style: Optional[str] = None,
-    border_color: Optional[str] = None,
-    number_format: Optional[str] = None,
-    alignment: Optional[str] = None,
-    wrap_text: bool = False,
-    merge_cells: bool = False,
-    protection: Optional[Dict[str, Any]] = None,
-    conditional_format: Optional[Dict[str, Any]] = None
+    formulas: Optional[List[str]] = None,
+    cells: Optional[List[str]] = None,
+    overrides: Optional[Dict[str, Any]] = None
 ) -> str:
     """
-    Apply formatting to a range of cells.
+    Evaluate formulas from the workbook file without Excel.
+    
+    Uses the built-in formula engine on the saved .xlsx/.xlsm contents, so it
+    works for read-only sessions and on machines without Excel. Stale cached
+    values are recalculated; overrides allow what-if edits that are rolled
+    back after evaluation and never written to the file.
     
     Args:
-        sheet_name: Name of worksheet
-        start_cell: Starting cell
-        session_id: Session ID from open_workbook (preferred)
-        filepath: Path to Excel file (legacy, deprecated)
-        end_cell: Ending cell (optional)
-        bold: Apply bold formatting
-        italic: Apply italic formatting
-        underline: Apply underline formatting
-        font_size: Font size
-        font_color: Font color
-        bg_color: Background color
-        border_style: Border style
-        border_color: Border color
-        number_format: Number format
-        alignment: Text alignment
-        wrap_text: Enable text wrapping
-        merge_cells: Merge cells in range
-        protection: Cell protection settings (optional)
-        conditional_format: Conditional formatting settings (optional)
-        
-    Note: Use session_id for better performance. filepath parameter is deprecated.
+        sheet_name: Sheet used for unqualified references
+        session_id: Session ID from open_workbook (evaluates the session's file)
+        filepath: Path to Excel file (alternative to session_id)
+        formulas: Formulas to evaluate without storing them
+        cells: Cells whose recalculated values to return (e.g., "B2" or "Data!C5")
+        overrides: Temporary edits on sheet_name, e.g. {"B2": 100, "C2": "=B2*2"}
     """
     try:
-        # Support both new (session_id) and old (filepath) API
         if session_id:
-            # New API: use session
-            session = SESSION_MANAGER.get_session(session_id)
-            if not session:
-                return ERROR_TEMPLATES['SESSION_NOT_FOUND'].format(
-                    session_id=session_id, 
-                    ttl=10  # Default TTL is 10 minutes (600 seconds)
-                )
-            
-            with session.lock:
-                from xlwings_mcp.xlwings_impl.formatting_xlw import format_range_xlw_with_wb
-                result = format_range_xlw_with_wb(
-                    session.workbook,
-                    sheet_name=sheet_name,
-                    start_cell=start_cell,
-                    end_cell=end_cell,
-                    bold=bold,
-                    italic=italic,
-                    underline=underline,
-                    font_size=font_size,
-                    font_color=font_color,
-                    bg_color=bg_color,
-                    border_style=border_style,
-                    border_color=border_color,
-                    number_format=number_format,
-                    alignment=alignment,
-                    wrap_text=wrap_text,
-                    merge_cells=merge_cells
-                )
+            session = get_validated_session(session_id)
+            if isinstance(session, str):  # Error message returned
+                return session
+            full_path = session.filepath
         elif filepath:
-            # Legacy API: backwards compatibility
-            logger.warning("Using deprecated filepath parameter. Please use session_id instead.")
             full_path = get_excel_path(filepath)
-            from xlwings_mcp.xlwings_impl.formatting_xlw import format_range_xlw
-            result = format_range_xlw(
-                filepath=full_path,
-                sheet_name=sheet_name,
-                start_cell=start_cell,
-                end_cell=end_cell,
-                bold=bold,
-                italic=italic,
-                underline=underline,
-                font_size=font_size,
-                font_color=font_color,
-                bg_color=bg_color,
-                border_style=border_style,
-                border_color=border_color,
-                number_format=number_format,
-                alignment=alignment,
-                wrap_text=wrap_text,
-                merge_cells=merge_cells
-            )
         else:
             return ERROR_TEMPLATES['PARAMETER_MISSING'].format(
                 param1='session_id',
                 param2='filepath'
             )
         
-        return result.get("message", "Range formatted successfully") if "error" not in result else f"Error: {result['error']}"
-    except (ValidationError, FormattingError) as e:
+        from xlwings_mcp.formula.offline import evaluate_offline
+        result = evaluate_offline(full_path, sheet_name, formulas=formulas, cells=cells, overrides=overrides)
+        
+        if "error" in result:
+            return f"Error: {result['error']}"
+        import json
+        return json.dumps(result, indent=2, default=str, ensure_ascii=False)
+        
+    except (ValidationError, CalculationError) as e:
         return f"Error: {str(e)}"
     except Exception as e:
-        logger.error(f"Error formatting range: {e}")
+        logger.error("Error evaluating formulas offline: %s", e)
         raise
 
+def get_dependency_index(session):
+    """
+    Return the session's dependency index, building it on first use.
+    Must be called while holding session.lock.
+    
+    Returns:
+        DependencyIndex, or an error message string
+    """
+    if session.dependency_index is None:
+        from xlwings_mcp.xlwings_impl.dependencies_xlw import build_dependency_index_xlw_with_wb
+        result = build_dependency_index_xlw_with_wb(session.workbook)
+        if "error" in result:
+            return f"Error: {result['error']}"
+        session.dependency_index = result["index"]
+    return session.dependency_index
+
 @mcp.tool()
-def read_data_from_excel(
+def get_precedents(
     session_id: str,
     sheet_name: str,
-    start_cell: Optional[str] = None,
-    end_cell: Optional[str] = None,
-    preview_only: bool = False
+    cell: str,
+    transitive: bool = False,
+    limit: int = 1000
 ) -> str:
     """
-    Read data from Excel worksheet with cell metadata including validation rules.
+    List the ranges and defined names that feed a cell's formula.
+    
+    Answers from a per-session formula index that is built once per workbook
+    and kept current by formula and data writes.
     
     Args:
         session_id: Session ID from open_workbook (required)
         sheet_name: Name of worksheet
-        start_cell: Starting cell (default A1)
-        end_cell: Ending cell (optional, auto-expands if not provided)
-        preview_only: Whether to return preview only
+        cell: Cell or range address (e.g., "D10" or "D2:D100")
+        transitive: Follow precedents through intermediate formulas
+        limit: Maximum number of ranges to return
     """
     try:
-        # Validate session using centralized helper
         session = get_validated_session(session_id)
         if isinstance(session, str):  # Error message returned
             return session
-            
-        with session.lock:
-            from xlwings_mcp.xlwings_impl.data_xlw import read_data_from_excel_xlw_with_wb
-            return read_data_from_excel_xlw_with_wb(session.workbook, sheet_name, start_cell, end_cell, preview_only)
         
-    except (ValidationError, DataError) as e:
+        # An index that is already built answers under the shared lock
+        with session.lock.shared():
+            index = session.dependency_index
+            result = index.precedents(sheet_name, cell, transitive=transitive, limit=limit) if index else None
+        if result is None:
+            with session.lock:
+                index = get_dependency_index(session)
+                if isinstance(index, str):
+                    return index
+                result = index.precedents(sheet_name, cell, transitive=transitive, limit=limit)
+        
+        import json
+        return json.dumps(result, indent=2, default=str, ensure_ascii=False)
+        
+    except (ValidationError, CalculationError) as e:
         return f"Error: {str(e)}"
     except Exception as e:
-        logger.error(f"Error reading data: {e}")
+        logger.error("Error getting precedents: %s", e)
         raise
 
 @mcp.tool()
-def write_data_to_excel(
+def get_dependents(
     session_id: str,
     sheet_name: str,
-    data: List[List],
-    start_cell: Optional[str] = None
+    target_range: str,
+    transitive: bool = False,
+    limit: int = 1000
 ) -> str:
     """
-    Write data to Excel worksheet.
-    Excel formula will write to cell without any verification.
-
+    List the formula cells that read a cell, range or whole column.
+    
     Args:
         session_id: Session ID from open_workbook (required)
-        sheet_name: Name of worksheet to write to
-        data: List of lists containing data to write to the worksheet, sublists are assumed to be rows
-        start_cell: Cell to start writing to (optional, auto-finds appropriate location)
+        sheet_name: Name of worksheet
+        target_range: Address to check (e.g., "B2", "B2:B500" or "C:C")
+        transitive: Include cells that depend on the direct dependents
+        limit: Maximum number of cells to return
     """
     try:
-        # Validate session using centralized helper
         session = get_validated_session(session_id)
         if isinstance(session, str):  # Error message returned
             return session
-            
-        with session.lock:
-            from xlwings_mcp.xlwings_impl.data_xlw import write_data_to_excel_xlw_with_wb
-            result = write_data_to_excel_xlw_with_wb(session.workbook, sheet_name, data, start_cell)
         
-        return result.get("message", "Data written successfully") if "error" not in result else f"Error: {result['error']}"
-            
-    except (ValidationError, DataError) as e:
-        return f"Error: {str(e)}"
-    except Exception as e:
-        logger.error(f"Error writing data: {e}")
-        raise
-
+        # An index that is already built answers under the shared lock
+        with session.lock.shared():
+            index = session.dependency_index
+            result = index.dependents(sheet_name, target_range, transitive=transitive, limit=limit) if index else None
+        if result is None:
+            with session.lock:
+                index = get_dependency_index(session)
+                if isinstance(index, str):
+                    return index
+                result = index.dependents(sheet_name, target_range, transitive=transitive, limit=limit)
+        
+        import json
+        return json.dumps(result, indent=2, default=str, ensure_ascii=False)
+        
+    except (ValidationError, CalculationError) as e:
+        return f"Error: {str(e)}"
+    except Exception as e:
+        logger.error("Error getting dependents: %s", e)
+        raise
+
+def ensure_calculated(session) -> None:
+    """
+    Run the recalculation deferred by a "deferred" session before data is read.
+    Must be called while holding session.lock.
+    """
+    if session.calculation_mode != "deferred" or not session.calc_pending:
+        return
+    from xlwings_mcp.xlwings_impl.calculations_xlw import recalculate_xlw_with_wb
+    result = recalculate_xlw_with_wb(session.workbook)
+    session.record_calculation()
+    if "error" not in result:
+        session.mark_calculated()
+
+def is_error_result(result) -> bool:
+    """Whether a *_with_wb result (dict, or JSON text for the read tools) reports an error"""
+    if isinstance(result, dict):
+        return "error" in result
+    return isinstance(result, str) and result.lstrip("{ \n").startswith(('"error"', "Error"))
+
+def read_through(session, key, compute):
+    """
+    Answer a read-only tool from the session's result cache under the shared
+    lock, so repeated reads run concurrently with each other. On a miss the
+    result is computed under the exclusive lock and cached unless it failed.
+    
+    Args:
+        key: Tool name and arguments identifying the result
+        compute: Called with session.lock held; returns the *_with_wb result
+    """
+    with session.lock.shared():
+        result = session.cached_read(key)
+    if result is not None:
+        return result
+    with session.lock:
+        # Another call may have filled it while this one waited
+        result = session.cached_read(key)
+        if result is None:
+            result = compute()
+            if not is_error_result(result):
+                session.store_read(key, result)
+    return result
+
+@mcp.tool()
+def set_calculation_mode(
+    session_id: str,
+    mode: str
+) -> str:
+    """
+    Set the calculation mode for a session.
+    
+    Modes:
+    - automatic: Excel default; every mutation recalculates dependents
+    - manual: nothing recalculates until recalculate() is called
+    - deferred: writes skip recalculation; one recalculation runs before the next read
+    - semiautomatic: automatic except data tables
+    
+    Args:
+        session_id: Session ID from open_workbook (required)
+        mode: One of "automatic", "manual", "deferred", "semiautomatic"
+    """
+    try:
+        session = get_validated_session(session_id)
+        if isinstance(session, str):  # Error message returned
+            return session
+        
+        with session.lock:
+            from xlwings_mcp.xlwings_impl.calculations_xlw import set_calculation_mode_xlw_with_wb
+            result = set_calculation_mode_xlw_with_wb(session.workbook, mode)
+            session.record_calculation()
+            if "error" not in result:
+                session.calculation_mode = result["mode"]
+                if result["excel_calculation"] != "manual":
+                    session.mark_calculated()
+        
+        if "error" in result:
+            return f"Error: {result['error']}"
+        import json
+        return json.dumps(result, indent=2, default=str, ensure_ascii=False)
+        
+    except (ValidationError, CalculationError) as e:
+        return f"Error: {str(e)}"
+    except Exception as e:
+        logger.error("Error setting calculation mode: %s", e)
+        raise
+
+@mcp.tool()
+def recalculate(
+    session_id: str,
+    sheet_name: Optional[str] = None,
+    target_range: Optional[str] = None,
+    full: bool = False
+) -> str:
+    """
+    Recalculate the workbook, one sheet or one range and report the time taken.
+    
+    Args:
+        session_id: Session ID from open_workbook (required)
+        sheet_name: Limit recalculation to this sheet (optional)
+        target_range: Limit recalculation to this range on sheet_name (e.g., "A1:F200")
+        full: Rebuild and recalculate every formula in the workbook (slow; ignores scope)
+    """
+    try:
+        session = get_validated_session(session_id)
+        if isinstance(session, str):  # Error message returned
+            return session
+        
+        with session.lock:
+            from xlwings_mcp.xlwings_impl.calculations_xlw import recalculate_xlw_with_wb
+            result = recalculate_xlw_with_wb(session.workbook, sheet_name, target_range, full)
+            session.record_calculation()
+            if "error" not in result:
+                session.mark_calculated(complete=result["scope"] in ("workbook", "full"))
+        
+        if "error" in result:
+            return f"Error: {result['error']}"
+        import json
+        return json.dumps(result, indent=2, default=str, ensure_ascii=False)
+        
+    except (ValidationError, CalculationError) as e:
+        return f"Error: {str(e)}"
+    except Exception as e:
+        logger.error("Error recalculating: %s", e)
+        raise
+
+@mcp.tool()
+def format_range(
+    sheet_name: str,
+    start_cell: str,
+    session_id: Optional[str] = None,
+    filepath: Optional[str] = None,
+    end_cell: Optional[str] = None,
+    bold: bool = False,
+    italic: bool = False,
+    underline: bool = False,
+    font_size: Optional[int] = None,
+    font_color: Optional[str] = None,
+    bg_color: Optional[str] = None,
+    border_style: Optional[str] = None,
+    border_color: Optional[str] = None,
+    number_format: Optional[str] = None,
+    alignment: Optional[str] = None,
+    wrap_text: bool = False,
+    merge_cells: bool = False,
+    protection: Optional[Dict[str, Any]] = None,
+    conditional_format: Optional[Dict[str, Any]] = None
+) -> str:
+    """
+    Apply formatting to a range of cells.
+    
+    Args:
+        sheet_name: Name of worksheet
+        start_cell: Starting cell
+        session_id: Session ID from open_workbook (preferred)
+        filepath: Path to Excel file (legacy, deprecated)
+        end_cell: Ending cell (optional)
+        bold: Apply bold formatting
+        italic: Apply italic formatting
+        underline: Apply underline formatting
+        font_size: Font size
+        font_color: Font color
+        bg_color: Background color
+        border_style: Border style
+        border_color: Border color
+        number_format: Number format
+        alignment: Text alignment
+        wrap_text: Enable text wrapping
+        merge_cells: Merge cells in range
+        protection: Cell protection settings (optional)
+        conditional_format: Conditional formatting settings (optional)
+        
+    Note: Use session_id for better performance. filepath parameter is deprecated.
+    """
+    try:
+        with tool_session(session_id, filepath) as session:
+            if isinstance(session, str):
+                return session
+            from xlwings_mcp.xlwings_impl.formatting_xlw import format_range_xlw_with_wb
+            result = format_range_xlw_with_wb(
+                session.workbook,
+                sheet_name=sheet_name,
+                start_cell=start_cell,
+                end_cell=end_cell,
+                bold=bold,
+                italic=italic,
+                underline=underline,
+                font_size=font_size,
+                font_color=font_color,
+                bg_color=bg_color,
+                border_style=border_style,
+                border_color=border_color,
+                number_format=number_format,
+                alignment=alignment,
+                wrap_text=wrap_text,
+                merge_cells=merge_cells
+            )
+            session.mark_changed()
+            if "error" not in result:
+                # A number format changes how values read back (e.g. dates); merging clears cells
+                patch_value_snapshot(session, sheet_name if number_format or merge_cells else None)
+        
+        return result.get("message", "Range formatted successfully") if "error" not in result else f"Error: {result['error']}"
+    except (ValidationError, FormattingError) as e:
+        return f"Error: {str(e)}"
+    except Exception as e:
+        logger.error("Error formatting range: %s", e)
+        raise
+
+@mcp.tool()
+def read_data_from_excel(
+    session_id: str,
+    sheet_name: str,
+    start_cell: Optional[str] = None,
+    end_cell: Optional[str] = None,
+    preview_only: bool = False
+) -> str:
+    """
+    Read data from Excel worksheet with cell metadata including validation rules.
+    
+    Args:
+        session_id: Session ID from open_workbook (required)
+        sheet_name: Name of worksheet
+        start_cell: Starting cell (default A1)
+        end_cell: Ending cell (optional, auto-expands if not provided)
+        preview_only: Whether to return preview only
+    """
+    try:
+        # Validate session using centralized helper
+        session = get_validated_session(session_id)
+        if isinstance(session, str):  # Error message returned
+            return session
+            
+        from xlwings_mcp.xlwings_impl.data_xlw import cell_records, read_data_from_excel_xlw_with_wb
+
+        if start_cell and end_cell:
+            # Explicit block: serve it from the session's value snapshot
+            from xlwings_mcp.exceptions import FormulaParseError
+            from xlwings_mcp.formula.parser import MAX_COLS, MAX_ROWS, split_cell
+            try:
+                (row1, col1), (row2, col2) = split_cell(start_cell), split_cell(end_cell)
+            except FormulaParseError:
+                row1 = row2 = col1 = col2 = 0
+            if min(row1, row2, col1, col2) >= 1 and max(row1, row2) <= MAX_ROWS and max(col1, col2) <= MAX_COLS:
+                r1, c1, r2, c2 = min(row1, row2), min(col1, col2), max(row1, row2), max(col1, col2)
+                
+                def render(values):
+                    import json
+                    result = cell_records(sheet_name, r1, c1, values)
+                    METRICS.add_cells(len(result["cells"]))
+                    return json.dumps(result, indent=2, default=str, ensure_ascii=False)
+                result = read_block(session, ("read_data_from_excel", sheet_name, r1, c1, r2, c2), sheet_name, r1, c1, r2, c2, render)
+                if result is not None:
+                    return result
+        
+        def read():
+            ensure_calculated(session)
+            return read_data_from_excel_xlw_with_wb(session.workbook, sheet_name, start_cell, end_cell, preview_only)
+        return read_through(session, ("read_data_from_excel", sheet_name, start_cell, end_cell, preview_only), read)
+        
+    except (ValidationError, DataError) as e:
+        return f"Error: {str(e)}"
+    except Exception as e:
+        logger.error("Error reading data: %s", e)
+        raise
+
+def get_columnar_table(session, sheet_name: str, data_range: Optional[str], header: bool):
+    """
+    Return a cached columnar copy of a range, reading it from Excel if the
+    workbook changed since the last read. A cached copy is returned under the
+    shared lock; reading from Excel takes session.lock exclusively.
+    
+    Returns:
+        Read result dict with "table" and "cached", or with "error"
+    """
+    from xlwings_mcp.xlwings_impl.query_xlw import cached_columnar_table, read_columnar_xlw_with_wb
+    with session.lock.shared():
+        table = cached_columnar_table(session.columnar_cache, sheet_name, data_range, header, session.read_token())
+    if table is not None:
+        return {"table": table, "cached": True}
+    with session.lock:
+        ensure_calculated(session)
+        return read_columnar_xlw_with_wb(
+            session.workbook,
+            sheet_name,
+            data_range,
+            header,
+            cache=session.columnar_cache,
+            change_token=session.read_token()
+        )
+
+@mcp.tool()
+def aggregate_range(
+    session_id: str,
+    sheet_name: str,
+    values: List[str],
+    group_by: Optional[List[str]] = None,
+    agg_funcs: Optional[List[str]] = None,
+    data_range: Optional[str] = None,
+    header: bool = True,
+    sort_by: Optional[str] = None,
+    descending: bool = False,
+    limit: Optional[int] = None
+) -> str:
+    """
+    Summarize a range by group (like a pivot table) without modifying the workbook.
+    
+    The range is read from Excel once and cached until the workbook changes,
+    so follow-up summaries of the same range do not touch Excel.
+    
+    Args:
+        session_id: Session ID from open_workbook (required)
+        sheet_name: Name of worksheet
+        values: Columns to aggregate (header names, or column letters)
+        group_by: Columns to group by (omit for grand totals)
+        agg_funcs: Aggregations per value column: sum, count, mean/average, min, max,
+            count_distinct (default ["sum"])
+        data_range: Source range including the header row (default: used range)
+        header: Whether the first row holds column names
+        sort_by: Output column to sort by (e.g., "sum(Sales)")
+        descending: Sort in descending order
+        limit: Maximum number of groups to return
+    """
+    try:
+        session = get_validated_session(session_id)
+        if isinstance(session, str):  # Error message returned
+            return session
+        
+        read = get_columnar_table(session, sheet_name, data_range, header)
+        if "error" in read:
+            return f"Error: {read['error']}"
+        
+        from xlwings_mcp.columnar import aggregate
+        table = read["table"]
+        started = time.perf_counter()
+        result = aggregate(table, group_by, values, agg_funcs, sort_by, descending, limit)
+        result["source"] = f"{sheet_name}!{table.address}"
+        result["cached"] = read["cached"]
+        result["read_ms"] = 0.0 if read["cached"] else table.read_ms
+        result["aggregate_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        
+        import json
+        return json.dumps(result, indent=2, default=str, ensure_ascii=False)
+        
+    except (ValidationError, DataError) as e:
+        return f"Error: {str(e)}"
+    except Exception as e:
+        logger.error("Error aggregating range: %s", e)
+        raise
+
+@mcp.tool()
+def query_range(
+    session_id: str,
+    sheet_name: str,
+    where: Optional[List[Dict[str, Any]]] = None,
+    columns: Optional[List[str]] = None,
+    sort_by: Optional[List[str]] = None,
+    descending: bool = False,
+    limit: Optional[int] = 100,
+    offset: int = 0,
+    data_range: Optional[str] = None,
+    header: bool = True
+) -> str:
+    """
+    Return only the rows of a table that match a filter, evaluated server-side.
+    
+    The range is read from Excel once and cached until the workbook changes,
+    so repeated queries on the same table do not touch Excel.
+    
+    Args:
+        session_id: Session ID from open_workbook (required)
+        sheet_name: Name of worksheet
+        where: Conditions that must all hold, e.g. [{"column": "Region", "op": "==", "value": "East"},
+            {"column": "Sales", "op": ">=", "value": 1000}]. Operators: ==, !=, >, >=, <, <=,
+            in, not_in, between ([low, high]), contains, startswith, endswith, is_empty, not_empty
+        columns: Columns to return (default: all)
+        sort_by: Columns to sort by, in priority order
+        descending: Sort in descending order
+        limit: Maximum number of rows to return (None for all)
+        offset: Number of matching rows to skip
+        data_range: Source range including the header row (default: used range)
+        header: Whether the first row holds column names
+    """
+    try:
+        session = get_validated_session(session_id)
+        if isinstance(session, str):  # Error message returned
+            return session
+        
+        read = get_columnar_table(session, sheet_name, data_range, header)
+        if "error" in read:
+            return f"Error: {read['error']}"
+        
+        from xlwings_mcp.columnar import query
+        table = read["table"]
+        started = time.perf_counter()
+        result = query(table, where, columns, sort_by, descending, limit, offset)
+        result["source"] = f"{sheet_name}!{table.address}"
+        result["cached"] = read["cached"]
+        result["read_ms"] = 0.0 if read["cached"] else table.read_ms
+        result["query_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        
+        import json
+        return json.dumps(result, indent=2, default=str, ensure_ascii=False)
+        
+    except (ValidationError, DataError) as e:
+        return f"Error: {str(e)}"
+    except Exception as e:
+        logger.error("Error querying range: %s", e)
+        raise
+
+def get_column_index(session, sheet_name: str, key_column: str):
+    """
+    Return the session's index on a key column, rebuilding it if a structural
+    change (or, for formula keys, any change) made it stale.
+    Must be called while holding session.lock.
+    
+    Returns:
+        ColumnIndex, or an error message string
+    """
+    for position, index in enumerate(session.column_indexes):
+        if index.sheet.lower() != sheet_name.lower() or not (
+            index.matches(key_column) or index.spec[0].lower() == str(key_column).strip().lower()
+        ):
+            continue
+        stale = index.structure_token != session.structure_token or (
+            index.has_formulas and index.change_token != session.change_token
+        )
+        if not stale:
+            return index
+        ensure_calculated(session)
+        from xlwings_mcp.xlwings_impl.lookup_xlw import build_column_index_xlw_with_wb
+        result = build_column_index_xlw_with_wb(session.workbook, sheet_name, *index.spec)
+        if "error" in result:
+            del session.column_indexes[position]
+            return f"Error: Index on '{key_column}' could not be rebuilt: {result['error']}"
+        rebuilt = result["index"]
+        rebuilt.structure_token = session.structure_token
+        rebuilt.change_token = session.change_token
+        session.column_indexes[position] = rebuilt
+        return rebuilt
+    return (
+        f"Error: No index on column '{key_column}' of sheet '{sheet_name}'. "
+        f"Create one with create_column_index() first."
+    )
+
+@mcp.tool()
+def create_column_index(
+    session_id: str,
+    sheet_name: str,
+    key_column: str,
+    table_name: Optional[str] = None,
+    header_row: Optional[int] = 1
+) -> str:
+    """
+    Build an index on a key column (e.g., InvoiceID) for fast lookup_rows() queries.
+    
+    The column is read from Excel once; writes and row/column inserts or deletes
+    made through this server keep the index current.
+    
+    Args:
+        session_id: Session ID from open_workbook (required)
+        sheet_name: Name of worksheet
+        key_column: Header name or column letter of the key column
+        table_name: Excel table to index instead of the sheet's used range
+        header_row: Row holding the column names (0 if the sheet has no header row)
+    """
+    try:
+        session = get_validated_session(session_id)
+        if isinstance(session, str):  # Error message returned
+            return session
+        
+        with session.lock:
+            ensure_calculated(session)
+            from xlwings_mcp.xlwings_impl.lookup_xlw import build_column_index_xlw_with_wb
+            result = build_column_index_xlw_with_wb(session.workbook, sheet_name, key_column, table_name, header_row)
+            if "error" in result:
+                return f"Error: {result['error']}"
+            
+            index = result["index"]
+            index.structure_token = session.structure_token
+            index.change_token = session.change_token
+            session.column_indexes = [
+                existing for existing in session.column_indexes
+                if existing.sheet.lower() != index.sheet.lower() or existing.column != index.column
+            ]
+            session.column_indexes.append(index)
+            stats = index.stats()
+        
+        import json
+        return json.dumps(stats, indent=2, default=str, ensure_ascii=False)
+        
+    except (ValidationError, DataError) as e:
+        return f"Error: {str(e)}"
+    except Exception as e:
+        logger.error("Error creating column index: %s", e)
+        raise
+
+@mcp.tool()
+def lookup_rows(
+    session_id: str,
+    sheet_name: str,
+    key_column: str,
+    value: Optional[Any] = None,
+    values: Optional[List[Any]] = None,
+    low: Optional[Any] = None,
+    high: Optional[Any] = None,
+    limit: int = 100
+) -> str:
+    """
+    Find rows by key using an index from create_column_index().
+    
+    Equality lookups (value/values) are hash lookups; range lookups (low/high,
+    inclusive) use a sorted view. Only the matching rows are read from Excel.
+    
+    Args:
+        session_id: Session ID from open_workbook (required)
+        sheet_name: Name of worksheet
+        key_column: Indexed column (header name or column letter)
+        value: Key to find
+        values: Several keys to find
+        low: Lower bound of a key range
+        high: Upper bound of a key range
+        limit: Maximum number of rows to return
+    """
+    try:
+        session = get_validated_session(session_id)
+        if isinstance(session, str):  # Error message returned
+            return session
+        if value is None and not values and low is None and high is None:
+            return "Error: Provide value, values, or low/high"
+        
+        with session.lock:
+            index = get_column_index(session, sheet_name, key_column)
+            if isinstance(index, str):
+                return index
+            if value is not None or values:
+                rows = index.find(([value] if value is not None else []) + list(values or []))
+            else:
+                rows = index.find_range(low, high)
+            
+            from xlwings_mcp.xlwings_impl.lookup_xlw import read_index_rows_xlw_with_wb
+            result = read_index_rows_xlw_with_wb(session.workbook, index, rows[:limit])
+        
+        if "error" in result:
+            return f"Error: {result['error']}"
+        result["matched"] = len(rows)
+        if len(rows) > limit:
+            result["truncated"] = True
+        import json
+        return json.dumps(result, indent=2, default=str, ensure_ascii=False)
+        
+    except (ValidationError, DataError) as e:
+        return f"Error: {str(e)}"
+    except Exception as e:
+        logger.error("Error looking up rows: %s", e)
+        raise
+
+@mcp.tool()
+def write_data_to_excel(
+    session_id: str,
+    sheet_name: str,
+    data: List[List],
+    start_cell: Optional[str] = None
+) -> str:
+    """
+    Write data to Excel worksheet.
+    Excel formula will write to cell without any verification.
+
+    Args:
+        session_id: Session ID from open_workbook (required)
+        sheet_name: Name of worksheet to write to
+        data: List of lists containing data to write to the worksheet, sublists are assumed to be rows
+        start_cell: Cell to start writing to (optional, auto-finds appropriate location)
+    """
+    try:
+        # Validate session using centralized helper
+        session = get_validated_session(session_id)
+        if isinstance(session, str):  # Error message returned
+            return session
+            
+        with session.lock:
+            from xlwings_mcp.xlwings_impl.data_xlw import write_data_to_excel_xlw_with_wb
+            result = write_data_to_excel_xlw_with_wb(session.workbook, sheet_name, data, start_cell)
+            session.mark_changed()
+            if "error" not in result:
+                refresh_dependency_index(session, sheet_name, result.get("range"))
+                refresh_column_indexes(session, sheet_name, result.get("range"))
+                patch_value_snapshot(session, sheet_name, lambda sheet: sheet.values_written(*block_bounds(result["range"])[:2], data))
+        
+        return result.get("message", "Data written successfully") if "error" not in result else f"Error: {result['error']}"
+            
+    except (ValidationError, DataError) as e:
+        return f"Error: {str(e)}"
+    except Exception as e:
+        logger.error("Error writing data: %s", e)
+        raise
+
 @mcp.tool()
 def create_workbook(
     session_id: Optional[str] = None,
@@ -525,6 +1413,7 @@ def create_workbook(
             with session.lock:
                 from xlwings_mcp.xlwings_impl.workbook_xlw import create_workbook_xlw_with_wb
                 result = create_workbook_xlw_with_wb(session.workbook)
+                session.mark_changed()
                 return result.get("message", "Workbook created successfully") if "error" not in result else f"Error: {result['error']}"
         elif filepath:
             # Legacy API: backwards compatibility
@@ -542,7 +1431,7 @@ def create_workbook(
     except WorkbookError as e:
         return f"Error: {str(e)}"
     except Exception as e:
-        logger.error(f"Error creating workbook: {e}")
+        logger.error("Error creating workbook: %s", e)
         raise
 
 @mcp.tool()
@@ -566,13 +1455,16 @@ def create_worksheet(
         with session.lock:
             from xlwings_mcp.xlwings_impl.sheet_xlw import create_worksheet_xlw_with_wb
             result = create_worksheet_xlw_with_wb(session.workbook, sheet_name)
+            session.mark_changed(structure=True)
+            if "error" not in result:
+                patch_value_snapshot(session)
         
         return result.get("message", "Worksheet created successfully") if "error" not in result else f"Error: {result['error']}"
         
     except (ValidationError, WorkbookError) as e:
         return f"Error: {str(e)}"
     except Exception as e:
-        logger.error(f"Error creating worksheet: {e}")
+        logger.error("Error creating worksheet: %s", e)
         raise
 
 @mcp.tool()
@@ -604,35 +1496,12 @@ def create_chart(
     Note: Use session_id for better performance. filepath parameter is deprecated.
     """
     try:
-        # Support both new (session_id) and old (filepath) API
-        if session_id:
-            # New API: use session
-            session = SESSION_MANAGER.get_session(session_id)
-            if not session:
-                return ERROR_TEMPLATES['SESSION_NOT_FOUND'].format(
-                    session_id=session_id, 
-                    ttl=10  # Default TTL is 10 minutes (600 seconds)
-                )
-            
-            with session.lock:
-                from xlwings_mcp.xlwings_impl.advanced_xlw import create_chart_xlw_with_wb
-                result = create_chart_xlw_with_wb(
-                    session.workbook,
-                    sheet_name=sheet_name,
-                    data_range=data_range,
-                    chart_type=chart_type,
-                    target_cell=target_cell,
-                    title=title,
-                    x_axis=x_axis,
-                    y_axis=y_axis
-                )
-        elif filepath:
-            # Legacy API: backwards compatibility
-            logger.warning("Using deprecated filepath parameter. Please use session_id instead.")
-            full_path = get_excel_path(filepath)
-            from xlwings_mcp.xlwings_impl.advanced_xlw import create_chart_xlw
-            result = create_chart_xlw(
-                filepath=full_path,
+        with tool_session(session_id, filepath) as session:
+            if isinstance(session, str):
+                return session
+            from xlwings_mcp.xlwings_impl.advanced_xlw import create_chart_xlw_with_wb
+            result = create_chart_xlw_with_wb(
+                session.workbook,
                 sheet_name=sheet_name,
                 data_range=data_range,
                 chart_type=chart_type,
@@ -641,18 +1510,70 @@ def create_chart(
                 x_axis=x_axis,
                 y_axis=y_axis
             )
-        else:
-            return ERROR_TEMPLATES['PARAMETER_MISSING'].format(
-                param1='session_id',
-                param2='filepath'
-            )
+            session.mark_changed()
+            patch_value_snapshot(session)
         
         return result.get("message", "Chart created successfully") if "error" not in result else f"Error: {result['error']}"
         
     except (ValidationError, ChartError) as e:
         return f"Error: {str(e)}"
     except Exception as e:
-        logger.error(f"Error creating chart: {e}")
+        logger.error("Error creating chart: %s", e)
+        raise
+
+@mcp.tool()
+def create_charts(
+    session_id: str,
+    sheet_name: str,
+    charts: List[Dict[str, Any]],
+    anchor_cell: Optional[str] = None,
+    columns: int = 2,
+    chart_width: float = 480,
+    chart_height: float = 288
+) -> str:
+    """
+    Create several charts in one call, laid out in a grid, with a single save.
+    
+    Args:
+        session_id: Session ID from open_workbook (required)
+        sheet_name: Worksheet the charts are placed on
+        charts: Chart specs, e.g. [{"data_range": "Data!A1:B13", "chart_type": "line",
+            "title": "Revenue", "x_axis": "Month", "y_axis": "USD"}]. Optional "target_cell"
+            overrides the grid position.
+        anchor_cell: Top-left cell of the grid (default: right of the used range)
+        columns: Charts per grid row
+        chart_width: Width of each chart in points
+        chart_height: Height of each chart in points
+    """
+    try:
+        session = get_validated_session(session_id)
+        if isinstance(session, str):  # Error message returned
+            return session
+        
+        with session.lock:
+            from xlwings_mcp.xlwings_impl.advanced_xlw_with_wb import create_charts_xlw_with_wb
+            result = create_charts_xlw_with_wb(
+                session.workbook,
+                sheet_name,
+                charts,
+                anchor_cell=anchor_cell,
+                columns=columns,
+                chart_width=chart_width,
+                chart_height=chart_height
+            )
+            if result.get("charts"):
+                session.mark_changed()
+                patch_value_snapshot(session)
+        
+        import json
+        if "error" in result:
+            return f"Error: {json.dumps(result, default=str, ensure_ascii=False)}" if "errors" in result else f"Error: {result['error']}"
+        return json.dumps(result, indent=2, default=str, ensure_ascii=False)
+        
+    except (ValidationError, ChartError) as e:
+        return f"Error: {str(e)}"
+    except Exception as e:
+        logger.error("Error creating charts: %s", e)
         raise
 
 @mcp.tool()
@@ -688,37 +1609,12 @@ def create_pivot_table(
     Note: Use session_id for better performance. filepath parameter is deprecated.
     """
     try:
-        # Support both new (session_id) and old (filepath) API
-        if session_id:
-            # New API: use session
-            session = SESSION_MANAGER.get_session(session_id)
-            if not session:
-                return ERROR_TEMPLATES['SESSION_NOT_FOUND'].format(
-                    session_id=session_id, 
-                    ttl=10  # Default TTL is 10 minutes (600 seconds)
-                )
-            
-            with session.lock:
-                from xlwings_mcp.xlwings_impl.advanced_xlw import create_pivot_table_xlw_with_wb
-                result = create_pivot_table_xlw_with_wb(
-                    session.workbook,
-                    sheet_name=sheet_name,
-                    data_range=data_range,
-                    rows=rows,
-                    values=values,
-                    columns=columns,
-                    agg_func=agg_func,
-                    target_sheet=target_sheet,
-                    target_cell=target_cell,
-                    pivot_name=pivot_name
-                )
-        elif filepath:
-            # Legacy API: backwards compatibility
-            logger.warning("Using deprecated filepath parameter. Please use session_id instead.")
-            full_path = get_excel_path(filepath)
-            from xlwings_mcp.xlwings_impl.advanced_xlw import create_pivot_table_xlw
-            result = create_pivot_table_xlw(
-                filepath=full_path,
+        with tool_session(session_id, filepath) as session:
+            if isinstance(session, str):
+                return session
+            from xlwings_mcp.xlwings_impl.advanced_xlw import create_pivot_table_xlw_with_wb
+            result = create_pivot_table_xlw_with_wb(
+                session.workbook,
                 sheet_name=sheet_name,
                 data_range=data_range,
                 rows=rows,
@@ -727,13 +1623,10 @@ def create_pivot_table(
                 agg_func=agg_func,
                 target_sheet=target_sheet,
                 target_cell=target_cell,
-                pivot_name=pivot_name
-            )
-        else:
-            return ERROR_TEMPLATES['PARAMETER_MISSING'].format(
-                param1='session_id',
-                param2='filepath'
+                pivot_name=pivot_name,
+                pivot_caches=session.pivot_caches
             )
+            session.mark_changed(structure=True)
         
         # Handle warnings in response
         if "warnings" in result and result["warnings"]:
@@ -745,7 +1638,59 @@ def create_pivot_table(
     except (ValidationError, PivotError) as e:
         return f"Error: {str(e)}"
     except Exception as e:
-        logger.error(f"Error creating pivot table: {e}")
+        logger.error("Error creating pivot table: %s", e)
+        raise
+
+@mcp.tool()
+def create_pivot_tables(
+    session_id: str,
+    sheet_name: str,
+    data_range: str,
+    pivots: List[Dict[str, Any]],
+    target_sheet: Optional[str] = None
+) -> str:
+    """
+    Create several pivot tables from one source range sharing a single pivot cache.
+    
+    Pivots are laid out with updates suspended and the shared cache is refreshed
+    once at the end; the workbook is saved once.
+    
+    Args:
+        session_id: Session ID from open_workbook (required)
+        sheet_name: Name of worksheet containing source data
+        data_range: Source data range (e.g., "A1:E100" or "Sheet2!A1:E100")
+        pivots: Pivot specs, e.g. [{"rows": ["Region"], "values": ["Sales"], "agg_func": "sum"},
+            {"rows": ["Month"], "columns": ["Region"], "values": ["Units"]}]. Optional keys:
+            columns, agg_func, target_sheet, target_cell, pivot_name
+        target_sheet: Sheet for pivots without their own target_sheet (default: new sheet per pivot)
+    """
+    try:
+        session = get_validated_session(session_id)
+        if isinstance(session, str):  # Error message returned
+            return session
+        
+        with session.lock:
+            from xlwings_mcp.xlwings_impl.advanced_xlw_with_wb import create_pivot_tables_xlw_with_wb
+            result = create_pivot_tables_xlw_with_wb(
+                session.workbook,
+                sheet_name,
+                data_range,
+                pivots,
+                target_sheet=target_sheet,
+                pivot_caches=session.pivot_caches
+            )
+            if result.get("pivots"):
+                session.mark_changed(structure=True)
+        
+        if "error" in result:
+            return f"Error: {result['error']}"
+        import json
+        return json.dumps(result, indent=2, default=str, ensure_ascii=False)
+        
+    except (ValidationError, PivotError) as e:
+        return f"Error: {str(e)}"
+    except Exception as e:
+        logger.error("Error creating pivot tables: %s", e)
         raise
 
 @mcp.tool()
@@ -771,49 +1716,107 @@ def create_table(
     Note: Use session_id for better performance. filepath parameter is deprecated.
     """
     try:
-        # Support both new (session_id) and old (filepath) API
-        if session_id:
-            # New API: use session
-            session = SESSION_MANAGER.get_session(session_id)
-            if not session:
-                return ERROR_TEMPLATES['SESSION_NOT_FOUND'].format(
-                    session_id=session_id, 
-                    ttl=10  # Default TTL is 10 minutes (600 seconds)
-                )
-            
-            with session.lock:
-                from xlwings_mcp.xlwings_impl.advanced_xlw import create_table_xlw_with_wb
-                result = create_table_xlw_with_wb(
-                    session.workbook,
-                    sheet_name=sheet_name,
-                    data_range=data_range,
-                    table_name=table_name,
-                    table_style=table_style
-                )
-        elif filepath:
-            # Legacy API: backwards compatibility
-            logger.warning("Using deprecated filepath parameter. Please use session_id instead.")
-            full_path = get_excel_path(filepath)
-            from xlwings_mcp.xlwings_impl.advanced_xlw import create_table_xlw
-            result = create_table_xlw(
-                filepath=full_path,
+        with tool_session(session_id, filepath) as session:
+            if isinstance(session, str):
+                return session
+            from xlwings_mcp.xlwings_impl.advanced_xlw_with_wb import create_table_xlw_with_wb
+            result = create_table_xlw_with_wb(
+                session.workbook,
                 sheet_name=sheet_name,
                 data_range=data_range,
                 table_name=table_name,
                 table_style=table_style
             )
-        else:
-            return ERROR_TEMPLATES['PARAMETER_MISSING'].format(
-                param1='session_id',
-                param2='filepath'
-            )
+            session.mark_changed()
+            session.table_inventory.clear()
+        
+        return result.get("message", "Table created successfully") if "error" not in result else f"Error: {result['error']}"
+        
+    except DataError as e:
+        return f"Error: {str(e)}"
+    except Exception as e:
+        logger.error("Error creating table: %s", e)
+        raise
+
+@mcp.tool()
+def read_table(
+    session_id: str,
+    table_name: str,
+    columns: Optional[List[str]] = None
+) -> str:
+    """
+    Read an Excel table (ListObject) by name: header and all data rows in one call.
+    
+    Args:
+        session_id: Session ID from open_workbook (required)
+        table_name: Name of the table (any sheet)
+        columns: Header names to return (default: all columns)
+    """
+    try:
+        session = get_validated_session(session_id)
+        if isinstance(session, str):  # Error message returned
+            return session
+        
+        from xlwings_mcp.xlwings_impl.table_xlw import read_table_xlw_with_wb
+        
+        def read():
+            ensure_calculated(session)
+            return read_table_xlw_with_wb(session.workbook, table_name, columns, inventory=session.table_inventory)
+        result = read_through(session, ("read_table", table_name.lower(), tuple(columns or ())), read)
+        
+        if "error" in result:
+            return f"Error: {result['error']}"
+        import json
+        return json.dumps(result, indent=2, default=str, ensure_ascii=False)
+        
+    except (ValidationError, DataError) as e:
+        return f"Error: {str(e)}"
+    except Exception as e:
+        logger.error("Error reading table: %s", e)
+        raise
+
+@mcp.tool()
+def append_table_rows(
+    session_id: str,
+    table_name: str,
+    rows: List[Any]
+) -> str:
+    """
+    Append rows to the bottom of an Excel table, growing the table to include them.
+    
+    Calculated columns (formula columns) fill automatically and should be left out
+    or set to null.
+    
+    Args:
+        session_id: Session ID from open_workbook (required)
+        table_name: Name of the table (any sheet)
+        rows: Rows as lists in column order, or objects keyed by header name,
+            e.g. [["2024-05-01", "East", 120]] or [{"Date": "2024-05-01", "Sales": 120}]
+    """
+    try:
+        session = get_validated_session(session_id)
+        if isinstance(session, str):  # Error message returned
+            return session
         
-        return result.get("message", "Table created successfully") if "error" not in result else f"Error: {result['error']}"
+        with session.lock:
+            from xlwings_mcp.xlwings_impl.table_xlw import append_table_rows_xlw_with_wb
+            result = append_table_rows_xlw_with_wb(session.workbook, table_name, rows, inventory=session.table_inventory)
+            if "error" not in result:
+                session.mark_changed()
+                refresh_dependency_index(session, result["sheet"], result["range"])
+                refresh_column_indexes(session, result["sheet"], result["range"])
         
-    except DataError as e:
+        if "error" in result:
+            return f"Error: {result['error']}"
+        message = f"{result['message']} ({result['range']})"
+        if result["calculated_columns"]:
+            message += f"; calculated columns filled: {', '.join(result['calculated_columns'])}"
+        return message
+        
+    except (ValidationError, DataError) as e:
         return f"Error: {str(e)}"
     except Exception as e:
-        logger.error(f"Error creating table: {e}")
+        logger.error("Error appending table rows: %s", e)
         raise
 
 @mcp.tool()
@@ -839,13 +1842,16 @@ def copy_worksheet(
         with session.lock:
             from xlwings_mcp.xlwings_impl.sheet_xlw import copy_worksheet_xlw_with_wb
             result = copy_worksheet_xlw_with_wb(session.workbook, source_sheet, target_sheet)
+            session.mark_changed(structure=True)
+            if "error" not in result:
+                patch_value_snapshot(session)
         
         return result.get("message", "Worksheet copied successfully") if "error" not in result else f"Error: {result['error']}"
         
     except (ValidationError, SheetError) as e:
         return f"Error: {str(e)}"
     except Exception as e:
-        logger.error(f"Error copying worksheet: {e}")
+        logger.error("Error copying worksheet: %s", e)
         raise
 
 @mcp.tool()
@@ -869,13 +1875,16 @@ def delete_worksheet(
         with session.lock:
             from xlwings_mcp.xlwings_impl.sheet_xlw import delete_worksheet_xlw_with_wb
             result = delete_worksheet_xlw_with_wb(session.workbook, sheet_name)
+            session.mark_changed(structure=True)
+            if "error" not in result:
+                patch_value_snapshot(session, sheet_name)
         
         return result.get("message", "Worksheet deleted successfully") if "error" not in result else f"Error: {result['error']}"
         
     except (ValidationError, SheetError) as e:
         return f"Error: {str(e)}"
     except Exception as e:
-        logger.error(f"Error deleting worksheet: {e}")
+        logger.error("Error deleting worksheet: %s", e)
         raise
 
 @mcp.tool()
@@ -901,13 +1910,16 @@ def rename_worksheet(
         with session.lock:
             from xlwings_mcp.xlwings_impl.sheet_xlw import rename_worksheet_xlw_with_wb
             result = rename_worksheet_xlw_with_wb(session.workbook, old_name, new_name)
+            session.mark_changed(structure=True)
+            if "error" not in result:
+                patch_value_snapshot(session, old_name, lambda sheet: sheet.renamed(new_name))
         
         return result.get("message", "Worksheet renamed successfully") if "error" not in result else f"Error: {result['error']}"
         
     except (ValidationError, SheetError) as e:
         return f"Error: {str(e)}"
     except Exception as e:
-        logger.error(f"Error renaming worksheet: {e}")
+        logger.error("Error renaming worksheet: %s", e)
         raise
 
 @mcp.tool()
@@ -928,9 +1940,11 @@ def get_workbook_metadata(
         if isinstance(session, str):  # Error message returned
             return session
             
-        with session.lock:
-            from xlwings_mcp.xlwings_impl.workbook_xlw import get_workbook_metadata_xlw_with_wb
-            result = get_workbook_metadata_xlw_with_wb(session.workbook, include_ranges=include_ranges)
+        from xlwings_mcp.xlwings_impl.workbook_xlw import get_workbook_metadata_xlw_with_wb
+        result = read_through(
+            session, ("get_workbook_metadata", include_ranges),
+            lambda: get_workbook_metadata_xlw_with_wb(session.workbook, include_ranges=include_ranges)
+        )
         
         if "error" in result:
             return f"Error: {result['error']}"
@@ -940,7 +1954,7 @@ def get_workbook_metadata(
     except (ValidationError, WorkbookError) as e:
         return f"Error: {str(e)}"
     except Exception as e:
-        logger.error(f"Error getting workbook metadata: {e}")
+        logger.error("Error getting workbook metadata: %s", e)
         raise
 
 @mcp.tool()
@@ -964,36 +1978,20 @@ def merge_cells(
     Note: Use session_id for better performance. filepath parameter is deprecated.
     """
     try:
-        # Support both new (session_id) and old (filepath) API
-        if session_id:
-            # New API: use session
-            session = SESSION_MANAGER.get_session(session_id)
-            if not session:
-                return ERROR_TEMPLATES['SESSION_NOT_FOUND'].format(
-                    session_id=session_id, 
-                    ttl=10  # Default TTL is 10 minutes (600 seconds)
-                )
-            
-            with session.lock:
-                from xlwings_mcp.xlwings_impl.range_xlw import merge_cells_xlw_with_wb
-                result = merge_cells_xlw_with_wb(session.workbook, sheet_name, start_cell, end_cell)
-        elif filepath:
-            # Legacy API: backwards compatibility
-            logger.warning("Using deprecated filepath parameter. Please use session_id instead.")
-            full_path = get_excel_path(filepath)
-            from xlwings_mcp.xlwings_impl.range_xlw import merge_cells_xlw
-            result = merge_cells_xlw(full_path, sheet_name, start_cell, end_cell)
-        else:
-            return ERROR_TEMPLATES['PARAMETER_MISSING'].format(
-                param1='session_id',
-                param2='filepath'
-            )
+        with tool_session(session_id, filepath) as session:
+            if isinstance(session, str):
+                return session
+            from xlwings_mcp.xlwings_impl.range_xlw import merge_cells_xlw_with_wb
+            result = merge_cells_xlw_with_wb(session.workbook, sheet_name, start_cell, end_cell)
+            session.mark_changed(structure=True)
+            if "error" not in result:
+                patch_value_snapshot(session, sheet_name, lambda sheet: sheet.overwritten(*block_bounds(f"{start_cell}:{end_cell}")))
         
         return result.get("message", "Cells merged successfully") if "error" not in result else f"Error: {result['error']}"
     except (ValidationError, SheetError) as e:
         return f"Error: {str(e)}"
     except Exception as e:
-        logger.error(f"Error merging cells: {e}")
+        logger.error("Error merging cells: %s", e)
         raise
 
 @mcp.tool()
@@ -1017,36 +2015,20 @@ def unmerge_cells(
     Note: Use session_id for better performance. filepath parameter is deprecated.
     """
     try:
-        # Support both new (session_id) and old (filepath) API
-        if session_id:
-            # New API: use session
-            session = SESSION_MANAGER.get_session(session_id)
-            if not session:
-                return ERROR_TEMPLATES['SESSION_NOT_FOUND'].format(
-                    session_id=session_id, 
-                    ttl=10  # Default TTL is 10 minutes (600 seconds)
-                )
-            
-            with session.lock:
-                from xlwings_mcp.xlwings_impl.range_xlw import unmerge_cells_xlw_with_wb
-                result = unmerge_cells_xlw_with_wb(session.workbook, sheet_name, start_cell, end_cell)
-        elif filepath:
-            # Legacy API: backwards compatibility
-            logger.warning("Using deprecated filepath parameter. Please use session_id instead.")
-            full_path = get_excel_path(filepath)
-            from xlwings_mcp.xlwings_impl.range_xlw import unmerge_cells_xlw
-            result = unmerge_cells_xlw(full_path, sheet_name, start_cell, end_cell)
-        else:
-            return ERROR_TEMPLATES['PARAMETER_MISSING'].format(
-                param1='session_id',
-                param2='filepath'
-            )
+        with tool_session(session_id, filepath) as session:
+            if isinstance(session, str):
+                return session
+            from xlwings_mcp.xlwings_impl.range_xlw import unmerge_cells_xlw_with_wb
+            result = unmerge_cells_xlw_with_wb(session.workbook, sheet_name, start_cell, end_cell)
+            session.mark_changed()
+            if "error" not in result:
+                patch_value_snapshot(session)
         
         return result.get("message", "Cells unmerged successfully") if "error" not in result else f"Error: {result['error']}"
     except (ValidationError, SheetError) as e:
         return f"Error: {str(e)}"
     except Exception as e:
-        logger.error(f"Error unmerging cells: {e}")
+        logger.error("Error unmerging cells: %s", e)
         raise
 
 @mcp.tool()
@@ -1066,43 +2048,23 @@ def get_merged_cells(
     Note: Use session_id for better performance. filepath parameter is deprecated.
     """
     try:
-        # Support both new (session_id) and old (filepath) API
-        if session_id:
-            # New API: use session
-            session = SESSION_MANAGER.get_session(session_id)
-            if not session:
-                return ERROR_TEMPLATES['SESSION_NOT_FOUND'].format(
-                    session_id=session_id, 
-                    ttl=10  # Default TTL is 10 minutes (600 seconds)
-                )
-            
-            with session.lock:
-                from xlwings_mcp.xlwings_impl.range_xlw import get_merged_cells_xlw_with_wb
-                result = get_merged_cells_xlw_with_wb(session.workbook, sheet_name)
-                if "error" in result:
-                    return f"Error: {result['error']}"
-                import json
-                return json.dumps(result, indent=2, default=str)
-        elif filepath:
-            # Legacy API: backwards compatibility
-            logger.warning("Using deprecated filepath parameter. Please use session_id instead.")
-            full_path = get_excel_path(filepath)
-            from xlwings_mcp.xlwings_impl.range_xlw import get_merged_cells_xlw
-            result = get_merged_cells_xlw(full_path, sheet_name)
-            if "error" in result:
-                return f"Error: {result['error']}"
-            import json
-            return json.dumps(result, indent=2, default=str)
-        else:
-            return ERROR_TEMPLATES['PARAMETER_MISSING'].format(
-                param1='session_id',
-                param2='filepath'
+        with tool_session(session_id, filepath, lock=False) as session:
+            if isinstance(session, str):
+                return session
+            from xlwings_mcp.xlwings_impl.range_xlw import get_merged_cells_xlw_with_wb
+            result = read_through(
+                session, ("get_merged_cells", sheet_name),
+                lambda: get_merged_cells_xlw_with_wb(session.workbook, sheet_name)
             )
+        if "error" in result:
+            return f"Error: {result['error']}"
+        import json
+        return json.dumps(result, indent=2, default=str)
         
     except (ValidationError, SheetError) as e:
         return f"Error: {str(e)}"
     except Exception as e:
-        logger.error(f"Error getting merged cells: {e}")
+        logger.error("Error getting merged cells: %s", e)
         raise
 
 @mcp.tool()
@@ -1130,50 +2092,145 @@ def copy_range(
     Note: Use session_id for better performance. filepath parameter is deprecated.
     """
     try:
-        # Support both new (session_id) and old (filepath) API
-        if session_id:
-            # New API: use session
-            session = SESSION_MANAGER.get_session(session_id)
-            if not session:
-                return ERROR_TEMPLATES['SESSION_NOT_FOUND'].format(
-                    session_id=session_id, 
-                    ttl=10  # Default TTL is 10 minutes (600 seconds)
-                )
-            
-            with session.lock:
-                from xlwings_mcp.xlwings_impl.range_xlw import copy_range_xlw_with_wb
-                result = copy_range_xlw_with_wb(
-                    session.workbook,
-                    sheet_name,
-                    source_start,
-                    source_end,
-                    target_start,
-                    target_sheet or sheet_name  # Use source sheet if target_sheet is None
-                )
-        elif filepath:
-            # Legacy API: backwards compatibility
-            logger.warning("Using deprecated filepath parameter. Please use session_id instead.")
-            full_path = get_excel_path(filepath)
-            from xlwings_mcp.xlwings_impl.range_xlw import copy_range_xlw
-            result = copy_range_xlw(
-                full_path,
+        with tool_session(session_id, filepath) as session:
+            if isinstance(session, str):
+                return session
+            from xlwings_mcp.xlwings_impl.range_xlw import copy_range_xlw_with_wb
+            result = copy_range_xlw_with_wb(
+                session.workbook,
                 sheet_name,
                 source_start,
                 source_end,
                 target_start,
                 target_sheet or sheet_name  # Use source sheet if target_sheet is None
             )
-        else:
-            return ERROR_TEMPLATES['PARAMETER_MISSING'].format(
-                param1='session_id',
-                param2='filepath'
-            )
+            session.mark_changed(structure=True)
+            if "error" not in result:
+                patch_value_snapshot(session, target_sheet or sheet_name, lambda sheet: sheet.formulas_written(*block_bounds(result["target_range"])))
         
         return result.get("message", "Range copied successfully") if "error" not in result else f"Error: {result['error']}"
     except (ValidationError, SheetError) as e:
         return f"Error: {str(e)}"
     except Exception as e:
-        logger.error(f"Error copying range: {e}")
+        logger.error("Error copying range: %s", e)
+        raise
+
+def export_session_values(session_id: str, sheet_name: str, source_range: Optional[str] = None):
+    """
+    Bulk read of a session's range (or a sheet's used range) for copy_between_sessions.
+
+    Returns:
+        The transfer_xlw result dict (values included), or the session error text
+    """
+    session = get_validated_session(session_id)
+    if isinstance(session, str):  # Error message returned
+        return session
+    with session.lock:
+        ensure_calculated(session)
+        from xlwings_mcp.xlwings_impl.transfer_xlw import read_values_xlw_with_wb
+        return read_values_xlw_with_wb(session.workbook, sheet_name, source_range)
+
+def import_session_values(session_id: str, block: Dict[str, Any], target_sheet: str, target_start: Optional[str] = None):
+    """
+    Bulk write of a block from export_session_values into another session.
+
+    Returns:
+        The transfer_xlw result dict, or the session error text
+    """
+    session = get_validated_session(session_id)
+    if isinstance(session, str):  # Error message returned
+        return session
+    from xlwings_mcp.formula.parser import cell_address
+    values = block["values"]
+    start = target_start or cell_address(block["top"], block["left"])
+    with session.lock:
+        from xlwings_mcp.xlwings_impl.transfer_xlw import write_values_xlw_with_wb
+        result = write_values_xlw_with_wb(session.workbook, target_sheet, values, start, new_sheet=block["whole_sheet"])
+        if "error" in result:
+            session.mark_changed()
+        elif result["created"]:
+            session.mark_changed(structure=True)
+            patch_value_snapshot(session)
+        else:
+            session.mark_changed()
+            refresh_dependency_index(session, target_sheet, result["range"])
+            refresh_column_indexes(session, target_sheet, result["range"])
+            patch_value_snapshot(session, target_sheet, lambda sheet: sheet.values_written(*block_bounds(result["range"])[:2], values))
+    return result
+
+def transfer_summary(mode: str, source_session_id: str, target_session_id: str, block, result) -> str:
+    """copy_between_sessions response: where the data went, never the data itself"""
+    for outcome in (block, result):
+        if isinstance(outcome, str):
+            return outcome
+        if "error" in outcome:
+            return f"Error: {outcome['error']}"
+    import json
+    summary = {"mode": mode, "source_session_id": source_session_id, "target_session_id": target_session_id}
+    summary.update({key: value for key, value in result.items() if key != "created"})
+    return json.dumps(summary, indent=2, default=str, ensure_ascii=False)
+
+@mcp.tool()
+def copy_between_sessions(
+    source_session_id: str,
+    target_session_id: str,
+    source_sheet: str,
+    target_sheet: Optional[str] = None,
+    source_range: Optional[str] = None,
+    target_start: Optional[str] = None
+) -> str:
+    """
+    Copy a range or a whole worksheet from one session's workbook into another's
+    without returning the data. Workbooks in the same Excel instance are copied
+    natively (values, formulas and formatting); otherwise values are transferred
+    in one bulk read and one bulk write.
+
+    Args:
+        source_session_id: Session ID of the workbook to copy from
+        target_session_id: Session ID of the workbook to copy into (may be the same)
+        source_sheet: Name of the source worksheet
+        target_sheet: Name of the target worksheet (defaults to source_sheet); created
+            for range copies, must not exist yet for whole-sheet copies
+        source_range: Range to copy (e.g., "A1:F500"); omit to copy the whole sheet
+        target_start: Top-left target cell for range copies (defaults to the source position)
+    """
+    try:
+        source = get_validated_session(source_session_id)
+        if isinstance(source, str):  # Error message returned
+            return source
+        target = get_validated_session(target_session_id)
+        if isinstance(target, str):  # Error message returned
+            return target
+        target_sheet = target_sheet or source_sheet
+
+        if source.app is not target.app:
+            block = export_session_values(source_session_id, source_sheet, source_range)
+            if isinstance(block, str) or "error" in block:
+                return transfer_summary("values", source_session_id, target_session_id, block, {})
+            result = import_session_values(target_session_id, block, target_sheet, target_start)
+            return transfer_summary("values", source_session_id, target_session_id, block, result)
+
+        # One Excel instance: lock both sessions, in a fixed order so that
+        # opposite copies between the same pair cannot deadlock
+        with ExitStack() as stack:
+            for session in sorted({source, target}, key=lambda s: s.id):
+                stack.enter_context(session.lock)
+            ensure_calculated(source)
+            from xlwings_mcp.xlwings_impl.transfer_xlw import copy_native_xlw_with_wb
+            result = copy_native_xlw_with_wb(
+                source.workbook, target.workbook, source_sheet, target_sheet, source_range, target_start
+            )
+            target.mark_changed(structure=True)
+            if "error" not in result and "range" in result:
+                patch_value_snapshot(target, target_sheet, lambda sheet: sheet.formulas_written(*block_bounds(result["range"])))
+            elif "error" not in result:
+                patch_value_snapshot(target)
+        return transfer_summary("native", source_session_id, target_session_id, {}, result)
+
+    except (ValidationError, SheetError) as e:
+        return f"Error: {str(e)}"
+    except Exception as e:
+        logger.error("Error copying between sessions: %s", e)
         raise
 
 @mcp.tool()
@@ -1199,48 +2256,26 @@ def delete_range(
     Note: Use session_id for better performance. filepath parameter is deprecated.
     """
     try:
-        # Support both new (session_id) and old (filepath) API
-        if session_id:
-            # New API: use session
-            session = SESSION_MANAGER.get_session(session_id)
-            if not session:
-                return ERROR_TEMPLATES['SESSION_NOT_FOUND'].format(
-                    session_id=session_id, 
-                    ttl=10  # Default TTL is 10 minutes (600 seconds)
-                )
-            
-            with session.lock:
-                from xlwings_mcp.xlwings_impl.range_xlw import delete_range_xlw_with_wb
-                result = delete_range_xlw_with_wb(
-                    session.workbook,
-                    sheet_name,
-                    start_cell,
-                    end_cell,
-                    shift_direction
-                )
-        elif filepath:
-            # Legacy API: backwards compatibility
-            logger.warning("Using deprecated filepath parameter. Please use session_id instead.")
-            full_path = get_excel_path(filepath)
-            from xlwings_mcp.xlwings_impl.range_xlw import delete_range_xlw
-            result = delete_range_xlw(
-                full_path,
+        with tool_session(session_id, filepath) as session:
+            if isinstance(session, str):
+                return session
+            from xlwings_mcp.xlwings_impl.range_xlw import delete_range_xlw_with_wb
+            result = delete_range_xlw_with_wb(
+                session.workbook,
                 sheet_name,
                 start_cell,
                 end_cell,
                 shift_direction
             )
-        else:
-            return ERROR_TEMPLATES['PARAMETER_MISSING'].format(
-                param1='session_id',
-                param2='filepath'
-            )
+            session.mark_changed(structure=True)
+            if "error" not in result:
+                patch_value_snapshot(session, sheet_name, lambda sheet: sheet.cells_deleted(*block_bounds(result["deleted_range"]), shift_direction))
         
         return result.get("message", "Range deleted successfully") if "error" not in result else f"Error: {result['error']}"
     except (ValidationError, SheetError) as e:
         return f"Error: {str(e)}"
     except Exception as e:
-        logger.error(f"Error deleting range: {e}")
+        logger.error("Error deleting range: %s", e)
         raise
 
 @mcp.tool()
@@ -1264,29 +2299,13 @@ def validate_excel_range(
     Note: Use session_id for better performance. filepath parameter is deprecated.
     """
     try:
-        # Support both new (session_id) and old (filepath) API
-        if session_id:
-            # New API: use session
-            session = SESSION_MANAGER.get_session(session_id)
-            if not session:
-                return ERROR_TEMPLATES['SESSION_NOT_FOUND'].format(
-                    session_id=session_id, 
-                    ttl=10  # Default TTL is 10 minutes (600 seconds)
-                )
-            
-            with session.lock:
-                from xlwings_mcp.xlwings_impl.validation_xlw import validate_excel_range_xlw_with_wb
-                result = validate_excel_range_xlw_with_wb(session.workbook, sheet_name, start_cell, end_cell)
-        elif filepath:
-            # Legacy API: backwards compatibility
-            logger.warning("Using deprecated filepath parameter. Please use session_id instead.")
-            full_path = get_excel_path(filepath)
-            from xlwings_mcp.xlwings_impl.validation_xlw import validate_excel_range_xlw
-            result = validate_excel_range_xlw(full_path, sheet_name, start_cell, end_cell)
-        else:
-            return ERROR_TEMPLATES['PARAMETER_MISSING'].format(
-                param1='session_id',
-                param2='filepath'
+        with tool_session(session_id, filepath, lock=False) as session:
+            if isinstance(session, str):
+                return session
+            from xlwings_mcp.xlwings_impl.validation_xlw import validate_excel_range_xlw_with_wb
+            result = read_through(
+                session, ("validate_excel_range", sheet_name, start_cell, end_cell),
+                lambda: validate_excel_range_xlw_with_wb(session.workbook, sheet_name, start_cell, end_cell)
             )
         
         return result.get("message", "Range validation completed") if "error" not in result else f"Error: {result['error']}"
@@ -1294,7 +2313,7 @@ def validate_excel_range(
     except (ValidationError, DataError) as e:
         return f"Error: {str(e)}"
     except Exception as e:
-        logger.error(f"Error validating range: {e}")
+        logger.error("Error validating range: %s", e)
         raise
 
 @mcp.tool()
@@ -1320,29 +2339,13 @@ def get_data_validation_info(
         JSON string containing all validation rules in the worksheet
     """
     try:
-        # Support both new (session_id) and old (filepath) API
-        if session_id:
-            # New API: use session
-            session = SESSION_MANAGER.get_session(session_id)
-            if not session:
-                return ERROR_TEMPLATES['SESSION_NOT_FOUND'].format(
-                    session_id=session_id, 
-                    ttl=10  # Default TTL is 10 minutes (600 seconds)
-                )
-            
-            with session.lock:
-                from xlwings_mcp.xlwings_impl.validation_xlw import get_data_validation_info_xlw_with_wb
-                result = get_data_validation_info_xlw_with_wb(session.workbook, sheet_name)
-        elif filepath:
-            # Legacy API: backwards compatibility
-            logger.warning("Using deprecated filepath parameter. Please use session_id instead.")
-            full_path = get_excel_path(filepath)
-            from xlwings_mcp.xlwings_impl.validation_xlw import get_data_validation_info_xlw
-            result = get_data_validation_info_xlw(full_path, sheet_name)
-        else:
-            return ERROR_TEMPLATES['PARAMETER_MISSING'].format(
-                param1='session_id',
-                param2='filepath'
+        with tool_session(session_id, filepath, lock=False) as session:
+            if isinstance(session, str):
+                return session
+            from xlwings_mcp.xlwings_impl.validation_xlw import get_data_validation_info_xlw_with_wb
+            result = read_through(
+                session, ("get_data_validation_info", sheet_name),
+                lambda: get_data_validation_info_xlw_with_wb(session.workbook, sheet_name)
             )
         
         if "error" in result:
@@ -1353,7 +2356,7 @@ def get_data_validation_info(
     except (ValidationError, DataError) as e:
         return f"Error: {str(e)}"
     except Exception as e:
-        logger.error(f"Error getting validation info: {e}")
+        logger.error("Error getting validation info: %s", e)
         raise
 
 @mcp.tool()
@@ -1377,30 +2380,15 @@ def insert_rows(
     Note: Use session_id for better performance. filepath parameter is deprecated.
     """
     try:
-        # Support both new (session_id) and old (filepath) API
-        if session_id:
-            # New API: use session
-            session = SESSION_MANAGER.get_session(session_id)
-            if not session:
-                return ERROR_TEMPLATES['SESSION_NOT_FOUND'].format(
-                    session_id=session_id, 
-                    ttl=10  # Default TTL is 10 minutes (600 seconds)
-                )
-            
-            with session.lock:
-                from xlwings_mcp.xlwings_impl.rows_cols_xlw import insert_rows_xlw_with_wb
-                result = insert_rows_xlw_with_wb(session.workbook, sheet_name, start_row, count)
-        elif filepath:
-            # Legacy API: backwards compatibility
-            logger.warning("Using deprecated filepath parameter. Please use session_id instead.")
-            full_path = get_excel_path(filepath)
-            from xlwings_mcp.xlwings_impl.rows_cols_xlw import insert_rows_xlw
-            result = insert_rows_xlw(full_path, sheet_name, start_row, count)
-        else:
-            return ERROR_TEMPLATES['PARAMETER_MISSING'].format(
-                param1='session_id',
-                param2='filepath'
-            )
+        with tool_session(session_id, filepath) as session:
+            if isinstance(session, str):
+                return session
+            from xlwings_mcp.xlwings_impl.rows_cols_xlw import insert_rows_xlw_with_wb
+            result = insert_rows_xlw_with_wb(session.workbook, sheet_name, start_row, count)
+            session.mark_changed(structure=True)
+            if "error" not in result:
+                shift_column_indexes(session, sheet_name, "rows", start_row, count)
+                patch_value_snapshot(session, sheet_name, lambda sheet: sheet.rows_shifted(start_row, count))
         
         if "error" in result:
             return f"Error: {result['error']}"
@@ -1409,7 +2397,7 @@ def insert_rows(
     except (ValidationError, SheetError) as e:
         return f"Error: {str(e)}"
     except Exception as e:
-        logger.error(f"Error inserting rows: {e}")
+        logger.error("Error inserting rows: %s", e)
         raise
 
 @mcp.tool()
@@ -1433,30 +2421,15 @@ def insert_columns(
     Note: Use session_id for better performance. filepath parameter is deprecated.
     """
     try:
-        # Support both new (session_id) and old (filepath) API
-        if session_id:
-            # New API: use session
-            session = SESSION_MANAGER.get_session(session_id)
-            if not session:
-                return ERROR_TEMPLATES['SESSION_NOT_FOUND'].format(
-                    session_id=session_id, 
-                    ttl=10  # Default TTL is 10 minutes (600 seconds)
-                )
-            
-            with session.lock:
-                from xlwings_mcp.xlwings_impl.rows_cols_xlw import insert_columns_xlw_with_wb
-                result = insert_columns_xlw_with_wb(session.workbook, sheet_name, start_col, count)
-        elif filepath:
-            # Legacy API: backwards compatibility
-            logger.warning("Using deprecated filepath parameter. Please use session_id instead.")
-            full_path = get_excel_path(filepath)
-            from xlwings_mcp.xlwings_impl.rows_cols_xlw import insert_columns_xlw
-            result = insert_columns_xlw(full_path, sheet_name, start_col, count)
-        else:
-            return ERROR_TEMPLATES['PARAMETER_MISSING'].format(
-                param1='session_id',
-                param2='filepath'
-            )
+        with tool_session(session_id, filepath) as session:
+            if isinstance(session, str):
+                return session
+            from xlwings_mcp.xlwings_impl.rows_cols_xlw import insert_columns_xlw_with_wb
+            result = insert_columns_xlw_with_wb(session.workbook, sheet_name, start_col, count)
+            session.mark_changed(structure=True)
+            if "error" not in result:
+                shift_column_indexes(session, sheet_name, "columns", start_col, count)
+                patch_value_snapshot(session, sheet_name, lambda sheet: sheet.columns_shifted(start_col, count))
         
         if "error" in result:
             return f"Error: {result['error']}"
@@ -1465,7 +2438,7 @@ def insert_columns(
     except (ValidationError, SheetError) as e:
         return f"Error: {str(e)}"
     except Exception as e:
-        logger.error(f"Error inserting columns: {e}")
+        logger.error("Error inserting columns: %s", e)
         raise
 
 @mcp.tool()
@@ -1489,30 +2462,15 @@ def delete_sheet_rows(
     Note: Use session_id for better performance. filepath parameter is deprecated.
     """
     try:
-        # Support both new (session_id) and old (filepath) API
-        if session_id:
-            # New API: use session
-            session = SESSION_MANAGER.get_session(session_id)
-            if not session:
-                return ERROR_TEMPLATES['SESSION_NOT_FOUND'].format(
-                    session_id=session_id, 
-                    ttl=10  # Default TTL is 10 minutes (600 seconds)
-                )
-            
-            with session.lock:
-                from xlwings_mcp.xlwings_impl.rows_cols_xlw import delete_sheet_rows_xlw_with_wb
-                result = delete_sheet_rows_xlw_with_wb(session.workbook, sheet_name, start_row, count)
-        elif filepath:
-            # Legacy API: backwards compatibility
-            logger.warning("Using deprecated filepath parameter. Please use session_id instead.")
-            full_path = get_excel_path(filepath)
-            from xlwings_mcp.xlwings_impl.rows_cols_xlw import delete_sheet_rows_xlw
-            result = delete_sheet_rows_xlw(full_path, sheet_name, start_row, count)
-        else:
-            return ERROR_TEMPLATES['PARAMETER_MISSING'].format(
-                param1='session_id',
-                param2='filepath'
-            )
+        with tool_session(session_id, filepath) as session:
+            if isinstance(session, str):
+                return session
+            from xlwings_mcp.xlwings_impl.rows_cols_xlw import delete_sheet_rows_xlw_with_wb
+            result = delete_sheet_rows_xlw_with_wb(session.workbook, sheet_name, start_row, count)
+            session.mark_changed(structure=True)
+            if "error" not in result:
+                shift_column_indexes(session, sheet_name, "rows", start_row, -count)
+                patch_value_snapshot(session, sheet_name, lambda sheet: sheet.rows_shifted(start_row, -count))
         
         if "error" in result:
             return f"Error: {result['error']}"
@@ -1521,7 +2479,7 @@ def delete_sheet_rows(
     except (ValidationError, SheetError) as e:
         return f"Error: {str(e)}"
     except Exception as e:
-        logger.error(f"Error deleting rows: {e}")
+        logger.error("Error deleting rows: %s", e)
         raise
 
 @mcp.tool()
@@ -1545,30 +2503,15 @@ def delete_sheet_columns(
     Note: Use session_id for better performance. filepath parameter is deprecated.
     """
     try:
-        # Support both new (session_id) and old (filepath) API
-        if session_id:
-            # New API: use session
-            session = SESSION_MANAGER.get_session(session_id)
-            if not session:
-                return ERROR_TEMPLATES['SESSION_NOT_FOUND'].format(
-                    session_id=session_id, 
-                    ttl=10  # Default TTL is 10 minutes (600 seconds)
-                )
-            
-            with session.lock:
-                from xlwings_mcp.xlwings_impl.rows_cols_xlw import delete_sheet_columns_xlw_with_wb
-                result = delete_sheet_columns_xlw_with_wb(session.workbook, sheet_name, start_col, count)
-        elif filepath:
-            # Legacy API: backwards compatibility
-            logger.warning("Using deprecated filepath parameter. Please use session_id instead.")
-            full_path = get_excel_path(filepath)
-            from xlwings_mcp.xlwings_impl.rows_cols_xlw import delete_sheet_columns_xlw
-            result = delete_sheet_columns_xlw(full_path, sheet_name, start_col, count)
-        else:
-            return ERROR_TEMPLATES['PARAMETER_MISSING'].format(
-                param1='session_id',
-                param2='filepath'
-            )
+        with tool_session(session_id, filepath) as session:
+            if isinstance(session, str):
+                return session
+            from xlwings_mcp.xlwings_impl.rows_cols_xlw import delete_sheet_columns_xlw_with_wb
+            result = delete_sheet_columns_xlw_with_wb(session.workbook, sheet_name, start_col, count)
+            session.mark_changed(structure=True)
+            if "error" not in result:
+                shift_column_indexes(session, sheet_name, "columns", start_col, -count)
+                patch_value_snapshot(session, sheet_name, lambda sheet: sheet.columns_shifted(start_col, -count))
         
         if "error" in result:
             return f"Error: {result['error']}"
@@ -1577,61 +2520,119 @@ def delete_sheet_columns(
     except (ValidationError, SheetError) as e:
         return f"Error: {str(e)}"
     except Exception as e:
-        logger.error(f"Error deleting columns: {e}")
+        logger.error("Error deleting columns: %s", e)
+        raise
+
+@mcp.tool()
+def get_server_metrics(reset: bool = False) -> str:
+    """
+    Per-tool latency and cost metrics since start (or the last reset).
+    
+    For each tool: call and error counts, and count/mean/p50/p95/p99/max of
+    wall time, session lock wait, time in Excel (COM), time saving, response
+    bytes and cells touched. The same data is served in Prometheus text format
+    at /metrics on the SSE and streamable HTTP transports.
+    
+    Args:
+        reset: Clear all metrics after taking this snapshot
+    """
+    try:
+        result = METRICS.snapshot()
+        if reset:
+            METRICS.reset()
+        import json
+        return json.dumps(result, indent=2, default=str, ensure_ascii=False)
+        
+    except Exception as e:
+        logger.error("Error getting server metrics: %s", e)
         raise
 
-async def run_sse():
-    """Run Excel MCP server in SSE mode."""
+@mcp.custom_route("/metrics", methods=["GET"])
+async def prometheus_metrics(request):
+    """Prometheus scrape endpoint (HTTP transports only)."""
+    from starlette.responses import PlainTextResponse
+    text = await SUPERVISOR.prometheus() if SUPERVISOR is not None else METRICS.prometheus()
+    return PlainTextResponse(text, media_type="text/plain; version=0.0.4")
+
+def start_workers(workers: int) -> None:
+    """Serve tool calls from worker processes, sharded by session and workbook."""
+    global SUPERVISOR
+    from xlwings_mcp.cluster import Supervisor
+    logger.info("Starting %s worker processes", workers)
+    SUPERVISOR = Supervisor(workers, files_path=EXCEL_FILES_PATH, journal=RECOVERY_JOURNAL)
+    SUPERVISOR.start()
+    SUPERVISOR.install(mcp)
+
+def shutdown() -> None:
+    """Stop the workers, or close this process's sessions."""
+    try:
+        if SUPERVISOR is not None:
+            SUPERVISOR.stop()
+            logger.info("All worker processes stopped")
+        else:
+            SESSION_MANAGER.close_all_sessions()
+            logger.info("All Excel sessions closed")
+    except Exception as e:
+        logger.error("Error closing sessions during shutdown: %s", e)
+
+async def run_sse(workers: int = 0):
+    """Run Excel MCP server in SSE mode, with tool calls spread over `workers` processes if > 1."""
+    setup_logging()
     # Assign value to EXCEL_FILES_PATH in SSE mode
     global EXCEL_FILES_PATH
     EXCEL_FILES_PATH = os.environ.get("EXCEL_FILES_PATH", "./excel_files")
     # Create directory if it doesn't exist
     os.makedirs(EXCEL_FILES_PATH, exist_ok=True)
+    # Workers keep their own recovery journals
+    if workers > 1:
+        start_workers(workers)
+    else:
+        setup_recovery()
     
     try:
-        logger.info(f"Starting Excel MCP server with SSE transport (files directory: {EXCEL_FILES_PATH})")
+        logger.info("Starting Excel MCP server with SSE transport (files directory: %s)", EXCEL_FILES_PATH)
         await mcp.run_sse_async()
     except KeyboardInterrupt:
         logger.info("Server stopped by user")
     except Exception as e:
-        logger.error(f"Server failed: {e}")
+        logger.error("Server failed: %s", e)
         raise
     finally:
         # Clean up all sessions on shutdown
-        try:
-            SESSION_MANAGER.close_all_sessions()
-            logger.info("All Excel sessions closed")
-        except Exception as e:
-            logger.error(f"Error closing sessions during shutdown: {e}")
+        shutdown()
         logger.info("Server shutdown complete")
 
-async def run_streamable_http():
-    """Run Excel MCP server in streamable HTTP mode."""
+async def run_streamable_http(workers: int = 0):
+    """Run Excel MCP server in streamable HTTP mode, with tool calls spread over `workers` processes if > 1."""
+    setup_logging()
     # Assign value to EXCEL_FILES_PATH in streamable HTTP mode
     global EXCEL_FILES_PATH
     EXCEL_FILES_PATH = os.environ.get("EXCEL_FILES_PATH", "./excel_files")
     # Create directory if it doesn't exist
     os.makedirs(EXCEL_FILES_PATH, exist_ok=True)
+    # Workers keep their own recovery journals
+    if workers > 1:
+        start_workers(workers)
+    else:
+        setup_recovery()
     
     try:
-        logger.info(f"Starting Excel MCP server with streamable HTTP transport (files directory: {EXCEL_FILES_PATH})")
+        logger.info("Starting Excel MCP server with streamable HTTP transport (files directory: %s)", EXCEL_FILES_PATH)
         await mcp.run_streamable_http_async()
     except KeyboardInterrupt:
         logger.info("Server stopped by user")
     except Exception as e:
-        logger.error(f"Server failed: {e}")
+        logger.error("Server failed: %s", e)
         raise
     finally:
         # Clean up all sessions on shutdown
-        try:
-            SESSION_MANAGER.close_all_sessions()
-            logger.info("All Excel sessions closed")
-        except Exception as e:
-            logger.error(f"Error closing sessions during shutdown: {e}")
+        shutdown()
         logger.info("Server shutdown complete")
 
 def run_stdio():
     """Run Excel MCP server in stdio mode."""
+    setup_logging()
+    setup_recovery()
     # No need to assign EXCEL_FILES_PATH in stdio mode
     
     try:
@@ -1640,7 +2641,7 @@ def run_stdio():
     except KeyboardInterrupt:
         logger.info("Server stopped by user")
     except Exception as e:
-        logger.error(f"Server failed: {e}")
+        logger.error("Server failed: %s", e)
         raise
     finally:
         # Clean up all sessions on shutdown
@@ -1648,5 +2649,5 @@ def run_stdio():
             SESSION_MANAGER.close_all_sessions()
             logger.info("All Excel sessions closed")
         except Exception as e:
-            logger.error(f"Error closing sessions during shutdown: {e}")
+            logger.error("Error closing sessions during shutdown: %s", e)
         logger.info("Server shutdown complete")
\ No newline at end of file
@@ -3,19 +3,46 @@ Excel Session Manager for xlwings MCP Server
 Manages Excel application instances and workbook sessions with TTL and LRU policies.
 """
 
+import heapq
+import itertools
 import os
 import uuid
 import time
 import threading
 import logging
-from typing import Dict, Optional, Any, Tuple
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Any, Set, Tuple
 from pathlib import Path
 from datetime import datetime
 
-import xlwings as xw
+from .metrics import METRICS
+from .scheduler import SessionScheduler
+
+# xlwings (and pywin32 behind it) and the xlwings_impl helpers are imported on first
+# use, so starting the server and listing its tools never loads the COM stack
 
 logger = logging.getLogger(__name__)
 
+# Admission estimate for a workbook that is not open yet: a fresh Excel
+# process plus the file expanded in memory (used until its RSS can be read)
+_APP_BASE_BYTES = 150 * 1024 * 1024
+_FILE_EXPANSION = 4
+# Seconds a session's RSS sample is reused before psutil is asked again
+MEMORY_SAMPLE_TTL = float(os.getenv("EXCEL_MCP_MEMORY_SAMPLE_TTL", "2"))
+
+# Read-only tool results kept per session for reads under the shared lock
+READ_CACHE_SIZE = int(os.getenv("EXCEL_MCP_READ_CACHE_SIZE", "32"))
+
+
+def estimate_open_cost(filepath: str) -> int:
+    """Estimated bytes an Excel session on this file will hold"""
+    try:
+        size = os.path.getsize(filepath)
+    except OSError:
+        size = 0
+    return _APP_BASE_BYTES + _FILE_EXPANSION * size
+
 
 def is_file_locked(filepath: str) -> bool:
     """
@@ -37,7 +64,7 @@ def is_file_locked(filepath: str) -> bool:
                 # Check if process has the file open
                 for item in proc.open_files():
                     if item.path == abs_path:
-                        logger.info(f"FILE_LOCKED: {filepath} is locked by {proc.info['name']} (PID: {proc.info['pid']})")
+                        logger.info("FILE_LOCKED: %s is locked by %s (PID: %s)", filepath, proc.info['name'], proc.info['pid'])
                         return True
             except (psutil.NoSuchProcess, psutil.AccessDenied):
                 continue
@@ -78,7 +105,39 @@ class ExcelSession:
         self.read_only = read_only
         self.created_at = time.time()
         self.last_accessed = time.time()
-        self.lock = threading.RLock()
+        # Re-entrant lock serving waiting calls read-first from a bounded queue
+        self.lock = SessionScheduler(session_id)
+        
+        # Bumped by every mutating tool; derived caches compare against it
+        self.change_token = 0
+        # Bumped when cells move or sheets change; position-based indexes compare against it
+        self.structure_token = 0
+        # (sheet_name, formula) -> (change_token, validation result), LRU-bounded
+        self.formula_validation_cache: "OrderedDict[Tuple[str, str], Tuple[int, Dict[str, Any]]]" = OrderedDict()
+        # Formula dependency index, built on first precedents/dependents query
+        self.dependency_index = None
+        # Pivot caches keyed by normalized source address, shared by pivots on the same data
+        self.pivot_caches: Dict[str, Any] = {}
+        # (sheet, range, header) -> (change_token, ColumnarTable) for server-side queries, LRU-bounded
+        self.columnar_cache: "OrderedDict[Tuple[str, str, bool], Tuple[int, Any]]" = OrderedDict()
+        # Lower-cased table name -> {"name", "sheet"}, rescanned when a lookup misses
+        self.table_inventory: Dict[str, Dict[str, Any]] = {}
+        # Opt-in key-column indexes (ColumnIndex) created by create_column_index
+        self.column_indexes: List[Any] = []
+        # (tool, arguments) -> (read_token, result) for read-only tools served under the shared lock, LRU-bounded
+        self.read_cache: "OrderedDict[Tuple[Any, ...], Tuple[Tuple[int, int], Any]]" = OrderedDict()
+        # Immutable ValueSnapshot of loaded sheets, replaced (never modified) under the exclusive lock
+        # and read without any lock
+        self.value_snapshot = None
+        # (monotonic time, bytes) of the last memory_bytes() probe
+        self._memory_sample: Optional[Tuple[float, int]] = None
+        
+        # Session calculation mode ("automatic", "manual", "deferred", "semiautomatic")
+        self.calculation_mode = "automatic"
+        self.calc_pending = False
+        self.calc_stats = {"calls": 0, "total_ms": 0.0, "last_ms": None}
+        # Bumped by every completed recalculation; cached cell values compare against it
+        self.calc_token = 0
         
         # Track Excel process ID for zombie process cleanup
         try:
@@ -92,11 +151,96 @@ class ExcelSession:
         except Exception:
             self.process_id = None
             
-        logger.debug(f"SESSION_CREATE: Session {session_id} created with PID {self.process_id}")
+        logger.debug("SESSION_CREATE: Session %s created with PID %s", session_id, self.process_id)
         
     def touch(self):
         """Update last access time"""
         self.last_accessed = time.time()
+    
+    def memory_bytes(self) -> int:
+        """Memory held by this session: its Excel process RSS, or an estimate
+        from the file size when psutil or the process ID is unavailable.
+        Samples are reused for MEMORY_SAMPLE_TTL seconds."""
+        sample = self._memory_sample
+        now = time.monotonic()
+        if sample is not None and now - sample[0] < MEMORY_SAMPLE_TTL:
+            return sample[1]
+        size = None
+        if self.process_id:
+            try:
+                import psutil
+                size = psutil.Process(self.process_id).memory_info().rss
+            except Exception:
+                pass
+        if size is None:
+            size = estimate_open_cost(self.filepath)
+        self._memory_sample = (now, size)
+        return size
+    
+    def mark_changed(self, structure: bool = False):
+        """Record that the workbook was modified, invalidating derived caches
+        
+        Args:
+            structure: True when cells moved or sheets changed (inserts, deletes,
+                copies, renames), which invalidates position-based indexes
+        """
+        self.change_token += 1
+        if structure:
+            self.structure_token += 1
+            self.dependency_index = None
+        if self.calculation_mode != "automatic":
+            self.calc_pending = True
+        self.record_calculation()
+    
+    def mark_calculated(self, complete: bool = True):
+        """Record a recalculation
+        
+        Args:
+            complete: True when the whole workbook was recalculated, which
+                clears any deferred recalculation
+        """
+        if complete:
+            self.calc_pending = False
+        self.calc_token += 1
+    
+    def read_token(self) -> Tuple[int, int]:
+        """Version of everything a read can observe: cell and structure edits, and recalculations"""
+        return (self.change_token, self.calc_token)
+    
+    def cached_read(self, key: Tuple[Any, ...]) -> Any:
+        """Cached result of a read-only tool, or None if missing or stale
+        
+        Safe under the shared lock: only looks up and reorders existing entries.
+        """
+        cached = self.read_cache.get(key)
+        if cached is None or cached[0] != self.read_token():
+            return None
+        try:
+            self.read_cache.move_to_end(key)
+        except KeyError:
+            pass
+        return cached[1]
+    
+    def store_read(self, key: Tuple[Any, ...], result: Any):
+        """Cache a read-only tool result (must be called with the exclusive lock held)"""
+        self.read_cache[key] = (self.read_token(), result)
+        self.read_cache.move_to_end(key)
+        while len(self.read_cache) > READ_CACHE_SIZE:
+            self.read_cache.popitem(last=False)
+    
+    def record_calculation(self) -> float:
+        """Fold recalculation time measured during the current tool call into the session stats
+        
+        Returns:
+            Milliseconds spent calculating in this call
+        """
+        from .xlwings_impl.helpers import ExcelHelper
+        ms = ExcelHelper.pop_calc_time()
+        if ms:
+            self.calc_stats["calls"] += 1
+            self.calc_stats["total_ms"] += ms
+            self.calc_stats["last_ms"] = round(ms, 1)
+        return ms
         
     def get_info(self) -> Dict[str, Any]:
         """Get session information"""
@@ -107,7 +251,16 @@ class ExcelSession:
             "read_only": self.read_only,
             "created_at": datetime.fromtimestamp(self.created_at).isoformat(),
             "last_access": datetime.fromtimestamp(self.last_accessed).isoformat(),
-            "sheets": [sheet.name for sheet in self.workbook.sheets] if self.workbook else []
+            "sheets": [sheet.name for sheet in self.workbook.sheets] if self.workbook else [],
+            "memory_mb": round(self.memory_bytes() / (1024 * 1024), 1),
+            "queue": self.lock.stats(),
+            "calculation": {
+                "mode": self.calculation_mode,
+                "pending": self.calc_pending,
+                "calls": self.calc_stats["calls"],
+                "total_ms": round(self.calc_stats["total_ms"], 1),
+                "last_ms": self.calc_stats["last_ms"]
+            }
         }
 
 
@@ -130,20 +283,72 @@ class ExcelSessionManager:
             self._sessions: Dict[str, ExcelSession] = {}
             self._sessions_lock = threading.RLock()
             
-            # Auto-recovery support: Store expired session info for recovery
-            self._expired_sessions: Dict[str, Dict[str, Any]] = {}
+            # Auto-recovery support: Store expired session info for recovery.
+            # _expired_sessions is oldest-first so trimming it is a popitem; redirects
+            # always point one hop to the newest session, and _redirect_sources is their
+            # reverse index (new session_id -> old session_ids) for O(1) cleanup.
+            self._expired_sessions: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
             self._session_redirects: Dict[str, str] = {}
+            self._redirect_sources: Dict[str, Set[str]] = {}
+            # Optional on-disk journal so recovery survives a restart (see enable_recovery_journal)
+            self._journal = None
+            # Mints new session IDs; cluster workers replace it so IDs hash to themselves
+            self.session_id_factory: Callable[[], str] = lambda: str(uuid.uuid4())
             self._max_expired_history = int(os.getenv('EXCEL_MCP_MAX_EXPIRED_HISTORY', '100'))
             
             # Configuration from environment
             self._ttl = int(os.getenv('EXCEL_MCP_SESSION_TTL', '600'))  # 10 minutes default
             self._max_sessions = int(os.getenv('EXCEL_MCP_MAX_OPEN', '8'))  # 8 sessions max
+            # Total Excel memory for sessions; 0 leaves only the session count limit
+            self._memory_budget = int(float(os.getenv('EXCEL_MCP_MEMORY_BUDGET_MB', '0')) * 1024 * 1024)
+            # How long open_workbook waits for capacity before failing
+            self._open_wait = float(os.getenv('EXCEL_MCP_OPEN_WAIT', '120'))
             
-            # Start cleanup thread
-            self._cleanup_thread = threading.Thread(target=self._cleanup_worker, daemon=True)
-            self._cleanup_thread.start()
+            # Admission control: opens wait on this condition (sharing _sessions_lock)
+            # until evicted sessions finish saving and closing in the background
+            self._capacity = threading.Condition(self._sessions_lock)
+            self._closing: Dict[str, ExcelSession] = {}
+            self._reserved: Dict[str, int] = {}  # session_id -> estimated bytes for opens in progress
+            self._recovering: Dict[str, threading.Lock] = {}  # expired session_id -> guard of its recovery
+            
+            # Implicit sessions serving the deprecated filepath= parameter, keyed by
+            # absolute path. They share one hidden Excel instance, are not listed, and
+            # close after EXCEL_MCP_PATH_SESSION_IDLE seconds without a call.
+            self._path_sessions: Dict[str, ExcelSession] = {}
+            self._path_app = None
+            self._path_open_lock = threading.Lock()
+            self._path_idle = float(os.getenv('EXCEL_MCP_PATH_SESSION_IDLE', '60'))
             
-            logger.info(f"ExcelSessionManager initialized: TTL={self._ttl}s, MAX={self._max_sessions}, Auto-Recovery=ON")
+            # Expiry: a heap of (deadline, seq, kind, key) for sessions ("session", id) and
+            # pooled path sessions ("path", path). touch() does not update it; when an
+            # entry comes due for a session used since, it is pushed again at its new
+            # deadline, so each session costs at most one wakeup per TTL.
+            self._deadlines: List[Tuple[float, int, str, str]] = []
+            self._deadline_seq = itertools.count()
+            self._deadline_cv = threading.Condition(threading.Lock())
+            
+            # Expiry thread, started with the first session; teardown runs on a pool
+            self._cleanup_thread: Optional[threading.Thread] = None
+            self._teardown_workers = int(os.getenv('EXCEL_MCP_TEARDOWN_WORKERS', '4'))
+            self._teardown_pool = None
+            
+            logger.info("ExcelSessionManager initialized: TTL=%ss, MAX=%s, Auto-Recovery=ON", self._ttl, self._max_sessions)
+
+    def _ensure_cleanup_thread(self):
+        """Start the expiry thread and teardown pool if not running (must be called with lock held)"""
+        if self._cleanup_thread is None:
+            from concurrent.futures import ThreadPoolExecutor
+            self._teardown_pool = ThreadPoolExecutor(max_workers=self._teardown_workers,
+                                                     thread_name_prefix="session-teardown")
+            self._cleanup_thread = threading.Thread(target=self._cleanup_worker, name="session-expiry", daemon=True)
+            self._cleanup_thread.start()
+    
+    def _schedule(self, deadline: float, kind: str, key: str):
+        """Add an expiry deadline, waking the expiry thread if it is now the earliest"""
+        with self._deadline_cv:
+            heapq.heappush(self._deadlines, (deadline, next(self._deadline_seq), kind, key))
+            if self._deadlines[0][2:] == (kind, key):
+                self._deadline_cv.notify()
 
     def _extract_session_info(self, session: ExcelSession) -> Dict[str, Any]:
         """Extract essential info from session for recovery purposes"""
@@ -183,26 +388,51 @@ class ExcelSessionManager:
             try:
                 current_mtime = os.path.getmtime(filepath)
                 if current_mtime > stored_mtime:
-                    logger.warning(f"FILE_MODIFIED: '{filepath}' was modified since session expired. "
-                                 f"Data may be inconsistent (last known: {datetime.fromtimestamp(stored_mtime)}, "
-                                 f"current: {datetime.fromtimestamp(current_mtime)})")
+                    logger.warning("FILE_MODIFIED: '%s' was modified since session expired. "
+                                   "Data may be inconsistent (last known: %s, current: %s)",
+                                   filepath, datetime.fromtimestamp(stored_mtime), datetime.fromtimestamp(current_mtime))
             except (OSError, IOError):
                 pass  # Ignore mtime check errors
         
         return True, None
     
     def _auto_recover_session(self, session_id: str) -> Optional[ExcelSession]:
-        """Attempt to recover an expired session"""
-        session_info = self._expired_sessions.get(session_id)
+        """Attempt to recover an expired session (called without the manager lock)
+        
+        Concurrent calls for one session are serialized; the later ones return
+        the session the first one recovered.
+        """
+        with self._sessions_lock:
+            guard = self._recovering.setdefault(session_id, threading.Lock())
+        with guard:
+            try:
+                return self._recover_guarded(session_id)
+            finally:
+                with self._sessions_lock:
+                    if self._recovering.get(session_id) is guard:
+                        del self._recovering[session_id]
+    
+    def _recover_guarded(self, session_id: str) -> Optional[ExcelSession]:
+        """Recover an expired session while holding its recovery guard"""
+        with self._sessions_lock:
+            # Recovered by another caller while this one waited
+            target = self._session_redirects.get(session_id)
+            if target in self._sessions:
+                return self._sessions[target]
+            session_info = self._expired_sessions.get(session_id)
         if not session_info:
             return None
         
-        logger.info(f"AUTO_RECOVERY: Attempting to recover session '{session_id}' for '{session_info['filepath']}'")
+        logger.info("AUTO_RECOVERY: Attempting to recover session '%s' for '%s'", session_id, session_info['filepath'])
+        
+        # The expired session's Excel may still be closing the file in the background
+        with self._capacity:
+            self._capacity.wait_for(lambda: session_id not in self._closing, timeout=self._open_wait)
         
         # Validate file state before recovery
         is_valid, error_msg = self._validate_file_state(session_info)
         if not is_valid:
-            logger.warning(f"AUTO_RECOVERY_FAILED: {error_msg}")
+            logger.warning("AUTO_RECOVERY_FAILED: %s", error_msg)
             return None
         
         try:
@@ -213,57 +443,152 @@ class ExcelSessionManager:
                 read_only=session_info['read_only']
             )
             
-            # Create redirect mapping from old to new session
-            self._session_redirects[session_id] = new_session_id
-            
-            # Get the new session
-            new_session = self._sessions.get(new_session_id)
+            with self._sessions_lock:
+                # Create redirect mapping from old to new session
+                self._add_redirect(session_id, new_session_id)
+                new_session = self._sessions.get(new_session_id)
             if new_session:
-                logger.info(f"AUTO_RECOVERY_SUCCESS: Session '{session_id}' recovered as '{new_session_id}' "
-                           f"for '{session_info['filepath']}'")
+                logger.info("AUTO_RECOVERY_SUCCESS: Session '%s' recovered as '%s' for '%s'",
+                            session_id, new_session_id, session_info['filepath'])
                 return new_session
             
         except Exception as e:
-            logger.error(f"AUTO_RECOVERY_ERROR: Failed to recover session '{session_id}': {e}")
+            logger.error("AUTO_RECOVERY_ERROR: Failed to recover session '%s': %s", session_id, e)
         
         return None
 
-    def _manage_expired_history(self):
-        """Manage expired session history to prevent memory bloat"""
-        if len(self._expired_sessions) > self._max_expired_history:
-            # Remove oldest expired sessions (FIFO)
-            expired_items = list(self._expired_sessions.items())
-            expired_items.sort(key=lambda x: x[1]['expired_at'])
-            
-            # Remove excess items
-            excess_count = len(self._expired_sessions) - self._max_expired_history
-            for i in range(excess_count):
-                session_id, session_info = expired_items[i]
-                del self._expired_sessions[session_id]
-                
-                # Also remove any redirect mappings
-                redirect_keys_to_remove = [k for k, v in self._session_redirects.items() if k == session_id]
-                for key in redirect_keys_to_remove:
-                    del self._session_redirects[key]
+    def _remember_expired(self, session_id: str, session_info: Dict[str, Any]):
+        """Add a session to recovery history, dropping the oldest past the cap (must be called with lock held)"""
+        self._expired_sessions.pop(session_id, None)
+        self._expired_sessions[session_id] = session_info
+        self._journal_append("expire", id=session_id, info=session_info)
+        excess_count = 0
+        while len(self._expired_sessions) > self._max_expired_history:
+            old_id, _ = self._expired_sessions.popitem(last=False)
+            self._drop_redirect(old_id)
+            self._journal_append("forget", id=old_id)
+            excess_count += 1
+        if excess_count:
+            logger.debug("MEMORY_CLEANUP: Removed %s old expired sessions from history", excess_count)
+    
+    def _forget(self, session_id: str):
+        """Drop all recovery state for a closed session (must be called with lock held)"""
+        self._expired_sessions.pop(session_id, None)
+        self._drop_redirect(session_id)
+        for source in self._redirect_sources.pop(session_id, ()):
+            self._session_redirects.pop(source, None)
+        self._journal_append("forget", id=session_id)
+    
+    def _add_redirect(self, old_id: str, new_id: str):
+        """Point old_id, and everything already redirected to it, at new_id (must be called with lock held)"""
+        self._drop_redirect(old_id)
+        sources = self._redirect_sources.pop(old_id, set())
+        sources.add(old_id)
+        for source in sources:
+            self._session_redirects[source] = new_id
+        self._redirect_sources.setdefault(new_id, set()).update(sources)
+        self._journal_append("redirect", **{"from": old_id, "to": new_id})
+    
+    def _drop_redirect(self, source: str):
+        """Remove one redirect and its reverse index entry (must be called with lock held)"""
+        target = self._session_redirects.pop(source, None)
+        if target is not None:
+            sources = self._redirect_sources.get(target)
+            if sources is not None:
+                sources.discard(source)
+                if not sources:
+                    del self._redirect_sources[target]
+    
+    def enable_recovery_journal(self, path: str):
+        """Persist recovery state to a JSONL journal and load what it holds
+        
+        Sessions that were open or expired when the server last stopped become
+        recoverable by their old IDs. Called by the server entry points, so
+        importing the module never touches the disk.
+        
+        Args:
+            path: Journal file (created if missing)
+        """
+        from .recovery import RecoveryJournal
+        journal = RecoveryJournal(path)
+        entries, redirects = journal.load()
+        with self._sessions_lock:
+            for session_id, info in entries.items():
+                if session_id not in self._sessions:
+                    self._expired_sessions.pop(session_id, None)
+                    self._expired_sessions[session_id] = info
+            while len(self._expired_sessions) > self._max_expired_history:
+                self._expired_sessions.popitem(last=False)
+            for source, target in redirects.items():
+                if target in self._expired_sessions:
+                    self._session_redirects[source] = target
+                    self._redirect_sources.setdefault(target, set()).add(source)
+            self._journal = journal
+            self._compact_journal()
+        logger.info("RECOVERY_JOURNAL: %s loaded (%s recoverable sessions, %s redirects)",
+                    path, len(self._expired_sessions), len(self._session_redirects))
+    
+    def adopt_recovery_journal(self, path: str) -> int:
+        """Make the recoverable sessions in another process's journal recoverable here
+        
+        Used by cluster workers when a sibling dies: calls for its session IDs are
+        routed to a surviving worker, which reopens them from their files.
+        
+        Args:
+            path: The other process's journal
             
-            if excess_count > 0:
-                logger.debug(f"MEMORY_CLEANUP: Removed {excess_count} old expired sessions from history")
+        Returns:
+            Number of sessions adopted
+        """
+        from .recovery import RecoveryJournal
+        entries, redirects = RecoveryJournal(path).load()
+        with self._sessions_lock:
+            for session_id, info in entries.items():
+                if session_id not in self._sessions:
+                    self._remember_expired(session_id, info)
+            for source, target in redirects.items():
+                if target in self._expired_sessions:
+                    self._add_redirect(source, target)
+        logger.info("RECOVERY_JOURNAL: Adopted %s recoverable sessions from %s", len(entries), path)
+        return len(entries)
+    
+    def _journal_append(self, op: str, **fields: Any):
+        """Record a recovery event if the journal is enabled (must be called with lock held)"""
+        if self._journal is None:
+            return
+        self._journal.append(op, **fields)
+        if self._journal.needs_compaction(len(self._expired_sessions) + len(self._sessions) + len(self._session_redirects)):
+            self._compact_journal()
+    
+    def _compact_journal(self):
+        """Rewrite the journal as the current state (must be called with lock held)"""
+        self._journal.compact(
+            self._expired_sessions,
+            self._session_redirects,
+            {session_id: self._extract_session_info(session) for session_id, session in self._sessions.items()},
+        )
     
     def open_workbook(self, filepath: str, visible: bool = False, 
                      read_only: bool = False) -> str:
         """Open a workbook and create a new session"""
         
         # Generate session ID
-        session_id = str(uuid.uuid4())
+        session_id = self.session_id_factory()
+        
+        # A pooled filepath= session would hold the file open (its changes are already saved)
+        self.close_path_session(filepath, save=False)
         
-        # Check if we need to evict old sessions (LRU)
         with self._sessions_lock:
-            if len(self._sessions) >= self._max_sessions:
-                self._evict_lru_session()
+            self._ensure_cleanup_thread()
+        # Wait for room, evicting idle sessions in the background if needed
+        self._admit(session_id, filepath)
         
         try:
             # Log session creation
-            logger.debug(f"Creating session {session_id} for {filepath} (visible={visible}, read_only={read_only})")
+            logger.debug("Creating session %s for %s (visible=%s, read_only=%s)", session_id, filepath, visible, read_only)
+            
+            import xlwings as xw
+            METRICS.install_save_timer()
             
             # Create Excel app instance
             app = xw.App(visible=visible, add_book=False)
@@ -280,27 +605,33 @@ class ExcelSessionManager:
                     raise IOError(f"FILE_ACCESS_ERROR: '{abs_path}' is locked by another process. Use force_close_workbook_by_path() to force close it first.")
                 
                 wb = app.books.open(abs_path, read_only=read_only)
-                logger.debug(f"Opened existing workbook: {abs_path}")
+                logger.debug("Opened existing workbook: %s", abs_path)
             else:
                 # Create new workbook if doesn't exist
                 wb = app.books.add()
                 Path(abs_path).parent.mkdir(parents=True, exist_ok=True)
                 wb.save(abs_path)
-                logger.debug(f"Created new workbook: {abs_path}")
+                logger.debug("Created new workbook: %s", abs_path)
             
             # Create session
             session = ExcelSession(session_id, abs_path, app, wb, visible, read_only)
             
             # Store session
             with self._sessions_lock:
+                self._reserved.pop(session_id, None)
                 self._sessions[session_id] = session
-                logger.info(f"Session {session_id} created for {filepath} (total sessions: {len(self._sessions)})")
+                self._schedule(session.last_accessed + self._ttl, "session", session_id)
+                self._journal_append("open", id=session_id, info=self._extract_session_info(session))
+                logger.info("Session %s created for %s (total sessions: %s)", session_id, filepath, len(self._sessions))
             
             return session_id
             
         except Exception as e:
-            logger.error(f"Failed to create session for {filepath}: {e}")
+            logger.error("Failed to create session for %s: %s", filepath, e)
             # Clean up on failure
+            with self._capacity:
+                if self._reserved.pop(session_id, None) is not None:
+                    self._capacity.notify_all()
             if 'app' in locals():
                 try:
                     app.quit()
@@ -309,81 +640,64 @@ class ExcelSessionManager:
             raise
     
     def get_session(self, session_id: str) -> Optional[ExcelSession]:
-        """Get a session by ID with automatic recovery support"""
+        """Get a session by ID with automatic recovery support
+        
+        The lookup runs under the manager lock; recovering an expired session
+        (which starts Excel and may wait for capacity) runs after releasing it.
+        """
         with self._sessions_lock:
-            # Check for redirect first (if session was recovered)
+            # Check for redirect first (if session was recovered); redirects are always one hop
             actual_session_id = self._session_redirects.get(session_id, session_id)
             
             session = self._sessions.get(actual_session_id)
             if session:
                 # Check if session is expired
-                if hasattr(session, 'last_accessed'):
-                    time_since_access = time.time() - session.last_accessed
-                    if time_since_access > self._ttl:
-                        logger.warning(f"SESSION_TIMEOUT: Session '{actual_session_id}' expired (last accessed {time_since_access:.0f}s ago, TTL={self._ttl}s)")
-                        
-                        # Store session info for potential recovery before cleanup
-                        session_info = self._extract_session_info(session)
-                        
-                        # Clean up expired session
-                        try:
-                            if session.workbook:
-                                session.workbook.close()
-                            if session.app:
-                                session.app.quit()
-                        except:
-                            pass
-                        
-                        # Move to expired sessions for potential recovery
-                        self._expired_sessions[session_id] = session_info
-                        self._manage_expired_history()
-                        
-                        # Remove from active sessions
-                        del self._sessions[actual_session_id]
-                        
-                        # Remove redirect if it exists
-                        if session_id in self._session_redirects:
-                            del self._session_redirects[session_id]
-                        
-                        # Attempt automatic recovery
-                        logger.info(f"AUTO_RECOVERY: Session '{session_id}' expired, attempting automatic recovery...")
-                        recovered_session = self._auto_recover_session(session_id)
-                        if recovered_session:
-                            recovered_session.touch()
-                            return recovered_session
-                        
-                        return None
+                time_since_access = time.time() - session.last_accessed
+                if time_since_access <= self._ttl:
+                    session.touch()
+                    logger.debug("Session %s accessed", session_id)
+                    return session
                 
-                session.touch()
-                logger.debug(f"Session {session_id} accessed")
-                return session
-            else:
-                # Session not found in active sessions, try auto-recovery
-                if session_id in self._expired_sessions:
-                    logger.info(f"AUTO_RECOVERY: Session '{session_id}' not active, attempting recovery...")
-                    recovered_session = self._auto_recover_session(session_id)
-                    if recovered_session:
-                        recovered_session.touch()
-                        return recovered_session
+                logger.warning("SESSION_TIMEOUT: Session '%s' expired (last accessed %.0fs ago, TTL=%ss)", actual_session_id, time_since_access, self._ttl)
                 
-                logger.warning(f"SESSION_NOT_FOUND: Session '{session_id}' not found and cannot be recovered. It may have been permanently closed.")
-            
-            return None
+                # Same as _expire_session: keep it for recovery and close it in the background
+                self._remember_expired(actual_session_id, self._extract_session_info(session))
+                del self._sessions[actual_session_id]
+                self._closing[actual_session_id] = session
+                self._teardown_pool.submit(self._teardown, session, False)
+                logger.info("AUTO_RECOVERY: Session '%s' expired, attempting automatic recovery...", session_id)
+            elif actual_session_id in self._expired_sessions:
+                logger.info("AUTO_RECOVERY: Session '%s' not active, attempting recovery...", session_id)
+            else:
+                logger.warning("SESSION_NOT_FOUND: Session '%s' not found and cannot be recovered. It may have been permanently closed.", session_id)
+                return None
+        
+        # The new session inherits every ID that led here
+        recovered_session = self._auto_recover_session(actual_session_id)
+        if recovered_session:
+            recovered_session.touch()
+        return recovered_session
     
-    def close_workbook(self, session_id: str, save: bool = True) -> bool:
-        """Close a workbook and remove session"""
+    def close_workbook(self, session_id: str, save: bool = True, recoverable: bool = False) -> bool:
+        """Close a workbook and remove session
+        
+        Args:
+            session_id: Session to close (or an ID redirected to it)
+            save: Save before closing
+            recoverable: Keep the session in recovery history (used at shutdown)
+        """
         with self._sessions_lock:
             # Handle redirect mapping if exists
             actual_session_id = self._session_redirects.get(session_id, session_id)
             
             session = self._sessions.get(actual_session_id)
             if not session:
-                logger.warning(f"Cannot close: session {session_id} not found")
+                logger.warning("Cannot close: session %s not found", session_id)
                 return False
             
             try:
                 with session.lock:
-                    logger.debug(f"Closing session {session_id} (actual: {actual_session_id})")
+                    logger.debug("Closing session %s (actual: %s)", session_id, actual_session_id)
                     
                     # Save and close workbook
                     if session.workbook:
@@ -399,32 +713,28 @@ class ExcelSessionManager:
                     del self._sessions[actual_session_id]
                     
                     # Clean up auto-recovery related data
-                    if session_id in self._expired_sessions:
-                        del self._expired_sessions[session_id]
-                    
-                    # Clean up redirect mappings
-                    redirect_keys_to_remove = []
-                    for k, v in self._session_redirects.items():
-                        if k == session_id or v == actual_session_id:
-                            redirect_keys_to_remove.append(k)
+                    if recoverable:
+                        self._remember_expired(actual_session_id, self._extract_session_info(session))
+                    else:
+                        if session_id != actual_session_id:
+                            self._forget(session_id)
+                        self._forget(actual_session_id)
                     
-                    for key in redirect_keys_to_remove:
-                        del self._session_redirects[key]
-                    
-                    logger.info(f"Session {session_id} closed permanently (remaining sessions: {len(self._sessions)})")
+                    self._capacity.notify_all()
+                    logger.info("Session %s closed permanently (remaining sessions: %s)", session_id, len(self._sessions))
                     return True
                     
             except Exception as e:
-                logger.error(f"Error closing session {session_id}: {e}")
+                logger.error("Error closing session %s: %s", session_id, e)
                 # Force remove from sessions even on error
                 if actual_session_id in self._sessions:
                     del self._sessions[actual_session_id]
                     
                 # Clean up recovery data on error too
-                if session_id in self._expired_sessions:
-                    del self._expired_sessions[session_id]
-                if session_id in self._session_redirects:
-                    del self._session_redirects[session_id]
+                if not recoverable:
+                    if session_id != actual_session_id:
+                        self._forget(session_id)
+                    self._forget(actual_session_id)
                     
                 return False
     
@@ -437,98 +747,313 @@ class ExcelSessionManager:
         """Close all sessions (for shutdown)"""
         with self._sessions_lock:
             session_ids = list(self._sessions.keys())
+            paths = list(self._path_sessions.keys())
             
+        # Unsaved changes are dropped, but clients can still recover their sessions
+        # from the saved files, including after a restart when the journal is enabled
         for session_id in session_ids:
             try:
-                self.close_workbook(session_id, save=False)
+                self.close_workbook(session_id, save=False, recoverable=True)
             except Exception as e:
-                logger.error(f"Error closing session {session_id} during shutdown: {e}")
+                logger.error("Error closing session %s during shutdown: %s", session_id, e)
+        
+        # Let evicted sessions finish saving
+        with self._capacity:
+            self._capacity.wait_for(lambda: not self._closing, timeout=self._open_wait)
+        
+        # Pooled sessions were saved after every change, nothing is pending
+        for path in paths:
+            self.close_path_session(path, save=False)
         
         logger.info("All sessions closed")
     
-    def _evict_lru_session(self):
-        """Evict least recently used session (must be called with lock held)"""
-        if not self._sessions:
-            return
+    @contextmanager
+    def path_session(self, filepath: str) -> Iterator[ExcelSession]:
+        """Lock and yield the pooled session for a deprecated filepath= tool call.
+        
+        Consecutive calls on the same file reuse the open workbook, and calls on
+        any file reuse one warm hidden Excel instance, instead of launching Excel
+        per call. If the call changed the workbook it is saved on exit, as the
+        per-call path did.
+        
+        Args:
+            filepath: Path to an existing workbook
+        """
+        abs_path = os.path.abspath(filepath)
+        while True:
+            with self._sessions_lock:
+                self._ensure_cleanup_thread()
+                session = self._path_sessions.get(abs_path)
+            if session is None:
+                session = self._open_path_session(abs_path)
+            with session.lock:
+                if session.workbook is None:
+                    # Closed for idleness between lookup and lock; open it again
+                    continue
+                token = session.change_token
+                try:
+                    yield session
+                    if session.change_token != token and not session.read_only and not self._saved(session):
+                        session.workbook.save()
+                finally:
+                    session.touch()
+                return
+    
+    @staticmethod
+    def _saved(session: ExcelSession) -> bool:
+        """True if Excel has no unsaved changes (many impl functions save themselves)"""
+        try:
+            return session.workbook.api.Saved is True
+        except Exception:
+            return False
+    
+    def _open_path_session(self, abs_path: str) -> ExcelSession:
+        """Open a pooled session in the shared hidden Excel instance"""
+        with self._path_open_lock:
+            with self._sessions_lock:
+                session = self._path_sessions.get(abs_path)
+            if session is not None:
+                return session
+            
+            import xlwings as xw
+            METRICS.install_save_timer()
+            
+            if is_file_locked(abs_path):
+                raise IOError(f"FILE_ACCESS_ERROR: '{abs_path}' is locked by another process. Use force_close_workbook_by_path() to force close it first.")
+            
+            if self._path_app is None:
+                app = xw.App(visible=False, add_book=False)
+                app.display_alerts = False
+                app.screen_updating = False
+                self._path_app = app
+                logger.debug("PATH_POOL: Started shared Excel instance")
+            
+            wb = self._path_app.books.open(abs_path)
+            session = ExcelSession(f"path:{abs_path}", abs_path, self._path_app, wb)
+            with self._sessions_lock:
+                self._path_sessions[abs_path] = session
+                self._schedule(session.last_accessed + self._path_idle, "path", abs_path)
+            logger.info("PATH_POOL: Opened %s for filepath calls (pooled: %s)", abs_path, len(self._path_sessions))
+            return session
+    
+    def close_path_session(self, filepath: str, save: bool = True) -> bool:
+        """Close the pooled session for a path, if any
+        
+        Args:
+            filepath: Workbook path
+            save: Save before closing (changes are already saved after each call)
+            
+        Returns:
+            True if a pooled session was closed
+        """
+        abs_path = os.path.abspath(filepath)
+        with self._sessions_lock:
+            session = self._path_sessions.pop(abs_path, None)
+        if session is None:
+            return False
+        with session.lock:
+            try:
+                if save and not session.read_only:
+                    session.workbook.save()
+                session.workbook.close()
+            except Exception as e:
+                logger.warning("PATH_POOL: Error closing %s: %s", abs_path, e)
+            session.workbook = None
+        logger.info("PATH_POOL: Closed %s (pooled: %s)", abs_path, len(self._path_sessions))
+        
+        # Quit the shared instance with its last workbook
+        with self._path_open_lock:
+            with self._sessions_lock:
+                idle_app = self._path_app if not self._path_sessions else None
+                if idle_app is not None:
+                    self._path_app = None
+            if idle_app is not None:
+                try:
+                    idle_app.quit()
+                except Exception as e:
+                    logger.warning("PATH_POOL: Error quitting shared Excel instance: %s", e)
+        return True
+    
+    def _admit(self, session_id: str, filepath: str):
+        """Reserve capacity for a new session, evicting idle sessions if needed
         
-        # Find LRU session
-        lru_session = min(self._sessions.values(), key=lambda s: s.last_accessed)
-        logger.info(f"Evicting LRU session {lru_session.id} (last access: {datetime.fromtimestamp(lru_session.last_accessed).isoformat()})")
+        Waits (without holding the manager lock) while evicted sessions save and
+        close in the background, so other sessions keep working meanwhile.
+        Session memory is sampled outside the manager lock.
         
-        # Close it
-        self.close_workbook(lru_session.id, save=True)
+        Raises:
+            WorkbookError: The workbook alone exceeds the memory budget and other
+                sessions are open (they are not evicted for it)
+            TimeoutError: No capacity freed within EXCEL_MCP_OPEN_WAIT seconds
+        """
+        cost = estimate_open_cost(filepath)
+        started = time.perf_counter()
+        deadline = time.monotonic() + self._open_wait
+        while True:
+            with self._sessions_lock:
+                sessions = list(self._sessions.items()) + list(self._closing.items())
+            sampled = {sid: s.memory_bytes() for sid, s in sessions}
+            with self._capacity:
+                if self._memory_budget and cost > self._memory_budget:
+                    # Evicting everyone would still not make it fit; open it only on an idle server
+                    if self._sessions or self._closing or self._reserved:
+                        from .exceptions import WorkbookError
+                        raise WorkbookError(
+                            f"WORKBOOK_TOO_LARGE: '{filepath}' needs about {cost / (1024 * 1024):.0f} MB, more than "
+                            f"the whole memory budget ({self._memory_budget / (1024 * 1024):.0f} MB). It can only be "
+                            f"opened while no other session is open ({len(self._sessions)} open)."
+                        )
+                    self._reserved[session_id] = cost
+                    break
+                # Sessions opened since the sample are charged their estimate
+                costs = {sid: sampled[sid] if sid in sampled else estimate_open_cost(s.filepath)
+                         for sid, s in list(self._sessions.items()) + list(self._closing.items())}
+                self._evict_for(cost, costs)
+                if self._fits(cost, costs):
+                    self._reserved[session_id] = cost
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(
+                        f"CAPACITY_TIMEOUT: No session capacity freed within {self._open_wait:.0f}s "
+                        f"(open: {len(self._sessions)}, closing: {len(self._closing)}, max: {self._max_sessions})"
+                    )
+                # Re-check at least every second; process memory changes without notification
+                self._capacity.wait(min(remaining, 1.0))
+        waited_ms = (time.perf_counter() - started) * 1000
+        METRICS.observe("session_open_wait_ms", waited_ms)
+        if waited_ms > 1000:
+            logger.info("ADMISSION: Waited %.0fms for capacity to open %s", waited_ms, filepath)
+    
+    def _fits(self, cost: int, costs: Dict[str, int]) -> bool:
+        """Whether a session of this cost can open now (must be called with lock held)"""
+        count = len(self._sessions) + len(self._closing) + len(self._reserved)
+        if count >= self._max_sessions:
+            return False
+        if self._memory_budget and sum(costs.values()) + sum(self._reserved.values()) + cost > self._memory_budget:
+            return False
+        return True
+    
+    def _evict_for(self, cost: int, costs: Dict[str, int]):
+        """Evict sessions until a new one of this cost fits once pending closes finish
+        (must be called with lock held)
+        
+        Sessions are chosen by idle time weighted by memory, so one large idle
+        workbook goes before several small ones and recently used sessions stay.
+        """
+        count = len(self._sessions) + len(self._reserved)
+        used = sum(costs.get(sid, 0) for sid in self._sessions) + sum(self._reserved.values())
+        
+        def over() -> bool:
+            if count >= self._max_sessions:
+                return True
+            return bool(self._memory_budget) and used + cost > self._memory_budget and count > 0
+        
+        now = time.time()
+        candidates = sorted(self._sessions.values(),
+                            key=lambda s: (now - s.last_accessed + 1) * costs.get(s.id, 1), reverse=True)
+        for session in candidates:
+            if not over():
+                break
+            count -= 1
+            used -= costs.get(session.id, 0)
+            self._evict(session, costs.get(session.id, 0))
+    
+    def _evict(self, session: ExcelSession, cost: int):
+        """Remove a session and save/close it on a background thread (must be called with lock held)"""
+        logger.info("EVICT: Session %s (%.0f MB, last access: %s) closing in background",
+                    session.id, cost / (1024 * 1024), datetime.fromtimestamp(session.last_accessed).isoformat())
+        del self._sessions[session.id]
+        self._closing[session.id] = session
+        self._forget(session.id)
+        METRICS.inc("sessions_evicted_total")
+        self._teardown_pool.submit(self._teardown, session, True)
+    
+    def _teardown(self, session: ExcelSession, save: bool):
+        """Save (optionally), close and quit a session already removed from the table.
+        Runs on the teardown pool after any in-flight call releases the session lock."""
+        try:
+            cleanup_success = False
+            try:
+                with session.lock:
+                    if session.workbook:
+                        if save and not session.read_only:
+                            session.workbook.save()
+                        session.workbook.close()
+                    if session.app:
+                        session.app.quit()
+                cleanup_success = True
+                logger.debug("TEARDOWN: Excel resources cleaned normally for session %s", session.id)
+            except Exception as cleanup_error:
+                logger.warning("Normal cleanup failed for session %s: %s", session.id, cleanup_error)
+            
+            # Force kill zombie process if normal cleanup failed
+            if not cleanup_success and session.process_id:
+                try:
+                    import psutil
+                    import subprocess
+                    
+                    # Check if process still exists
+                    if psutil.pid_exists(session.process_id):
+                        logger.warning("TEARDOWN: Force killing zombie Excel process %s for session %s", session.process_id, session.id)
+                        subprocess.run(['taskkill', '/F', '/PID', str(session.process_id)], 
+                                     capture_output=True, check=False)
+                        logger.info("TEARDOWN: Zombie process %s terminated", session.process_id)
+                except Exception as force_kill_error:
+                    logger.error("Failed to force kill process %s: %s", session.process_id, force_kill_error)
+        finally:
+            with self._capacity:
+                self._closing.pop(session.id, None)
+                self._capacity.notify_all()
     
     def _cleanup_worker(self):
-        """Background thread to clean up expired sessions while preserving recovery info"""
+        """Sleep until the earliest deadline, then expire what is due"""
         while True:
             try:
-                time.sleep(30)  # Check every 30 seconds
+                with self._deadline_cv:
+                    while not self._deadlines or self._deadlines[0][0] > time.time():
+                        timeout = self._deadlines[0][0] - time.time() if self._deadlines else None
+                        self._deadline_cv.wait(timeout)
+                    _, _, kind, key = heapq.heappop(self._deadlines)
                 
-                current_time = time.time()
-                expired_sessions = []
-                
-                with self._sessions_lock:
-                    for session_id, session in self._sessions.items():
-                        if current_time - session.last_accessed > self._ttl:
-                            expired_sessions.append((session_id, session))
-                
-                # Process expired sessions - move to history instead of permanent deletion
-                for session_id, session in expired_sessions:
-                    logger.info(f"TTL_CLEANUP: Moving expired session '{session_id}' to recovery history (TTL={self._ttl}s)")
-                    try:
-                        with self._sessions_lock:
-                            # Extract session info for recovery before cleanup
-                            session_info = self._extract_session_info(session)
-                            
-                            # Clean up Excel resources with zombie process protection
-                            cleanup_success = False
-                            try:
-                                if session.workbook:
-                                    session.workbook.close()
-                                if session.app:
-                                    session.app.quit()
-                                cleanup_success = True
-                                logger.debug(f"TTL_CLEANUP: Excel resources cleaned normally for session {session_id}")
-                            except Exception as cleanup_error:
-                                logger.warning(f"Normal cleanup failed for session {session_id}: {cleanup_error}")
-                            
-                            # Force kill zombie process if normal cleanup failed
-                            if not cleanup_success and hasattr(session, 'process_id') and session.process_id:
-                                try:
-                                    import psutil
-                                    import subprocess
-                                    
-                                    # Check if process still exists
-                                    if psutil.pid_exists(session.process_id):
-                                        logger.warning(f"TTL_CLEANUP: Force killing zombie Excel process {session.process_id} for session {session_id}")
-                                        subprocess.run(['taskkill', '/F', '/PID', str(session.process_id)], 
-                                                     capture_output=True, check=False)
-                                        logger.info(f"TTL_CLEANUP: Zombie process {session.process_id} terminated")
-                                except Exception as force_kill_error:
-                                    logger.error(f"Failed to force kill process {session.process_id}: {force_kill_error}")
-                            
-                            # Move to expired sessions for potential recovery
-                            self._expired_sessions[session_id] = session_info
-                            self._manage_expired_history()
-                            
-                            # Remove from active sessions
-                            if session_id in self._sessions:
-                                del self._sessions[session_id]
-                            
-                            logger.debug(f"TTL_CLEANUP: Session '{session_id}' moved to recovery history (active: {len(self._sessions)}, history: {len(self._expired_sessions)})")
-                            
-                    except Exception as e:
-                        logger.error(f"Error processing expired session {session_id}: {e}")
-                        # Force cleanup if regular cleanup fails
-                        try:
-                            with self._sessions_lock:
-                                if session_id in self._sessions:
-                                    del self._sessions[session_id]
-                        except:
-                            pass
-                        
+                if kind == "session":
+                    self._expire_session(key)
+                else:
+                    self._expire_path_session(key)
             except Exception as e:
-                logger.error(f"Error in cleanup worker: {e}")
+                logger.error("Error in cleanup worker: %s", e)
+    
+    def _expire_session(self, session_id: str):
+        """Move a session whose TTL passed to recovery history and tear it down in the background"""
+        with self._sessions_lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                return  # Closed, evicted or expired on access already
+            deadline = session.last_accessed + self._ttl
+            if deadline > time.time():
+                self._schedule(deadline, "session", session_id)
+                return
+            
+            logger.info("TTL_CLEANUP: Moving expired session '%s' to recovery history (TTL=%ss)", session_id, self._ttl)
+            self._remember_expired(session_id, self._extract_session_info(session))
+            del self._sessions[session_id]
+            # Its Excel process counts against capacity until teardown finishes
+            self._closing[session_id] = session
+            logger.debug("TTL_CLEANUP: Session '%s' moved to recovery history (active: %s, history: %s)", session_id, len(self._sessions), len(self._expired_sessions))
+        self._teardown_pool.submit(self._teardown, session, False)
+    
+    def _expire_path_session(self, path: str):
+        """Close a pooled path session once it has been idle for the idle interval"""
+        with self._sessions_lock:
+            session = self._path_sessions.get(path)
+            if session is None:
+                return
+            deadline = session.last_accessed + self._path_idle
+            if deadline > time.time():
+                self._schedule(deadline, "path", path)
+                return
+        logger.debug("PATH_POOL: Closing %s after %ss idle", path, self._path_idle)
+        self._teardown_pool.submit(self.close_path_session, path, False)
 
 
 # Global singleton instance
@@ -0,0 +1,338 @@
+"""
+In-memory copies of sheet values, so reads can be answered without COM.
+A sheet is loaded with one bulk read of its used range and then kept in step
+with the writes, inserts and deletes that go through the server. Snapshots are
+never modified: every change builds a new one (sharing unchanged rows) and the
+session publishes it with one reference swap, so readers use them without the
+session lock. Cells whose value only Excel knows (formula results, or written
+values Excel may convert) are read back in one bulk read when a read needs them.
+"""
+
+import os
+from datetime import datetime
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Set, Tuple
+
+# Sheets with more cells than this are always read from Excel
+SNAPSHOT_MAX_CELLS = int(os.getenv("EXCEL_MCP_SNAPSHOT_MAX_CELLS", "1000000"))
+
+Cell = Tuple[int, int]
+
+_BOOLEAN_TEXT = ("TRUE", "FALSE")
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def settled_value(value: Any, previous: Any) -> Tuple[Any, bool]:
+    """The value Excel will return for a value written over previous, and whether that is certain.
+
+    Numbers and dates come back according to the cell's number format, so they
+    are only certain where the cell already held the same kind of value. Text
+    Excel may parse on entry (numbers, dates, booleans, errors) is left to be
+    read back as well.
+    """
+    if value is None or isinstance(value, bool):
+        return value, True
+    if _is_number(value):
+        return (float(value), True) if _is_number(previous) else (None, False)
+    if isinstance(value, datetime):
+        return (value, True) if isinstance(previous, datetime) else (None, False)
+    if isinstance(value, str) and value:
+        if value[0] in "=+-@'#" or value.strip().upper() in _BOOLEAN_TEXT or any(ch.isdigit() for ch in value):
+            return None, False
+        return value, True
+    return None, False
+
+
+def _shift(cells: FrozenSet[Cell], axis: int, start: int, count: int) -> FrozenSet[Cell]:
+    """Move cells across an insert (count > 0) or delete (count < 0) of rows (axis 0) or columns (axis 1)."""
+    moved = set()
+    for cell in cells:
+        position = cell[axis]
+        if position >= start:
+            if count < 0 and position < start - count:
+                continue
+            position += count
+        moved.add((position, cell[1]) if axis == 0 else (cell[0], position))
+    return frozenset(moved)
+
+
+class SheetValues:
+    """Values of one sheet's block starting at (top, left); cells outside it are empty.
+
+    formulas holds the formula cells (and spilled cells) seen at load or written
+    since; their values, and anything a dynamic array could spill over below and
+    to the right of them, are only trusted while the session's read token still
+    equals loaded_token. unsettled holds written cells whose value is unknown.
+    """
+
+    __slots__ = ("name", "top", "left", "width", "rows", "formulas", "unsettled", "loaded_token")
+
+    def __init__(self, name: str, top: int, left: int, width: int, rows: List[List[Any]],
+                 formulas: FrozenSet[Cell] = frozenset(), unsettled: FrozenSet[Cell] = frozenset(),
+                 loaded_token: Any = None):
+        self.name = name
+        self.top = top
+        self.left = left
+        self.width = width
+        self.rows = rows    # shared between snapshots; never modified in place
+        self.formulas = formulas
+        self.unsettled = unsettled
+        self.loaded_token = loaded_token
+
+    @property
+    def bottom(self) -> int:
+        return self.top + len(self.rows) - 1
+
+    @property
+    def right(self) -> int:
+        return self.left + self.width - 1
+
+    def cell_count(self) -> int:
+        return len(self.rows) * self.width
+
+    def _replace(self, **changes: Any) -> "SheetValues":
+        fields = {name: getattr(self, name) for name in self.__slots__}
+        fields.update(changes)
+        return SheetValues(**fields)
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def formulas_stale(self, read_token: Any) -> bool:
+        return bool(self.formulas) and self.loaded_token != read_token
+
+    def is_fresh(self, r1: int, c1: int, r2: int, c2: int, read_token: Any) -> bool:
+        """Whether every cell of a block can be served without reading Excel."""
+        if any(r1 <= r <= r2 and c1 <= c <= c2 for r, c in self.unsettled):
+            return False
+        if self.formulas_stale(read_token):
+            return not any(r <= r2 and c <= c2 for r, c in self.formulas)
+        return True
+
+    def unsettled_bounds(self) -> Optional[Tuple[int, int, int, int]]:
+        """Smallest block holding every unsettled cell"""
+        if not self.unsettled:
+            return None
+        rows = [r for r, _ in self.unsettled]
+        cols = [c for _, c in self.unsettled]
+        return min(rows), min(cols), max(rows), max(cols)
+
+    def block(self, r1: int, c1: int, r2: int, c2: int) -> List[List[Any]]:
+        """Values of a block as a 2D list (rows of columns)."""
+        lo, hi = max(c1, self.left), min(c2, self.right)
+        before = [None] * max(0, min(lo, c2 + 1) - c1)
+        after = [None] * max(0, c2 - max(hi, c1 - 1))
+        empty = [None] * max(0, c2 - c1 + 1)
+        out = []
+        for r in range(r1, r2 + 1):
+            i = r - self.top
+            if 0 <= i < len(self.rows) and lo <= hi:
+                out.append(before + self.rows[i][lo - self.left:hi - self.left + 1] + after)
+            else:
+                out.append(list(empty))
+        return out
+
+    # ------------------------------------------------------------------
+    # Changes (each returns a new SheetValues)
+    # ------------------------------------------------------------------
+
+    def _covering(self, r1: int, c1: int, r2: int, c2: int) -> Tuple[int, int, int, List[List[Any]]]:
+        """(top, left, width, rows) grown to cover a block; rows is a new outer list."""
+        top, left = min(self.top, r1), min(self.left, c1)
+        width = max(self.right, c2) - left + 1
+        pad_left, pad_right = self.left - left, width - self.width - (self.left - left)
+        if pad_left or pad_right:
+            rows = [[None] * pad_left + row + [None] * pad_right for row in self.rows]
+        else:
+            rows = list(self.rows)
+        rows = [[None] * width for _ in range(self.top - top)] + rows
+        rows += [[None] * width for _ in range(max(self.bottom, r2) - (top + len(rows) - 1))]
+        return top, left, width, rows
+
+    def _write(self, r1: int, c1: int, grid: List[List[Any]]) -> "SheetValues":
+        if not grid or not grid[0]:
+            return self
+        top, left, width, rows = self._covering(r1, c1, r1 + len(grid) - 1, c1 + len(grid[0]) - 1)
+        for offset, line in enumerate(grid):
+            i = r1 + offset - top
+            row = list(rows[i])
+            row[c1 - left:c1 - left + len(line)] = line
+            rows[i] = row
+        return self._replace(top=top, left=left, width=width, rows=rows)
+
+    def _with_cells(self, r1: int, c1: int, r2: int, c2: int, formulas: Set[Cell], unsettled: Set[Cell]) -> "SheetValues":
+        """Replace the formula and unsettled cells inside a block."""
+
+        def outside(cells: FrozenSet[Cell]) -> Set[Cell]:
+            return {(r, c) for r, c in cells if not (r1 <= r <= r2 and c1 <= c <= c2)}
+
+        return self._replace(formulas=frozenset(outside(self.formulas) | formulas),
+                             unsettled=frozenset(outside(self.unsettled) | unsettled))
+
+    def values_written(self, r1: int, c1: int, data: List[List[Any]]) -> "SheetValues":
+        """After Range.value = data (a rectangular 2D list) at (r1, c1)."""
+        if not all(isinstance(line, (list, tuple)) for line in data) or len({len(line) for line in data}) != 1:
+            raise ValueError("data is not a rectangular 2D list")
+        r2, c2 = r1 + len(data) - 1, c1 + len(data[0]) - 1
+        previous = self.block(r1, c1, r2, c2)
+        grid, formulas, unsettled = [], set(), set()
+        for i, line in enumerate(data):
+            out = []
+            for j, value in enumerate(line):
+                settled, certain = settled_value(value, previous[i][j])
+                out.append(settled)
+                if not certain:
+                    cell = (r1 + i, c1 + j)
+                    (formulas if isinstance(value, str) and value.startswith("=") else unsettled).add(cell)
+            grid.append(out)
+        return self._write(r1, c1, grid)._with_cells(r1, c1, r2, c2, formulas, unsettled)
+
+    def formulas_written(self, r1: int, c1: int, r2: int, c2: int) -> "SheetValues":
+        """After formulas, or content that may hold them (Range.Copy), were entered into a block."""
+        cells = {(r, c) for r in range(r1, r2 + 1) for c in range(c1, c2 + 1)}
+        grid = [[None] * (c2 - c1 + 1) for _ in range(r2 - r1 + 1)]
+        return self._write(r1, c1, grid)._with_cells(r1, c1, r2, c2, cells, set())
+
+    def overwritten(self, r1: int, c1: int, r2: int, c2: int) -> "SheetValues":
+        """After a block's values were changed in a way only Excel knows (e.g. merging), without formulas."""
+        cells = {(r, c) for r in range(r1, r2 + 1) for c in range(c1, c2 + 1)}
+        grid = [[None] * (c2 - c1 + 1) for _ in range(r2 - r1 + 1)]
+        return self._write(r1, c1, grid)._with_cells(r1, c1, r2, c2, set(), cells)
+
+    def refreshed(self, r1: int, c1: int, grid: List[List[Any]]) -> "SheetValues":
+        """After re-reading a block that holds every unsettled cell."""
+        return self._write(r1, c1, grid)._replace(unsettled=frozenset())
+
+    def rows_shifted(self, start: int, count: int) -> "SheetValues":
+        """After inserting count rows before start (count > 0) or deleting rows start..start-count-1."""
+        rows = list(self.rows)
+        top = self.top
+        if count > 0:
+            if start <= top:
+                top += count
+            elif start <= self.bottom:
+                i = start - top
+                rows[i:i] = [[None] * self.width for _ in range(count)]
+        else:
+            end = start - count - 1
+            lo, hi = max(start, top), min(end, self.bottom)
+            if lo <= hi:
+                del rows[lo - top:hi - top + 1]
+            top -= max(0, min(end, top - 1) - start + 1)
+        return self._replace(top=top, rows=rows,
+                             formulas=_shift(self.formulas, 0, start, count),
+                             unsettled=_shift(self.unsettled, 0, start, count))
+
+    def columns_shifted(self, start: int, count: int) -> "SheetValues":
+        """After inserting count columns before start (count > 0) or deleting columns start..start-count-1."""
+        left, width, rows = self.left, self.width, self.rows
+        if count > 0:
+            if start <= left:
+                left += count
+            elif start <= self.right:
+                i = start - left
+                rows = [row[:i] + [None] * count + row[i:] for row in rows]
+                width += count
+        else:
+            end = start - count - 1
+            lo, hi = max(start, left), min(end, self.right)
+            if lo <= hi:
+                rows = [row[:lo - left] + row[hi - left + 1:] for row in rows]
+                width -= hi - lo + 1
+            left -= max(0, min(end, left - 1) - start + 1)
+        return self._replace(left=left, width=width, rows=list(rows),
+                             formulas=_shift(self.formulas, 1, start, count),
+                             unsettled=_shift(self.unsettled, 1, start, count))
+
+    def cells_deleted(self, r1: int, c1: int, r2: int, c2: int, direction: str) -> "SheetValues":
+        """After Range.Delete on a block, shifting the cells below ("up") or to the right ("left") into it."""
+        if direction == "up":
+            height = r2 - r1 + 1
+            span = self.block(r1, c1, max(self.bottom, r2), c2)
+            moved = span[height:] + [[None] * (c2 - c1 + 1) for _ in range(height)]
+
+            def move(cell: Cell) -> Optional[Cell]:
+                r, c = cell
+                if not c1 <= c <= c2 or r < r1:
+                    return cell
+                return None if r <= r2 else (r - height, c)
+        else:
+            breadth = c2 - c1 + 1
+            span = self.block(r1, c1, r2, max(self.right, c2))
+            moved = [line[breadth:] + [None] * breadth for line in span]
+
+            def move(cell: Cell) -> Optional[Cell]:
+                r, c = cell
+                if not r1 <= r <= r2 or c < c1:
+                    return cell
+                return None if c <= c2 else (r, c - breadth)
+
+        def moved_cells(cells: FrozenSet[Cell]) -> FrozenSet[Cell]:
+            return frozenset(cell for cell in map(move, cells) if cell is not None)
+
+        return self._write(r1, c1, moved)._replace(formulas=moved_cells(self.formulas),
+                                                   unsettled=moved_cells(self.unsettled))
+
+    def renamed(self, name: str) -> "SheetValues":
+        return self._replace(name=name)
+
+
+class ValueSnapshot:
+    """The sheets loaded for one session, valid while change_token matches the session's.
+
+    oversize names the sheets found larger than SNAPSHOT_MAX_CELLS, so reads of
+    them go straight to Excel instead of trying to load them again.
+    """
+
+    __slots__ = ("change_token", "sheets", "oversize", "rendered")
+
+    def __init__(self, change_token: int, sheets: Optional[Dict[str, SheetValues]] = None,
+                 oversize: FrozenSet[str] = frozenset()):
+        self.change_token = change_token
+        self.sheets: Dict[str, SheetValues] = sheets or {}
+        self.oversize = oversize
+        # Results built from this snapshot's values, shared by readers; dies with the snapshot
+        self.rendered: Dict[Any, Any] = {}
+
+    def sheet(self, name: str) -> Optional[SheetValues]:
+        return self.sheets.get(name)
+
+    def remember(self, key: Any, result: Any, limit: int) -> None:
+        """Keep a result rendered from this snapshot (called without a lock; dict updates are atomic)."""
+        if len(self.rendered) >= limit:
+            self.rendered.clear()
+        self.rendered[key] = result
+
+    def cell_count(self) -> int:
+        return sum(sheet.cell_count() for sheet in self.sheets.values())
+
+    def with_sheet(self, sheet: SheetValues) -> "ValueSnapshot":
+        return ValueSnapshot(self.change_token, {**self.sheets, sheet.name: sheet}, self.oversize)
+
+    def with_oversize(self, name: str) -> "ValueSnapshot":
+        sheets = {key: sheet for key, sheet in self.sheets.items() if key != name}
+        return ValueSnapshot(self.change_token, sheets, self.oversize | {name})
+
+    def edited(self, change_token: int, name: Optional[str] = None,
+               edit: Optional[Callable[[SheetValues], SheetValues]] = None) -> "ValueSnapshot":
+        """Snapshot after a change to sheet name (matched like Excel, ignoring case):
+        edit maps its values to the new ones; without edit the sheet is dropped.
+        Other sheets carry over; without name, all of them do. The changed
+        sheet loses its oversize mark, since the change may have shrunk it."""
+        sheets = {}
+        for key, sheet in self.sheets.items():
+            if name is not None and key.lower() == name.lower():
+                try:
+                    sheet = edit(sheet) if edit else None
+                except Exception:
+                    sheet = None
+                if sheet is None or sheet.cell_count() > SNAPSHOT_MAX_CELLS:
+                    continue
+            sheets[sheet.name] = sheet
+        oversize = self.oversize
+        if name is not None:
+            oversize = frozenset(key for key in oversize if key.lower() != name.lower())
+        return ValueSnapshot(change_token, sheets, oversize)
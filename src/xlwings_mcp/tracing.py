@@ -0,0 +1,238 @@
+"""
+Opt-in COM call tracing for the Excel MCP Server.
+Wraps a workbook (or any stand-in object model) in proxies that count and
+time every attribute get/set and method call reached through it, keyed by
+the access path (e.g. Book.sheets > Sheets[] > Sheet.range() > Range.value).
+
+Enable for the server with EXCEL_MCP_TRACE_COM=1; set EXCEL_MCP_TRACE_FOLDED
+to a file path to append per-call folded stacks (flamegraph.pl / speedscope
+input). test/test_tracing.py wraps the simulated workbook from benchmarks/ in a
+ComTracer to assert the call budgets of bulk reads.
+"""
+
+import inspect
+import os
+import threading
+import time
+from datetime import date, datetime, time as dt_time
+from typing import Any, Dict, List, Optional, Tuple
+
+TRACING_ENABLED = os.getenv("EXCEL_MCP_TRACE_COM", "0").lower() in ("1", "true", "yes")
+FOLDED_PATH = os.getenv("EXCEL_MCP_TRACE_FOLDED")
+
+# Values returned as-is; everything else is wrapped so calls made through it are traced
+_PLAIN_TYPES = (str, bytes, int, float, bool, type(None), date, datetime, dt_time)
+
+_folded_lock = threading.Lock()
+
+
+def _is_plain(value: Any) -> bool:
+    if isinstance(value, _PLAIN_TYPES):
+        return True
+    if isinstance(value, (list, tuple)):
+        return all(_is_plain(item) for item in value)
+    return False
+
+
+def _unwrap(value: Any) -> Any:
+    """Strip proxies from arguments before they reach the real object model."""
+    if isinstance(value, TracingProxy):
+        return object.__getattribute__(value, "_target")
+    if isinstance(value, list):
+        return [_unwrap(item) for item in value]
+    if isinstance(value, tuple):
+        return tuple(_unwrap(item) for item in value)
+    if isinstance(value, dict):
+        return {key: _unwrap(item) for key, item in value.items()}
+    return value
+
+
+def _type_name(target: Any) -> str:
+    name = type(target).__name__
+    # pywin32 dispatch objects all share a class; use the COM interface name instead
+    if name in ("CDispatch", "DispatchBaseClass"):
+        name = getattr(target, "_username_", None) or "COM"
+    return name
+
+
+class ComTracer:
+    """Aggregates the traced operations of one tool invocation (or one test)."""
+
+    def __init__(self, label: str = "trace"):
+        self.label = label
+        self.stats: Dict[Tuple[str, ...], List[float]] = {}    # path -> [count, total_ms]
+
+    def record(self, path: Tuple[str, ...], ms: float) -> None:
+        entry = self.stats.get(path)
+        if entry is None:
+            self.stats[path] = [1, ms]
+        else:
+            entry[0] += 1
+            entry[1] += ms
+
+    def wrap(self, target: Any, name: Optional[str] = None) -> "TracingProxy":
+        """Return a traced view of target; name labels the root (default: its type)."""
+        return TracingProxy(target, self, (name or _type_name(target),))
+
+    @property
+    def total_calls(self) -> int:
+        return int(sum(entry[0] for entry in self.stats.values()))
+
+    @property
+    def total_ms(self) -> float:
+        return sum(entry[1] for entry in self.stats.values())
+
+    def by_operation(self) -> Dict[str, Dict[str, Any]]:
+        """Totals per leaf operation (e.g. "Range.value"), most frequent first."""
+        totals: Dict[str, List[float]] = {}
+        for path, (count, ms) in self.stats.items():
+            entry = totals.setdefault(path[-1], [0, 0.0])
+            entry[0] += count
+            entry[1] += ms
+        ordered = sorted(totals.items(), key=lambda item: (-item[1][0], item[0]))
+        return {op: {"calls": int(count), "ms": round(ms, 3)} for op, (count, ms) in ordered}
+
+    def folded(self, unit: str = "calls") -> List[str]:
+        """Folded stacks, one "label;frame;frame value" line per path (value: calls or µs)."""
+        lines = []
+        for path, (count, ms) in sorted(self.stats.items()):
+            value = int(count) if unit == "calls" else max(1, int(ms * 1000))
+            lines.append(";".join((self.label,) + path) + f" {value}")
+        return lines
+
+    def summary(self, top: int = 10) -> Dict[str, Any]:
+        operations = self.by_operation()
+        return {
+            "calls": self.total_calls,
+            "ms": round(self.total_ms, 3),
+            "top": dict(list(operations.items())[:top]),
+        }
+
+    def dump_folded(self, path: str, unit: str = "us") -> None:
+        """Append this trace's folded stacks to a file."""
+        lines = self.folded(unit)
+        if not lines:
+            return
+        with _folded_lock:
+            with open(path, "a", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+
+
+class TracingProxy:
+    """Transparent stand-in for an object-model node that reports every access to a ComTracer."""
+
+    __slots__ = ("_target", "_tracer", "_path")
+
+    def __init__(self, target: Any, tracer: ComTracer, path: Tuple[str, ...]):
+        object.__setattr__(self, "_target", target)
+        object.__setattr__(self, "_tracer", tracer)
+        object.__setattr__(self, "_path", path)
+
+    def _child(self, value: Any, label: str) -> Any:
+        if _is_plain(value) or isinstance(value, TracingProxy):
+            return value
+        path = object.__getattribute__(self, "_path")
+        tracer = object.__getattribute__(self, "_tracer")
+        return TracingProxy(value, tracer, path + (label,))
+
+    def _timed(self, label: str, fn, *args, **kwargs):
+        path = object.__getattribute__(self, "_path") + (label,)
+        started = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            object.__getattribute__(self, "_tracer").record(path, (time.perf_counter() - started) * 1000)
+
+    def _label(self, suffix: str) -> str:
+        return f"{_type_name(object.__getattribute__(self, '_target'))}{suffix}"
+
+    def __getattr__(self, name: str) -> Any:
+        target = object.__getattribute__(self, "_target")
+        started = time.perf_counter()
+        value = getattr(target, name)
+        if inspect.ismethod(value) or inspect.isfunction(value) or inspect.isbuiltin(value):
+            # Method lookup is folded into the call it precedes
+            return _BoundCall(self, value, self._label(f".{name}()"))
+        label = self._label(f".{name}")
+        object.__getattribute__(self, "_tracer").record(
+            object.__getattribute__(self, "_path") + (label,), (time.perf_counter() - started) * 1000
+        )
+        return self._child(value, label)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        target = object.__getattribute__(self, "_target")
+        self._timed(self._label(f".{name}="), setattr, target, name, _unwrap(value))
+
+    def __call__(self, *args, **kwargs):
+        target = object.__getattribute__(self, "_target")
+        label = self._label("()")
+        return self._child(self._timed(label, target, *_unwrap(args), **_unwrap(kwargs)), label)
+
+    def __getitem__(self, key):
+        target = object.__getattribute__(self, "_target")
+        label = self._label("[]")
+        return self._child(self._timed(label, target.__getitem__, _unwrap(key)), label)
+
+    def __setitem__(self, key, value):
+        target = object.__getattribute__(self, "_target")
+        self._timed(self._label("[]="), target.__setitem__, _unwrap(key), _unwrap(value))
+
+    def __iter__(self):
+        target = object.__getattribute__(self, "_target")
+        label = self._label("[]")
+        items = self._timed(self._label(".__iter__"), list, target)
+        return iter([self._child(item, label) for item in items])
+
+    def __len__(self):
+        target = object.__getattribute__(self, "_target")
+        return self._timed(self._label(".__len__"), len, target)
+
+    def __contains__(self, item):
+        target = object.__getattribute__(self, "_target")
+        return self._timed(self._label(".__contains__"), target.__contains__, _unwrap(item))
+
+    def __bool__(self):
+        target = object.__getattribute__(self, "_target")
+        return bool(target)
+
+    def __eq__(self, other):
+        return object.__getattribute__(self, "_target") == _unwrap(other)
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return hash(object.__getattribute__(self, "_target"))
+
+    def __enter__(self):
+        target = object.__getattribute__(self, "_target")
+        return self._child(target.__enter__(), self._label(".__enter__"))
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return object.__getattribute__(self, "_target").__exit__(exc_type, exc_val, exc_tb)
+
+    def __repr__(self):
+        return repr(object.__getattribute__(self, "_target"))
+
+    def __str__(self):
+        return str(object.__getattribute__(self, "_target"))
+
+
+class _BoundCall:
+    """A traced method: the call itself is one operation; its result is traced further."""
+
+    __slots__ = ("_owner", "_method", "_label")
+
+    def __init__(self, owner: TracingProxy, method, label: str):
+        self._owner = owner
+        self._method = method
+        self._label = label
+
+    def __call__(self, *args, **kwargs):
+        value = self._owner._timed(self._label, self._method, *_unwrap(args), **_unwrap(kwargs))
+        return self._owner._child(value, self._label)
+
+
+def unwrap(value: Any) -> Any:
+    """Return the real object behind a traced proxy (or the value itself)."""
+    return _unwrap(value)
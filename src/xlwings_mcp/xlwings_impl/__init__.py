@@ -3,4 +3,9 @@ xlwings implementation module for Excel MCP Server
 Phase 1 migration: xlwings를 사용한 Excel 파일 조작 기능
 """
 
-__version__ = "1.0.0"
\ No newline at end of file
+from ..metrics import METRICS
+
+__version__ = "1.0.0"
+
+# Time the *_with_wb session entry points of every module here as COM work
+METRICS.instrument_package(__name__)
@@ -47,7 +47,7 @@ def create_chart_xlw(
     wb = None
     
     try:
-        logger.info(f"📈 Creating {chart_type} chart in {sheet_name}")
+        logger.info("📈 Creating %s chart in %s", chart_type, sheet_name)
         
         # Check if file exists
         if not os.path.exists(filepath):
@@ -101,7 +101,7 @@ def create_chart_xlw(
                 else:
                     logger.warning("Cannot set chart type - using default")
         except Exception as e:
-            logger.warning(f"Chart type setting failed: {e}, using default")
+            logger.warning("Chart type setting failed: %s, using default", e)
         
         # Set chart position
         target = sheet.range(target_cell)
@@ -139,7 +139,7 @@ def create_chart_xlw(
                         y_axis_obj.HasTitle = True
                         y_axis_obj.AxisTitle.Text = y_axis
                 except Exception as e:
-                    logger.warning(f"Axis label setting failed: {e}")
+                    logger.warning("Axis label setting failed: %s", e)
         except:
             # Some chart types don't have axes
             pass
@@ -147,7 +147,7 @@ def create_chart_xlw(
         # Save the workbook
         wb.save()
         
-        logger.info(f"✅ Successfully created {chart_type} chart")
+        logger.info("✅ Successfully created %s chart", chart_type)
         return {
             "message": f"Successfully created {chart_type} chart",
             "chart_type": chart_type,
@@ -157,7 +157,7 @@ def create_chart_xlw(
         }
         
     except Exception as e:
-        logger.error(f"❌ Error creating chart: {str(e)}")
+        logger.error("❌ Error creating chart: %s", str(e))
         return {"error": str(e)}
         
     finally:
@@ -201,7 +201,7 @@ def create_pivot_table_xlw(
     wb = None
     
     try:
-        logger.info(f"📊 Creating pivot table in {sheet_name}")
+        logger.info("📊 Creating pivot table in %s", sheet_name)
         
         # Check if file exists
         if not os.path.exists(filepath):
@@ -357,7 +357,7 @@ def create_pivot_table_xlw(
                     field = pivot_table.PivotFields(value_field)
                     field.Orientation = 4  # xlDataField
                     success = True
-                    logger.info(f"Added value field '{value_field}' successfully")
+                    logger.info("Added value field '%s' successfully", value_field)
                 except:
                     try:
                         # Method 2: Index access
@@ -365,7 +365,7 @@ def create_pivot_table_xlw(
                         field = pivot_table.PivotFields(field_index)
                         field.Orientation = 4  # xlDataField
                         success = True
-                        logger.info(f"Added value field '{value_field}' using index")
+                        logger.info("Added value field '%s' using index", value_field)
                     except Exception as e:
                         error_msg = f"Failed to add value field '{value_field}': {str(e)}"
                         logger.warning(error_msg)
@@ -396,13 +396,13 @@ def create_pivot_table_xlw(
                                     # Check if this is our field (name contains the original field name)
                                     if value_field in str(data_field.SourceName):
                                         data_field.Function = agg_map[agg_func.lower()]
-                                        logger.info(f"Set aggregation to {agg_func} for {value_field}")
+                                        logger.info("Set aggregation to %s for %s", agg_func, value_field)
                                         break
                                 except:
                                     continue
                     except Exception as e:
                         # Non-critical: aggregation function setting failed
-                        logger.debug(f"Could not set aggregation function for {value_field}: {e}")
+                        logger.debug("Could not set aggregation function for %s: %s", value_field, e)
                         # Don't add to warnings - field was added successfully
             else:
                 warnings.append(f"Value field '{value_field}' not found in data headers")
@@ -430,14 +430,14 @@ def create_pivot_table_xlw(
         # Add warnings if any
         if warnings:
             result["warnings"] = warnings
-            logger.info(f"⚠️ Pivot table created with warnings: {warnings}")
+            logger.info("⚠️ Pivot table created with warnings: %s", warnings)
         else:
-            logger.info(f"✅ Successfully created pivot table '{pivot_name}' at {pivot_sheet.name}!{target_cell}")
+            logger.info("✅ Successfully created pivot table '%s' at %s!%s", pivot_name, pivot_sheet.name, target_cell)
         
         return result
         
     except Exception as e:
-        logger.error(f"❌ Error creating pivot table: {str(e)}")
+        logger.error("❌ Error creating pivot table: %s", str(e))
         return {"error": str(e)}
         
     finally:
@@ -471,7 +471,7 @@ def create_table_xlw(
     wb = None
     
     try:
-        logger.info(f"📋 Creating Excel table in {sheet_name}")
+        logger.info("📋 Creating Excel table in %s", sheet_name)
         
         # Check if file exists
         if not os.path.exists(filepath):
@@ -519,7 +519,7 @@ def create_table_xlw(
         # Save the workbook
         wb.save()
         
-        logger.info(f"✅ Successfully created table '{table_name}'")
+        logger.info("✅ Successfully created table '%s'", table_name)
         return {
             "message": f"Successfully created Excel table",
             "table_name": table_name,
@@ -531,7 +531,7 @@ def create_table_xlw(
         }
         
     except Exception as e:
-        logger.error(f"❌ Error creating table: {str(e)}")
+        logger.error("❌ Error creating table: %s", str(e))
         return {"error": str(e)}
         
     finally:
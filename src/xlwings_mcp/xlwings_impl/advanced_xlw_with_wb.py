@@ -7,8 +7,89 @@ import xlwings as xw
 from typing import Dict, Any, List, Optional
 import logging
 
+from .helpers import ExcelHelper
+
 logger = logging.getLogger(__name__)
 
+# Chart type names -> Microsoft XlChartType constants
+CHART_TYPE_MAP = {
+    'column': -4100,            # xlColumnClustered
+    'column_stacked': 52,       # xlColumnStacked
+    'bar': -4099,               # xlBarClustered
+    'bar_stacked': 58,          # xlBarStacked
+    'line': 4,                  # xlLine
+    'line_markers': 65,         # xlLineMarkers
+    'pie': 5,                   # xlPie
+    'area': 1,                  # xlArea
+    'scatter': -4169,           # xlXYScatter
+    'scatter_lines': 74,        # xlXYScatterLines
+    'doughnut': -4120,          # xlDoughnut
+    'radar': -4151,             # xlRadarMarkers
+}
+
+# Chart types without category/value axes (axis titles are skipped)
+CHARTS_WITHOUT_AXES = {'pie', 'doughnut'}
+
+XL_CATEGORY = 1
+XL_VALUE = 2
+
+def _split_sheet_range(address: str, default_sheet: str):
+    """Split "Sheet!A1:B2" / "'My Sheet'!A1:B2" into (sheet, range)."""
+    if "!" not in address:
+        return default_sheet, address
+    sheet, _, rng = address.rpartition("!")
+    if sheet.startswith("'") and sheet.endswith("'"):
+        sheet = sheet[1:-1].replace("''", "'")
+    return sheet, rng
+
+def _add_chart(sheet, source_range, excel_chart_type: int, left: float, top: float,
+               width: float, height: float, title: str = "", x_axis: str = "",
+               y_axis: str = "", has_axes: bool = True):
+    """Create one chart through ChartObjects().Add with all properties set directly.
+    
+    A chart whose data or type cannot be set is deleted again and the error
+    raised; title and axis labels are cosmetic, so failures there are only
+    reported as warnings.
+    
+    Returns:
+        (chart name, warnings)
+    """
+    chart_object = sheet.api.ChartObjects().Add(left, top, width, height)
+    try:
+        chart_com = chart_object.Chart
+        chart_com.SetSourceData(source_range.api)
+        chart_com.ChartType = excel_chart_type
+        name = chart_object.Name
+    except Exception:
+        try:
+            chart_object.Delete()
+        except Exception as e:
+            logger.warning("Could not remove incomplete chart: %s", e)
+        raise
+    
+    warnings = []
+    if title:
+        try:
+            chart_com.HasTitle = True
+            chart_com.ChartTitle.Text = title
+        except Exception as e:
+            warnings.append(f"Title setting failed: {e}")
+    
+    if has_axes:
+        for axis_type, label in ((XL_CATEGORY, x_axis), (XL_VALUE, y_axis)):
+            if not label:
+                continue
+            try:
+                axis = chart_com.Axes(axis_type)
+                axis.HasTitle = True
+                axis.AxisTitle.Text = label
+            except Exception as e:
+                warnings.append(f"Axis label setting failed: {e}")
+    
+    for warning in warnings:
+        logger.warning(warning)
+    return name, warnings
+
 def create_chart_xlw_with_wb(
     wb,
     sheet_name: str,
@@ -35,7 +116,7 @@ def create_chart_xlw_with_wb(
         Dict with success message or error
     """
     try:
-        logger.info(f"📈 Creating {chart_type} chart in {sheet_name}")
+        logger.info("📈 Creating %s chart in %s", chart_type, sheet_name)
         
         # Check if sheet exists
         sheet_names = [s.name for s in wb.sheets]
@@ -44,115 +125,311 @@ def create_chart_xlw_with_wb(
         
         sheet = wb.sheets[sheet_name]
         
-        # Map chart types to Excel constants (Microsoft XlChartType enumeration)
-        chart_type_map = {
-            'column': -4100,    # xlColumnClustered
-            'bar': -4099,       # xlBarClustered
-            'line': 4,          # xlLine
-            'pie': 5,           # xlPie
-            'area': 1,          # xlArea
-            'scatter': -4169,   # xlXYScatter
-            'doughnut': -4120,  # xlDoughnut
-            'radar': -4151,     # xlRadarMarkers
-        }
-        
-        if chart_type.lower() not in chart_type_map:
-            available_types = ', '.join(chart_type_map.keys())
+        chart_key = chart_type.lower()
+        if chart_key not in CHART_TYPE_MAP:
+            available_types = ', '.join(CHART_TYPE_MAP.keys())
             return {"error": f"CHART_TYPE_ERROR: '{chart_type}' is not supported. Available types: {available_types}"}
         
-        excel_chart_type = chart_type_map[chart_type.lower()]
-        
-        # Get data range first
         data_range_obj = sheet.range(data_range)
-        
-        # Create chart using xlwings method
-        chart = sheet.charts.add()
-        
-        # Set data source
-        chart.set_source_data(data_range_obj)
-        
-        # Set chart type - use xlwings chart_type property or COM API
-        try:
-            # First try xlwings native method (accepts string)
-            if hasattr(chart, 'chart_type'):
-                try:
-                    # xlwings accepts the string directly
-                    chart.chart_type = chart_type.lower()
-                    logger.info(f"Set chart type to {chart_type} using xlwings method")
-                except:
-                    # If string doesn't work, try the constant
-                    chart.chart_type = excel_chart_type
-                    logger.info(f"Set chart type to {chart_type} using constant {excel_chart_type}")
-            else:
-                # Fallback to COM API
-                chart_api = chart.api
-                if hasattr(chart_api, 'ChartType'):
-                    chart_api.ChartType = excel_chart_type
-                    logger.info(f"Set chart type to {chart_type} via COM API (constant: {excel_chart_type})")
-                else:
-                    # Last resort - chart may already have correct type from creation
-                    logger.warning(f"Could not explicitly set chart type, using default")
-        except Exception as e:
-            # Non-fatal: log but continue (chart may still work with default type)
-            logger.warning(f"Chart type setting had issues but continuing: {e}")
-        
-        # Set chart position
         target = sheet.range(target_cell)
-        chart.top = target.top
-        chart.left = target.left
         
-        # Calculate chart size based on data range
+        # Dynamic sizing based on data
         data_rows = data_range_obj.rows.count
         data_cols = data_range_obj.columns.count
+        width = min(600, max(400, data_cols * 80))
+        height = min(450, max(300, data_rows * 15))
         
-        # Dynamic sizing based on data
-        chart.width = min(600, max(400, data_cols * 80))  # Adjust width based on columns
-        chart.height = min(450, max(300, data_rows * 15))  # Adjust height based on rows
-        
-        # Set chart properties safely
-        try:
-            chart_com = chart.api
-            
-            # Set title
-            if title and hasattr(chart_com, 'HasTitle'):
-                chart_com.HasTitle = True
-                if hasattr(chart_com, 'ChartTitle'):
-                    chart_com.ChartTitle.Text = title
-            
-            # Set axis labels
-            if hasattr(chart_com, 'Axes'):
-                try:
-                    if x_axis:
-                        x_axis_obj = chart_com.Axes(1)  # xlCategory
-                        x_axis_obj.HasTitle = True
-                        x_axis_obj.AxisTitle.Text = x_axis
-                        
-                    if y_axis:
-                        y_axis_obj = chart_com.Axes(2)  # xlValue
-                        y_axis_obj.HasTitle = True
-                        y_axis_obj.AxisTitle.Text = y_axis
-                except Exception as e:
-                    logger.warning(f"Axis label setting failed: {e}")
-        except:
-            # Some chart types don't have axes
-            pass
+        with ExcelHelper.calc_state_context(wb):
+            _, warnings = _add_chart(
+                sheet, data_range_obj, CHART_TYPE_MAP[chart_key],
+                target.left, target.top, width, height,
+                title=title, x_axis=x_axis, y_axis=y_axis,
+                has_axes=chart_key not in CHARTS_WITHOUT_AXES
+            )
         
         # Save the workbook
         wb.save()
         
-        logger.info(f"✅ Successfully created {chart_type} chart")
-        return {
+        logger.info("✅ Successfully created %s chart", chart_type)
+        result = {
             "message": f"Successfully created {chart_type} chart",
             "chart_type": chart_type,
             "data_range": data_range,
             "position": target_cell,
             "sheet": sheet_name
         }
+        if warnings:
+            result["warnings"] = warnings
+        return result
+        
+    except Exception as e:
+        logger.error("❌ Error creating chart: %s", str(e))
+        return {"error": str(e)}
+
+def create_charts_xlw_with_wb(
+    wb,
+    sheet_name: str,
+    charts: List[Dict[str, Any]],
+    anchor_cell: Optional[str] = None,
+    columns: int = 2,
+    chart_width: float = 480,
+    chart_height: float = 288,
+    gap: float = 12
+) -> Dict[str, Any]:
+    """Session-based batch chart creation laid out in a grid.
+    
+    Args:
+        wb: Workbook object from session
+        sheet_name: Worksheet the charts are placed on
+        charts: Chart specs with keys data_range (required; may be "Sheet!A1:C10"),
+            chart_type (required), title, x_axis, y_axis, target_cell (overrides the grid slot)
+        anchor_cell: Top-left cell of the grid (default: two columns right of the used range)
+        columns: Charts per grid row
+        chart_width: Width of each chart in points
+        chart_height: Height of each chart in points
+        gap: Spacing between charts in points
+        
+    Returns:
+        Dict with created charts, per-spec errors and layout info
+    """
+    try:
+        if not charts:
+            return {"error": "No chart specs provided"}
+        if columns < 1:
+            return {"error": "columns must be at least 1"}
+        
+        sheet_names = [s.name for s in wb.sheets]
+        if sheet_name not in sheet_names:
+            return {"error": f"Sheet '{sheet_name}' not found"}
+        sheet = wb.sheets[sheet_name]
+        
+        # Resolve every spec before touching Excel so bad input fails fast
+        resolved = []
+        errors = []
+        for position, spec in enumerate(charts):
+            chart_key = str(spec.get("chart_type", "")).lower()
+            if chart_key not in CHART_TYPE_MAP:
+                errors.append({
+                    "index": position,
+                    "error": f"CHART_TYPE_ERROR: '{spec.get('chart_type')}' is not supported. "
+                             f"Available types: {', '.join(CHART_TYPE_MAP.keys())}"
+                })
+                continue
+            if not spec.get("data_range"):
+                errors.append({"index": position, "error": "data_range is required"})
+                continue
+            source_sheet, source_range = _split_sheet_range(spec["data_range"], sheet_name)
+            if source_sheet not in sheet_names:
+                errors.append({"index": position, "error": f"Sheet '{source_sheet}' not found"})
+                continue
+            resolved.append((position, spec, chart_key, source_sheet, source_range))
+        
+        if not resolved:
+            return {"error": "No valid chart specs", "errors": errors}
+        
+        if anchor_cell:
+            anchor = sheet.range(anchor_cell)
+        else:
+            used = sheet.used_range
+            anchor = sheet.cells(1, used.last_cell.column + 2)
+        origin_left, origin_top = anchor.left, anchor.top
+        
+        created = []
+        # Grid slots go only to charts placed on the grid, so explicit targets leave no holes
+        slot = 0
+        with ExcelHelper.calc_state_context(wb):
+            for position, spec, chart_key, source_sheet, source_range in resolved:
+                on_grid = not spec.get("target_cell")
+                if not on_grid:
+                    target = sheet.range(spec["target_cell"])
+                    left, top = target.left, target.top
+                else:
+                    grid_row, grid_col = divmod(slot, columns)
+                    left = origin_left + grid_col * (chart_width + gap)
+                    top = origin_top + grid_row * (chart_height + gap)
+                try:
+                    name, warnings = _add_chart(
+                        sheet, wb.sheets[source_sheet].range(source_range), CHART_TYPE_MAP[chart_key],
+                        left, top, chart_width, chart_height,
+                        title=spec.get("title", ""), x_axis=spec.get("x_axis", ""),
+                        y_axis=spec.get("y_axis", ""),
+                        has_axes=chart_key not in CHARTS_WITHOUT_AXES
+                    )
+                    entry = {
+                        "index": position,
+                        "name": name,
+                        "chart_type": chart_key,
+                        "data_range": spec["data_range"],
+                        "left": left,
+                        "top": top
+                    }
+                    if warnings:
+                        entry["warnings"] = warnings
+                    created.append(entry)
+                    slot += on_grid
+                except Exception as e:
+                    errors.append({"index": position, "error": str(e)})
+        
+        # Save once for the whole batch
+        if created:
+            wb.save()
+        
+        logger.info("✅ Created %s of %s charts in %s", len(created), len(charts), sheet_name)
+        result = {
+            "message": f"Created {len(created)} of {len(charts)} charts in {sheet_name}",
+            "sheet": sheet_name,
+            "charts": created,
+            "layout": {"columns": columns, "chart_width": chart_width, "chart_height": chart_height}
+        }
+        if errors:
+            result["errors"] = errors
+        return result
         
     except Exception as e:
-        logger.error(f"❌ Error creating chart: {str(e)}")
+        logger.error("❌ Error creating charts: %s", str(e))
         return {"error": str(e)}
 
+# Pivot table COM constants
+XL_DATABASE = 1
+XL_R1C1 = -4150
+XL_ROW_FIELD = 1
+XL_COLUMN_FIELD = 2
+XL_DATA_FIELD = 4
+
+PIVOT_AGG_MAP = {
+    'count': -4112,    # xlCount
+    'average': -4106,  # xlAverage
+    'mean': -4106,     # xlAverage (alias)
+    'max': -4136,      # xlMax
+    'min': -4139,      # xlMin
+}
+
+def _pivot_source_key(source_range) -> str:
+    """Normalized cache key for a source range: "sheet!R1C1:R100C5"."""
+    address = source_range.api.Address(True, True, XL_R1C1)
+    return f"{source_range.sheet.name.lower()}!{address.upper()}"
+
+def _normalize_source_data(source_data: str) -> str:
+    """Normalize PivotCache.SourceData ("'My Sheet'!R1C1:R9C3", "[Book]Sheet!...") to a cache key."""
+    sheet, _, address = str(source_data).rpartition("!")
+    sheet = sheet.strip("'").replace("''", "'")
+    if "]" in sheet:
+        sheet = sheet.split("]", 1)[1]
+    return f"{sheet.lower()}!{address.upper()}"
+
+def _get_pivot_cache(wb, source_range, registry: Optional[Dict[str, Any]]):
+    """Return (pivot_cache, key, reused) for a source range.
+    
+    Looks in the session registry first, then at caches already in the workbook,
+    and only creates a new cache when no existing one covers the same source.
+    """
+    key = _pivot_source_key(source_range)
+    
+    cache = registry.get(key) if registry is not None else None
+    if cache is not None:
+        try:
+            if _normalize_source_data(cache.SourceData) == key:
+                return cache, key, True
+        except Exception:
+            pass
+        registry.pop(key, None)
+    
+    try:
+        caches = wb.api.PivotCaches()
+        for i in range(1, caches.Count + 1):
+            candidate = caches.Item(i)
+            try:
+                if _normalize_source_data(candidate.SourceData) == key:
+                    if registry is not None:
+                        registry[key] = candidate
+                    return candidate, key, True
+            except Exception:
+                continue
+    except Exception as e:
+        logger.debug("Could not scan existing pivot caches: %s", e)
+    
+    cache = wb.api.PivotCaches().Create(SourceType=XL_DATABASE, SourceData=source_range.api)
+    return cache, key, False
+
+def _existing_pivot_names(wb) -> set:
+    names = set()
+    for sheet in wb.sheets:
+        try:
+            sheet_pivots = sheet.api.PivotTables()
+            for i in range(1, sheet_pivots.Count + 1):
+                names.add(sheet_pivots.Item(i).Name)
+        except Exception:
+            pass
+    return names
+
+def _unique_pivot_name(existing: set) -> str:
+    counter = 1
+    while f"PivotTable{counter}" in existing:
+        counter += 1
+    return f"PivotTable{counter}"
+
+def _configure_pivot_fields(pivot_table, field_names: List[Any], rows: List[str],
+                            columns: Optional[List[str]], values: List[str], agg_func: str) -> List[str]:
+    """Assign row/column/data fields; returns warnings for fields that could not be added."""
+    warnings = []
+    layout = [(rows, XL_ROW_FIELD, "row"), (columns or [], XL_COLUMN_FIELD, "column"), (values, XL_DATA_FIELD, "value")]
+    for fields, orientation, label in layout:
+        for field_name in fields:
+            if field_name not in field_names:
+                warnings.append(f"{label.capitalize()} field '{field_name}' not found in data headers")
+                continue
+            try:
+                field = pivot_table.PivotFields(field_names.index(field_name) + 1)
+                field.Orientation = orientation
+            except Exception as e:
+                error_msg = f"Failed to add {label} field '{field_name}': {str(e)}"
+                logger.warning(error_msg)
+                warnings.append(error_msg)
+    
+    agg_key = agg_func.lower()
+    if agg_key in PIVOT_AGG_MAP:
+        for i in range(1, pivot_table.DataFields.Count + 1):
+            try:
+                pivot_table.DataFields(i).Function = PIVOT_AGG_MAP[agg_key]
+            except Exception as e:
+                logger.debug("Could not set aggregation function on data field %s: %s", i, e)
+    return warnings
+
+def _discard_pivot(pivot_table) -> bool:
+    """Remove a pivot whose setup failed part-way; True if it was cleared.
+    A pivot that cannot be cleared is at least taken out of ManualUpdate."""
+    try:
+        pivot_table.TableRange2.Clear()
+        return True
+    except Exception as e:
+        logger.warning("Could not remove half-built pivot table: %s", e)
+        try:
+            pivot_table.ManualUpdate = False
+        except Exception:
+            pass
+        return False
+
+def _resolve_pivot_source(wb, sheet_name: str, data_range: str, sheet_names: List[str]):
+    """Return (source_sheet, source_range) or an error string."""
+    if "!" in data_range:
+        source_sheet_name, range_part = data_range.split("!", 1)
+        source_sheet_name = source_sheet_name.strip('\'"')
+        if source_sheet_name not in sheet_names:
+            return f"Source sheet '{source_sheet_name}' not found"
+        source_sheet = wb.sheets[source_sheet_name]
+        return source_sheet, source_sheet.range(range_part)
+    source_sheet = wb.sheets[sheet_name]
+    return source_sheet, source_sheet.range(data_range)
+
+def _new_pivot_sheet(wb, sheet_names: List[str]):
+    pivot_sheet_name = "PivotTable"
+    counter = 1
+    while pivot_sheet_name in sheet_names:
+        pivot_sheet_name = f"PivotTable{counter}"
+        counter += 1
+    sheet_names.append(pivot_sheet_name)
+    return wb.sheets.add(pivot_sheet_name)
+
 def create_pivot_table_xlw_with_wb(
     wb,
     sheet_name: str,
@@ -163,7 +440,8 @@ def create_pivot_table_xlw_with_wb(
     agg_func: str = "sum",
     target_sheet: Optional[str] = None,
     target_cell: str = None,
-    pivot_name: Optional[str] = None
+    pivot_name: Optional[str] = None,
+    pivot_caches: Optional[Dict[str, Any]] = None
 ) -> Dict[str, Any]:
     """Session-based version using existing workbook object.
     
@@ -178,12 +456,13 @@ def create_pivot_table_xlw_with_wb(
         target_sheet: Target sheet for pivot table (optional)
         target_cell: Target cell for pivot table (optional, default finds empty area)
         pivot_name: Custom name for pivot table (optional)
+        pivot_caches: Session registry of pivot caches keyed by source address (optional)
         
     Returns:
         Dict with success message or error
     """
     try:
-        logger.info(f"📊 Creating pivot table in {sheet_name}")
+        logger.info("📊 Creating pivot table in %s", sheet_name)
         
         # Check if sheet exists
         sheet_names = [s.name for s in wb.sheets]
@@ -191,36 +470,18 @@ def create_pivot_table_xlw_with_wb(
             return {"error": f"Sheet '{sheet_name}' not found"}
         
         # Parse data range to support cross-sheet references
-        if "!" in data_range:
-            # Format: "SheetName!A1:E100"
-            source_sheet_name, range_part = data_range.split("!", 1)
-            # Remove quotes if present
-            source_sheet_name = source_sheet_name.strip('\'"')
-            if source_sheet_name not in sheet_names:
-                return {"error": f"Source sheet '{source_sheet_name}' not found"}
-            source_sheet = wb.sheets[source_sheet_name]
-            source_range = source_sheet.range(range_part)
-        else:
-            # Use the provided sheet_name
-            source_sheet = wb.sheets[sheet_name]
-            source_range = source_sheet.range(data_range)
+        source = _resolve_pivot_source(wb, sheet_name, data_range, sheet_names)
+        if isinstance(source, str):
+            return {"error": source}
+        source_sheet, source_range = source
         
         # Determine target sheet for pivot table
         if target_sheet:
-            # Use specified target sheet
-            if target_sheet not in sheet_names:
-                # Create if doesn't exist
-                pivot_sheet = wb.sheets.add(target_sheet)
-            else:
-                pivot_sheet = wb.sheets[target_sheet]
+            # Use specified target sheet, create if doesn't exist
+            pivot_sheet = wb.sheets[target_sheet] if target_sheet in sheet_names else wb.sheets.add(target_sheet)
         else:
             # Auto-generate unique pivot sheet name
-            pivot_sheet_name = "PivotTable"
-            counter = 1
-            while pivot_sheet_name in sheet_names:
-                pivot_sheet_name = f"PivotTable{counter}"
-                counter += 1
-            pivot_sheet = wb.sheets.add(pivot_sheet_name)
+            pivot_sheet = _new_pivot_sheet(wb, sheet_names)
         
         # Determine target cell position
         if not target_cell:
@@ -232,152 +493,32 @@ def create_pivot_table_xlw_with_wb(
             else:
                 target_cell = "A3"  # Default position if sheet is empty
         
-        # Use COM API to create pivot table
-        pivot_cache = wb.api.PivotCaches().Create(
-            SourceType=1,  # xlDatabase
-            SourceData=source_range.api
-        )
+        # Reuse the pivot cache of any pivot built on the same source
+        pivot_cache, cache_key, cache_reused = _get_pivot_cache(wb, source_range, pivot_caches)
         
-        # Generate unique pivot table name if not provided
         if not pivot_name:
-            existing_pivots = []
-            try:
-                # Try to get existing pivot table names
-                for sheet in wb.sheets:
-                    try:
-                        sheet_pivots = sheet.api.PivotTables()
-                        for i in range(1, sheet_pivots.Count + 1):
-                            existing_pivots.append(sheet_pivots.Item(i).Name)
-                    except:
-                        pass
-            except:
-                pass
-            
-            # Generate unique name
-            pivot_name = "PivotTable1"
-            counter = 1
-            while pivot_name in existing_pivots:
-                counter += 1
-                pivot_name = f"PivotTable{counter}"
+            pivot_name = _unique_pivot_name(_existing_pivot_names(wb))
         
         pivot_table = pivot_cache.CreatePivotTable(
             TableDestination=pivot_sheet.range(target_cell).api,
             TableName=pivot_name
         )
+        if pivot_caches is not None:
+            pivot_caches[cache_key] = pivot_table.PivotCache()
         
         # Get field names from first row of data (use source_range which is already parsed)
-        header_range = source_range.rows[0]
-        field_names = [cell.value for cell in header_range]
-        
-        # Track warnings for partial failures
-        warnings = []
-        
-        # Add row fields - try different COM API access methods
-        for row_field in rows:
-            if row_field in field_names:
-                success = False
-                try:
-                    # Method 1: Direct string access
-                    field = pivot_table.PivotFields(row_field)
-                    field.Orientation = 1  # xlRowField
-                    success = True
-                except:
-                    try:
-                        # Method 2: Index access
-                        field_index = field_names.index(row_field) + 1
-                        field = pivot_table.PivotFields(field_index)
-                        field.Orientation = 1  # xlRowField
-                        success = True
-                    except Exception as e:
-                        error_msg = f"Failed to add row field '{row_field}': {str(e)}"
-                        logger.warning(error_msg)
-                        warnings.append(error_msg)
-            else:
-                warnings.append(f"Row field '{row_field}' not found in data headers")
-        
-        # Add column fields
-        if columns:
-            for col_field in columns:
-                if col_field in field_names:
-                    success = False
-                    try:
-                        # Method 1: Direct string access
-                        field = pivot_table.PivotFields(col_field)
-                        field.Orientation = 2  # xlColumnField
-                        success = True
-                    except:
-                        try:
-                            # Method 2: Index access
-                            field_index = field_names.index(col_field) + 1
-                            field = pivot_table.PivotFields(field_index)
-                            field.Orientation = 2  # xlColumnField
-                            success = True
-                        except Exception as e:
-                            error_msg = f"Failed to add column field '{col_field}': {str(e)}"
-                            logger.warning(error_msg)
-                            warnings.append(error_msg)
-                else:
-                    warnings.append(f"Column field '{col_field}' not found in data headers")
+        field_names = source_range.rows[0].value
+        if not isinstance(field_names, list):
+            field_names = [field_names]
         
-        # Add value fields with aggregation
-        for value_field in values:
-            if value_field in field_names:
-                success = False
-                try:
-                    # Method 1: Direct string access
-                    field = pivot_table.PivotFields(value_field)
-                    field.Orientation = 4  # xlDataField
-                    success = True
-                    logger.info(f"Added value field '{value_field}' successfully")
-                except:
-                    try:
-                        # Method 2: Index access
-                        field_index = field_names.index(value_field) + 1
-                        field = pivot_table.PivotFields(field_index)
-                        field.Orientation = 4  # xlDataField
-                        success = True
-                        logger.info(f"Added value field '{value_field}' using index")
-                    except Exception as e:
-                        error_msg = f"Failed to add value field '{value_field}': {str(e)}"
-                        logger.warning(error_msg)
-                        warnings.append(error_msg)
-                
-                # Try to set aggregation function if field was added successfully
-                if success and agg_func.lower() != 'sum':
-                    try:
-                        # Safer approach: iterate through DataFields to find our field
-                        agg_map = {
-                            'count': -4112,    # xlCount
-                            'average': -4106,  # xlAverage
-                            'mean': -4106,     # xlAverage (alias)
-                            'max': -4136,      # xlMax
-                            'min': -4139,      # xlMin
-                        }
-                        
-                        if agg_func.lower() in agg_map:
-                            # Wait a moment for COM to update
-                            import time
-                            time.sleep(0.1)
-                            
-                            # Try to find and update the data field
-                            for i in range(1, pivot_table.DataFields.Count + 1):
-                                try:
-                                    data_field = pivot_table.DataFields(i)
-                                    # Check if this is our field (name contains the original field name)
-                                    if value_field in str(data_field.SourceName):
-                                        data_field.Function = agg_map[agg_func.lower()]
-                                        logger.info(f"Set aggregation to {agg_func} for {value_field}")
-                                        break
-                                except:
-                                    continue
-                    except Exception as e:
-                        # Non-critical: aggregation function setting failed
-                        logger.debug(f"Could not set aggregation function for {value_field}: {e}")
-            else:
-                warnings.append(f"Value field '{value_field}' not found in data headers")
-        
-        # Apply default pivot table style
-        pivot_table.TableStyle2 = "PivotStyleMedium9"
+        # Lay out all fields with a single pivot update at the end
+        pivot_table.ManualUpdate = True
+        try:
+            warnings = _configure_pivot_fields(pivot_table, field_names, rows, columns, values, agg_func)
+            # Apply default pivot table style
+            pivot_table.TableStyle2 = "PivotStyleMedium9"
+        finally:
+            pivot_table.ManualUpdate = False
         
         # Save the workbook
         wb.save()
@@ -393,20 +534,172 @@ def create_pivot_table_xlw_with_wb(
             "rows": rows,
             "columns": columns or [],
             "values": values,
-            "aggregation": agg_func
+            "aggregation": agg_func,
+            "cache_reused": cache_reused
         }
         
         # Add warnings if any
         if warnings:
             result["warnings"] = warnings
-            logger.info(f"⚠️ Pivot table created with warnings: {warnings}")
+            logger.info("⚠️ Pivot table created with warnings: %s", warnings)
         else:
-            logger.info(f"✅ Successfully created pivot table '{pivot_name}' at {pivot_sheet.name}!{target_cell}")
+            logger.info("✅ Successfully created pivot table '%s' at %s!%s", pivot_name, pivot_sheet.name, target_cell)
+        
+        return result
+        
+    except Exception as e:
+        logger.error("❌ Error creating pivot table: %s", str(e))
+        return {"error": str(e)}
+
+def create_pivot_tables_xlw_with_wb(
+    wb,
+    sheet_name: str,
+    data_range: str,
+    pivots: List[Dict[str, Any]],
+    target_sheet: Optional[str] = None,
+    pivot_caches: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """Session-based batch creation of pivot tables sharing one pivot cache.
+    
+    Every pivot is laid out with ManualUpdate on; the shared cache is refreshed
+    once after all pivots exist.
+    
+    Args:
+        wb: Workbook object from session
+        sheet_name: Name of worksheet containing source data
+        data_range: Source data range shared by all pivots (e.g., "A1:E100" or "Data!A1:E100")
+        pivots: Pivot specs with keys rows, values (required), columns, agg_func,
+            target_sheet, target_cell, pivot_name
+        target_sheet: Default sheet for pivots without their own target_sheet
+            (default: a new sheet per pivot)
+        pivot_caches: Session registry of pivot caches keyed by source address (optional)
+        
+    Returns:
+        Dict with created pivots, per-spec errors and cache reuse info
+    """
+    try:
+        if not pivots:
+            return {"error": "No pivot specs provided"}
+        
+        sheet_names = [s.name for s in wb.sheets]
+        if sheet_name not in sheet_names:
+            return {"error": f"Sheet '{sheet_name}' not found"}
         
+        source = _resolve_pivot_source(wb, sheet_name, data_range, sheet_names)
+        if isinstance(source, str):
+            return {"error": source}
+        source_sheet, source_range = source
+        
+        field_names = source_range.rows[0].value
+        if not isinstance(field_names, list):
+            field_names = [field_names]
+        
+        pivot_cache, cache_key, cache_reused = _get_pivot_cache(wb, source_range, pivot_caches)
+        existing_names = _existing_pivot_names(wb)
+        
+        # Pivots sharing a sheet without explicit cells are placed side by side;
+        # widths come from distinct column-field values (read once, only if needed)
+        source_values = None
+        next_column: Dict[str, int] = {}
+        
+        created = []
+        errors = []
+        built = []
+        with ExcelHelper.calc_state_context(wb):
+            for position, spec in enumerate(pivots):
+                rows = spec.get("rows") or []
+                values = spec.get("values") or []
+                columns = spec.get("columns") or []
+                if not rows or not values:
+                    errors.append({"index": position, "error": "rows and values are required"})
+                    continue
+                
+                pivot_table = None
+                slot = None
+                try:
+                    sheet_target = spec.get("target_sheet") or target_sheet
+                    if sheet_target:
+                        if sheet_target not in sheet_names:
+                            wb.sheets.add(sheet_target)
+                            sheet_names.append(sheet_target)
+                        pivot_sheet = wb.sheets[sheet_target]
+                    else:
+                        pivot_sheet = _new_pivot_sheet(wb, sheet_names)
+                    
+                    target_cell = spec.get("target_cell")
+                    if not target_cell:
+                        col = next_column.get(pivot_sheet.name, 1)
+                        slot = (pivot_sheet.name, col)
+                        target_cell = pivot_sheet.cells(3, col).address.replace("$", "")
+                        width = 1 + len(values)
+                        if columns:
+                            if source_values is None:
+                                source_values = source_range.value[1:]
+                            combos = {
+                                tuple(row[field_names.index(c)] for c in columns if c in field_names)
+                                for row in source_values
+                            }
+                            width = 1 + (len(combos) + 1) * len(values)
+                        next_column[pivot_sheet.name] = col + width + 1
+                    
+                    pivot_name = spec.get("pivot_name") or _unique_pivot_name(existing_names)
+                    existing_names.add(pivot_name)
+                    
+                    pivot_table = pivot_cache.CreatePivotTable(
+                        TableDestination=pivot_sheet.range(target_cell).api,
+                        TableName=pivot_name
+                    )
+                    pivot_table.ManualUpdate = True
+                    warnings = _configure_pivot_fields(
+                        pivot_table, field_names, rows, columns, values, spec.get("agg_func", "sum")
+                    )
+                    pivot_table.TableStyle2 = "PivotStyleMedium9"
+                    built.append(pivot_table)
+                    
+                    entry = {
+                        "index": position,
+                        "pivot_name": pivot_name,
+                        "pivot_sheet": pivot_sheet.name,
+                        "pivot_cell": target_cell
+                    }
+                    if warnings:
+                        entry["warnings"] = warnings
+                    created.append(entry)
+                except Exception as e:
+                    # Give back the destination of a pivot that was not built
+                    if pivot_table is None or _discard_pivot(pivot_table):
+                        if slot:
+                            next_column[slot[0]] = slot[1]
+                        if pivot_table is not None:
+                            existing_names.discard(pivot_name)
+                    errors.append({"index": position, "error": str(e)})
+            
+            # Single deferred refresh lays out every pivot on the shared cache
+            if built:
+                shared_cache = built[0].PivotCache()
+                shared_cache.Refresh()
+                for pivot_table in built:
+                    pivot_table.ManualUpdate = False
+                if pivot_caches is not None:
+                    pivot_caches[cache_key] = shared_cache
+        
+        if created:
+            wb.save()
+        
+        logger.info("✅ Created %s of %s pivot tables from %s", len(created), len(pivots), data_range)
+        result = {
+            "message": f"Created {len(created)} of {len(pivots)} pivot tables from one pivot cache",
+            "source_range": data_range,
+            "source_sheet": source_sheet.name,
+            "cache_reused": cache_reused,
+            "pivots": created
+        }
+        if errors:
+            result["errors"] = errors
         return result
         
     except Exception as e:
-        logger.error(f"❌ Error creating pivot table: {str(e)}")
+        logger.error("❌ Error creating pivot tables: %s", str(e))
         return {"error": str(e)}
 
 def create_table_xlw_with_wb(
@@ -429,7 +722,7 @@ def create_table_xlw_with_wb(
         Dict with success message or error
     """
     try:
-        logger.info(f"📋 Creating Excel table in {sheet_name}")
+        logger.info("📋 Creating Excel table in %s", sheet_name)
         
         # Check if sheet exists
         sheet_names = [s.name for s in wb.sheets]
@@ -469,7 +762,7 @@ def create_table_xlw_with_wb(
         # Save the workbook
         wb.save()
         
-        logger.info(f"✅ Successfully created table '{table_name}'")
+        logger.info("✅ Successfully created table '%s'", table_name)
         return {
             "message": f"Successfully created Excel table",
             "table_name": table_name,
@@ -481,5 +774,5 @@ def create_table_xlw_with_wb(
         }
         
     except Exception as e:
-        logger.error(f"❌ Error creating table: {str(e)}")
-        return {"error": str(e)}
\ No newline at end of file
+        logger.error("❌ Error creating table: %s", str(e))
+        return {"error": str(e)}
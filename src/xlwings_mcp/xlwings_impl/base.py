@@ -58,16 +58,16 @@ def excel_context(
             raise FileNotFoundError(f"File not found: {filepath}")
         
         # Excel 앱 시작
-        logger.debug(f"Starting Excel app (visible={visible})")
+        logger.debug("Starting Excel app (visible=%s)", visible)
         app = xw.App(visible=visible, add_book=False)
         
         if file_path.exists():
             # 기존 파일 열기
-            logger.debug(f"Opening existing workbook: {filepath}")
+            logger.debug("Opening existing workbook: %s", filepath)
             wb = app.books.open(filepath)
         else:
             # 새 워크북 생성
-            logger.debug(f"Creating new workbook: {filepath}")
+            logger.debug("Creating new workbook: %s", filepath)
             # 디렉토리 생성
             file_path.parent.mkdir(parents=True, exist_ok=True)
             
@@ -80,11 +80,11 @@ def excel_context(
             # 파일 저장 (경로 설정)
             wb.save(filepath)
         
-        logger.debug(f"Successfully opened/created workbook: {filepath}")
+        logger.debug("Successfully opened/created workbook: %s", filepath)
         yield wb
         
     except Exception as e:
-        logger.error(f"Excel context error: {e}")
+        logger.error("Excel context error: %s", e)
         raise
         
     finally:
@@ -94,14 +94,14 @@ def excel_context(
                 wb.close()
                 logger.debug("Workbook closed successfully")
             except Exception as e:
-                logger.warning(f"Failed to close workbook: {e}")
+                logger.warning("Failed to close workbook: %s", e)
         
         if app:
             try:
                 app.quit()
                 logger.debug("Excel app quit successfully")
             except Exception as e:
-                logger.warning(f"Failed to quit Excel app: {e}")
+                logger.warning("Failed to quit Excel app: %s", e)
 
 
 @contextmanager
@@ -127,12 +127,12 @@ def excel_app_context(visible: bool = False) -> Generator[xw.App, None, None]:
     app = None
     
     try:
-        logger.debug(f"Starting Excel app context (visible={visible})")
+        logger.debug("Starting Excel app context (visible=%s)", visible)
         app = xw.App(visible=visible, add_book=False)
         yield app
         
     except Exception as e:
-        logger.error(f"Excel app context error: {e}")
+        logger.error("Excel app context error: %s", e)
         raise
         
     finally:
@@ -141,7 +141,7 @@ def excel_app_context(visible: bool = False) -> Generator[xw.App, None, None]:
                 app.quit()
                 logger.debug("Excel app quit successfully")
             except Exception as e:
-                logger.warning(f"Failed to quit Excel app: {e}")
+                logger.warning("Failed to quit Excel app: %s", e)
 
 
 def validate_file_path(filepath: str, must_exist: bool = True) -> Path:
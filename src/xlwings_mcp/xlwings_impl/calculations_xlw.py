@@ -4,13 +4,33 @@ Phase 1: apply_formula
 """
 
 import os
+import time
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 
 import xlwings as xw
+from .helpers import ExcelHelper
+from ..metrics import METRICS
 
 logger = logging.getLogger(__name__)
 
+def _normalize_formula(formula: Any) -> Any:
+    """Prefix non-empty formula strings with '=' (other values pass through)."""
+    if isinstance(formula, str) and formula and not formula.startswith('='):
+        return f'={formula}'
+    return formula
+
+def _sample_row_indices(row_count: int, sample_size: int) -> List[int]:
+    """Evenly spaced row offsets (always including first and last row)."""
+    if sample_size <= 0 or row_count <= 0:
+        return []
+    if sample_size >= row_count:
+        return list(range(row_count))
+    if sample_size == 1:
+        return [0]
+    step = (row_count - 1) / (sample_size - 1)
+    return sorted({round(i * step) for i in range(sample_size)})
+
 def apply_formula_xlw_with_wb(
     wb,
     sheet_name: str,
@@ -42,22 +62,25 @@ def apply_formula_xlw_with_wb(
         # Get cell
         cell_range = ws.range(cell)
         
-        # Apply formula
-        try:
-            cell_range.formula = formula
-        except Exception as e:
-            return {
-                "error": f"Formula error in cell {cell}: {str(e)}",
-                "formula": formula,
-                "cell": cell
-            }
+        # Apply formula; dependents recalculate once when the context exits
+        with ExcelHelper.calc_state_context(wb) as calc:
+            try:
+                cell_range.formula = formula
+            except Exception as e:
+                return {
+                    "error": f"Formula error in cell {cell}: {str(e)}",
+                    "formula": formula,
+                    "cell": cell
+                }
+            # Keep the returned value current when the session is in manual mode
+            calc.calculate(cell_range.api)
         
         # Get calculated result
         try:
             calculated_value = cell_range.value
             display_value = cell_range.api.Text
         except Exception as e:
-            logger.warning(f"Failed to read calculated value: {e}")
+            logger.warning("Failed to read calculated value: %s", e)
             calculated_value = None
             display_value = None
         
@@ -69,13 +92,114 @@ def apply_formula_xlw_with_wb(
             "cell": cell,
             "formula": formula,
             "calculated_value": calculated_value,
-            "display_value": display_value
+            "display_value": display_value,
+            "calc_ms": round(calc.calc_ms, 1)
         }
         
     except Exception as e:
-        logger.error(f"Failed to apply formula: {e}")
+        logger.error("Failed to apply formula: %s", e)
         return {"error": f"Failed to apply formula: {str(e)}"}
 
+def apply_formulas_xlw_with_wb(
+    wb,
+    sheet_name: str,
+    target_range: str,
+    formula: Optional[str] = None,
+    formulas: Optional[List[List[Any]]] = None,
+    r1c1: bool = False,
+    preview_rows: int = 5
+) -> Dict[str, Any]:
+    """Apply formulas to a whole range in one assignment (session-based).
+    
+    Either a single ``formula`` is filled across ``target_range`` (relative
+    references adjust per cell, as with Excel fill-down), or a 2D ``formulas``
+    matrix is written cell-for-cell. A matrix may be anchored at a single
+    top-left cell, in which case the range is sized to the matrix.
+    
+    Args:
+        wb: Workbook object from session
+        sheet_name: Sheet name
+        target_range: Target range (e.g., "C2:C20001") or top-left cell for a matrix
+        formula: Single formula to fill across the range
+        formulas: 2D list of formulas (rows of cells)
+        r1c1: Interpret formulas in R1C1 notation
+        preview_rows: Number of evenly spaced rows to read back (0 disables preview)
+        
+    Returns:
+        Dictionary with written range, cell count and sampled preview
+    """
+    try:
+        if (formula is None) == (formulas is None):
+            return {"error": "Provide exactly one of 'formula' or 'formulas'"}
+        
+        # Check sheet exists
+        if sheet_name not in [s.name for s in wb.sheets]:
+            return {"error": f"Sheet '{sheet_name}' not found"}
+        
+        ws = wb.sheets[sheet_name]
+        rng = ws.range(target_range)
+        
+        if formulas is not None:
+            if not formulas or not all(isinstance(row, list) for row in formulas):
+                return {"error": "'formulas' must be a non-empty list of rows"}
+            width = len(formulas[0])
+            if width == 0 or any(len(row) != width for row in formulas):
+                return {"error": "All rows in 'formulas' must have the same non-zero length"}
+            
+            shape = (len(formulas), width)
+            if rng.count == 1:
+                rng = rng.resize(*shape)
+            elif rng.shape != shape:
+                return {"error": f"Range {target_range} has shape {rng.shape} but formulas matrix is {shape}"}
+            payload = [[_normalize_formula(f) for f in row] for row in formulas]
+        else:
+            payload = _normalize_formula(formula)
+        
+        # One assignment for the whole range, calculation deferred until done
+        with ExcelHelper.calc_state_context(wb) as calc:
+            try:
+                if r1c1:
+                    rng.api.FormulaR1C1 = payload
+                else:
+                    rng.formula = payload
+            except Exception as e:
+                return {
+                    "error": f"Formula error in range {target_range}: {str(e)}",
+                    "range": target_range
+                }
+            # Single recalculation of the written block: here in manual mode,
+            # otherwise when automatic calculation is restored on exit
+            calc.calculate(rng.api)
+        
+        row_count, col_count = rng.shape
+        preview = []
+        for offset in _sample_row_indices(row_count, preview_rows):
+            row_range = rng.rows[offset]
+            values = row_range.value
+            preview.append({
+                "row": row_range.row,
+                "values": values if isinstance(values, list) else [values]
+            })
+        
+        # Save workbook
+        wb.save()
+        
+        address = rng.address.replace("$", "")
+        METRICS.add_cells(row_count * col_count)
+        return {
+            "message": f"Formulas applied to {address}",
+            "range": address,
+            "cells": row_count * col_count,
+            "mode": "matrix" if formulas is not None else "fill",
+            "notation": "R1C1" if r1c1 else "A1",
+            "preview": preview,
+            "calc_ms": round(calc.calc_ms, 1)
+        }
+        
+    except Exception as e:
+        logger.error("Failed to apply formulas: %s", e)
+        return {"error": f"Failed to apply formulas: {str(e)}"}
+
 def apply_formula_xlw(
     filepath: str,
     sheet_name: str,
@@ -136,7 +260,7 @@ def apply_formula_xlw(
             calculated_value = cell_range.value
             display_value = cell_range.api.Text  # Excel에 표시되는 텍스트
         except Exception as e:
-            logger.warning(f"계산 결과 읽기 실패: {e}")
+            logger.warning("계산 결과 읽기 실패: %s", e)
             calculated_value = None
             display_value = None
         
@@ -152,7 +276,7 @@ def apply_formula_xlw(
         }
         
     except Exception as e:
-        logger.error(f"xlwings 수식 적용 실패: {e}")
+        logger.error("xlwings 수식 적용 실패: %s", e)
         return {"error": f"Failed to apply formula: {str(e)}"}
         
     finally:
@@ -161,30 +285,155 @@ def apply_formula_xlw(
             try:
                 wb.close()
             except Exception as e:
-                logger.warning(f"워크북 닫기 실패: {e}")
+                logger.warning("워크북 닫기 실패: %s", e)
         
         if app:
             try:
                 app.quit()
             except Exception as e:
-                logger.warning(f"Excel 앱 종료 실패: {e}")
+                logger.warning("Excel 앱 종료 실패: %s", e)
 
-def validate_formula_syntax_xlw_with_wb(
+# Application.Evaluate returns Excel errors as COM HRESULT integers
+EXCEL_ERROR_CODES = {
+    -2146826288: "#NULL!",
+    -2146826281: "#DIV/0!",
+    -2146826273: "#VALUE!",
+    -2146826265: "#REF!",
+    -2146826259: "#NAME?",
+    -2146826252: "#NUM!",
+    -2146826246: "#N/A",
+}
+
+# Application.Evaluate rejects strings longer than this
+EVALUATE_MAX_LENGTH = 255
+
+def _check_formula_structure(formula: str) -> Optional[str]:
+    """Cheap structural checks Excel would reject; returns an error message or None."""
+    body = formula[1:].strip()
+    if not body:
+        return "Formula is empty"
+    
+    depth = 0
+    in_string = False
+    in_sheet_name = False
+    for ch in body:
+        if in_string:
+            if ch == '"':
+                in_string = False
+        elif in_sheet_name:
+            if ch == "'":
+                in_sheet_name = False
+        elif ch == '"':
+            in_string = True
+        elif ch == "'":
+            in_sheet_name = True
+        elif ch == '(':
+            depth += 1
+        elif ch == ')':
+            depth -= 1
+            if depth < 0:
+                return "Unbalanced parentheses: unexpected ')'"
+    
+    if in_string:
+        return "Unterminated string literal"
+    if in_sheet_name:
+        return "Unterminated quoted sheet name"
+    if depth > 0:
+        return "Unbalanced parentheses: missing ')'"
+    if body[-1] in "+-*/^&=<>,":
+        return f"Formula ends with operator '{body[-1]}'"
+    return None
+
+def _to_preview_value(value: Any, max_cells: int = 25) -> Any:
+    """Convert an Evaluate result into a JSON-friendly preview."""
+    if isinstance(value, int) and value in EXCEL_ERROR_CODES:
+        return EXCEL_ERROR_CODES[value]
+    if hasattr(value, 'Value') and not isinstance(value, (str, int, float, bool)):
+        # Evaluate returns a Range object for plain references
+        value = value.Value
+    if isinstance(value, tuple):
+        rows = [list(row) if isinstance(row, tuple) else [row] for row in value]
+        preview = []
+        remaining = max_cells
+        for row in rows:
+            if remaining <= 0:
+                break
+            row = [_to_preview_value(v) for v in row[:remaining]]
+            remaining -= len(row)
+            preview.append(row)
+        return preview
+    return value
+
+def _evaluate_formula(ws, formula: str) -> Dict[str, Any]:
+    """Validate one formula in the sheet's context without writing to any cell."""
+    structure_error = _check_formula_structure(formula)
+    if structure_error:
+        return {
+            "valid": False,
+            "message": f"Invalid formula syntax: {structure_error}",
+            "formula": formula
+        }
+    
+    if len(formula) > EVALUATE_MAX_LENGTH:
+        return {
+            "valid": True,
+            "message": f"Formula structure is valid (not evaluated: longer than {EVALUATE_MAX_LENGTH} characters)",
+            "formula": formula,
+            "evaluated": False,
+            "preview_value": None
+        }
+    
+    try:
+        # Worksheet.Evaluate resolves unqualified references against this sheet
+        raw = ws.api.Evaluate(formula)
+    except Exception as e:
+        return {
+            "valid": False,
+            "message": f"Invalid formula syntax: {str(e)}",
+            "formula": formula
+        }
+    
+    preview_value = _to_preview_value(raw)
+    if preview_value == "#NAME?":
+        return {
+            "valid": False,
+            "message": "Invalid formula: unknown function or name (#NAME?)",
+            "formula": formula,
+            "preview_value": preview_value
+        }
+    
+    return {
+        "valid": True,
+        "message": "Formula syntax is valid",
+        "formula": formula,
+        "evaluated": True,
+        "preview_value": preview_value
+    }
+
+def validate_formulas_xlw_with_wb(
     wb,
     sheet_name: str,
-    cell: str,
-    formula: str
+    formulas: List[str],
+    cache: Optional["OrderedDict"] = None,
+    change_token: int = 0,
+    cache_limit: int = 1024
 ) -> Dict[str, Any]:
-    """Session-based formula syntax validation using existing workbook object.
+    """Validate several formulas without touching any cell (session-based).
+    
+    Formulas are evaluated with ``Worksheet.Evaluate``, so nothing is written,
+    no dependents recalculate and the workbook is not dirtied. Results are
+    cached per (sheet, formula) and reused while ``change_token`` is unchanged.
     
     Args:
         wb: Workbook object from session
-        sheet_name: Sheet name
-        cell: Target cell
-        formula: Formula to validate
+        sheet_name: Sheet providing the evaluation context
+        formulas: Formulas to validate ('=' prefix optional)
+        cache: Session cache (OrderedDict) of previous results
+        change_token: Session change token the cached results must match
+        cache_limit: Maximum number of cached results
         
     Returns:
-        Validation result dictionary
+        Dictionary with per-formula results and summary counts
     """
     try:
         # Check sheet exists
@@ -192,55 +441,71 @@ def validate_formula_syntax_xlw_with_wb(
             return {"error": f"Sheet '{sheet_name}' not found"}
         
         ws = wb.sheets[sheet_name]
+        results = []
+        cache_hits = 0
         
-        # Normalize formula
-        if not formula.startswith('='):
-            formula = f'={formula}'
-        
-        # Backup original values
-        cell_range = ws.range(cell)
-        original_value = cell_range.value
-        original_formula = cell_range.formula
-        
-        try:
-            # Temporarily apply formula for validation
-            cell_range.formula = formula
+        for formula in formulas:
+            formula = _normalize_formula(str(formula))
+            key = (sheet_name, formula)
             
-            # Check calculated result
-            preview_value = cell_range.value
+            cached = cache.get(key) if cache is not None else None
+            if cached and cached[0] == change_token:
+                cache.move_to_end(key)
+                results.append(dict(cached[1], cached=True))
+                cache_hits += 1
+                continue
             
-            # Restore original values
-            if original_formula and original_formula.startswith('='):
-                cell_range.formula = original_formula
-            else:
-                cell_range.value = original_value
+            result = _evaluate_formula(ws, formula)
+            results.append(result)
             
-            return {
-                "valid": True,
-                "message": "Formula syntax is valid",
-                "formula": formula,
-                "preview_value": preview_value
-            }
-            
-        except Exception as e:
-            # Try to restore original values
-            try:
-                if original_formula and original_formula.startswith('='):
-                    cell_range.formula = original_formula
-                else:
-                    cell_range.value = original_value
-            except Exception:
-                pass
-                
-            return {
-                "valid": False,
-                "message": f"Invalid formula syntax: {str(e)}",
-                "formula": formula
-            }
+            if cache is not None:
+                cache[key] = (change_token, result)
+                cache.move_to_end(key)
+                while len(cache) > cache_limit:
+                    cache.popitem(last=False)
+        
+        valid_count = sum(1 for r in results if r["valid"])
+        return {
+            "message": f"Validated {len(results)} formula(s): {valid_count} valid, {len(results) - valid_count} invalid",
+            "sheet": sheet_name,
+            "results": results,
+            "valid_count": valid_count,
+            "invalid_count": len(results) - valid_count,
+            "cache_hits": cache_hits
+        }
         
     except Exception as e:
-        logger.error(f"xlwings formula validation failed: {e}")
-        return {"error": f"Failed to validate formula: {str(e)}"}
+        logger.error("xlwings formula validation failed: %s", e)
+        return {"error": f"Failed to validate formulas: {str(e)}"}
+
+def validate_formula_syntax_xlw_with_wb(
+    wb,
+    sheet_name: str,
+    cell: str,
+    formula: str,
+    cache: Optional["OrderedDict"] = None,
+    change_token: int = 0
+) -> Dict[str, Any]:
+    """Session-based formula syntax validation using existing workbook object.
+    
+    The formula is evaluated in the sheet's context; the target cell is
+    never written, so validation has no side effects on the workbook.
+    
+    Args:
+        wb: Workbook object from session
+        sheet_name: Sheet name
+        cell: Target cell (kept for API compatibility; not modified)
+        formula: Formula to validate
+        cache: Session cache of previous validation results (optional)
+        change_token: Session change token the cached results must match
+        
+    Returns:
+        Validation result dictionary
+    """
+    result = validate_formulas_xlw_with_wb(wb, sheet_name, [formula], cache=cache, change_token=change_token)
+    if "error" in result:
+        return result
+    return result["results"][0]
 
 def validate_formula_syntax_xlw(
     filepath: str,
@@ -325,7 +590,7 @@ def validate_formula_syntax_xlw(
             }
         
     except Exception as e:
-        logger.error(f"xlwings 수식 검증 실패: {e}")
+        logger.error("xlwings 수식 검증 실패: %s", e)
         return {"error": f"Failed to validate formula: {str(e)}"}
         
     finally:
@@ -334,10 +599,107 @@ def validate_formula_syntax_xlw(
             try:
                 wb.close()
             except Exception as e:
-                logger.warning(f"워크북 닫기 실패: {e}")
+                logger.warning("워크북 닫기 실패: %s", e)
         
         if app:
             try:
                 app.quit()
             except Exception as e:
-                logger.warning(f"Excel 앱 종료 실패: {e}")
\ No newline at end of file
+                logger.warning("Excel 앱 종료 실패: %s", e)
+
+
+# Session calculation modes -> Excel application calculation setting.
+# "deferred" keeps Excel in manual mode and recalculates once before the next read.
+CALCULATION_MODES = {
+    "automatic": "automatic",
+    "manual": "manual",
+    "deferred": "manual",
+    "semiautomatic": "semiautomatic",
+}
+
+def set_calculation_mode_xlw_with_wb(wb, mode: str) -> Dict[str, Any]:
+    """Session-based calculation mode change.
+    
+    Args:
+        wb: Workbook object from session
+        mode: "automatic", "manual", "deferred" or "semiautomatic"
+        
+    Returns:
+        Dictionary with previous/new Excel setting and time spent recalculating
+    """
+    try:
+        mode = (mode or "").lower()
+        if mode not in CALCULATION_MODES:
+            return {"error": f"Invalid calculation mode '{mode}'. Use one of: {', '.join(CALCULATION_MODES)}"}
+        
+        app = wb.app
+        previous = app.calculation
+        target = CALCULATION_MODES[mode]
+        
+        # Leaving manual mode makes Excel catch up on pending recalculation
+        started = time.perf_counter()
+        if previous != target:
+            app.calculation = target
+        calc_ms = (time.perf_counter() - started) * 1000 if target != "manual" else 0.0
+        ExcelHelper.add_calc_time(calc_ms)
+        
+        return {
+            "message": f"Calculation mode set to {mode}",
+            "mode": mode,
+            "excel_calculation": target,
+            "previous_excel_calculation": previous,
+            "calc_ms": round(calc_ms, 1)
+        }
+        
+    except Exception as e:
+        logger.error("Failed to set calculation mode: %s", e)
+        return {"error": f"Failed to set calculation mode: {str(e)}"}
+
+def recalculate_xlw_with_wb(
+    wb,
+    sheet_name: Optional[str] = None,
+    range_address: Optional[str] = None,
+    full: bool = False
+) -> Dict[str, Any]:
+    """Session-based targeted recalculation.
+    
+    Args:
+        wb: Workbook object from session
+        sheet_name: Limit recalculation to this sheet (optional)
+        range_address: Limit recalculation to this range on sheet_name (optional)
+        full: Force a full rebuild of every formula (CalculateFull); ignores scope
+        
+    Returns:
+        Dictionary with scope and time spent calculating
+    """
+    try:
+        if range_address and not sheet_name:
+            return {"error": "sheet_name is required when range_address is given"}
+        if sheet_name and sheet_name not in [s.name for s in wb.sheets]:
+            return {"error": f"Sheet '{sheet_name}' not found"}
+        
+        started = time.perf_counter()
+        if full:
+            scope = "full"
+            wb.app.api.CalculateFull()
+        elif range_address:
+            scope = f"{sheet_name}!{range_address}"
+            wb.sheets[sheet_name].range(range_address).api.Calculate()
+        elif sheet_name:
+            scope = sheet_name
+            wb.sheets[sheet_name].api.Calculate()
+        else:
+            scope = "workbook"
+            wb.app.calculate()
+        calc_ms = (time.perf_counter() - started) * 1000
+        ExcelHelper.add_calc_time(calc_ms)
+        
+        return {
+            "message": f"Recalculated {scope} in {calc_ms:.1f}ms",
+            "scope": scope,
+            "calc_ms": round(calc_ms, 1)
+        }
+        
+    except Exception as e:
+        logger.error("Failed to recalculate: %s", e)
+        return {"error": f"Failed to recalculate: {str(e)}"}
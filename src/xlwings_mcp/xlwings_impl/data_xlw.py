@@ -11,6 +11,8 @@ from pathlib import Path
 
 import xlwings as xw
 from .helpers import ExcelHelper
+from ..formula.parser import column_letter
+from ..metrics import METRICS
 
 logger = logging.getLogger(__name__)
 
@@ -126,7 +128,7 @@ def read_data_from_excel_xlw(
         return json.dumps(result, indent=2, default=str, ensure_ascii=False)
         
     except Exception as e:
-        logger.error(f"xlwings 데이터 읽기 실패: {e}")
+        logger.error("xlwings 데이터 읽기 실패: %s", e)
         return json.dumps({"error": f"Failed to read data: {str(e)}"}, indent=2)
         
     finally:
@@ -135,13 +137,13 @@ def read_data_from_excel_xlw(
             try:
                 wb.close()
             except Exception as e:
-                logger.warning(f"워크북 닫기 실패: {e}")
+                logger.warning("워크북 닫기 실패: %s", e)
         
         if app:
             try:
                 app.quit()
             except Exception as e:
-                logger.warning(f"Excel 앱 종료 실패: {e}")
+                logger.warning("Excel 앱 종료 실패: %s", e)
 
 def write_data_to_excel_xlw(
     filepath: str,
@@ -209,7 +211,7 @@ def write_data_to_excel_xlw(
         return {"message": f"Data written to {sheet_name} starting from {start_cell}"}
         
     except Exception as e:
-        logger.error(f"xlwings 데이터 쓰기 실패: {e}")
+        logger.error("xlwings 데이터 쓰기 실패: %s", e)
         return {"error": f"Failed to write data: {str(e)}"}
         
     finally:
@@ -218,13 +220,44 @@ def write_data_to_excel_xlw(
             try:
                 wb.close()
             except Exception as e:
-                logger.warning(f"워크북 닫기 실패: {e}")
+                logger.warning("워크북 닫기 실패: %s", e)
         
         if app:
             try:
                 app.quit()
             except Exception as e:
-                logger.warning(f"Excel 앱 종료 실패: {e}")
+                logger.warning("Excel 앱 종료 실패: %s", e)
+
+def cell_records(sheet_name: str, top: int, left: int, values: List[List[Any]]) -> Dict[str, Any]:
+    """2차원 값 블록을 셀 메타데이터 결과로 변환 (COM 호출 없음)
+    
+    Args:
+        sheet_name: 시트명
+        top: 블록 첫 행 번호
+        left: 블록 첫 열 번호
+        values: 행 단위 2차원 값 리스트
+        
+    Returns:
+        read_data_from_excel 결과 딕셔너리 (range, sheet_name, cells)
+    """
+    cells = []
+    for i, row in enumerate(values):
+        for j, val in enumerate(row):
+            cells.append({
+                "address": f"${column_letter(left + j)}${top + i}",
+                "value": val,
+                "row": top + i,
+                "column": left + j
+            })
+    bottom, right = top + len(values) - 1, left + (len(values[0]) if values else 1) - 1
+    address = f"${column_letter(left)}${top}"
+    if (bottom, right) != (top, left):
+        address += f":${column_letter(right)}${bottom}"
+    return {
+        "range": address,
+        "sheet_name": sheet_name,
+        "cells": cells
+    }
 
 def read_data_from_excel_xlw_with_wb(
     wb,
@@ -273,59 +306,15 @@ def read_data_from_excel_xlw_with_wb(
                 # 빈 시트이거나 단일 셀인 경우
                 data_range = ws.range(start_cell)
         
-        # 데이터 읽기
-        values = data_range.value
-        
-        # 결과 구조 생성
-        result = {
-            "range": str(data_range.address),
-            "sheet_name": sheet_name,
-            "cells": []
-        }
-        
-        # 셀별 데이터 변환
-        if values is None:
-            # 단일 빈 셀
-            result["cells"].append({
-                "address": data_range.address,
-                "value": None,
-                "row": data_range.row,
-                "column": data_range.column
-            })
-        elif isinstance(values, list):
-            # 다차원 배열
-            for i, row in enumerate(values):
-                if isinstance(row, list):
-                    for j, val in enumerate(row):
-                        cell_range = data_range.offset(i, j).resize(1, 1)
-                        result["cells"].append({
-                            "address": cell_range.address,
-                            "value": val,
-                            "row": cell_range.row,
-                            "column": cell_range.column
-                        })
-                else:
-                    # 단일 열의 경우
-                    cell_range = data_range.offset(i, 0).resize(1, 1)
-                    result["cells"].append({
-                        "address": cell_range.address,
-                        "value": row,
-                        "row": cell_range.row,
-                        "column": cell_range.column
-                    })
-        else:
-            # 단일 값
-            result["cells"].append({
-                "address": data_range.address,
-                "value": values,
-                "row": data_range.row,
-                "column": data_range.column
-            })
+        # 데이터 읽기 (항상 2차원 - 한 행/한 열 범위도 동일하게 처리)
+        values = data_range.options(ndim=2).value
+        result = cell_records(sheet_name, data_range.row, data_range.column, values)
         
+        METRICS.add_cells(len(result["cells"]))
         return json.dumps(result, indent=2, default=str, ensure_ascii=False)
         
     except Exception as e:
-        logger.error(f"xlwings 데이터 읽기 실패: {e}")
+        logger.error("xlwings 데이터 읽기 실패: %s", e)
         return json.dumps({"error": f"Failed to read data: {str(e)}"}, indent=2)
 
 def write_data_to_excel_xlw_with_wb(
@@ -369,15 +358,23 @@ def write_data_to_excel_xlw_with_wb(
                 start_cell = "A1"
         
         # 데이터 쓰기 (성능 최적화를 위해 calc_state_context 사용)
-        with ExcelHelper.calc_state_context(wb):
+        with ExcelHelper.calc_state_context(wb) as calc:
             range_obj = ws.range(start_cell)
             range_obj.value = data
         
         # 파일 저장
         wb.save()
         
-        return {"message": f"Data written to {sheet_name} starting from {start_cell}"}
+        width = max((len(row) if isinstance(row, (list, tuple)) else 1) for row in data)
+        written = range_obj.resize(len(data), max(width, 1)).address.replace("$", "")
+        METRICS.add_cells(len(data) * max(width, 1))
+        
+        return {
+            "message": f"Data written to {sheet_name} starting from {start_cell}",
+            "range": written,
+            "calc_ms": round(calc.calc_ms, 1)
+        }
         
     except Exception as e:
-        logger.error(f"xlwings 데이터 쓰기 실패: {e}")
-        return {"error": f"Failed to write data: {str(e)}"}
\ No newline at end of file
+        logger.error("xlwings 데이터 쓰기 실패: %s", e)
+        return {"error": f"Failed to write data: {str(e)}"}
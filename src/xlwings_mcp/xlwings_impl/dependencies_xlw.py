@@ -0,0 +1,62 @@
+"""
+xlwings implementation for the formula dependency index
+Builds the index from one bulk formula read per sheet and refreshes written blocks
+"""
+
+import time
+import logging
+from typing import Dict, Any
+
+from ..formula.index import DependencyIndex
+
+logger = logging.getLogger(__name__)
+
+
+def build_dependency_index_xlw_with_wb(wb) -> Dict[str, Any]:
+    """Session-based dependency index build.
+
+    Reads Range.formula of each sheet's used range in a single call per sheet.
+
+    Args:
+        wb: Workbook object from session
+
+    Returns:
+        Dict with the built index and build statistics, or an error
+    """
+    try:
+        started = time.perf_counter()
+        sheets = list(wb.sheets)
+        index = DependencyIndex(sheet.name for sheet in sheets)
+        formula_cells = 0
+        for ws in sheets:
+            used = ws.used_range
+            formula_cells += index.load_block(ws.name, used.row, used.column, used.formula)
+
+        build_ms = round((time.perf_counter() - started) * 1000, 1)
+        logger.info("Built dependency index: %s formulas across %s sheets in %sms", formula_cells, len(sheets), build_ms)
+        return {"index": index, "formula_cells": formula_cells, "build_ms": build_ms}
+
+    except Exception as e:
+        logger.error("xlwings dependency index build failed: %s", e)
+        return {"error": f"Failed to build dependency index: {str(e)}"}
+
+
+def refresh_dependency_index_xlw_with_wb(wb, index: DependencyIndex, sheet_name: str, address: str) -> bool:
+    """Re-read formulas of a written block into an existing index.
+
+    Args:
+        wb: Workbook object from session
+        index: Index to update in place
+        sheet_name: Sheet that was written
+        address: Written range (e.g., "A1:C10")
+
+    Returns:
+        True on success; False means the index should be discarded
+    """
+    try:
+        rng = wb.sheets[sheet_name].range(address)
+        index.load_block(sheet_name, rng.row, rng.column, rng.formula)
+        return True
+    except Exception as e:
+        logger.warning("Dependency index refresh failed for %s!%s: %s", sheet_name, address, e)
+        return False
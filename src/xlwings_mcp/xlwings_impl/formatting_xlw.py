@@ -125,7 +125,7 @@ def format_range_xlw(
     wb = None
     
     try:
-        logger.info(f"🎨 Applying formatting to range {start_cell}:{end_cell or start_cell} in {sheet_name}")
+        logger.info("🎨 Applying formatting to range %s:%s in %s", start_cell, end_cell or start_cell, sheet_name)
         
         # Check if file exists
         if not os.path.exists(filepath):
@@ -163,7 +163,7 @@ def format_range_xlw(
             try:
                 rgb = parse_color(font_color)
                 range_obj.font.color = rgb
-                logger.info(f"Applied font color: {font_color} -> RGB{rgb}")
+                logger.info("Applied font color: %s -> RGB%s", font_color, rgb)
             except ValueError as e:
                 return {"error": str(e)}
         
@@ -172,7 +172,7 @@ def format_range_xlw(
             try:
                 rgb = parse_color(bg_color)
                 range_obj.color = rgb
-                logger.info(f"Applied background color: {bg_color} -> RGB{rgb}")
+                logger.info("Applied background color: %s -> RGB%s", bg_color, rgb)
             except ValueError as e:
                 return {"error": str(e)}
         
@@ -233,7 +233,7 @@ def format_range_xlw(
         # Save the workbook
         wb.save()
         
-        logger.info(f"✅ Successfully applied formatting to range")
+        logger.info("✅ Successfully applied formatting to range")
         return {
             "message": f"Successfully applied formatting to range {start_cell}:{end_cell or start_cell}",
             "range": f"{start_cell}:{end_cell or start_cell}",
@@ -254,7 +254,7 @@ def format_range_xlw(
         }
         
     except Exception as e:
-        logger.error(f"❌ Error applying formatting: {str(e)}")
+        logger.error("❌ Error applying formatting: %s", str(e))
         return {"error": str(e)}
         
     finally:
@@ -286,7 +286,7 @@ def validate_formula_syntax_xlw(
     wb = None
     
     try:
-        logger.info(f"🔍 Validating formula syntax: {formula}")
+        logger.info("🔍 Validating formula syntax: %s", formula)
         
         # Check if file exists
         if not os.path.exists(filepath):
@@ -340,7 +340,7 @@ def validate_formula_syntax_xlw(
             # Don't save - we were just validating
             
             if formula_valid:
-                logger.info(f"✅ Formula syntax is valid: {formula}")
+                logger.info("✅ Formula syntax is valid: %s", formula)
                 return {
                     "message": f"Formula syntax is valid",
                     "formula": formula,
@@ -348,7 +348,7 @@ def validate_formula_syntax_xlw(
                     "valid": True
                 }
             else:
-                logger.warning(f"⚠️ Formula has error: {error_type}")
+                logger.warning("⚠️ Formula has error: %s", error_type)
                 return {
                     "message": f"Formula contains error: {error_type}",
                     "formula": formula,
@@ -359,7 +359,7 @@ def validate_formula_syntax_xlw(
                 
         except Exception as e:
             # If we can't set the formula, it's invalid
-            logger.error(f"❌ Invalid formula syntax: {str(e)}")
+            logger.error("❌ Invalid formula syntax: %s", str(e))
             return {
                 "message": f"Invalid formula syntax: {str(e)}",
                 "formula": formula,
@@ -369,7 +369,7 @@ def validate_formula_syntax_xlw(
             }
         
     except Exception as e:
-        logger.error(f"❌ Error validating formula: {str(e)}")
+        logger.error("❌ Error validating formula: %s", str(e))
         return {"error": str(e)}
         
     finally:
@@ -421,7 +421,7 @@ def format_range_xlw_with_wb(
         Dict with success message or error
     """
     try:
-        logger.info(f"🎨 Applying formatting to range {start_cell}:{end_cell or start_cell} in {sheet_name}")
+        logger.info("🎨 Applying formatting to range %s:%s in %s", start_cell, end_cell or start_cell, sheet_name)
         
         # Check if sheet exists
         sheet_names = [s.name for s in wb.sheets]
@@ -451,7 +451,7 @@ def format_range_xlw_with_wb(
             try:
                 rgb = parse_color(font_color)
                 range_obj.font.color = rgb
-                logger.info(f"Applied font color: {font_color} -> RGB{rgb}")
+                logger.info("Applied font color: %s -> RGB%s", font_color, rgb)
             except ValueError as e:
                 return {"error": str(e)}
         
@@ -460,7 +460,7 @@ def format_range_xlw_with_wb(
             try:
                 rgb = parse_color(bg_color)
                 range_obj.color = rgb
-                logger.info(f"Applied background color: {bg_color} -> RGB{rgb}")
+                logger.info("Applied background color: %s -> RGB%s", bg_color, rgb)
             except ValueError as e:
                 return {"error": str(e)}
         
@@ -521,7 +521,7 @@ def format_range_xlw_with_wb(
         # Save the workbook
         wb.save()
         
-        logger.info(f"✅ Successfully applied formatting to range")
+        logger.info("✅ Successfully applied formatting to range")
         return {
             "message": f"Successfully applied formatting to range {start_cell}:{end_cell or start_cell}",
             "range": f"{start_cell}:{end_cell or start_cell}",
@@ -542,5 +542,5 @@ def format_range_xlw_with_wb(
         }
         
     except Exception as e:
-        logger.error(f"❌ Error applying formatting: {str(e)}")
-        return {"error": str(e)}
\ No newline at end of file
+        logger.error("❌ Error applying formatting: %s", str(e))
+        return {"error": str(e)}
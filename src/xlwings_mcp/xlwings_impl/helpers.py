@@ -3,12 +3,19 @@ Helper functions for xlwings implementation.
 Provides abstraction layer for common operations and better error handling.
 """
 
-import xlwings as xw
-from typing import Optional, Dict, Any, Tuple
+import time
+import threading
+from typing import Optional, Dict, Any, Tuple, TYPE_CHECKING
 import logging
 
+if TYPE_CHECKING:
+    import xlwings as xw
+
 logger = logging.getLogger(__name__)
 
+# Calculation time accumulated by the current thread's tool call
+_calc_timing = threading.local()
+
 
 class ExcelHelper:
     """Helper class for Excel operations with better error handling and abstraction."""
@@ -29,6 +36,7 @@ class ExcelHelper:
                 self.original_calculation = None
                 self.original_screen_updating = None
                 self.original_enable_events = None
+                self.calc_ms = 0.0
                 
             def __enter__(self):
                 # Save original states
@@ -42,11 +50,28 @@ class ExcelHelper:
                 self.app.enable_events = False
                 
                 return self
+            
+            def calculate(self, target):
+                """Recalculate target (a Range or Sheet .api) if restoring the original
+                mode will not, i.e. when it was manual; timed into calc_ms"""
+                if self.original_calculation != 'manual':
+                    return
+                started = time.perf_counter()
+                target.Calculate()
+                ms = (time.perf_counter() - started) * 1000
+                self.calc_ms += ms
+                ExcelHelper.add_calc_time(ms)
                 
             def __exit__(self, exc_type, exc_val, exc_tb):
-                # Restore original states
+                # Restore original states; switching back to automatic runs the
+                # deferred recalculation, so that is what gets timed
                 if self.original_calculation:
+                    started = time.perf_counter()
                     self.app.calculation = self.original_calculation
+                    if self.original_calculation != 'manual':
+                        ms = (time.perf_counter() - started) * 1000
+                        self.calc_ms += ms
+                        ExcelHelper.add_calc_time(ms)
                 if self.original_screen_updating is not None:
                     self.app.screen_updating = self.original_screen_updating
                 if self.original_enable_events is not None:
@@ -55,7 +80,19 @@ class ExcelHelper:
         return CalcStateContext(wb)
     
     @staticmethod
-    def find_empty_cell(sheet: xw.Sheet, start_row: int = 1, start_col: int = 1) -> str:
+    def add_calc_time(ms: float) -> None:
+        """Add recalculation time to the current thread's running total."""
+        _calc_timing.total_ms = getattr(_calc_timing, 'total_ms', 0.0) + ms
+    
+    @staticmethod
+    def pop_calc_time() -> float:
+        """Return and reset the current thread's accumulated recalculation time (ms)."""
+        total = getattr(_calc_timing, 'total_ms', 0.0)
+        _calc_timing.total_ms = 0.0
+        return total
+    
+    @staticmethod
+    def find_empty_cell(sheet: "xw.Sheet", start_row: int = 1, start_col: int = 1) -> str:
         """
         Find the next empty cell in a worksheet.
         
@@ -81,7 +118,7 @@ class ExcelHelper:
             
             return f"{col_letter}{empty_row}"
         except Exception as e:
-            logger.warning(f"Could not find empty cell: {e}, defaulting to A1")
+            logger.warning("Could not find empty cell: %s, defaulting to A1", e)
             return "A1"
     
     @staticmethod
@@ -103,7 +140,7 @@ class ExcelHelper:
         return result
     
     @staticmethod
-    def parse_range_with_sheet(range_str: str, wb: xw.Book, default_sheet_name: str) -> Tuple[xw.Sheet, xw.Range]:
+    def parse_range_with_sheet(range_str: str, wb: "xw.Book", default_sheet_name: str) -> Tuple["xw.Sheet", "xw.Range"]:
         """
         Parse a range string that may include sheet reference.
         
@@ -177,7 +214,7 @@ class ExcelHelper:
                 if i == len(operations) - 1:
                     # Last operation failed
                     if error_msg:
-                        logger.warning(f"{error_msg}: {e}")
+                        logger.warning("%s: %s", error_msg, e)
                     return default
                 # Try next operation
                 continue
@@ -268,7 +305,7 @@ class ExcelHelper:
                 data_field.Function = agg_constant
                 return True
         except Exception as e:
-            logger.warning(f"Could not set aggregation function: {e}")
+            logger.warning("Could not set aggregation function: %s", e)
         
         return False
 
@@ -276,11 +313,11 @@ class ExcelHelper:
 class PivotTableBuilder:
     """Builder class for creating pivot tables with intelligent defaults."""
     
-    def __init__(self, wb: xw.Book):
+    def __init__(self, wb: "xw.Book"):
         self.wb = wb
         self.helper = ExcelHelper()
     
-    def find_best_location(self, sheet: xw.Sheet) -> str:
+    def find_best_location(self, sheet: "xw.Sheet") -> str:
         """
         Find the best location for a new pivot table.
         
@@ -314,7 +351,7 @@ class PivotTableBuilder:
         
         return self.helper.generate_unique_name("PivotTable", existing_names)
     
-    def get_or_create_pivot_sheet(self, preferred_name: Optional[str] = None) -> xw.Sheet:
+    def get_or_create_pivot_sheet(self, preferred_name: Optional[str] = None) -> "xw.Sheet":
         """
         Get existing sheet or create new one for pivot table.
         
@@ -0,0 +1,180 @@
+"""
+xlwings implementation for key-column indexes
+One bulk column read builds the index; lookups read back only the matching rows
+"""
+
+import time
+import logging
+from typing import Dict, Any, List, Optional
+
+from ..column_index import ColumnIndex
+from ..formula.parser import cell_address, column_index, split_range
+
+logger = logging.getLogger(__name__)
+
+
+def _as_list(values: Any) -> List[Any]:
+    if isinstance(values, list):
+        return values
+    return [values]
+
+
+def _has_formulas(formulas: Any) -> bool:
+    """Whether a Range.formula result (str or nested tuples) contains any formula."""
+    if isinstance(formulas, (list, tuple)):
+        return any(_has_formulas(item) for item in formulas)
+    return isinstance(formulas, str) and formulas.startswith("=")
+
+
+def _resolve_key_column(key_column: str, headers: List[Any], first_col: int) -> Optional[int]:
+    """Sheet column for a header name (case-insensitive) or column letter."""
+    key = str(key_column).strip().lower()
+    for offset, name in enumerate(headers):
+        if name is not None and str(name).strip().lower() == key:
+            return first_col + offset
+    if key.isalpha() and len(key) <= 3:
+        return column_index(key)
+    return None
+
+
+def build_column_index_xlw_with_wb(
+    wb,
+    sheet_name: str,
+    key_column: str,
+    table_name: Optional[str] = None,
+    header_row: Optional[int] = 1
+) -> Dict[str, Any]:
+    """Session-based key-column index build.
+
+    Args:
+        wb: Workbook object from session
+        sheet_name: Sheet name
+        key_column: Header name or column letter of the key column
+        table_name: Excel table (ListObject) to index instead of the sheet's used range
+        header_row: Row with column names for sheet ranges (None or 0 when there is none)
+
+    Returns:
+        Dict with the built index, or an error
+    """
+    try:
+        if sheet_name not in [s.name for s in wb.sheets]:
+            return {"error": f"Sheet '{sheet_name}' not found"}
+
+        ws = wb.sheets[sheet_name]
+        started = time.perf_counter()
+
+        if table_name:
+            if table_name not in [t.name for t in ws.tables]:
+                return {"error": f"Table '{table_name}' not found on sheet '{sheet_name}'"}
+            table = ws.tables[table_name]
+            body = table.data_body_range
+            header_range = table.header_row_range
+            first_col = table.range.column
+            last_col = first_col + table.range.columns.count - 1
+            header_row = header_range.row if header_range is not None else None
+            headers = _as_list(header_range.value) if header_range is not None else []
+            first_row = body.row if body is not None else table.range.last_cell.row + 1
+            last_row = body.last_cell.row if body is not None else first_row - 1
+        else:
+            used = ws.used_range
+            first_col = used.column
+            last_col = used.last_cell.column
+            last_row = used.last_cell.row
+            if header_row:
+                headers = _as_list(ws.range((header_row, first_col), (header_row, last_col)).value)
+                first_row = header_row + 1
+            else:
+                header_row = None
+                headers = []
+                first_row = used.row
+
+        column = _resolve_key_column(key_column, headers, first_col)
+        if column is None:
+            names = ", ".join(str(h) for h in headers if h is not None)
+            return {"error": f"Key column '{key_column}' not found. Available columns: {names}"}
+        offset = column - first_col
+        header = str(headers[offset]).strip() if 0 <= offset < len(headers) and headers[offset] is not None else None
+
+        index = ColumnIndex(sheet_name, column, header, first_row, (first_col, max(last_col, column)),
+                            table_name=table_name, header_row=header_row)
+        index.spec = (str(key_column).strip(), table_name, header_row)
+        if last_row >= first_row:
+            key_range = ws.range((first_row, column), (last_row, column))
+            index.set_values(first_row, key_range.options(ndim=1).value)
+            index.has_formulas = _has_formulas(key_range.formula)
+
+        index.build_ms = round((time.perf_counter() - started) * 1000, 1)
+        logger.info("Built column index %s!%s: %s keys in %sms", sheet_name, key_column, index.stats()['rows'], index.build_ms)
+        return {"index": index}
+
+    except Exception as e:
+        logger.error("xlwings column index build failed: %s", e)
+        return {"error": f"Failed to build column index: {str(e)}"}
+
+
+def refresh_column_index_xlw_with_wb(wb, index: ColumnIndex, address: str) -> bool:
+    """Re-read the key cells of a written block into an existing index.
+
+    Args:
+        wb: Workbook object from session
+        index: Index to update in place
+        address: Written range on the index's sheet (e.g., "A1:C10")
+
+    Returns:
+        True on success; False means the index should be rebuilt
+    """
+    try:
+        _, r1, c1, r2, c2 = split_range(address)
+        if not c1 <= index.column <= c2 or r2 < index.first_row:
+            return True
+        r1 = max(r1, index.first_row)
+        key_range = wb.sheets[index.sheet].range((r1, index.column), (r2, index.column))
+        index.set_values(r1, _as_list(key_range.options(ndim=1).value))
+        if _has_formulas(key_range.formula):
+            index.has_formulas = True
+        return True
+    except Exception as e:
+        logger.warning("Column index refresh failed for %s!%s: %s", index.sheet, address, e)
+        return False
+
+
+def read_index_rows_xlw_with_wb(wb, index: ColumnIndex, rows: List[int]) -> Dict[str, Any]:
+    """Read the indexed column span of the given sheet rows.
+
+    Nearby rows are fetched with one block read; scattered rows with one read each.
+
+    Args:
+        wb: Workbook object from session
+        index: Index whose span (first to last column) is returned
+        rows: Sorted sheet rows to read
+
+    Returns:
+        Dict with column headers and one entry per row, or an error
+    """
+    try:
+        ws = wb.sheets[index.sheet]
+        first_col, last_col = index.span
+        headers = []
+        if index.header_row:
+            headers = _as_list(ws.range((index.header_row, first_col), (index.header_row, last_col)).value)
+
+        matches = []
+        if rows and rows[-1] - rows[0] + 1 <= 2 * len(rows) + 16:
+            block = ws.range((rows[0], first_col), (rows[-1], last_col)).options(ndim=2).value
+            for row in rows:
+                matches.append((row, block[row - rows[0]]))
+        else:
+            for row in rows:
+                matches.append((row, _as_list(ws.range((row, first_col), (row, last_col)).options(ndim=1).value)))
+
+        return {
+            "columns": headers,
+            "rows": [
+                {"row": row, "address": f"{cell_address(row, first_col)}:{cell_address(row, last_col)}", "values": values}
+                for row, values in matches
+            ],
+        }
+
+    except Exception as e:
+        logger.error("xlwings index row read failed: %s", e)
+        return {"error": f"Failed to read rows: {str(e)}"}
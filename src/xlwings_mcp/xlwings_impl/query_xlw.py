@@ -0,0 +1,120 @@
+"""
+xlwings implementation for server-side range queries
+Reads a range once into a ColumnarTable; aggregation runs in Python without COM
+"""
+
+import time
+import logging
+from typing import Dict, Any, Optional
+
+from ..columnar import ColumnarTable
+from ..formula.parser import cell_address, split_range
+from ..metrics import METRICS
+
+logger = logging.getLogger(__name__)
+
+
+def _cache_key(sheet_name: str, data_range: Optional[str], header: bool):
+    return (sheet_name.lower(), (data_range or "").replace("$", "").upper(), bool(header))
+
+
+def cached_columnar_table(
+    cache: "OrderedDict",
+    sheet_name: str,
+    data_range: Optional[str],
+    header: bool,
+    change_token: Any
+) -> Optional[ColumnarTable]:
+    """Table from an earlier read of the same range if the workbook has not changed since; touches no COM"""
+    key = _cache_key(sheet_name, data_range, header)
+    cached = cache.get(key)
+    if not cached or cached[0] != change_token:
+        return None
+    try:
+        cache.move_to_end(key)
+    except KeyError:
+        pass
+    return cached[1]
+
+
+def _within_used_range(ws, data_range: str):
+    """(range, top, left) of data_range cut off at the sheet's last used row and
+    column, so whole-column or whole-row ranges such as "A:D" read only cells
+    that can hold data"""
+    _, r1, c1, r2, c2 = split_range(data_range)
+    last = ws.used_range.last_cell
+    r2 = max(r1, min(r2, last.row))
+    c2 = max(c1, min(c2, last.column))
+    return ws.range((r1, c1), (r2, c2)), r1, c1
+
+
+def _block_address(top: int, left: int, values) -> str:
+    """A1 address of the block values was read from, without asking Excel"""
+    bottom, right = top + len(values) - 1, left + (len(values[0]) if values else 1) - 1
+    if (bottom, right) == (top, left):
+        return cell_address(top, left)
+    return f"{cell_address(top, left)}:{cell_address(bottom, right)}"
+
+
+def read_columnar_xlw_with_wb(
+    wb,
+    sheet_name: str,
+    data_range: Optional[str] = None,
+    header: bool = True,
+    cache: Optional["OrderedDict"] = None,
+    change_token: Any = 0,
+    cache_limit: int = 8
+) -> Dict[str, Any]:
+    """Session-based bulk read of a range into a columnar table.
+
+    Tables are cached per (sheet, range, header) and reused while
+    ``change_token`` is unchanged, so follow-up queries skip COM entirely.
+
+    Args:
+        wb: Workbook object from session
+        sheet_name: Sheet name
+        data_range: Source range (e.g., "A1:F5000"); defaults to the sheet's used range
+        header: First row holds column names
+        cache: Session cache (OrderedDict) of previous reads
+        change_token: Session version (read token) the cached tables must match
+        cache_limit: Maximum number of cached tables
+
+    Returns:
+        Dict with the table and whether it came from the cache, or an error
+    """
+    key = _cache_key(sheet_name, data_range, header)
+    table = cached_columnar_table(cache, sheet_name, data_range, header, change_token) if cache is not None else None
+    if table is not None:
+        return {"table": table, "cached": True}
+
+    try:
+        if sheet_name not in [s.name for s in wb.sheets]:
+            return {"error": f"Sheet '{sheet_name}' not found"}
+
+        ws = wb.sheets[sheet_name]
+        started = time.perf_counter()
+        if data_range:
+            rng, top, left = _within_used_range(ws, data_range)
+        else:
+            rng = ws.used_range
+            top, left = rng.row, rng.column
+        values = rng.options(ndim=2).value
+        read_ms = round((time.perf_counter() - started) * 1000, 1)
+
+        table = ColumnarTable.from_values(
+            sheet_name, _block_address(top, left, values), top, left,
+            values, header=header, read_ms=read_ms
+        )
+        METRICS.add_cells(table.memory_cells())
+        logger.info("Columnar read %s!%s: %s rows x %s columns in %sms", sheet_name, table.address, table.row_count, len(table.headers), read_ms)
+
+        if cache is not None:
+            cache[key] = (change_token, table)
+            cache.move_to_end(key)
+            while len(cache) > cache_limit:
+                cache.popitem(last=False)
+        return {"table": table, "cached": False}
+
+    except Exception as e:
+        logger.error("xlwings columnar read failed: %s", e)
+        return {"error": f"Failed to read range: {str(e)}"}
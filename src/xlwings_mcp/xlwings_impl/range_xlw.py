@@ -8,6 +8,8 @@ from typing import List, Dict, Any, Optional, Tuple
 import logging
 import os
 
+from .helpers import ExcelHelper
+
 logger = logging.getLogger(__name__)
 
 def merge_cells_xlw(filepath: str, sheet_name: str, start_cell: str, end_cell: str) -> Dict[str, Any]:
@@ -27,7 +29,7 @@ def merge_cells_xlw(filepath: str, sheet_name: str, start_cell: str, end_cell: s
     wb = None
     
     try:
-        logger.info(f"🔗 Merging cells {start_cell}:{end_cell} in {sheet_name}")
+        logger.info("🔗 Merging cells %s:%s in %s", start_cell, end_cell, sheet_name)
         
         # Check if file exists
         if not os.path.exists(filepath):
@@ -57,7 +59,7 @@ def merge_cells_xlw(filepath: str, sheet_name: str, start_cell: str, end_cell: s
         # Save the workbook
         wb.save()
         
-        logger.info(f"✅ Successfully merged cells {start_cell}:{end_cell}")
+        logger.info("✅ Successfully merged cells %s:%s", start_cell, end_cell)
         return {
             "message": f"Successfully merged cells {start_cell}:{end_cell}",
             "range": f"{start_cell}:{end_cell}",
@@ -65,7 +67,7 @@ def merge_cells_xlw(filepath: str, sheet_name: str, start_cell: str, end_cell: s
         }
         
     except Exception as e:
-        logger.error(f"❌ Error merging cells: {str(e)}")
+        logger.error("❌ Error merging cells: %s", str(e))
         return {"error": str(e)}
         
     finally:
@@ -92,7 +94,7 @@ def unmerge_cells_xlw(filepath: str, sheet_name: str, start_cell: str, end_cell:
     wb = None
     
     try:
-        logger.info(f"🔓 Unmerging cells {start_cell}:{end_cell} in {sheet_name}")
+        logger.info("🔓 Unmerging cells %s:%s in %s", start_cell, end_cell, sheet_name)
         
         # Check if file exists
         if not os.path.exists(filepath):
@@ -122,7 +124,7 @@ def unmerge_cells_xlw(filepath: str, sheet_name: str, start_cell: str, end_cell:
         # Save the workbook
         wb.save()
         
-        logger.info(f"✅ Successfully unmerged cells {start_cell}:{end_cell}")
+        logger.info("✅ Successfully unmerged cells %s:%s", start_cell, end_cell)
         return {
             "message": f"Successfully unmerged cells {start_cell}:{end_cell}",
             "range": f"{start_cell}:{end_cell}",
@@ -130,7 +132,7 @@ def unmerge_cells_xlw(filepath: str, sheet_name: str, start_cell: str, end_cell:
         }
         
     except Exception as e:
-        logger.error(f"❌ Error unmerging cells: {str(e)}")
+        logger.error("❌ Error unmerging cells: %s", str(e))
         return {"error": str(e)}
         
     finally:
@@ -155,7 +157,7 @@ def get_merged_cells_xlw(filepath: str, sheet_name: str) -> Dict[str, Any]:
     wb = None
     
     try:
-        logger.info(f"📊 Getting merged cells in {sheet_name}")
+        logger.info("📊 Getting merged cells in %s", sheet_name)
         
         # Check if file exists
         if not os.path.exists(filepath):
@@ -244,9 +246,9 @@ def get_merged_cells_xlw(filepath: str, sheet_name: str) -> Dict[str, Any]:
                             # Skip cells that cause errors
                             continue
         except Exception as e:
-            logger.warning(f"Could not get merged cells: {e}")
+            logger.warning("Could not get merged cells: %s", e)
         
-        logger.info(f"✅ Found {len(merged_ranges)} merged ranges")
+        logger.info("✅ Found %s merged ranges", len(merged_ranges))
         return {
             "merged_ranges": merged_ranges,
             "count": len(merged_ranges),
@@ -254,7 +256,7 @@ def get_merged_cells_xlw(filepath: str, sheet_name: str) -> Dict[str, Any]:
         }
         
     except Exception as e:
-        logger.error(f"❌ Error getting merged cells: {str(e)}")
+        logger.error("❌ Error getting merged cells: %s", str(e))
         return {"error": str(e)}
         
     finally:
@@ -293,7 +295,7 @@ def copy_range_xlw(
         # Use target_sheet if provided, otherwise use source sheet
         target_sheet = target_sheet or sheet_name
         
-        logger.info(f"📋 Copying range {source_start}:{source_end} to {target_start} in {target_sheet}")
+        logger.info("📋 Copying range %s:%s to %s in %s", source_start, source_end, target_start, target_sheet)
         
         # Check if file exists
         if not os.path.exists(filepath):
@@ -330,7 +332,7 @@ def copy_range_xlw(
         # Save the workbook
         wb.save()
         
-        logger.info(f"✅ Successfully copied range to {target_start}:{target_end}")
+        logger.info("✅ Successfully copied range to %s:%s", target_start, target_end)
         return {
             "message": f"Successfully copied range {source_start}:{source_end} to {target_start}",
             "source_range": f"{source_start}:{source_end}",
@@ -340,7 +342,7 @@ def copy_range_xlw(
         }
         
     except Exception as e:
-        logger.error(f"❌ Error copying range: {str(e)}")
+        logger.error("❌ Error copying range: %s", str(e))
         return {"error": str(e)}
         
     finally:
@@ -374,7 +376,7 @@ def delete_range_xlw(
     wb = None
     
     try:
-        logger.info(f"🗑️ Deleting range {start_cell}:{end_cell} in {sheet_name}, shift {shift_direction}")
+        logger.info("🗑️ Deleting range %s:%s in %s, shift %s", start_cell, end_cell, sheet_name, shift_direction)
         
         # Validate shift direction
         if shift_direction not in ["up", "left"]:
@@ -409,7 +411,7 @@ def delete_range_xlw(
         # Save the workbook
         wb.save()
         
-        logger.info(f"✅ Successfully deleted range {start_cell}:{end_cell}")
+        logger.info("✅ Successfully deleted range %s:%s", start_cell, end_cell)
         return {
             "message": f"Successfully deleted range {start_cell}:{end_cell} and shifted cells {shift_direction}",
             "deleted_range": f"{start_cell}:{end_cell}",
@@ -418,7 +420,7 @@ def delete_range_xlw(
         }
         
     except Exception as e:
-        logger.error(f"❌ Error deleting range: {str(e)}")
+        logger.error("❌ Error deleting range: %s", str(e))
         return {"error": str(e)}
         
     finally:
@@ -448,7 +450,7 @@ def batch_range_operations_xlw(
     results = []
     
     try:
-        logger.info(f"⚡ Executing {len(operations)} batch operations")
+        logger.info("⚡ Executing %s batch operations", len(operations))
         
         # Check if file exists
         if not os.path.exists(filepath):
@@ -511,7 +513,7 @@ def batch_range_operations_xlw(
         successes = sum(1 for r in results if r["status"] == "success")
         failures = sum(1 for r in results if r["status"] == "error")
         
-        logger.info(f"✅ Batch operations complete: {successes} succeeded, {failures} failed")
+        logger.info("✅ Batch operations complete: %s succeeded, %s failed", successes, failures)
         return {
             "total_operations": len(operations),
             "successes": successes,
@@ -520,7 +522,7 @@ def batch_range_operations_xlw(
         }
         
     except Exception as e:
-        logger.error(f"❌ Error in batch operations: {str(e)}")
+        logger.error("❌ Error in batch operations: %s", str(e))
         return {"error": str(e)}
         
     finally:
@@ -543,7 +545,7 @@ def merge_cells_xlw_with_wb(wb, sheet_name: str, start_cell: str, end_cell: str)
         Dict with success message or error
     """
     try:
-        logger.info(f"🔗 Merging cells {start_cell}:{end_cell} in {sheet_name}")
+        logger.info("🔗 Merging cells %s:%s in %s", start_cell, end_cell, sheet_name)
         
         # Check if sheet exists
         sheet_names = [s.name for s in wb.sheets]
@@ -565,7 +567,7 @@ def merge_cells_xlw_with_wb(wb, sheet_name: str, start_cell: str, end_cell: str)
         # Save the workbook
         wb.save()
         
-        logger.info(f"✅ Successfully merged cells {start_cell}:{end_cell}")
+        logger.info("✅ Successfully merged cells %s:%s", start_cell, end_cell)
         return {
             "message": f"Successfully merged cells {start_cell}:{end_cell}",
             "range": f"{start_cell}:{end_cell}",
@@ -573,7 +575,7 @@ def merge_cells_xlw_with_wb(wb, sheet_name: str, start_cell: str, end_cell: str)
         }
         
     except Exception as e:
-        logger.error(f"❌ Error merging cells: {str(e)}")
+        logger.error("❌ Error merging cells: %s", str(e))
         return {"error": str(e)}
 
 def unmerge_cells_xlw_with_wb(wb, sheet_name: str, start_cell: str, end_cell: str) -> Dict[str, Any]:
@@ -590,7 +592,7 @@ def unmerge_cells_xlw_with_wb(wb, sheet_name: str, start_cell: str, end_cell: st
         Dict with success message or error
     """
     try:
-        logger.info(f"🔓 Unmerging cells {start_cell}:{end_cell} in {sheet_name}")
+        logger.info("🔓 Unmerging cells %s:%s in %s", start_cell, end_cell, sheet_name)
         
         # Check if sheet exists
         sheet_names = [s.name for s in wb.sheets]
@@ -612,7 +614,7 @@ def unmerge_cells_xlw_with_wb(wb, sheet_name: str, start_cell: str, end_cell: st
         # Save the workbook
         wb.save()
         
-        logger.info(f"✅ Successfully unmerged cells {start_cell}:{end_cell}")
+        logger.info("✅ Successfully unmerged cells %s:%s", start_cell, end_cell)
         return {
             "message": f"Successfully unmerged cells {start_cell}:{end_cell}",
             "range": f"{start_cell}:{end_cell}",
@@ -620,7 +622,7 @@ def unmerge_cells_xlw_with_wb(wb, sheet_name: str, start_cell: str, end_cell: st
         }
         
     except Exception as e:
-        logger.error(f"❌ Error unmerging cells: {str(e)}")
+        logger.error("❌ Error unmerging cells: %s", str(e))
         return {"error": str(e)}
 
 def get_merged_cells_xlw_with_wb(wb, sheet_name: str) -> Dict[str, Any]:
@@ -635,7 +637,7 @@ def get_merged_cells_xlw_with_wb(wb, sheet_name: str) -> Dict[str, Any]:
         Dict with list of merged ranges or error
     """
     try:
-        logger.info(f"📊 Getting merged cells in {sheet_name}")
+        logger.info("📊 Getting merged cells in %s", sheet_name)
         
         # Check if sheet exists
         sheet_names = [s.name for s in wb.sheets]
@@ -716,9 +718,9 @@ def get_merged_cells_xlw_with_wb(wb, sheet_name: str) -> Dict[str, Any]:
                             # Skip cells that cause errors
                             continue
         except Exception as e:
-            logger.warning(f"Could not get merged cells: {e}")
+            logger.warning("Could not get merged cells: %s", e)
         
-        logger.info(f"✅ Found {len(merged_ranges)} merged ranges")
+        logger.info("✅ Found %s merged ranges", len(merged_ranges))
         return {
             "merged_ranges": merged_ranges,
             "count": len(merged_ranges),
@@ -726,7 +728,7 @@ def get_merged_cells_xlw_with_wb(wb, sheet_name: str) -> Dict[str, Any]:
         }
         
     except Exception as e:
-        logger.error(f"❌ Error getting merged cells: {str(e)}")
+        logger.error("❌ Error getting merged cells: %s", str(e))
         return {"error": str(e)}
 
 def copy_range_xlw_with_wb(
@@ -755,7 +757,7 @@ def copy_range_xlw_with_wb(
         # Use target_sheet if provided, otherwise use source sheet
         target_sheet = target_sheet or sheet_name
         
-        logger.info(f"📋 Copying range {source_start}:{source_end} to {target_start} in {target_sheet}")
+        logger.info("📋 Copying range %s:%s to %s in %s", source_start, source_end, target_start, target_sheet)
         
         # Check if sheets exist
         sheet_names = [s.name for s in wb.sheets]
@@ -772,7 +774,8 @@ def copy_range_xlw_with_wb(
         
         # Copy to target location
         # xlwings copy method preserves formatting and formulas
-        source_range.copy(destination=dest_sheet.range(target_start))
+        with ExcelHelper.calc_state_context(wb) as calc:
+            source_range.copy(destination=dest_sheet.range(target_start))
         
         # Calculate target end cell
         rows = source_range.rows.count
@@ -784,17 +787,18 @@ def copy_range_xlw_with_wb(
         # Save the workbook
         wb.save()
         
-        logger.info(f"✅ Successfully copied range to {target_start}:{target_end}")
+        logger.info("✅ Successfully copied range to %s:%s", target_start, target_end)
         return {
             "message": f"Successfully copied range {source_start}:{source_end} to {target_start}",
             "source_range": f"{source_start}:{source_end}",
             "target_range": f"{target_start}:{target_end}",
             "source_sheet": sheet_name,
-            "target_sheet": target_sheet
+            "target_sheet": target_sheet,
+            "calc_ms": round(calc.calc_ms, 1)
         }
         
     except Exception as e:
-        logger.error(f"❌ Error copying range: {str(e)}")
+        logger.error("❌ Error copying range: %s", str(e))
         return {"error": str(e)}
 
 def delete_range_xlw_with_wb(
@@ -818,7 +822,7 @@ def delete_range_xlw_with_wb(
         Dict with success message or error
     """
     try:
-        logger.info(f"🗑️ Deleting range {start_cell}:{end_cell} in {sheet_name}, shift {shift_direction}")
+        logger.info("🗑️ Deleting range %s:%s in %s, shift %s", start_cell, end_cell, sheet_name, shift_direction)
         
         # Validate shift direction
         if shift_direction not in ["up", "left"]:
@@ -835,26 +839,28 @@ def delete_range_xlw_with_wb(
         delete_range = sheet.range(f"{start_cell}:{end_cell}")
         
         # Delete and shift cells
-        if shift_direction == "up":
-            # Shift cells up (xlShiftUp = -4162)
-            delete_range.api.Delete(Shift=-4162)
-        else:  # shift_direction == "left"
-            # Shift cells left (xlShiftToLeft = -4159)
-            delete_range.api.Delete(Shift=-4159)
+        with ExcelHelper.calc_state_context(wb) as calc:
+            if shift_direction == "up":
+                # Shift cells up (xlShiftUp = -4162)
+                delete_range.api.Delete(Shift=-4162)
+            else:  # shift_direction == "left"
+                # Shift cells left (xlShiftToLeft = -4159)
+                delete_range.api.Delete(Shift=-4159)
         
         # Save the workbook
         wb.save()
         
-        logger.info(f"✅ Successfully deleted range {start_cell}:{end_cell}")
+        logger.info("✅ Successfully deleted range %s:%s", start_cell, end_cell)
         return {
             "message": f"Successfully deleted range {start_cell}:{end_cell} and shifted cells {shift_direction}",
             "deleted_range": f"{start_cell}:{end_cell}",
             "shift_direction": shift_direction,
-            "sheet": sheet_name
+            "sheet": sheet_name,
+            "calc_ms": round(calc.calc_ms, 1)
         }
         
     except Exception as e:
-        logger.error(f"❌ Error deleting range: {str(e)}")
+        logger.error("❌ Error deleting range: %s", str(e))
         return {"error": str(e)}
 
 def validate_excel_range_xlw_with_wb(
@@ -876,7 +882,7 @@ def validate_excel_range_xlw_with_wb(
         Dict containing validation result and range information
     """
     try:
-        logger.info(f"🔍 Validating range {start_cell}:{end_cell or start_cell} in {sheet_name}")
+        logger.info("🔍 Validating range %s:%s in %s", start_cell, end_cell or start_cell, sheet_name)
         
         # Check if sheet exists
         sheet_names = [s.name for s in wb.sheets]
@@ -917,7 +923,7 @@ def validate_excel_range_xlw_with_wb(
             else:
                 range_info["non_empty_cells"] = 0
             
-            logger.info(f"✅ Range validation successful: {range_obj.address}")
+            logger.info("✅ Range validation successful: %s", range_obj.address)
             return range_info
             
         except Exception as range_error:
@@ -930,5 +936,5 @@ def validate_excel_range_xlw_with_wb(
             }
         
     except Exception as e:
-        logger.error(f"Error validating range: {e}")
-        return {"error": str(e), "valid": False}
\ No newline at end of file
+        logger.error("Error validating range: %s", e)
+        return {"error": str(e), "valid": False}
@@ -8,6 +8,8 @@ from typing import Dict, Any
 import logging
 import os
 
+from .helpers import ExcelHelper
+
 logger = logging.getLogger(__name__)
 
 
@@ -33,7 +35,7 @@ def insert_rows_xlw(
     wb = None
     
     try:
-        logger.info(f"📊 Inserting {count} rows at row {start_row} in {sheet_name}")
+        logger.info("📊 Inserting %s rows at row %s in %s", count, start_row, sheet_name)
         
         # Check if file exists
         if not os.path.exists(filepath):
@@ -61,7 +63,7 @@ def insert_rows_xlw(
         # Save the workbook
         wb.save()
         
-        logger.info(f"✅ Successfully inserted {count} rows at row {start_row}")
+        logger.info("✅ Successfully inserted %s rows at row %s", count, start_row)
         return {
             "message": f"Successfully inserted {count} rows at row {start_row}",
             "sheet": sheet_name,
@@ -70,7 +72,7 @@ def insert_rows_xlw(
         }
         
     except Exception as e:
-        logger.error(f"Error inserting rows: {e}")
+        logger.error("Error inserting rows: %s", e)
         return {"error": str(e)}
         
     finally:
@@ -102,7 +104,7 @@ def insert_columns_xlw(
     wb = None
     
     try:
-        logger.info(f"📊 Inserting {count} columns at column {start_col} in {sheet_name}")
+        logger.info("📊 Inserting %s columns at column %s in %s", count, start_col, sheet_name)
         
         # Check if file exists
         if not os.path.exists(filepath):
@@ -139,7 +141,7 @@ def insert_columns_xlw(
         # Save the workbook
         wb.save()
         
-        logger.info(f"✅ Successfully inserted {count} columns at column {col_letter}")
+        logger.info("✅ Successfully inserted %s columns at column %s", count, col_letter)
         return {
             "message": f"Successfully inserted {count} columns at column {col_letter}",
             "sheet": sheet_name,
@@ -148,7 +150,7 @@ def insert_columns_xlw(
         }
         
     except Exception as e:
-        logger.error(f"Error inserting columns: {e}")
+        logger.error("Error inserting columns: %s", e)
         return {"error": str(e)}
         
     finally:
@@ -180,7 +182,7 @@ def delete_sheet_rows_xlw(
     wb = None
     
     try:
-        logger.info(f"🗑️ Deleting {count} rows starting from row {start_row} in {sheet_name}")
+        logger.info("🗑️ Deleting %s rows starting from row %s in %s", count, start_row, sheet_name)
         
         # Check if file exists
         if not os.path.exists(filepath):
@@ -206,7 +208,7 @@ def delete_sheet_rows_xlw(
         # Save the workbook
         wb.save()
         
-        logger.info(f"✅ Successfully deleted {count} rows starting from row {start_row}")
+        logger.info("✅ Successfully deleted %s rows starting from row %s", count, start_row)
         return {
             "message": f"Successfully deleted {count} rows starting from row {start_row}",
             "sheet": sheet_name,
@@ -215,7 +217,7 @@ def delete_sheet_rows_xlw(
         }
         
     except Exception as e:
-        logger.error(f"Error deleting rows: {e}")
+        logger.error("Error deleting rows: %s", e)
         return {"error": str(e)}
         
     finally:
@@ -247,7 +249,7 @@ def delete_sheet_columns_xlw(
     wb = None
     
     try:
-        logger.info(f"🗑️ Deleting {count} columns starting from column {start_col} in {sheet_name}")
+        logger.info("🗑️ Deleting %s columns starting from column %s in %s", count, start_col, sheet_name)
         
         # Check if file exists
         if not os.path.exists(filepath):
@@ -283,7 +285,7 @@ def delete_sheet_columns_xlw(
         # Save the workbook
         wb.save()
         
-        logger.info(f"✅ Successfully deleted {count} columns starting from column {col_letter}")
+        logger.info("✅ Successfully deleted %s columns starting from column %s", count, col_letter)
         return {
             "message": f"Successfully deleted {count} columns starting from column {col_letter}",
             "sheet": sheet_name,
@@ -292,7 +294,7 @@ def delete_sheet_columns_xlw(
         }
         
     except Exception as e:
-        logger.error(f"Error deleting columns: {e}")
+        logger.error("Error deleting columns: %s", e)
         return {"error": str(e)}
         
     finally:
@@ -319,7 +321,7 @@ def insert_rows_xlw_with_wb(
         Dict with success message or error
     """
     try:
-        logger.info(f"📊 Inserting {count} rows at row {start_row} in {sheet_name}")
+        logger.info("📊 Inserting %s rows at row %s in %s", count, start_row, sheet_name)
         
         # Check if sheet exists
         sheet_names = [s.name for s in wb.sheets]
@@ -328,27 +330,24 @@ def insert_rows_xlw_with_wb(
         
         sheet = wb.sheets[sheet_name]
         
-        # Insert rows using xlwings
-        # Get the range for the row to insert at
-        target_row = sheet.range(f"{start_row}:{start_row}")
-        
-        # Insert rows - use COM API for better control
-        for _ in range(count):
-            target_row.api.Insert()
+        # Insert all rows in one COM call; recalculation runs once on exit
+        with ExcelHelper.calc_state_context(wb) as calc:
+            sheet.range(f"{start_row}:{start_row + count - 1}").api.Insert()
         
         # Save the workbook
         wb.save()
         
-        logger.info(f"✅ Successfully inserted {count} rows at row {start_row}")
+        logger.info("✅ Successfully inserted %s rows at row %s", count, start_row)
         return {
             "message": f"Successfully inserted {count} rows at row {start_row}",
             "sheet": sheet_name,
             "start_row": start_row,
-            "count": count
+            "count": count,
+            "calc_ms": round(calc.calc_ms, 1)
         }
         
     except Exception as e:
-        logger.error(f"Error inserting rows: {e}")
+        logger.error("Error inserting rows: %s", e)
         return {"error": str(e)}
 
 def insert_columns_xlw_with_wb(
@@ -369,7 +368,7 @@ def insert_columns_xlw_with_wb(
         Dict with success message or error
     """
     try:
-        logger.info(f"📊 Inserting {count} columns at column {start_col} in {sheet_name}")
+        logger.info("📊 Inserting %s columns at column %s in %s", count, start_col, sheet_name)
         
         # Check if sheet exists
         sheet_names = [s.name for s in wb.sheets]
@@ -388,26 +387,26 @@ def insert_columns_xlw_with_wb(
         
         col_letter = col_num_to_letter(start_col)
         
-        # Insert columns using xlwings
-        target_col = sheet.range(f"{col_letter}:{col_letter}")
+        end_letter = col_num_to_letter(start_col + count - 1)
         
-        # Insert columns - use COM API for better control
-        for _ in range(count):
-            target_col.api.Insert()
+        # Insert all columns in one COM call; recalculation runs once on exit
+        with ExcelHelper.calc_state_context(wb) as calc:
+            sheet.range(f"{col_letter}:{end_letter}").api.Insert()
         
         # Save the workbook
         wb.save()
         
-        logger.info(f"✅ Successfully inserted {count} columns at column {col_letter}")
+        logger.info("✅ Successfully inserted %s columns at column %s", count, col_letter)
         return {
             "message": f"Successfully inserted {count} columns at column {col_letter}",
             "sheet": sheet_name,
             "start_col": start_col,
-            "count": count
+            "count": count,
+            "calc_ms": round(calc.calc_ms, 1)
         }
         
     except Exception as e:
-        logger.error(f"Error inserting columns: {e}")
+        logger.error("Error inserting columns: %s", e)
         return {"error": str(e)}
 
 def delete_sheet_rows_xlw_with_wb(
@@ -428,7 +427,7 @@ def delete_sheet_rows_xlw_with_wb(
         Dict with success message or error
     """
     try:
-        logger.info(f"🗑️ Deleting {count} rows starting from row {start_row} in {sheet_name}")
+        logger.info("🗑️ Deleting %s rows starting from row %s in %s", count, start_row, sheet_name)
         
         # Check if sheet exists
         sheet_names = [s.name for s in wb.sheets]
@@ -437,25 +436,24 @@ def delete_sheet_rows_xlw_with_wb(
         
         sheet = wb.sheets[sheet_name]
         
-        # Delete rows using xlwings
-        # Delete from bottom to top to maintain row indices
-        for i in range(count):
-            row_to_delete = sheet.range(f"{start_row}:{start_row}")
-            row_to_delete.api.Delete()
+        # Delete all rows in one COM call; recalculation runs once on exit
+        with ExcelHelper.calc_state_context(wb) as calc:
+            sheet.range(f"{start_row}:{start_row + count - 1}").api.Delete()
         
         # Save the workbook
         wb.save()
         
-        logger.info(f"✅ Successfully deleted {count} rows starting from row {start_row}")
+        logger.info("✅ Successfully deleted %s rows starting from row %s", count, start_row)
         return {
             "message": f"Successfully deleted {count} rows starting from row {start_row}",
             "sheet": sheet_name,
             "start_row": start_row,
-            "count": count
+            "count": count,
+            "calc_ms": round(calc.calc_ms, 1)
         }
         
     except Exception as e:
-        logger.error(f"Error deleting rows: {e}")
+        logger.error("Error deleting rows: %s", e)
         return {"error": str(e)}
 
 def delete_sheet_columns_xlw_with_wb(
@@ -476,7 +474,7 @@ def delete_sheet_columns_xlw_with_wb(
         Dict with success message or error
     """
     try:
-        logger.info(f"🗑️ Deleting {count} columns starting from column {start_col} in {sheet_name}")
+        logger.info("🗑️ Deleting %s columns starting from column %s in %s", count, start_col, sheet_name)
         
         # Check if sheet exists
         sheet_names = [s.name for s in wb.sheets]
@@ -495,23 +493,24 @@ def delete_sheet_columns_xlw_with_wb(
         
         col_letter = col_num_to_letter(start_col)
         
-        # Delete columns using xlwings
-        # Delete multiple times since we delete one at a time
-        for i in range(count):
-            col_to_delete = sheet.range(f"{col_letter}:{col_letter}")
-            col_to_delete.api.Delete()
+        end_letter = col_num_to_letter(start_col + count - 1)
+        
+        # Delete all columns in one COM call; recalculation runs once on exit
+        with ExcelHelper.calc_state_context(wb) as calc:
+            sheet.range(f"{col_letter}:{end_letter}").api.Delete()
         
         # Save the workbook
         wb.save()
         
-        logger.info(f"✅ Successfully deleted {count} columns starting from column {col_letter}")
+        logger.info("✅ Successfully deleted %s columns starting from column %s", count, col_letter)
         return {
             "message": f"Successfully deleted {count} columns starting from column {col_letter}",
             "sheet": sheet_name,
             "start_col": start_col,
-            "count": count
+            "count": count,
+            "calc_ms": round(calc.calc_ms, 1)
         }
         
     except Exception as e:
-        logger.error(f"Error deleting columns: {e}")
-        return {"error": str(e)}
\ No newline at end of file
+        logger.error("Error deleting columns: %s", e)
+        return {"error": str(e)}
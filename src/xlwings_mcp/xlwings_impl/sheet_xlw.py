@@ -51,7 +51,7 @@ def create_worksheet_xlw(filepath: str, sheet_name: str) -> Dict[str, Any]:
         return {"message": f"Sheet '{sheet_name}' created successfully"}
         
     except Exception as e:
-        logger.error(f"xlwings 워크시트 생성 실패: {e}")
+        logger.error("xlwings 워크시트 생성 실패: %s", e)
         return {"error": f"Failed to create worksheet: {str(e)}"}
         
     finally:
@@ -60,13 +60,13 @@ def create_worksheet_xlw(filepath: str, sheet_name: str) -> Dict[str, Any]:
             try:
                 wb.close()
             except Exception as e:
-                logger.warning(f"워크북 닫기 실패: {e}")
+                logger.warning("워크북 닫기 실패: %s", e)
         
         if app:
             try:
                 app.quit()
             except Exception as e:
-                logger.warning(f"Excel 앱 종료 실패: {e}")
+                logger.warning("Excel 앱 종료 실패: %s", e)
 
 def create_worksheet_xlw_with_wb(wb, sheet_name: str) -> Dict[str, Any]:
     """Session-based version using existing workbook object.
@@ -93,7 +93,7 @@ def create_worksheet_xlw_with_wb(wb, sheet_name: str) -> Dict[str, Any]:
         return {"message": f"Sheet '{sheet_name}' created successfully"}
         
     except Exception as e:
-        logger.error(f"xlwings 워크시트 생성 실패: {e}")
+        logger.error("xlwings 워크시트 생성 실패: %s", e)
         return {"error": f"Failed to create worksheet: {str(e)}"}
 
 def delete_worksheet_xlw_with_wb(wb, sheet_name: str) -> Dict[str, Any]:
@@ -125,7 +125,7 @@ def delete_worksheet_xlw_with_wb(wb, sheet_name: str) -> Dict[str, Any]:
         return {"message": f"Sheet '{sheet_name}' deleted successfully"}
         
     except Exception as e:
-        logger.error(f"xlwings 워크시트 삭제 실패: {e}")
+        logger.error("xlwings 워크시트 삭제 실패: %s", e)
         return {"error": f"Failed to delete worksheet: {str(e)}"}
 
 def rename_worksheet_xlw_with_wb(wb, old_name: str, new_name: str) -> Dict[str, Any]:
@@ -158,7 +158,7 @@ def rename_worksheet_xlw_with_wb(wb, old_name: str, new_name: str) -> Dict[str,
         return {"message": f"Sheet renamed from '{old_name}' to '{new_name}'"}
         
     except Exception as e:
-        logger.error(f"xlwings 워크시트 이름 변경 실패: {e}")
+        logger.error("xlwings 워크시트 이름 변경 실패: %s", e)
         return {"error": f"Failed to rename worksheet: {str(e)}"}
 
 def copy_worksheet_xlw_with_wb(wb, source_sheet: str, target_sheet: str) -> Dict[str, Any]:
@@ -211,7 +211,7 @@ def copy_worksheet_xlw_with_wb(wb, source_sheet: str, target_sheet: str) -> Dict
                     new_sheet.range("A1").value = source_range.value
                     
         except Exception as copy_error:
-            logger.warning(f"COM API 복사 실패, 대안 방법 사용: {copy_error}")
+            logger.warning("COM API 복사 실패, 대안 방법 사용: %s", copy_error)
             # 대안 방법: 새 시트를 만들고 데이터를 복사
             new_sheet = wb.sheets.add(name=target_sheet)
             source_range = source.used_range
@@ -224,7 +224,7 @@ def copy_worksheet_xlw_with_wb(wb, source_sheet: str, target_sheet: str) -> Dict
         return {"message": f"Sheet '{source_sheet}' copied to '{target_sheet}'"}
         
     except Exception as e:
-        logger.error(f"xlwings 워크시트 복사 실패: {e}")
+        logger.error("xlwings 워크시트 복사 실패: %s", e)
         return {"error": f"Failed to copy worksheet: {str(e)}"}
 
 def delete_worksheet_xlw(filepath: str, sheet_name: str) -> Dict[str, Any]:
@@ -270,7 +270,7 @@ def delete_worksheet_xlw(filepath: str, sheet_name: str) -> Dict[str, Any]:
         return {"message": f"Sheet '{sheet_name}' deleted successfully"}
         
     except Exception as e:
-        logger.error(f"xlwings 워크시트 삭제 실패: {e}")
+        logger.error("xlwings 워크시트 삭제 실패: %s", e)
         return {"error": f"Failed to delete worksheet: {str(e)}"}
         
     finally:
@@ -279,13 +279,13 @@ def delete_worksheet_xlw(filepath: str, sheet_name: str) -> Dict[str, Any]:
             try:
                 wb.close()
             except Exception as e:
-                logger.warning(f"워크북 닫기 실패: {e}")
+                logger.warning("워크북 닫기 실패: %s", e)
         
         if app:
             try:
                 app.quit()
             except Exception as e:
-                logger.warning(f"Excel 앱 종료 실패: {e}")
+                logger.warning("Excel 앱 종료 실패: %s", e)
 
 def rename_worksheet_xlw(filepath: str, old_name: str, new_name: str) -> Dict[str, Any]:
     """xlwings를 사용한 워크시트 이름 변경
@@ -331,7 +331,7 @@ def rename_worksheet_xlw(filepath: str, old_name: str, new_name: str) -> Dict[st
         return {"message": f"Sheet renamed from '{old_name}' to '{new_name}'"}
         
     except Exception as e:
-        logger.error(f"xlwings 워크시트 이름 변경 실패: {e}")
+        logger.error("xlwings 워크시트 이름 변경 실패: %s", e)
         return {"error": f"Failed to rename worksheet: {str(e)}"}
         
     finally:
@@ -340,13 +340,13 @@ def rename_worksheet_xlw(filepath: str, old_name: str, new_name: str) -> Dict[st
             try:
                 wb.close()
             except Exception as e:
-                logger.warning(f"워크북 닫기 실패: {e}")
+                logger.warning("워크북 닫기 실패: %s", e)
         
         if app:
             try:
                 app.quit()
             except Exception as e:
-                logger.warning(f"Excel 앱 종료 실패: {e}")
+                logger.warning("Excel 앱 종료 실패: %s", e)
 
 def copy_worksheet_xlw(filepath: str, source_sheet: str, target_sheet: str) -> Dict[str, Any]:
     """xlwings를 사용한 워크시트 복사
@@ -412,7 +412,7 @@ def copy_worksheet_xlw(filepath: str, source_sheet: str, target_sheet: str) -> D
                     new_sheet.range("A1").value = source_range.value
                     
         except Exception as copy_error:
-            logger.warning(f"COM API 복사 실패, 대안 방법 사용: {copy_error}")
+            logger.warning("COM API 복사 실패, 대안 방법 사용: %s", copy_error)
             # 대안 방법: 새 시트를 만들고 데이터를 복사
             new_sheet = wb.sheets.add(name=target_sheet)
             source_range = source.used_range
@@ -425,7 +425,7 @@ def copy_worksheet_xlw(filepath: str, source_sheet: str, target_sheet: str) -> D
         return {"message": f"Sheet '{source_sheet}' copied to '{target_sheet}'"}
         
     except Exception as e:
-        logger.error(f"xlwings 워크시트 복사 실패: {e}")
+        logger.error("xlwings 워크시트 복사 실패: %s", e)
         return {"error": f"Failed to copy worksheet: {str(e)}"}
         
     finally:
@@ -434,10 +434,10 @@ def copy_worksheet_xlw(filepath: str, source_sheet: str, target_sheet: str) -> D
             try:
                 wb.close()
             except Exception as e:
-                logger.warning(f"워크북 닫기 실패: {e}")
+                logger.warning("워크북 닫기 실패: %s", e)
         
         if app:
             try:
                 app.quit()
             except Exception as e:
-                logger.warning(f"Excel 앱 종료 실패: {e}")
\ No newline at end of file
+                logger.warning("Excel 앱 종료 실패: %s", e)
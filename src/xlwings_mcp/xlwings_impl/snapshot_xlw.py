@@ -0,0 +1,81 @@
+"""
+xlwings implementation for value snapshots
+Loads a sheet's values (and which cells hold formulas) in one bulk read of its
+used range, and re-reads the written cells whose stored value is unknown
+"""
+
+import time
+import logging
+from typing import Dict, Any
+
+from ..formula.parser import split_range
+from ..metrics import METRICS
+from ..snapshot import SNAPSHOT_MAX_CELLS, SheetValues
+
+logger = logging.getLogger(__name__)
+
+
+def load_sheet_values_xlw_with_wb(wb, sheet_name: str, read_token: Any) -> Dict[str, Any]:
+    """Session-based bulk read of a sheet's used range into SheetValues.
+
+    Args:
+        wb: Workbook object from session
+        sheet_name: Sheet name
+        read_token: Session read token the formula values belong to
+
+    Returns:
+        Dict with "sheet" (None, without reading values, when the sheet is too
+        large to keep), or an error
+    """
+    try:
+        if sheet_name not in [s.name for s in wb.sheets]:
+            return {"error": f"Sheet '{sheet_name}' not found"}
+
+        started = time.perf_counter()
+        used = wb.sheets[sheet_name].used_range
+        # One call for the bounds, so an oversize sheet is never transferred
+        _, top, left, bottom, right = split_range(used.address)
+        width = right - left + 1
+        if (bottom - top + 1) * width > SNAPSHOT_MAX_CELLS:
+            return {"sheet": None}
+        rows = used.options(ndim=2).value
+        formula_grid = used.formula
+        if isinstance(formula_grid, str):
+            formula_grid = ((formula_grid,),)
+
+        # Formula cells, and cells showing a value without one (spilled dynamic arrays)
+        formulas = frozenset(
+            (top + i, left + j)
+            for i, line in enumerate(formula_grid)
+            for j, text in enumerate(line)
+            if (isinstance(text, str) and text.startswith("=")) or (text == "" and rows[i][j] is not None)
+        )
+        read_ms = round((time.perf_counter() - started) * 1000, 1)
+        METRICS.add_cells(len(rows) * width)
+        logger.info("Snapshot of %s: %s rows x %s columns (%s formula cells) in %sms", sheet_name, len(rows), width, len(formulas), read_ms)
+        return {"sheet": SheetValues(sheet_name, top, left, width, [list(row) for row in rows],
+                                     formulas=formulas, loaded_token=read_token)}
+
+    except Exception as e:
+        logger.error("xlwings snapshot read failed: %s", e)
+        return {"error": f"Failed to read sheet: {str(e)}"}
+
+
+def refresh_sheet_values_xlw_with_wb(wb, sheet: SheetValues) -> Dict[str, Any]:
+    """Session-based re-read of the block holding a snapshot's unsettled cells.
+
+    Returns:
+        Dict with the refreshed "sheet", or an error
+    """
+    bounds = sheet.unsettled_bounds()
+    if bounds is None:
+        return {"sheet": sheet}
+    try:
+        r1, c1, r2, c2 = bounds
+        grid = wb.sheets[sheet.name].range((r1, c1), (r2, c2)).options(ndim=2).value
+        METRICS.add_cells((r2 - r1 + 1) * (c2 - c1 + 1))
+        return {"sheet": sheet.refreshed(r1, c1, [list(row) for row in grid])}
+
+    except Exception as e:
+        logger.error("xlwings snapshot refresh failed: %s", e)
+        return {"error": f"Failed to read range: {str(e)}"}
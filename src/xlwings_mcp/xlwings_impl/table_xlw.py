@@ -0,0 +1,232 @@
+"""
+xlwings implementation for Excel table (ListObject) reads and appends
+Tables are resolved by name from a per-session inventory instead of by address
+"""
+
+import logging
+from typing import Dict, Any, List, Optional
+
+from .helpers import ExcelHelper
+from ..metrics import METRICS
+
+logger = logging.getLogger(__name__)
+
+
+def _as_row(values: Any) -> List[Any]:
+    if isinstance(values, list):
+        return values
+    return [values]
+
+
+def build_table_inventory_xlw_with_wb(wb) -> Dict[str, Dict[str, Any]]:
+    """Map every table in the workbook (lower-cased name) to its name and sheet.
+
+    Args:
+        wb: Workbook object from session
+
+    Returns:
+        Dict of lower-cased table name -> {"name", "sheet"}
+    """
+    inventory = {}
+    for ws in wb.sheets:
+        for table in ws.tables:
+            inventory[table.name.lower()] = {"name": table.name, "sheet": ws.name}
+    return inventory
+
+
+def resolve_table_xlw_with_wb(wb, table_name: str, inventory: Optional[Dict[str, Dict[str, Any]]] = None):
+    """Find a table by name using the inventory, rescanning once if it is out of date.
+
+    Args:
+        wb: Workbook object from session
+        table_name: Table name (case-insensitive)
+        inventory: Session inventory to consult and refresh in place (optional)
+
+    Returns:
+        xlwings Table object, or None if no such table exists
+    """
+    if inventory is None:
+        inventory = {}
+    for attempt in range(2):
+        entry = inventory.get(table_name.lower())
+        if entry is not None:
+            try:
+                return wb.sheets[entry["sheet"]].tables[entry["name"]]
+            except Exception:
+                pass  # renamed or deleted outside the inventory
+        if attempt == 0:
+            inventory.clear()
+            inventory.update(build_table_inventory_xlw_with_wb(wb))
+    return None
+
+
+def read_table_xlw_with_wb(
+    wb,
+    table_name: str,
+    columns: Optional[List[str]] = None,
+    inventory: Optional[Dict[str, Dict[str, Any]]] = None
+) -> Dict[str, Any]:
+    """Session-based read of a table's header and DataBodyRange.
+
+    Args:
+        wb: Workbook object from session
+        table_name: Table name
+        columns: Header names to return (default: all)
+        inventory: Session table inventory
+
+    Returns:
+        Dict with column names, data rows and table location, or an error
+    """
+    try:
+        table = resolve_table_xlw_with_wb(wb, table_name, inventory)
+        if table is None:
+            return {"error": f"Table '{table_name}' not found"}
+
+        header_range = table.header_row_range
+        headers = _as_row(header_range.value) if header_range is not None else []
+        body = table.data_body_range
+        rows = body.options(ndim=2).value if body is not None else []
+
+        if columns:
+            lookup = {str(name).strip().lower(): i for i, name in enumerate(headers)}
+            missing = [name for name in columns if str(name).strip().lower() not in lookup]
+            if missing:
+                return {"error": f"Columns not in table '{table.name}': {', '.join(missing)}. Available: {', '.join(map(str, headers))}"}
+            picked = [lookup[str(name).strip().lower()] for name in columns]
+            headers = [headers[i] for i in picked]
+            rows = [[row[i] for i in picked] for row in rows]
+
+        METRICS.add_cells(len(rows) * len(headers))
+        return {
+            "table": table.name,
+            "sheet": table.parent.name,
+            "range": table.range.address.replace("$", ""),
+            "columns": headers,
+            "rows": rows,
+            "row_count": len(rows)
+        }
+
+    except Exception as e:
+        logger.error("xlwings table read failed: %s", e)
+        return {"error": f"Failed to read table: {str(e)}"}
+
+
+def append_table_rows_xlw_with_wb(
+    wb,
+    table_name: str,
+    rows: List[Any],
+    inventory: Optional[Dict[str, Dict[str, Any]]] = None
+) -> Dict[str, Any]:
+    """Session-based append of rows to the bottom of a table.
+
+    The table is resized once and the new values are written in one
+    assignment per run of input columns. Calculated columns (columns whose
+    last row holds a formula) are not written; they are filled with the
+    column formula in a single assignment.
+
+    Args:
+        wb: Workbook object from session
+        table_name: Table name
+        rows: Rows as lists in table column order, or dicts keyed by header name
+        inventory: Session table inventory
+
+    Returns:
+        Dict with the appended range, or an error
+    """
+    try:
+        if not rows:
+            return {"error": "No rows to append"}
+
+        table = resolve_table_xlw_with_wb(wb, table_name, inventory)
+        if table is None:
+            return {"error": f"Table '{table_name}' not found"}
+
+        if table.show_totals:
+            return {"error": f"Table '{table.name}' shows a totals row; hide it before appending"}
+
+        ws = table.parent
+        header_range = table.header_row_range
+        headers = [str(name) for name in _as_row(header_range.value)] if header_range is not None else []
+        width = table.range.columns.count
+        lo = table.api
+        existing = lo.ListRows.Count
+        body = table.data_body_range
+
+        # Calculated columns: formulas in the last data row, kept in R1C1 so they are row-independent
+        formulas_r1c1 = [None] * width
+        if existing and body is not None:
+            last_row = body[body.rows.count - 1, :]
+            raw = last_row.api.FormulaR1C1
+            raw = list(raw[0]) if isinstance(raw, tuple) else [raw]
+            formulas_r1c1 = [f if isinstance(f, str) and f.startswith("=") else None for f in raw]
+        calculated = [i for i, f in enumerate(formulas_r1c1) if f]
+
+        # Normalize input rows to full-width lists
+        lookup = {name.strip().lower(): i for i, name in enumerate(headers)}
+        matrix = []
+        for row in rows:
+            if isinstance(row, dict):
+                unknown = [key for key in row if str(key).strip().lower() not in lookup]
+                if unknown:
+                    return {"error": f"Columns not in table '{table.name}': {', '.join(map(str, unknown))}"}
+                line = [None] * width
+                for key, value in row.items():
+                    line[lookup[str(key).strip().lower()]] = value
+            else:
+                line = list(row) if isinstance(row, (list, tuple)) else [row]
+                if len(line) > width:
+                    return {"error": f"Row has {len(line)} values but table '{table.name}' has {width} columns"}
+                line += [None] * (width - len(line))
+            matrix.append(line)
+
+        count = len(matrix)
+        # An empty table keeps one blank insert row, which the first new row fills
+        first_new = (body.row + existing) if existing else table.range.row + 1
+        reuse_insert_row = 0 if existing else 1
+        below = ws.range((first_new + reuse_insert_row, table.range.column),
+                         (first_new + count - 1, table.range.column + width - 1)) if count > reuse_insert_row else None
+        if below is not None and any(v is not None for line in below.options(ndim=2).value for v in line):
+            return {"error": f"Cells below table '{table.name}' ({below.address.replace('$', '')}) are not empty"}
+
+        with ExcelHelper.calc_state_context(wb) as calc:
+            # One resize for all rows
+            header_row = table.range.row
+            new_last_row = first_new + count - 1
+            table.resize(ws.range((header_row, table.range.column), (new_last_row, table.range.column + width - 1)))
+
+            # One value assignment per contiguous run of input (non-calculated) columns
+            start = 0
+            while start < width:
+                if start in calculated:
+                    start += 1
+                    continue
+                end = start
+                while end + 1 < width and end + 1 not in calculated:
+                    end += 1
+                block = [line[start:end + 1] for line in matrix]
+                ws.range((first_new, table.range.column + start)).value = block
+                start = end + 1
+
+            # Calculated columns: one fill per column unless Excel already extended it
+            for i in calculated:
+                target = ws.range((first_new, table.range.column + i), (new_last_row, table.range.column + i))
+                if target.api.HasFormula is not True:
+                    target.api.FormulaR1C1 = formulas_r1c1[i]
+
+        wb.save()
+
+        METRICS.add_cells(count * width)
+        appended = ws.range((first_new, table.range.column), (new_last_row, table.range.column + width - 1))
+        return {
+            "message": f"Appended {count} rows to table '{table.name}'",
+            "table": table.name,
+            "sheet": ws.name,
+            "range": appended.address.replace("$", ""),
+            "rows_added": count,
+            "calculated_columns": [headers[i] for i in calculated if i < len(headers)],
+            "calc_ms": round(calc.calc_ms, 1)
+        }
+
+    except Exception as e:
+        logger.error("xlwings table append failed: %s", e)
+        return {"error": f"Failed to append rows: {str(e)}"}
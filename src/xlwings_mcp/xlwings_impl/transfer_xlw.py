@@ -0,0 +1,177 @@
+"""
+xlwings implementation for copying between workbooks
+Native Range.Copy / Worksheet.Copy when both workbooks share an Excel instance,
+otherwise one bulk read of the source and one bulk write to the target
+"""
+
+import time
+import logging
+from typing import Dict, Any, List, Optional
+
+from .helpers import ExcelHelper
+from ..formula.parser import cell_address
+from ..metrics import METRICS
+
+logger = logging.getLogger(__name__)
+
+
+def _copied_sheet(wb, before: List[str]) -> Optional[str]:
+    """Name of the sheet that appeared in wb since the names in before were listed"""
+    for name in [sheet.name for sheet in wb.sheets]:
+        if name not in before:
+            return name
+    return None
+
+
+def read_values_xlw_with_wb(wb, sheet_name: str, source_range: Optional[str] = None) -> Dict[str, Any]:
+    """Session-based bulk read of a range (or a sheet's used range) for transfer.
+
+    Args:
+        wb: Workbook object from session
+        sheet_name: Source sheet
+        source_range: Range to read (e.g., "A1:F500"); the used range if omitted
+
+    Returns:
+        Dict with sheet, top, left and a 2D list of values, or an error
+    """
+    try:
+        if sheet_name not in [s.name for s in wb.sheets]:
+            return {"error": f"Source sheet '{sheet_name}' not found"}
+
+        ws = wb.sheets[sheet_name]
+        started = time.perf_counter()
+        rng = ws.range(source_range) if source_range else ws.used_range
+        values = rng.options(ndim=2).value
+        read_ms = round((time.perf_counter() - started) * 1000, 1)
+
+        cells = len(values) * (len(values[0]) if values else 0)
+        METRICS.add_cells(cells)
+        logger.info("Read %s!%s for transfer: %s cells in %sms", sheet_name, rng.address, cells, read_ms)
+        return {
+            "sheet": sheet_name,
+            "top": rng.row,
+            "left": rng.column,
+            "values": values,
+            "whole_sheet": not source_range,
+            "read_ms": read_ms
+        }
+
+    except Exception as e:
+        logger.error("xlwings transfer read failed: %s", e)
+        return {"error": f"Failed to read source: {str(e)}"}
+
+
+def write_values_xlw_with_wb(
+    wb,
+    sheet_name: str,
+    values: List[List[Any]],
+    start_cell: str,
+    new_sheet: bool = False
+) -> Dict[str, Any]:
+    """Session-based bulk write of transferred values in one assignment.
+
+    Args:
+        wb: Workbook object from session
+        sheet_name: Target sheet, created if missing
+        values: 2D list of values
+        start_cell: Top-left target cell
+        new_sheet: The sheet must not exist yet (whole-sheet copies)
+
+    Returns:
+        Dict with the written range and whether the sheet was created, or an error
+    """
+    try:
+        sheet_names = [s.name for s in wb.sheets]
+        if new_sheet and sheet_name in sheet_names:
+            return {"error": f"Target sheet '{sheet_name}' already exists"}
+        created = sheet_name not in sheet_names
+        if created:
+            wb.sheets.add(sheet_name, after=wb.sheets[len(sheet_names) - 1])
+
+        ws = wb.sheets[sheet_name]
+        with ExcelHelper.calc_state_context(wb) as calc:
+            rng = ws.range(start_cell)
+            rng.value = values
+
+        wb.save()
+
+        rows, cols = len(values), len(values[0]) if values else 0
+        written = rng.resize(max(rows, 1), max(cols, 1)).address.replace("$", "")
+        METRICS.add_cells(rows * cols)
+        return {
+            "range": written,
+            "cells": rows * cols,
+            "created": created,
+            "calc_ms": round(calc.calc_ms, 1)
+        }
+
+    except Exception as e:
+        logger.error("xlwings transfer write failed: %s", e)
+        return {"error": f"Failed to write target: {str(e)}"}
+
+
+def copy_native_xlw_with_wb(
+    source_wb,
+    target_wb,
+    source_sheet: str,
+    target_sheet: str,
+    source_range: Optional[str] = None,
+    target_start: Optional[str] = None
+) -> Dict[str, Any]:
+    """Session-based Range.Copy / Worksheet.Copy between workbooks of one Excel instance.
+
+    Values, formulas and formatting are copied by Excel itself.
+
+    Args:
+        source_wb: Source workbook object
+        target_wb: Target workbook object (may be source_wb)
+        source_sheet: Source sheet
+        target_sheet: Target sheet; created for range copies, must not exist for sheet copies
+        source_range: Range to copy; the whole sheet if omitted
+        target_start: Top-left target cell for range copies (defaults to the source position)
+
+    Returns:
+        Dict with the target range or sheet and whether the sheet was created, or an error
+    """
+    try:
+        if source_sheet not in [s.name for s in source_wb.sheets]:
+            return {"error": f"Source sheet '{source_sheet}' not found"}
+        source = source_wb.sheets[source_sheet]
+        target_names = [s.name for s in target_wb.sheets]
+
+        if not source_range:
+            if target_sheet in target_names:
+                return {"error": f"Target sheet '{target_sheet}' already exists"}
+            source.api.Copy(After=target_wb.sheets[len(target_names) - 1].api)
+            copied = _copied_sheet(target_wb, target_names)
+            if copied is None:
+                return {"error": "Excel did not create the copied sheet"}
+            if copied != target_sheet:
+                target_wb.sheets[copied].name = target_sheet
+            target_wb.save()
+            return {"sheet": target_sheet, "created": True}
+
+        created = target_sheet not in target_names
+        if created:
+            target_wb.sheets.add(target_sheet, after=target_wb.sheets[len(target_names) - 1])
+        rng = source.range(source_range)
+        rows, cols = rng.shape
+        if not target_start:
+            target_start = cell_address(rng.row, rng.column)
+        destination = target_wb.sheets[target_sheet].range(target_start)
+        with ExcelHelper.calc_state_context(target_wb) as calc:
+            rng.copy(destination=destination)
+
+        target_wb.save()
+
+        METRICS.add_cells(rows * cols)
+        return {
+            "range": destination.resize(rows, cols).address.replace("$", ""),
+            "cells": rows * cols,
+            "created": created,
+            "calc_ms": round(calc.calc_ms, 1)
+        }
+
+    except Exception as e:
+        logger.error("xlwings native copy failed: %s", e)
+        return {"error": f"Failed to copy: {str(e)}"}
@@ -33,7 +33,7 @@ def get_data_validation_info_xlw(
     wb = None
     
     try:
-        logger.info(f"🔍 Getting data validation info for {sheet_name}")
+        logger.info("🔍 Getting data validation info for %s", sheet_name)
         
         # Check if file exists
         if not os.path.exists(filepath):
@@ -157,7 +157,7 @@ def get_data_validation_info_xlw(
                             continue
                 
         except Exception as e:
-            logger.warning(f"Error scanning for validation rules: {e}")
+            logger.warning("Error scanning for validation rules: %s", e)
         
         # Return validation information
         result = {
@@ -166,11 +166,11 @@ def get_data_validation_info_xlw(
             "validation_rules": validation_rules
         }
         
-        logger.info(f"✅ Found {len(validation_rules)} validation rules in {sheet_name}")
+        logger.info("✅ Found %s validation rules in %s", len(validation_rules), sheet_name)
         return result
         
     except Exception as e:
-        logger.error(f"Error getting validation info: {e}")
+        logger.error("Error getting validation info: %s", e)
         return {"error": str(e)}
         
     finally:
@@ -247,7 +247,7 @@ def validate_excel_range_xlw(
     wb = None
     
     try:
-        logger.info(f"🔍 Validating range {start_cell}:{end_cell or start_cell} in {sheet_name}")
+        logger.info("🔍 Validating range %s:%s in %s", start_cell, end_cell or start_cell, sheet_name)
         
         # Check if file exists
         if not os.path.exists(filepath):
@@ -296,7 +296,7 @@ def validate_excel_range_xlw(
             else:
                 range_info["non_empty_cells"] = 0
             
-            logger.info(f"✅ Range validation successful: {range_obj.address}")
+            logger.info("✅ Range validation successful: %s", range_obj.address)
             return range_info
             
         except Exception as range_error:
@@ -309,7 +309,7 @@ def validate_excel_range_xlw(
             }
         
     except Exception as e:
-        logger.error(f"Error validating range: {e}")
+        logger.error("Error validating range: %s", e)
         return {"error": str(e), "valid": False}
         
     finally:
@@ -333,7 +333,7 @@ def get_data_validation_info_xlw_with_wb(
         Dict containing all validation rules in the worksheet
     """
     try:
-        logger.info(f"🔍 Getting data validation info for {sheet_name}")
+        logger.info("🔍 Getting data validation info for %s", sheet_name)
         
         # Check if sheet exists
         sheet_names = [s.name for s in wb.sheets]
@@ -449,7 +449,7 @@ def get_data_validation_info_xlw_with_wb(
                             continue
                 
         except Exception as e:
-            logger.warning(f"Error scanning for validation rules: {e}")
+            logger.warning("Error scanning for validation rules: %s", e)
         
         # Return validation information
         result = {
@@ -458,11 +458,11 @@ def get_data_validation_info_xlw_with_wb(
             "validation_rules": validation_rules
         }
         
-        logger.info(f"✅ Found {len(validation_rules)} validation rules in {sheet_name}")
+        logger.info("✅ Found %s validation rules in %s", len(validation_rules), sheet_name)
         return result
         
     except Exception as e:
-        logger.error(f"Error getting validation info: {e}")
+        logger.error("Error getting validation info: %s", e)
         return {"error": str(e)}
 
 
@@ -485,7 +485,7 @@ def validate_excel_range_xlw_with_wb(
         Dict containing validation result and range information
     """
     try:
-        logger.info(f"🔍 Validating range {start_cell}:{end_cell or start_cell} in {sheet_name}")
+        logger.info("🔍 Validating range %s:%s in %s", start_cell, end_cell or start_cell, sheet_name)
         
         # Check if sheet exists
         sheet_names = [s.name for s in wb.sheets]
@@ -526,7 +526,7 @@ def validate_excel_range_xlw_with_wb(
             else:
                 range_info["non_empty_cells"] = 0
             
-            logger.info(f"✅ Range validation successful: {range_obj.address}")
+            logger.info("✅ Range validation successful: %s", range_obj.address)
             return range_info
             
         except Exception as range_error:
@@ -539,5 +539,5 @@ def validate_excel_range_xlw_with_wb(
             }
         
     except Exception as e:
-        logger.error(f"Error validating range: {e}")
+        logger.error("Error validating range: %s", e)
         return {"error": str(e), "valid": False}
@@ -66,7 +66,7 @@ def get_workbook_metadata_xlw(
                     metadata["last_saved_by"] = None
                     
             except Exception as e:
-                logger.debug(f"워크북 속성 읽기 부분적 실패: {e}")
+                logger.debug("워크북 속성 읽기 부분적 실패: %s", e)
             
             # 활성 시트 정보
             if wb.sheets:
@@ -111,7 +111,7 @@ def get_workbook_metadata_xlw(
                             sheet_info[sheet.name]["protected"] = False
                             
                     except Exception as e:
-                        logger.warning(f"시트 '{sheet.name}' 정보 수집 실패: {e}")
+                        logger.warning("시트 '%s' 정보 수집 실패: %s", sheet.name, e)
                         sheet_info[sheet.name] = {"error": str(e)}
                 
                 metadata["sheet_info"] = sheet_info
@@ -119,7 +119,7 @@ def get_workbook_metadata_xlw(
             return metadata
         
     except Exception as e:
-        logger.error(f"xlwings 워크북 메타데이터 조회 실패: {e}")
+        logger.error("xlwings 워크북 메타데이터 조회 실패: %s", e)
         return {"error": f"Failed to get workbook metadata: {str(e)}"}
 
 def create_workbook_xlw(
@@ -150,7 +150,7 @@ def create_workbook_xlw(
             }
         
     except Exception as e:
-        logger.error(f"xlwings 워크북 생성 실패: {e}")
+        logger.error("xlwings 워크북 생성 실패: %s", e)
         return {"error": f"Failed to create workbook: {str(e)}"}
 
 def get_sheet_list_xlw(filepath: str) -> Dict[str, Any]:
@@ -200,7 +200,7 @@ def get_sheet_list_xlw(filepath: str) -> Dict[str, Any]:
         }
         
     except Exception as e:
-        logger.error(f"xlwings 시트 목록 조회 실패: {e}")
+        logger.error("xlwings 시트 목록 조회 실패: %s", e)
         return {"error": f"Failed to get sheet list: {str(e)}"}
         
     finally:
@@ -209,13 +209,13 @@ def get_sheet_list_xlw(filepath: str) -> Dict[str, Any]:
             try:
                 wb.close()
             except Exception as e:
-                logger.warning(f"워크북 닫기 실패: {e}")
+                logger.warning("워크북 닫기 실패: %s", e)
         
         if app:
             try:
                 app.quit()
             except Exception as e:
-                logger.warning(f"Excel 앱 종료 실패: {e}")
+                logger.warning("Excel 앱 종료 실패: %s", e)
 
 def create_workbook_xlw_with_wb(wb, sheet_name: Optional[str] = None) -> Dict[str, Any]:
     """Session-based version using existing workbook object.
@@ -248,7 +248,7 @@ def create_workbook_xlw_with_wb(wb, sheet_name: Optional[str] = None) -> Dict[st
         }
         
     except Exception as e:
-        logger.error(f"xlwings 워크북 설정 실패: {e}")
+        logger.error("xlwings 워크북 설정 실패: %s", e)
         return {"error": f"Failed to configure workbook: {str(e)}"}
 
 def get_workbook_metadata_xlw_with_wb(
@@ -295,7 +295,7 @@ def get_workbook_metadata_xlw_with_wb(
                 metadata["last_saved_by"] = None
                 
         except Exception as e:
-            logger.debug(f"워크북 속성 읽기 부분적 실패: {e}")
+            logger.debug("워크북 속성 읽기 부분적 실패: %s", e)
         
         # 활성 시트 정보
         if wb.sheets:
@@ -340,7 +340,7 @@ def get_workbook_metadata_xlw_with_wb(
                         sheet_info[sheet.name]["protected"] = False
                         
                 except Exception as e:
-                    logger.warning(f"시트 '{sheet.name}' 정보 수집 실패: {e}")
+                    logger.warning("시트 '%s' 정보 수집 실패: %s", sheet.name, e)
                     sheet_info[sheet.name] = {"error": str(e)}
             
             metadata["sheet_info"] = sheet_info
@@ -348,5 +348,5 @@ def get_workbook_metadata_xlw_with_wb(
         return metadata
     
     except Exception as e:
-        logger.error(f"xlwings 워크북 메타데이터 조회 실패: {e}")
-        return {"error": f"Failed to get workbook metadata: {str(e)}"}
\ No newline at end of file
+        logger.error("xlwings 워크북 메타데이터 조회 실패: %s", e)
+        return {"error": f"Failed to get workbook metadata: {str(e)}"}
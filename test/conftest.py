@@ -0,0 +1,43 @@
+"""
+Shared setup for the test suite: import the package from src/ and the
+simulated Excel backend from benchmarks/, so tests run without Excel.
+"""
+
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+
+@pytest.fixture
+def sim_server(monkeypatch):
+    """The server module with xlwings.App replaced by the simulated backend;
+    sessions opened through it are closed after the test."""
+    import xlwings as xw
+    from simulated_excel import Backend, SimApp
+
+    monkeypatch.setattr(SimApp, "backend", Backend(latency_us=0, cell_ns=0))
+    monkeypatch.setattr(xw, "App", SimApp)
+    from xlwings_mcp import server
+    from xlwings_mcp.session import SESSION_MANAGER
+
+    before = {info["session_id"] for info in SESSION_MANAGER.list_sessions()}
+    yield server
+    for info in SESSION_MANAGER.list_sessions():
+        if info["session_id"] not in before:
+            SESSION_MANAGER.close_workbook(info["session_id"], save=False)
+
+
+@pytest.fixture
+def open_session(sim_server, tmp_path):
+    """Open a simulated workbook; returns (session_id, session)."""
+    from xlwings_mcp.session import SESSION_MANAGER
+
+    def open_(name="book.xlsx"):
+        session_id = sim_server.open_workbook(filepath=str(tmp_path / name))["session_id"]
+        return session_id, SESSION_MANAGER.get_session(session_id)
+    return open_
@@ -0,0 +1,32 @@
+"""Recalculation done by formula writes, per session calculation mode."""
+
+import json
+
+import pytest
+
+
+@pytest.mark.parametrize("mode, calculations", [("automatic", 0), ("manual", 1), ("deferred", 1)])
+def test_apply_formulas_recalculates_once(sim_server, open_session, mode, calculations):
+    session_id, session = open_session()
+    backend = session.workbook.sheets._items[0].backend
+    assert "Error" not in sim_server.set_calculation_mode(session_id, mode)
+
+    backend.reset()
+    backend.latency_us = 2000
+    result = json.loads(sim_server.apply_formulas(session_id, "Sheet1", "B1:B10", formula="=A1*2"))
+    backend.latency_us = 0
+    # Restoring automatic mode recalculates; an explicit Calculate is only needed in manual mode
+    assert backend.calls["Range.Calculate()"] == calculations
+    if calculations:
+        assert result["calc_ms"] >= 2
+
+
+@pytest.mark.parametrize("mode, calculations", [("automatic", 0), ("manual", 1), ("deferred", 1)])
+def test_apply_formula_recalculates_once(sim_server, open_session, mode, calculations):
+    session_id, session = open_session()
+    backend = session.workbook.sheets._items[0].backend
+    assert "Error" not in sim_server.set_calculation_mode(session_id, mode)
+
+    backend.reset()
+    assert "Error" not in sim_server.apply_formula(session_id, "Sheet1", "B1", "=A1*2")
+    assert backend.calls["Range.Calculate()"] == calculations
@@ -0,0 +1,58 @@
+"""Grid layout of create_charts on the simulated backend."""
+
+import json
+
+
+def test_grid_skips_charts_with_explicit_targets(sim_server, open_session):
+    session_id, _ = open_session()
+    result = json.loads(sim_server.create_charts(session_id, "Sheet1", [
+        {"data_range": "A1:B3", "chart_type": "line"},
+        {"data_range": "A1:B3", "chart_type": "bar", "target_cell": "Z50"},
+        {"data_range": "A1:B3", "chart_type": "pie"},
+        {"data_range": "A1:B3", "chart_type": "column"},
+    ], anchor_cell="D1", columns=2, chart_width=100, chart_height=50))
+
+    positions = [(chart["index"], chart["left"], chart["top"]) for chart in result["charts"]]
+    origin_left = positions[0][1]
+    assert positions[0] == (0, origin_left, 0)
+    # The pie takes the second grid slot, the column chart wraps to the next row
+    assert positions[2] == (2, origin_left + 112, 0)
+    assert positions[3] == (3, origin_left, 62)
+
+
+def fail_on(monkeypatch, backend, op):
+    """Make the first COM access named op raise, as Excel would."""
+    hit = backend.hit
+    failed = []
+
+    def failing(name, cells=0):
+        if name == op and not failed:
+            failed.append(name)
+            raise RuntimeError(f"{op} failed")
+        hit(name, cells)
+    monkeypatch.setattr(backend, "hit", failing)
+
+
+def test_failed_chart_is_deleted_and_frees_its_grid_slot(sim_server, open_session, monkeypatch):
+    session_id, session = open_session()
+    backend = session.workbook.sheets._items[0].backend
+    fail_on(monkeypatch, backend, "Chart.ChartType=")
+    backend.reset()
+    result = json.loads(sim_server.create_charts(session_id, "Sheet1", [
+        {"data_range": "A1:B3", "chart_type": "line"},
+        {"data_range": "A1:B3", "chart_type": "bar"},
+    ], anchor_cell="D1", columns=2, chart_width=100, chart_height=50))
+
+    assert [error["index"] for error in result["errors"]] == [0]
+    assert backend.calls["Add.Delete"] == 1
+    assert [(chart["index"], chart["top"]) for chart in result["charts"]] == [(1, 0)]
+    assert result["charts"][0]["left"] == session.workbook.sheets._items[0].range("D1").left
+
+
+def test_chart_title_failure_is_not_fatal(sim_server, open_session, monkeypatch):
+    session_id, session = open_session()
+    backend = session.workbook.sheets._items[0].backend
+    fail_on(monkeypatch, backend, "ChartTitle.Text=")
+    message = sim_server.create_chart("Sheet1", "A1:B3", "line", "D1", session_id=session_id, title="Sales")
+    assert not message.startswith("Error")
+    assert "Add.Delete" not in backend.calls
@@ -0,0 +1,153 @@
+"""Parser, function library and incremental recalculation of the offline formula engine."""
+
+import pytest
+
+from xlwings_mcp.exceptions import FormulaParseError
+from xlwings_mcp.formula import FormulaEngine, parse, shift_formula, split_range
+from xlwings_mcp.formula.parser import Binary, Literal, Ref, Unary
+
+
+def make_engine():
+    engine = FormulaEngine()
+    rows = [["Name", "Qty"], ["a", 1], ["b", 2], ["c", 3]]
+    for r, row in enumerate(rows, 1):
+        for c, value in enumerate(row, 1):
+            engine.load_value("Data", r, c, value)
+    engine.add_sheet("Calc")
+    return engine
+
+
+# Parser ---------------------------------------------------------------------
+
+def test_parse_precedence():
+    assert parse("=1+2*3") == Binary("+", Literal(1), Binary("*", Literal(2), Literal(3)))
+    # Unary minus binds tighter than ^, as in Excel (=-2^2 is 4)
+    assert parse("=-A1^2") == Binary("^", Unary("-", Ref(None, 1, 1, 1, 1)), Literal(2))
+
+
+@pytest.mark.parametrize("formula", ["=SUM(1,", "=1+", "=(1"])
+def test_parse_errors(formula):
+    with pytest.raises(FormulaParseError):
+        parse(formula)
+
+
+def test_split_range():
+    assert split_range("'My Sheet'!b2:a1") == ("My Sheet", 1, 1, 2, 2)
+    assert split_range("A:C") == (None, 1, 1, 1048576, 3)
+    assert split_range("2:3") == (None, 2, 1, 3, 16384)
+
+
+def test_shift_formula_keeps_absolute_parts():
+    assert shift_formula("=A1+$B$2+C$3+Sheet2!D4", 2, 1) == "=B3+$B$2+D$3+Sheet2!E6"
+
+
+# Functions ------------------------------------------------------------------
+
+@pytest.mark.parametrize("formula, expected", [
+    ("=1+2*3^2", 19),
+    ("=-2^2", 4),
+    ("=2&3", "23"),
+    ("=50%", 0.5),
+    ("={1,2;3,4}", [[1, 2], [3, 4]]),
+    ('="A"="a"', True),
+    ("=ROUND(2.5,0)", 3),
+    ("=ROUND(-2.5,0)", -3),
+    ("=SUM(Data!B:B)", 6),
+    ('=SUMIFS(Data!B2:B4,Data!A2:A4,"<>b")', 4),
+    ('=COUNTIF(Data!B2:B4,">1")', 2),
+    ('=VLOOKUP("b",Data!A1:B4,2,FALSE)', 2),
+    ('=XLOOKUP("b",Data!A2:A4,Data!B2:B4)', 2),
+    ('=XLOOKUP("z",Data!A2:A4,Data!B2:B4,"none")', "none"),
+    ("=INDEX(Data!A1:B4,3,2)", 2),
+    ('=MATCH("c",Data!A1:A4,0)', 4),
+    ("=MATCH(2.5,Data!B2:B4,1)", 2),
+    ('=INDEX(Data!B2:B4,MATCH("c",Data!A2:A4,0))', 3),
+])
+def test_functions(formula, expected):
+    assert make_engine().evaluate(formula, "Calc") == expected
+
+
+@pytest.mark.parametrize("formula, expected", [
+    ("=1/0", "#DIV/0!"),
+    ("=1/0+1", "#DIV/0!"),
+    ("=NA()+1", "#N/A"),
+    ('="a"+1', "#VALUE!"),
+    ('=XLOOKUP("z",Data!A2:A4,Data!B2:B4)', "#N/A"),
+    ("=FOO(1)", "#NAME?"),
+    ("=Nope!A1", "#REF!"),
+    ("=IFERROR(1/0,7)", 7),
+])
+def test_error_propagation(formula, expected):
+    assert make_engine().evaluate(formula, "Calc") == expected
+
+
+@pytest.mark.parametrize("formula, expected", [
+    ("=DATE(2024,1,1)", 45292),
+    # Serials after the fictitious 1900-02-29 are shifted by one
+    ("=DATE(1900,3,1)", 61),
+    ("=DATE(1900,2,28)", 59),
+    ("=YEAR(45292)", 2024),
+    ("=MONTH(DATE(2024,14,1))", 2),
+    ('=TEXT(45292,"yyyy-mm-dd")', "2024-01-01"),
+])
+def test_date_serials(formula, expected):
+    assert make_engine().evaluate(formula, "Calc") == expected
+
+
+# Recalculation --------------------------------------------------------------
+
+def test_incremental_recalc_across_sheets():
+    engine = make_engine()
+    engine.load_formula("Calc", 1, 1, "=SUM(Data!B2:B4)")
+    engine.load_formula("Calc", 2, 1, "=A1*10")
+    engine.load_formula("Calc", 3, 1, '=XLOOKUP("c",Data!A2:A4,Data!B2:B4)')
+    engine.load_formula("Calc", 4, 1, "=LEN(Data!A1)")
+    engine.recalculate()
+    assert engine.get_value("Calc", "A2") == 60
+
+    # LEN(Data!A1) does not read column B, so it is left alone
+    recalculated = engine.set_value("Data", "B2", 5)
+    assert sorted(recalculated) == ["Calc!A1", "Calc!A2", "Calc!A3"]
+    assert engine.get_value("Calc", "A1") == 10
+    assert engine.get_value("Calc", "A2") == 100
+
+    recalculated = engine.set_cells("Data", {"B4": 30, "A1": "Title"})
+    assert sorted(recalculated) == ["Calc!A1", "Calc!A2", "Calc!A3", "Calc!A4"]
+    assert engine.get_value("Calc", "A3") == 30
+    assert engine.get_value("Calc", "A4") == 5
+    assert not engine.dirty
+
+
+def test_dirty_ranges_compute_in_dependency_order():
+    engine = FormulaEngine()
+    for r in range(1, 201):
+        engine.load_value("S", r, 1, r)
+        engine.load_formula("S", r, 2, f"=SUM(A{r}:A{r + 2})")
+        engine.load_formula("S", r, 3, f"=SUM(B{r}:B{r + 1})+C{r + 1}" if r < 200 else "=0")
+    engine.recalculate()
+    assert engine.get_value("S", "B199") == 199 + 200
+    assert engine.get_value("S", "C199") == (199 + 200) + 200
+    assert not engine.dirty
+
+
+def test_formula_replaced_by_value():
+    engine = make_engine()
+    engine.load_formula("Calc", 1, 1, "=Data!B2*2")
+    engine.load_formula("Calc", 1, 2, "=A1+1")
+    engine.recalculate()
+    engine.set_value("Calc", "A1", 7)
+    assert engine.get_formula("Calc", "A1") is None
+    assert engine.get_value("Calc", "B1") == 8
+    # Data!B2 no longer feeds anything
+    assert engine.set_value("Data", "B2", 9) == []
+
+
+def test_circular_reference_reads_cached_value():
+    engine = FormulaEngine()
+    engine.load_formula("S", 1, 1, "=B1+1", cached=10)
+    engine.load_formula("S", 1, 2, "=A1+1", cached=20)
+    engine.recalculate()
+    # The cell closing the loop reads the other's previous value
+    values = (engine.get_value("S", "A1"), engine.get_value("S", "B1"))
+    assert values in ((21, 22), (12, 11))
+    assert not engine.dirty
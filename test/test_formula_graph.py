@@ -0,0 +1,53 @@
+"""Dependency graph edges and the dirty-cell index of the offline formula engine."""
+
+from xlwings_mcp.formula.graph import WIDE_RANGE_COLUMNS, DependencyGraph, DirtyCells
+from xlwings_mcp.formula.parser import Ref
+
+
+def test_dependents_of_points_ranges_and_wide_ranges():
+    graph = DependencyGraph()
+    graph.set_precedents(("S", 1, 5), [Ref("S", 2, 1, 2, 1)])
+    graph.set_precedents(("S", 2, 5), [Ref("S", 1, 1, 10, 2)])
+    graph.set_precedents(("S", 3, 5), [Ref("S", 4, 1, 4, WIDE_RANGE_COLUMNS + 10)])
+    graph.set_precedents(("T", 1, 1), [Ref("S", 2, 1, 2, 1)])
+
+    assert graph.dependents("S", 2, 1) == {("S", 1, 5), ("S", 2, 5), ("T", 1, 1)}
+    assert graph.dependents("S", 4, 70) == {("S", 3, 5)}
+    assert graph.dependents("S", 11, 1) == set()
+    assert graph.dependents("S", 1, 2, 3, 3) == {("S", 2, 5)}
+
+
+def test_set_precedents_replaces_and_remove_drops_edges():
+    graph = DependencyGraph()
+    graph.set_precedents(("S", 1, 5), [Ref("S", 1, 1, 1, 1)])
+    graph.set_precedents(("S", 1, 5), [Ref("S", 2, 2, 3, 2)])
+    assert graph.dependents("S", 1, 1) == set()
+    assert graph.dependents("S", 3, 2) == {("S", 1, 5)}
+    graph.remove(("S", 1, 5))
+    assert graph.dependents("S", 3, 2) == set()
+    assert ("S", 1, 5) not in graph
+
+
+def test_transitive_dependents_cross_sheets():
+    graph = DependencyGraph()
+    graph.set_precedents(("Calc", 1, 1), [Ref("Data", 1, 1, 5, 1)])
+    graph.set_precedents(("Report", 1, 1), [Ref("Calc", 1, 1, 1, 1)])
+    graph.set_precedents(("Report", 2, 1), [Ref("Report", 1, 1, 1, 1)])
+    graph.set_precedents(("Other", 1, 1), [Ref("Data", 1, 2, 1, 2)])
+    assert graph.transitive_dependents([("Data", 3, 1, 3, 1)]) == [
+        ("Calc", 1, 1), ("Report", 1, 1), ("Report", 2, 1)
+    ]
+
+
+def test_dirty_cells_in_block():
+    dirty = DirtyCells()
+    dirty.update([("S", 1, 1), ("S", 5, 1), ("S", 5, 3), ("T", 5, 1), ("S", 1000000, 2)])
+    assert sorted(dirty.in_block("S", 1, 1, 5, 2)) == [("S", 1, 1), ("S", 5, 1)]
+    # Whole-column and whole-row blocks only visit the dirty cells
+    assert dirty.in_block("S", 1, 2, 1048576, 2) == [("S", 1000000, 2)]
+    assert sorted(dirty.in_block("S", 5, 1, 5, 16384)) == [("S", 5, 1), ("S", 5, 3)]
+    dirty.discard(("S", 5, 1))
+    dirty.discard(("S", 5, 1))
+    assert ("S", 5, 1) not in dirty
+    assert dirty.in_block("S", 5, 1, 5, 1) == []
+    assert len(dirty) == 4
@@ -0,0 +1,91 @@
+"""xlsx reading and what-if evaluation of workbook files without Excel."""
+
+import zipfile
+
+import pytest
+
+from xlwings_mcp.formula import get_engine_for_file, load_workbook
+from xlwings_mcp.formula.offline import evaluate_offline
+
+_NS = 'xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"'
+_R_NS = 'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships"'
+_PKG_NS = 'xmlns="http://schemas.openxmlformats.org/package/2006/relationships"'
+
+
+def write_xlsx(path, sheets, names=()):
+    """Minimal .xlsx with inline cells: sheets is [(name, [<c> element, ...])]."""
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("xl/workbook.xml", (
+            f"<workbook {_NS} {_R_NS}><sheets>"
+            + "".join(f'<sheet name="{name}" sheetId="{n}" r:id="rId{n}"/>' for n, (name, _) in enumerate(sheets, 1))
+            + "</sheets><definedNames>"
+            + "".join(f'<definedName name="{name}">{text}</definedName>' for name, text in names)
+            + "</definedNames></workbook>"
+        ))
+        archive.writestr("xl/_rels/workbook.xml.rels", (
+            f"<Relationships {_PKG_NS}>"
+            + "".join(f'<Relationship Id="rId{n}" Target="worksheets/sheet{n}.xml"/>' for n in range(1, len(sheets) + 1))
+            + "</Relationships>"
+        ))
+        archive.writestr("xl/sharedStrings.xml", f"<sst {_NS}><si><t>North</t></si><si><r><t>So</t></r><r><t>uth</t></r></si></sst>")
+        for n, (_, cells) in enumerate(sheets, 1):
+            archive.writestr(f"xl/worksheets/sheet{n}.xml", f"<worksheet {_NS}><sheetData><row>{''.join(cells)}</row></sheetData></worksheet>")
+
+
+@pytest.fixture
+def workbook(tmp_path):
+    path = tmp_path / "model.xlsx"
+    write_xlsx(str(path), [
+        ("Data", [
+            '<c r="A1" t="s"><v>0</v></c>',
+            '<c r="A2" t="s"><v>1</v></c>',
+            '<c r="B1"><v>10</v></c>',
+            '<c r="B2"><v>2.5</v></c>',
+            '<c r="C1"><f t="shared" si="0" ref="C1:C2">B1*2</f><v>20</v></c>',
+            '<c r="C2"><f t="shared" si="0"/><v>5</v></c>',
+            '<c r="D1" t="b"><v>1</v></c>',
+            '<c r="D2" t="e"><v>#N/A</v></c>',
+        ]),
+        ("Calc", [
+            '<c r="A1"><f>SUM(Data!C1:C2)</f><v>25</v></c>',
+            '<c r="A2"><f>Rate*A1</f><v>2.5</v></c>',
+            '<c r="A3" t="inlineStr"><is><t>note</t></is></c>',
+        ]),
+    ], names=[("Rate", "Data!$B$2"), ("_xlnm.Print_Area", "Data!$A$1:$B$2")])
+    return str(path)
+
+
+def test_load_workbook(workbook):
+    engine = load_workbook(workbook)
+    assert engine.sheet_names == ["Data", "Calc"]
+    assert engine.get_value("Data", "A2") == "South"
+    assert engine.get_value("Data", "D1") is True
+    assert engine.get_value("Data", "D2") == "#N/A"
+    assert engine.get_value("Calc", "A3") == "note"
+    # The shared formula is shifted for C2
+    assert engine.get_formula("Data", "C2") == "=B2*2"
+    assert "_XLNM.PRINT_AREA" not in engine.names
+    assert engine.get_value("Calc", "A2") == 62.5
+
+
+def test_engine_cache_follows_file(workbook):
+    assert get_engine_for_file(workbook) is get_engine_for_file(workbook)
+
+
+def test_evaluate_offline_rolls_back_overrides(workbook):
+    result = evaluate_offline(workbook, "Data", formulas=["=SUM(B1:B2)"], cells=["Calc!A1", "Calc!A2"],
+                              overrides={"B1": 100, "C2": "=B2*4"})
+    assert result["formulas"] == [{"formula": "=SUM(B1:B2)", "value": 102.5}]
+    assert result["cells"] == {"Calc!A1": 210, "Calc!A2": 525}
+
+    result = evaluate_offline(workbook, "Data", cells=["B1", "C2", "Calc!A1"])
+    assert result["cells"] == {"B1": 10, "C2": 5, "Calc!A1": 25}
+    assert get_engine_for_file(workbook).get_formula("Data", "C2") == "=B2*2"
+
+
+def test_evaluate_offline_errors(workbook, tmp_path):
+    assert "error" in evaluate_offline(workbook, "Data")
+    assert "not found" in evaluate_offline(workbook, "Nope", cells=["A1"])["error"]
+    assert "File not found" in evaluate_offline(str(tmp_path / "missing.xlsx"), "Data", cells=["A1"])["error"]
+    result = evaluate_offline(workbook, "Data", formulas=["=SUM(1,"])
+    assert "error" in result["formulas"][0]
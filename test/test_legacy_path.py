@@ -0,0 +1,41 @@
+"""Deprecated filepath= tool calls served from the pooled path session."""
+
+import os
+
+import pytest
+
+from xlwings_mcp.session import SESSION_MANAGER
+
+
+@pytest.fixture
+def legacy_file(sim_server, tmp_path, monkeypatch):
+    """An existing workbook path; counts Excel launches and closes the pooled session afterwards."""
+    from simulated_excel import SimApp
+    launches = []
+    init = SimApp.__init__
+
+    def counting_init(self, *args, **kwargs):
+        launches.append(self)
+        init(self, *args, **kwargs)
+    monkeypatch.setattr(SimApp, "__init__", counting_init)
+    monkeypatch.setattr(SESSION_MANAGER, "_path_app", None)
+    path = tmp_path / "legacy.xlsx"
+    path.write_bytes(b"")
+    yield str(path), launches
+    SESSION_MANAGER.close_path_session(str(path), save=False)
+
+
+def test_second_filepath_call_reuses_the_pooled_app(sim_server, legacy_file):
+    path, launches = legacy_file
+    assert "Error" not in sim_server.insert_rows("Sheet1", 2, filepath=path, count=2)
+    session = SESSION_MANAGER._path_sessions[os.path.abspath(path)]
+    assert "Error" not in sim_server.merge_cells("Sheet1", "A1", "B1", filepath=path)
+    assert "Error" not in sim_server.get_merged_cells("Sheet1", filepath=path)
+    assert SESSION_MANAGER._path_sessions[os.path.abspath(path)] is session
+    assert len(launches) == 1
+    assert session.change_token == 2
+
+
+def test_session_id_or_filepath_is_required(sim_server):
+    assert "session_id" in sim_server.insert_rows("Sheet1", 2)
+    assert "not found" in sim_server.get_merged_cells("Sheet1", session_id="missing").lower()
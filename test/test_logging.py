@@ -0,0 +1,55 @@
+"""Overflow behaviour of the queue log handler."""
+
+import logging
+import queue
+import threading
+
+from xlwings_mcp.logging_setup import DeferredQueueHandler
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+def make_record(level, msg="message %s", args=(1,)):
+    return logging.LogRecord("test", level, __file__, 1, msg, args, None)
+
+
+def test_full_queue_drops_info_but_writes_warnings():
+    fallback = ListHandler()
+    handler = DeferredQueueHandler(queue.Queue(maxsize=1), fallback=fallback)
+    handler.handle(make_record(logging.INFO))
+    handler.handle(make_record(logging.INFO))
+    handler.handle(make_record(logging.DEBUG))
+    handler.handle(make_record(logging.WARNING, "warned %s"))
+    handler.handle(make_record(logging.ERROR, "failed %s"))
+
+    assert handler.dropped == 2
+    assert [record.getMessage() for record in fallback.records] == ["warned 1", "failed 1"]
+    assert handler.queue.qsize() == 1
+
+
+def test_full_queue_without_fallback_waits_for_room():
+    handler = DeferredQueueHandler(queue.Queue(maxsize=1))
+    handler.handle(make_record(logging.INFO))
+    drained = []
+    consumer = threading.Timer(0.05, lambda: drained.append(handler.queue.get()))
+    consumer.start()
+    handler.handle(make_record(logging.ERROR, "failed %s"))
+    consumer.join()
+
+    assert handler.dropped == 0
+    assert handler.queue.get_nowait().getMessage() == "failed 1"
+
+
+def test_mutable_arguments_are_rendered_at_call_time():
+    handler = DeferredQueueHandler(queue.Queue())
+    values = [1]
+    handler.handle(make_record(logging.INFO, "values %s", (values,)))
+    values.append(2)
+    assert handler.queue.get_nowait().getMessage() == "values [1]"
@@ -0,0 +1,33 @@
+"""create_pivot_tables on the simulated backend."""
+
+import json
+
+from xlwings_mcp.xlwings_impl import advanced_xlw_with_wb
+from simulated_excel import fill_sheet
+
+
+def test_half_built_pivot_is_removed_and_frees_its_slot(sim_server, open_session, monkeypatch):
+    session_id, session = open_session()
+    sheet = session.workbook.sheets._items[0]
+    fill_sheet(sheet, [["region", "sales"], ["north", 1.0], ["south", 2.0]])
+    configure = advanced_xlw_with_wb._configure_pivot_fields
+    calls = []
+
+    def failing_once(pivot_table, *args):
+        calls.append(pivot_table)
+        if len(calls) == 1:
+            raise RuntimeError("field setup failed")
+        return configure(pivot_table, *args)
+    monkeypatch.setattr(advanced_xlw_with_wb, "_configure_pivot_fields", failing_once)
+
+    backend = sheet.backend
+    backend.reset()
+    result = json.loads(sim_server.create_pivot_tables(session_id, "Sheet1", "A1:B3", [
+        {"rows": ["region"], "values": ["sales"]},
+        {"rows": ["region"], "values": ["sales"]},
+    ], target_sheet="Pivots"))
+
+    assert [error["index"] for error in result["errors"]] == [0]
+    assert backend.calls["TableRange2.Clear"] == 1
+    # The second pivot takes the destination the failed one gave back
+    assert [(pivot["index"], pivot["pivot_cell"]) for pivot in result["pivots"]] == [(1, "A3")]
@@ -0,0 +1,25 @@
+"""Columnar reads behind aggregate_range and query_range on the simulated backend."""
+
+import json
+
+from simulated_excel import fill_sheet
+
+
+def test_whole_column_range_reads_only_used_rows(sim_server, open_session):
+    session_id, session = open_session()
+    sheet = session.workbook.sheets._items[0]
+    fill_sheet(sheet, [["Region", "Qty"], ["North", 1], ["South", 2], ["North", 3]])
+    backend = sheet.backend
+    backend.reset()
+
+    result = json.loads(sim_server.aggregate_range(session_id, "Sheet1", ["Qty"], group_by=["Region"],
+                                                   agg_funcs=["sum"], data_range="A:D"))
+    assert result["rows"] == [["North", 4], ["South", 2]]
+    assert result["source"] == "Sheet1!A1:B4"
+    assert backend.cells < 100
+
+    result = json.loads(sim_server.query_range(session_id, "Sheet1", where=[{"column": "Qty", "op": ">", "value": 1}],
+                                               data_range="A1:XFD1048576"))
+    assert result["rows"] == [["South", 2], ["North", 3]]
+    assert result["source"] == "Sheet1!A1:B4"
+    assert backend.cells < 100
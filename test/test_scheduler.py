@@ -0,0 +1,200 @@
+"""Threaded tests of SessionScheduler: read bypass bound, queue limit, re-entry,
+internal callers and the shared-then-exclusive read path."""
+
+import threading
+import time
+
+import pytest
+
+from xlwings_mcp.exceptions import SessionBusyError
+from xlwings_mcp.metrics import BACKGROUND, METRICS
+from xlwings_mcp.scheduler import MAX_READ_BYPASS, QUEUE_LIMIT, SessionScheduler
+
+READ_TOOL = "read_data_from_excel"
+WRITE_TOOL = "write_data_to_excel"
+
+
+@pytest.fixture
+def tool(monkeypatch):
+    """Per-thread tool name seen by the scheduler; threads that set none are internal callers."""
+    local = threading.local()
+    monkeypatch.setattr(METRICS, "current_tool", lambda: getattr(local, "name", BACKGROUND))
+
+    def set_tool(name):
+        local.name = name
+    return set_tool
+
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out waiting for the scheduler"
+        time.sleep(0.001)
+
+
+def start(target, *args):
+    thread = threading.Thread(target=target, args=args, daemon=True)
+    thread.start()
+    return thread
+
+
+def test_write_is_passed_by_at_most_max_read_bypass_queued_reads(tool):
+    lock = SessionScheduler("s")
+    order = []
+
+    def call(name, label):
+        tool(name)
+        with lock:
+            order.append(label)
+
+    with lock:
+        threads = [start(call, WRITE_TOOL, "write")]
+        wait_until(lambda: lock.stats()["depth"] == 1)
+        for i in range(MAX_READ_BYPASS + 4):
+            threads.append(start(call, READ_TOOL, f"read{i}"))
+        wait_until(lambda: lock.stats()["depth"] == MAX_READ_BYPASS + 5)
+    for thread in threads:
+        thread.join(5)
+
+    assert order.index("write") == MAX_READ_BYPASS
+    assert order[:MAX_READ_BYPASS] == [f"read{i}" for i in range(MAX_READ_BYPASS)]
+
+
+def test_write_is_passed_by_at_most_max_read_bypass_shared_readers(tool):
+    lock = SessionScheduler("s")
+    entered = []
+    written = threading.Event()
+
+    def write():
+        tool(WRITE_TOOL)
+        with lock:
+            written.set()
+
+    def read():
+        tool(READ_TOOL)
+        if lock.acquire_shared(blocking=False):
+            entered.append(True)
+            lock.release_shared()
+        else:
+            entered.append(False)
+
+    lock.acquire_shared()
+    writer = start(write)
+    wait_until(lambda: lock.stats()["depth"] == 1)
+    for _ in range(MAX_READ_BYPASS + 2):
+        start(read).join(5)
+    assert entered == [True] * MAX_READ_BYPASS + [False] * 2
+    assert not written.is_set()
+    lock.release_shared()
+    writer.join(5)
+    assert written.is_set()
+
+
+def test_call_beyond_queue_limit_fails_at_once(tool):
+    lock = SessionScheduler("s")
+    errors = []
+
+    def call():
+        tool(WRITE_TOOL)
+        try:
+            with lock:
+                pass
+        except SessionBusyError as e:
+            errors.append(e)
+
+    with lock:
+        threads = [start(call) for _ in range(QUEUE_LIMIT)]
+        wait_until(lambda: lock.stats()["depth"] == QUEUE_LIMIT)
+        started = time.perf_counter()
+        start(call).join(5)
+        assert time.perf_counter() - started < 1
+        assert len(errors) == 1
+        assert lock.stats()["rejected"] == 1
+        assert lock.stats()["depth"] == QUEUE_LIMIT
+    for thread in threads:
+        thread.join(5)
+    assert len(errors) == 1
+    assert lock.stats()["depth"] == 0
+
+
+def test_reentry_does_not_count_against_the_queue_limit(tool):
+    lock = SessionScheduler("s")
+    tool(WRITE_TOOL)
+
+    def call():
+        tool(WRITE_TOOL)
+        with lock:
+            pass
+
+    with lock:
+        threads = [start(call) for _ in range(QUEUE_LIMIT)]
+        wait_until(lambda: lock.stats()["depth"] == QUEUE_LIMIT)
+        with lock:
+            with lock.shared():
+                assert lock.stats()["depth"] == QUEUE_LIMIT
+    for thread in threads:
+        thread.join(5)
+    assert lock.stats()["rejected"] == 0
+
+    lock.acquire_shared()
+    with lock.shared():
+        pass
+    with pytest.raises(RuntimeError):
+        lock.acquire()
+    lock.release_shared()
+
+
+def test_internal_callers_queue_past_the_limit(tool):
+    lock = SessionScheduler("s")
+    done = []
+
+    def call(name):
+        if name:
+            tool(name)
+        with lock:
+            done.append(name)
+
+    with lock:
+        threads = [start(call, WRITE_TOOL) for _ in range(QUEUE_LIMIT)]
+        wait_until(lambda: lock.stats()["depth"] == QUEUE_LIMIT)
+        threads.append(start(call, None))
+        wait_until(lambda: lock.stats()["depth"] == QUEUE_LIMIT + 1)
+    for thread in threads:
+        thread.join(5)
+    assert len(done) == QUEUE_LIMIT + 1
+    assert lock.stats()["rejected"] == 0
+
+
+def test_read_through_computes_a_miss_once_under_the_exclusive_lock(sim_server, open_session, tool):
+    _, session = open_session()
+    lock = session.lock
+    calls = []
+    results = []
+
+    def compute():
+        calls.append(lock._owner == threading.get_ident())
+        return "value"
+
+    def read():
+        tool(READ_TOOL)
+        results.append(sim_server.read_through(session, ("tool", 1), compute))
+
+    with lock:
+        threads = [start(read) for _ in range(2)]
+        wait_until(lambda: lock.stats()["depth"] == 2)
+    for thread in threads:
+        thread.join(5)
+    assert results == ["value", "value"]
+    assert calls == [True]
+
+    # A hit is answered under the shared lock; a miss here would raise on the exclusive upgrade
+    with lock.shared():
+        assert sim_server.read_through(session, ("tool", 1), compute) == "value"
+    assert calls == [True]
+
+    # Failed results are not cached
+    failures = []
+    assert sim_server.read_through(session, ("tool", 2), lambda: failures.append(1) or {"error": "x"}) == {"error": "x"}
+    sim_server.read_through(session, ("tool", 2), lambda: failures.append(1) or {"error": "x"})
+    assert len(failures) == 2
+
@@ -0,0 +1,67 @@
+"""Admission control of ExcelSessionManager on the simulated backend."""
+
+import pytest
+
+from xlwings_mcp import session as session_module
+from xlwings_mcp.exceptions import WorkbookError
+from xlwings_mcp.session import SESSION_MANAGER
+
+MB = 1024 * 1024
+
+
+@pytest.fixture
+def budget(sim_server, monkeypatch, tmp_path):
+    """400 MB budget; a workbook named big*.xlsx is estimated at 500 MB, others at 150 MB.
+    Memory probes record whether they ran under the manager lock."""
+    monkeypatch.setattr(SESSION_MANAGER, "_memory_budget", 400 * MB)
+    monkeypatch.setattr(session_module, "estimate_open_cost",
+                        lambda path: (500 if "big" in str(path) else 150) * MB)
+    probes = []
+
+    def memory_bytes(session):
+        probes.append(SESSION_MANAGER._capacity._is_owned())
+        return session_module.estimate_open_cost(session.filepath)
+    monkeypatch.setattr(session_module.ExcelSession, "memory_bytes", memory_bytes)
+
+    def open_(name):
+        return SESSION_MANAGER.open_workbook(str(tmp_path / name))
+    return open_, probes
+
+
+def test_oversized_workbook_does_not_evict_open_sessions(budget):
+    open_, probes = budget
+    first, second = open_("a.xlsx"), open_("b.xlsx")
+    with pytest.raises(WorkbookError, match="WORKBOOK_TOO_LARGE"):
+        open_("big.xlsx")
+    assert SESSION_MANAGER.get_session(first) is not None
+    assert SESSION_MANAGER.get_session(second) is not None
+    assert probes and not any(probes)
+
+
+def test_oversized_workbook_opens_on_an_idle_server(budget):
+    open_, _ = budget
+    assert SESSION_MANAGER.get_session(open_("big.xlsx")) is not None
+
+
+def test_eviction_makes_room_within_the_budget(budget):
+    open_, probes = budget
+    first = open_("a.xlsx")
+    second = open_("b.xlsx")
+    third = open_("c.xlsx")
+    assert SESSION_MANAGER.get_session(third) is not None
+    assert (SESSION_MANAGER.get_session(first) is None) != (SESSION_MANAGER.get_session(second) is None)
+    assert not any(probes)
+
+
+def test_memory_samples_are_reused(sim_server, monkeypatch, tmp_path):
+    calls = []
+    monkeypatch.setattr(session_module, "estimate_open_cost", lambda path: calls.append(path) or 150 * MB)
+    session_id = SESSION_MANAGER.open_workbook(str(tmp_path / "a.xlsx"))
+    session = SESSION_MANAGER.get_session(session_id)
+    session.process_id = None
+    calls.clear()
+    assert session.memory_bytes() == session.memory_bytes() == 150 * MB
+    assert len(calls) == 1
+    monkeypatch.setattr(session_module, "MEMORY_SAMPLE_TTL", 0)
+    session.memory_bytes()
+    assert len(calls) == 2
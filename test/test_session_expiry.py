@@ -0,0 +1,86 @@
+"""Expiry on access and automatic recovery of sessions, without holding up other callers."""
+
+import threading
+import time
+
+import pytest
+
+from xlwings_mcp.session import SESSION_MANAGER
+
+
+def expire(session):
+    """Age a session past the TTL; the file must exist on disk for recovery."""
+    open(session.filepath, "ab").close()
+    session.last_accessed -= SESSION_MANAGER._ttl + 1
+
+
+def call_in_thread(target, *args):
+    results = []
+    thread = threading.Thread(target=lambda: results.append(target(*args)), daemon=True)
+    thread.start()
+    return thread, results
+
+
+@pytest.fixture
+def blocked(monkeypatch):
+    """Patch a method so calls wait until the returned event is set."""
+    release = threading.Event()
+    entered = threading.Event()
+
+    def block(owner, name):
+        original = getattr(owner, name)
+
+        def wait(*args, **kwargs):
+            entered.set()
+            release.wait(5)
+            return original(*args, **kwargs)
+        monkeypatch.setattr(owner, name, wait)
+    yield block, entered, release
+    release.set()
+
+
+def test_expired_session_is_torn_down_in_the_background(open_session, blocked):
+    block, entered, release = blocked
+    expired_id, expired = open_session("expired.xlsx")
+    other_id, _ = open_session("other.xlsx")
+    block(expired.workbook, "close")
+    expire(expired)
+
+    recovering, recovered = call_in_thread(SESSION_MANAGER.get_session, expired_id)
+    assert entered.wait(5)
+    # The manager lock is free while the expired workbook closes
+    started = time.perf_counter()
+    assert SESSION_MANAGER.get_session(other_id) is not None
+    assert time.perf_counter() - started < 1
+    assert expired_id in SESSION_MANAGER._closing
+
+    release.set()
+    recovering.join(5)
+    assert recovered[0] is not None and recovered[0].id != expired_id
+    assert expired_id not in SESSION_MANAGER._closing
+    assert SESSION_MANAGER.get_session(expired_id) is recovered[0]
+
+
+def test_recovery_opens_excel_outside_the_manager_lock(open_session, blocked):
+    from simulated_excel import SimApp
+    block, entered, release = blocked
+    expired_id, expired = open_session("expired.xlsx")
+    other_id, _ = open_session("other.xlsx")
+    expire(expired)
+    block(SimApp, "__init__")
+
+    first, recovered = call_in_thread(SESSION_MANAGER.get_session, expired_id)
+    assert entered.wait(5)
+    second, again = call_in_thread(SESSION_MANAGER.get_session, expired_id)
+    started = time.perf_counter()
+    assert SESSION_MANAGER.get_session(other_id) is not None
+    assert len(SESSION_MANAGER.list_sessions()) >= 1
+    assert time.perf_counter() - started < 1
+
+    release.set()
+    first.join(5)
+    second.join(5)
+    # Concurrent callers share one recovered session
+    assert recovered[0] is not None
+    assert again[0] is recovered[0]
+    assert SESSION_MANAGER.get_session(expired_id) is recovered[0]
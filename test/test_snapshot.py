@@ -0,0 +1,175 @@
+"""Value snapshots kept in step with writes, inserts and deletes made through the
+tools on the simulated backend, compared with what the backend holds."""
+
+import json
+import threading
+
+import pytest
+
+from xlwings_mcp.snapshot import SheetValues
+
+SHEET = "Sheet1"
+BLOCK = ("A1", "H12")
+
+
+def snapshot_read(server, session_id, start=BLOCK[0], end=BLOCK[1]):
+    result = json.loads(server.read_data_from_excel(session_id, SHEET, start, end))
+    rows = {}
+    for cell in result["cells"]:
+        rows.setdefault(cell["row"], []).append(cell["value"])
+    return [rows[r] for r in sorted(rows)]
+
+
+def backend_read(session, r1=1, c1=1, r2=12, c2=8):
+    return session.workbook.sheets[SHEET]._read(r1, c1, r2, c2)
+
+
+@pytest.fixture
+def loaded(sim_server, open_session):
+    """A session whose snapshot of a 4x5 table has been loaded by a first read."""
+    session_id, session = open_session()
+    data = [["name", "qty", "price", "note", "flag"]]
+    data += [[f"item{i}", float(i), i * 1.5, "text", True] for i in range(1, 4)]
+    sim_server.write_data_to_excel(session_id, SHEET, data, "A1")
+    assert snapshot_read(sim_server, session_id) == backend_read(session)
+    assert session.value_snapshot.sheet(SHEET) is not None
+    return session_id, session
+
+
+EDITS = [
+    ("write over numbers", lambda s, sid: s.write_data_to_excel(sid, SHEET, [[10.0, 20.0], [30.0, 40.0]], "B2")),
+    ("write text Excel parses", lambda s, sid: s.write_data_to_excel(sid, SHEET, [["123", "2024-01-01", "TRUE"]], "C3")),
+    ("write outside the block", lambda s, sid: s.write_data_to_excel(sid, SHEET, [["far", 7.0]], "G9")),
+    ("insert rows", lambda s, sid: s.insert_rows(SHEET, 2, session_id=sid, count=2)),
+    ("insert columns", lambda s, sid: s.insert_columns(SHEET, 2, session_id=sid)),
+    ("delete rows", lambda s, sid: s.delete_sheet_rows(SHEET, 3, session_id=sid, count=2)),
+    ("delete columns", lambda s, sid: s.delete_sheet_columns(SHEET, 1, session_id=sid)),
+    ("formula", lambda s, sid: s.apply_formula(sid, SHEET, "E5", "=B2*2")),
+]
+
+
+def test_snapshot_matches_backend_after_each_edit(sim_server, loaded):
+    session_id, session = loaded
+    for label, edit in EDITS:
+        edit(sim_server, session_id)
+        assert session.value_snapshot is not None, label
+        assert snapshot_read(sim_server, session_id) == backend_read(session), label
+        # A snapshot loaded from scratch agrees with the patched one
+        session.value_snapshot = None
+        assert snapshot_read(sim_server, session_id) == backend_read(session), label
+
+
+def test_settled_cells_are_served_without_com(sim_server, loaded):
+    session_id, session = loaded
+    sim_server.write_data_to_excel(session_id, SHEET, [[5.0, "plain"]], "B2")
+    sheet = session.value_snapshot.sheet(SHEET)
+    assert sheet.is_fresh(1, 1, 12, 8, session.read_token())
+
+    backend = session.workbook.sheets[SHEET].backend
+    backend.reset()
+    values = snapshot_read(sim_server, session_id)
+    assert backend.total_calls == 0
+    assert values == backend_read(session)
+
+
+def test_unsettled_cells_are_read_back(sim_server, loaded):
+    session_id, session = loaded
+    sim_server.write_data_to_excel(session_id, SHEET, [["0042", 3.0]], "D2")
+    sheet = session.value_snapshot.sheet(SHEET)
+    assert sheet.unsettled == {(2, 4), (2, 5)}
+    assert sheet.is_fresh(1, 1, 1, 8, session.read_token())
+    assert not sheet.is_fresh(2, 4, 2, 4, session.read_token())
+
+    # The sim keeps "0042" as text where Excel may not; the read must show what the backend holds
+    session.workbook.sheets[SHEET]._write(2, 4, [[42.0]], formulas=False)
+    assert snapshot_read(sim_server, session_id) == backend_read(session)
+    assert session.value_snapshot.sheet(SHEET).unsettled == frozenset()
+
+
+def test_formula_values_go_stale_after_a_change(sim_server, loaded):
+    session_id, session = loaded
+    sim_server.apply_formula(session_id, SHEET, "F3", "=B3+1")
+    snapshot_read(sim_server, session_id)
+    sheet = session.value_snapshot.sheet(SHEET)
+    token = session.read_token()
+    assert (3, 6) in sheet.formulas
+    assert not sheet.formulas_stale(token)
+
+    sim_server.write_data_to_excel(session_id, SHEET, [["x"]], "A8")
+    sheet = session.value_snapshot.sheet(SHEET)
+    token = session.read_token()
+    assert sheet.formulas_stale(token)
+    # Blocks above or left of every formula stay servable; anything a formula could spill into does not
+    assert sheet.is_fresh(1, 1, 2, 8, token)
+    assert sheet.is_fresh(1, 1, 12, 5, token)
+    assert not sheet.is_fresh(3, 6, 3, 6, token)
+    assert not sheet.is_fresh(10, 7, 12, 8, token)
+
+    session.workbook.sheets[SHEET]._write(3, 6, [[99.0]], formulas=False)
+    assert snapshot_read(sim_server, session_id) == backend_read(session)
+
+
+def test_fresh_reads_do_not_wait_for_the_session_lock(sim_server, loaded):
+    session_id, session = loaded
+    results = {}
+
+    def read(label, start, end):
+        results[label] = snapshot_read(sim_server, session_id, start, end)
+
+    sim_server.write_data_to_excel(session_id, SHEET, [["123"]], "E6")
+    with session.lock:
+        fresh = threading.Thread(target=read, args=("fresh", "A1", "E4"), daemon=True)
+        fresh.start()
+        fresh.join(5)
+        assert "fresh" in results
+        stale = threading.Thread(target=read, args=("stale", "A1", "H12"), daemon=True)
+        stale.start()
+        stale.join(0.2)
+        assert "stale" not in results
+    stale.join(5)
+    assert results["fresh"] == backend_read(session, 1, 1, 4, 5)
+    assert results["stale"] == backend_read(session)
+
+
+def test_snapshot_is_dropped_when_a_change_was_missed(sim_server, loaded):
+    session_id, session = loaded
+    session.mark_changed()
+    sim_server.write_data_to_excel(session_id, SHEET, [[1.0]], "B2")
+    assert session.value_snapshot is None
+    assert snapshot_read(sim_server, session_id) == backend_read(session)
+
+
+def test_sheet_values_shift_like_excel():
+    sheet = SheetValues(SHEET, 2, 2, 2, [[1, 2], [3, 4]], formulas=frozenset({(3, 3)}))
+    inserted = sheet.rows_shifted(3, 1)
+    assert inserted.block(2, 2, 4, 3) == [[1, 2], [None, None], [3, 4]]
+    assert inserted.formulas == {(4, 3)}
+    assert sheet.rows_shifted(1, 2).block(4, 2, 5, 3) == [[1, 2], [3, 4]]
+    deleted = sheet.columns_shifted(1, -1)
+    assert (deleted.left, deleted.formulas) == (1, {(3, 2)})
+    assert deleted.cells_deleted(2, 1, 2, 1, "up").block(2, 1, 3, 2) == [[3, 2], [None, 4]]
+    assert sheet.rows == [[1, 2], [3, 4]]
+
+
+def test_oversize_sheet_is_not_loaded(sim_server, open_session, monkeypatch):
+    from xlwings_mcp import snapshot
+    from xlwings_mcp.xlwings_impl import snapshot_xlw
+    session_id, session = open_session()
+    sim_server.write_data_to_excel(session_id, SHEET, [[float(c) for c in range(5)] for _ in range(4)], "A1")
+    monkeypatch.setattr(snapshot, "SNAPSHOT_MAX_CELLS", 10)
+    monkeypatch.setattr(snapshot_xlw, "SNAPSHOT_MAX_CELLS", 10)
+    backend = session.workbook.sheets[SHEET].backend
+
+    backend.reset()
+    assert snapshot_read(sim_server, session_id, "A1", "B2") == backend_read(session, 1, 1, 2, 2)
+    assert backend.cells == 4
+    assert session.value_snapshot.oversize == {SHEET}
+
+    # Later reads skip the load attempt until the sheet changes
+    backend.reset()
+    assert snapshot_read(sim_server, session_id, "C1", "D2") == backend_read(session, 1, 3, 2, 4)
+    assert "Sheet.used_range" not in backend.calls
+    sim_server.delete_sheet_rows(SHEET, 1, session_id=session_id, count=3)
+    assert session.value_snapshot.oversize == frozenset()
+    assert snapshot_read(sim_server, session_id, "A1", "E1") == backend_read(session, 1, 1, 1, 5)
+    assert session.value_snapshot.sheet(SHEET) is not None
@@ -0,0 +1,68 @@
+"""Call budgets of bulk reads, traced with ComTracer over the simulated workbook."""
+
+import importlib
+import pkgutil
+
+import pytest
+
+from simulated_excel import fill_sheet
+from xlwings_mcp.tracing import ComTracer
+
+# Range-level calls a bulk read may make, however many cells it returns
+READ_BUDGET = 5
+
+
+def range_calls(tracer):
+    return sum(entry["calls"] for op, entry in tracer.by_operation().items() if op.startswith("SimRange."))
+
+
+def traced(workbook, read):
+    tracer = ComTracer("test")
+    result = read(tracer.wrap(workbook))
+    assert "error" not in result
+    return tracer
+
+
+def test_tracer_records_paths(open_session):
+    _, session = open_session()
+    tracer = ComTracer("test")
+    book = tracer.wrap(session.workbook)
+    book.sheets[0].range("A1").value = 5
+    assert book.sheets[0].range("A1").value == 5
+    operations = tracer.by_operation()
+    assert operations["SimRange.value="]["calls"] == 1
+    assert operations["SimRange.value"]["calls"] == 1
+    assert any(line.startswith("test;SimBook;SimBook.sheets;") for line in tracer.folded())
+
+
+@pytest.mark.parametrize("read", ["read_data", "columnar", "snapshot"])
+def test_bulk_read_call_budget(open_session, read):
+    from xlwings_mcp.xlwings_impl.data_xlw import read_data_from_excel_xlw_with_wb
+    from xlwings_mcp.xlwings_impl.query_xlw import read_columnar_xlw_with_wb
+    from xlwings_mcp.xlwings_impl.snapshot_xlw import load_sheet_values_xlw_with_wb
+
+    _, session = open_session()
+    sheet = session.workbook.sheets._items[0]
+    reads = {
+        "read_data": lambda rows: lambda wb: read_data_from_excel_xlw_with_wb(wb, "Sheet1", "A1", f"H{rows}"),
+        "columnar": lambda rows: lambda wb: read_columnar_xlw_with_wb(wb, "Sheet1", f"A1:H{rows}"),
+        "snapshot": lambda rows: lambda wb: load_sheet_values_xlw_with_wb(wb, "Sheet1", 0),
+    }
+    counts = []
+    for rows in (10, 5000):
+        fill_sheet(sheet, [[r * 10 + c for c in range(8)] for r in range(rows)])
+        tracer = traced(session.workbook, reads[read](rows))
+        assert range_calls(tracer) <= READ_BUDGET, tracer.by_operation()
+        counts.append(tracer.total_calls)
+    assert counts[0] == counts[1]
+
+
+def test_every_session_entry_point_is_instrumented():
+    from xlwings_mcp import xlwings_impl
+
+    entry_points = []
+    for info in pkgutil.iter_modules(xlwings_impl.__path__):
+        module = importlib.import_module(f"{xlwings_impl.__name__}.{info.name}")
+        entry_points += [fn for name, fn in vars(module).items() if name.endswith("_with_wb") and callable(fn)]
+    assert entry_points
+    assert all(getattr(fn, "_com_timed", False) for fn in entry_points)